@@ -80,10 +80,11 @@ from .atom import *
 from .flavor import restrict_flavors
 from .description import *
 from .filters import Filters
+from .rowset import RowSet
 
 # Import the user classes from the proper modules
 from .exceptions import *
-from .file import File, open_file, copy_file
+from .file import File, open_file, copy_file, get_cache_stats
 from .node import Node
 from .group import Group
 from .leaf import Leaf
@@ -114,7 +115,7 @@ __all__ = [
     'set_blosc_max_threads', 'set_blosc2_max_threads',
     'silence_hdf5_messages',
     # Helper classes:
-    'IsDescription', 'Description', 'Filters', 'Cols', 'Column',
+    'IsDescription', 'Description', 'Filters', 'Cols', 'Column', 'RowSet',
     # Types:
     'Enum',
     # Atom types:
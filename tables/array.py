@@ -1,5 +1,7 @@
 """Here is defined the Array class."""
 
+import itertools
+import math
 import operator
 import sys
 from typing import Any, Optional, Union, TYPE_CHECKING
@@ -8,6 +10,7 @@ import numpy as np
 import numpy.typing as npt
 
 from . import hdf5extension
+from .chunkcache import get_shared_cache
 from .filters import Filters
 from .flavor import flavor_of, array_as_internal, internal_to_flavor
 from .leaf import Leaf
@@ -755,12 +758,72 @@ class Array(hdf5extension.Array, Leaf):
         # Protection against reading empty arrays
         if 0 not in shape:
             # Arrays that have non-zero dimensionality
-            self._g_read_slice(startl, stopl, stepl, nparr)
+            if not self._read_cached_slice(startl, stopl, stepl, nparr):
+                self._g_read_slice(startl, stopl, stepl, nparr)
         # For zero-shaped arrays, return the scalar
         if nparr.shape == ():
             nparr = nparr[()]
         return nparr
 
+    def _read_cached_slice(self,
+                           startl: np.ndarray,
+                           stopl: np.ndarray,
+                           stepl: np.ndarray,
+                           nparr: np.ndarray) -> bool:
+        """Read a slice into `nparr` through the shared cache of chunks.
+
+        The chunks in the slice are read whole and kept in the cache.
+        False is returned (and nothing is read) if the cache is disabled,
+        the array is not chunked or the chunks in the slice would take too
+        much of the cache.
+
+        """
+
+        cache = get_shared_cache()
+        chunkshape = self.chunkshape
+        if (cache is None or chunkshape is None
+                or self.atom.kind == 'reference'):
+            return False
+        ranges = [range(start, stop, step) for start, stop, step
+                  in zip(startl.tolist(), stopl.tolist(), stepl.tolist())]
+        chunkranges = [range(r[0] // cs, r[-1] // cs + 1)
+                       for r, cs in zip(ranges, chunkshape)]
+        nchunks = math.prod(len(cr) for cr in chunkranges)
+        chunksize = math.prod(chunkshape) * self.atom.size
+        if not cache.fits(nchunks, nchunks * chunksize):
+            return False
+
+        out = nparr.reshape(tuple(len(r) for r in ranges) + self.atom.shape)
+        leafkey = self._shared_chunk_key()
+        for coords in itertools.product(*chunkranges):
+            # The elements of the slice in the chunk (src) and their
+            # place in the result (dst)
+            src, dst = [], []
+            for r, i, cs in zip(ranges, coords, chunkshape):
+                lo, step = i * cs, r.step
+                k0 = max(0, -((r.start - lo) // step))
+                k1 = min(len(r), -((r.start - lo - cs) // step))
+                first = r.start + k0 * step - lo
+                last = first + (k1 - k0 - 1) * step
+                src.append(slice(first, last + 1, step))
+                dst.append(slice(k0, k1))
+            if any(d.start >= d.stop for d in dst):
+                continue  # the slice steps over the chunk
+            key = leafkey + coords
+            chunk = cache.get(key)
+            if chunk is None:
+                cstart = [i * cs for i, cs in zip(coords, chunkshape)]
+                cstop = [min(c + cs, dim) for c, cs, dim
+                         in zip(cstart, chunkshape, self.shape)]
+                chunk = np.empty(dtype=self.atom.dtype,
+                                 shape=[b - a for a, b in zip(cstart, cstop)])
+                self._g_read_slice(np.array(cstart, dtype=SizeType),
+                                   np.array(cstop, dtype=SizeType),
+                                   np.ones(len(cstart), dtype=SizeType), chunk)
+                cache.put(key, chunk, chunk.nbytes)
+            out[tuple(dst)] = chunk[tuple(src)]
+        return True
+
     def _read_coords(self, coords: np.ndarray) -> np.ndarray:
         """Read a set of points defined by `coords`."""
 
@@ -0,0 +1,144 @@
+"""Here is defined the manager of the cache budget of a file."""
+
+import weakref
+from typing import Any, TYPE_CHECKING
+
+from .lrucacheextension import NumCache
+
+if TYPE_CHECKING:
+    from .file import File
+
+
+class CacheManager:
+    """Share a memory budget among the caches of the alive nodes in a file.
+
+    The caches of tables (for chunks and sequences) and of indexes (for
+    bounds, sorted values, limits and last row chunks) are resized every
+    `rebalance_every` queries.  The budget is shared in proportion to the
+    hits of every cache plus the misses that a larger cache would have
+    turned into hits (the lookups of keys evicted lately), weighted by
+    the bytes read again on a miss.  Caches which have just missed (like
+    the ones used by scans) or have not been used are shrunk to a small
+    floor, instead of being disabled as when their size is fixed.
+
+    Parameters
+    ----------
+    h5file
+        The file with the caches.
+    budget
+        The maximum number of bytes that the caches can take together.
+
+    """
+
+    rebalance_every = 64
+    """The number of queries between rebalances of the budget."""
+
+    floor_share = 8
+    """Every cache gets at least the budget divided by this number and by
+    the number of caches."""
+
+    def __init__(self, h5file: "File", budget: int) -> None:
+        self._h5file = weakref.proxy(h5file)
+        self.budget = budget
+        self._nqueries = 0
+        # The cache, hits and ghost hits in the last rebalance by name
+        self._counts: dict[str, tuple[Any, int, int]] = {}
+
+    def note_query(self) -> None:
+        """Count a query on the file, rebalancing the budget if it is time
+        to do so."""
+
+        self._nqueries += 1
+        if self._nqueries >= self.rebalance_every:
+            self._nqueries = 0
+            self.rebalance()
+
+    def _caches(self) -> dict[str, Any]:
+        caches = {}
+        for path, node in list(self._h5file._node_manager.registry.items()):
+            if node._v_isopen and hasattr(node, '_g_caches'):
+                caches.update((f'{path} {name}', cache)
+                              for name, cache in node._g_caches().items())
+        # Caches disabled by their configuration are left alone
+        return {name: cache for name, cache in caches.items()
+                if hasattr(cache, 'resize') and cache.nslots > 0}
+
+    @staticmethod
+    def _miss_cost(cache: Any) -> int:
+        """The estimated number of bytes read again on a miss."""
+
+        if isinstance(cache, NumCache):
+            return max(cache.maxnbytes // cache.nslots, 1)
+        if cache.nused > 0:
+            return max(cache.nbytes // cache.nused, 1)
+        return max(cache.maxnbytes // cache.nslots, 1)
+
+    @staticmethod
+    def _max_size(cache: Any, cost: int) -> int:
+        """The number of bytes beyond which the cache can not grow."""
+
+        if isinstance(cache, NumCache):
+            return ((1 << 16) - 1) * cost
+        # Objects may be larger than the average one
+        return 2 * cache.nslots * cost
+
+    def rebalance(self) -> dict[str, int]:
+        """Redistribute the budget among the caches of the alive nodes.
+
+        The size given to every cache is returned by name (see
+        :meth:`File.cache_stats` for the names).
+
+        """
+
+        caches = self._caches()
+        if not caches:
+            self._counts = {}
+            return {}
+        demands, costs, maxsizes = {}, {}, {}
+        for name, cache in caches.items():
+            hits, ghosthits = cache.nhits, cache.nghosthits
+            last = self._counts.get(name)
+            if (last is not None and last[0] is cache
+                    and hits >= last[1] and ghosthits >= last[2]):
+                hits -= last[1]
+                ghosthits -= last[2]
+            costs[name] = cost = self._miss_cost(cache)
+            maxsizes[name] = self._max_size(cache, cost)
+            # Misses are only worth more memory if they would have been
+            # hits in a larger cache (scans miss all the time, however
+            # large the cache is).
+            demands[name] = (hits + ghosthits) * cost
+        self._counts = {name: (cache, cache.nhits, cache.nghosthits)
+                        for name, cache in caches.items()}
+
+        # Every cache gets a floor, and the rest of the budget is shared
+        # in proportion to the demands (the share of caches which can not
+        # grow that much goes to the others).
+        floor = self.budget // (self.floor_share * len(caches))
+        sizes = {}
+        for name, cache in caches.items():
+            sizes[name] = min(floor, maxsizes[name])
+            if isinstance(cache, NumCache):
+                # Keep at least one slot, or the cache would look disabled
+                sizes[name] = max(sizes[name], costs[name])
+        free = self.budget - sum(sizes.values())
+        growing = {name for name in caches
+                   if demands[name] > 0 and sizes[name] < maxsizes[name]}
+        while growing and free > 0:
+            total = sum(demands[name] for name in growing)
+            capped = set()
+            for name in growing:
+                room = maxsizes[name] - sizes[name]
+                if free * demands[name] / total >= room:
+                    capped.add(name)
+            if not capped:
+                for name in growing:
+                    sizes[name] += int(free * demands[name] / total)
+                break
+            for name in capped:
+                free -= maxsizes[name] - sizes[name]
+                sizes[name] = maxsizes[name]
+            growing -= capped
+        for name, cache in caches.items():
+            cache.resize(sizes[name])
+        return sizes
@@ -0,0 +1,139 @@
+"""Here is defined the cache of decompressed chunks shared by open files."""
+
+import itertools
+import os
+import threading
+from typing import Any, Optional, TYPE_CHECKING
+
+from . import parameters
+from .lrucacheextension import ObjectCache
+
+if TYPE_CHECKING:
+    from .file import File
+
+# Identities for files whose chunks can not be shared with other handles.
+_private_files = itertools.count()
+# Generations of the chunks of leaves in files that may be modified.
+_generations = itertools.count(1)
+
+_shared_cache: Optional["SharedChunkCache"] = None
+_shared_cache_lock = threading.Lock()
+
+
+class SharedChunkCache:
+    """LRU cache of decompressed chunks shared by all the open files.
+
+    Chunks are kept under keys made of the identity of their file, the
+    address of their dataset in the file, the generation of the dataset
+    (which changes when the dataset is modified) and the index of the
+    chunk.  Every operation takes a lock, so the cache may be used by
+    several threads at the same time.
+
+    Parameters
+    ----------
+    nslots
+        The maximum number of chunks in the cache.
+    maxsize
+        The maximum size of the chunks in the cache (in bytes).
+
+    """
+
+    def __init__(self, nslots: int, maxsize: int) -> None:
+        self.nslots = nslots
+        self.maxsize = maxsize
+        self.cache = ObjectCache(nslots, maxsize, 'shared chunk cache')
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Any:
+        """Get the chunk with the `key`, or None if it is not cached."""
+
+        with self._lock:
+            nslot = self.cache.getslot(key)
+            if nslot < 0:
+                return None
+            return self.cache.getitem(nslot)
+
+    def put(self, key: tuple, chunk: Any, size: int) -> None:
+        """Keep the `chunk` (taking `size` bytes) under the `key`."""
+
+        with self._lock:
+            self.cache.setitem(key, chunk, size)
+
+    def fits(self, nchunks: int, size: int = 0) -> bool:
+        """Tell whether a read of `nchunks` chunks (taking `size` bytes)
+        should go through the cache.
+
+        Reads taking more than an eighth of the cache are better done
+        directly, so that large scans do not evict every other chunk.
+
+        """
+
+        return nchunks <= self.nslots // 8 and size <= self.maxsize // 8
+
+    def stats(self, reset: bool = False) -> dict[str, Any]:
+        """Get the statistics of the cache (and `reset` its counts)."""
+
+        with self._lock:
+            stats = self.cache.stats()
+            if reset:
+                self.cache.resetstats()
+        return stats
+
+
+def get_shared_cache() -> Optional[SharedChunkCache]:
+    """Get the shared cache of decompressed chunks.
+
+    The cache is sized by the ``SHARED_CHUNK_CACHE_SLOTS`` and
+    ``SHARED_CHUNK_CACHE_SIZE`` parameters in :mod:`tables.parameters`
+    (and built anew when they change).  None is returned when the cache
+    is disabled.
+
+    """
+
+    global _shared_cache
+
+    nslots = parameters.SHARED_CHUNK_CACHE_SLOTS
+    maxsize = parameters.SHARED_CHUNK_CACHE_SIZE
+    cache = _shared_cache
+    if nslots <= 0 or maxsize <= 0:
+        return None
+    if cache is None or (cache.nslots, cache.maxsize) != (nslots, maxsize):
+        with _shared_cache_lock:
+            cache = _shared_cache
+            if (cache is None
+                    or (cache.nslots, cache.maxsize) != (nslots, maxsize)):
+                cache = _shared_cache = SharedChunkCache(nslots, maxsize)
+    return cache
+
+
+def file_key(h5file: "File") -> tuple:
+    """Get the identity of `h5file` in the shared cache of chunks.
+
+    Files opened in read-only mode are identified by their device, inode,
+    size and modification time, so that handles to the same file (even
+    after reopening it) share their chunks.  Other files get an identity
+    of their own, since they may be modified through their handle.
+
+    """
+
+    if (h5file.mode == 'r'
+            and h5file.params.get('DRIVER_CORE_IMAGE') is None):
+        try:
+            stat = os.stat(h5file.filename)
+        except OSError:
+            pass
+        else:
+            return (stat.st_dev, stat.st_ino, stat.st_size,
+                    stat.st_mtime_ns)
+    return ('private', next(_private_files))
+
+
+def new_generation(h5file: "File") -> int:
+    """Get a generation for the chunks of a dataset in `h5file`.
+
+    Datasets in files opened in read-only mode can not change, so all
+    their chunks belong to the same generation.
+
+    """
+
+    return 0 if h5file.mode == 'r' else next(_generations)
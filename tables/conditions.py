@@ -4,6 +4,8 @@ Classes:
 
 `CompileCondition`
     Container for a compiled condition.
+`SetMembership`
+    Membership of column values in a set of values.
 
 Functions:
 
@@ -20,6 +22,7 @@ from typing import Any, Callable, Iterable, Optional, Type, Union, TYPE_CHECKING
 import numexpr as ne
 import numpy as np
 
+from .idxutils import exact_values
 from .utilsextension import get_nested_field
 from .utils import lazyattr
 
@@ -27,6 +30,10 @@ if TYPE_CHECKING:
     from .table import Column
 
 
+_isin_call = re.compile(
+    r"\bisin\(\s*([A-Za-z_]\w*)\s*,\s*([A-Za-z_]\w*)\s*\)")
+# E.g. "isin(col, ids)", with the names of the column and of the values.
+
 _no_matching_opcode = re.compile(r"[^a-z]([a-z]+)_([a-z]+)[^a-z]")
 # E.g. "gt" and "bfc" from "couldn't find matching opcode for 'gt_bfc'".
 
@@ -333,6 +340,72 @@ def _get_idx_expr(
     return _get_idx_expr_recurse(expr, indexedcols, [], [''])
 
 
+def _get_conjunct_cmps(
+    exprnode: ne.expressions.ExpressionNode,
+    conjunctcols: frozenset[str],
+) -> list[tuple[Any, str, Any]]:
+    """Get the comparisons of `conjunctcols` which `exprnode` requires.
+
+    These are the indexable variable-constant comparisons (see
+    `_get_indexable_cmp()`) involving variables in `conjunctcols` which
+    are joined by conjunctions at the top of `exprnode`, so that any row
+    fulfilling `exprnode` fulfills all of them.  A list of
+    ``(var, op, limit)`` tuples is returned.
+
+    """
+
+    if not conjunctcols:
+        return []
+    if exprnode.astType == 'op' and exprnode.value == 'and':
+        return [cmp_ for child in exprnode.children
+                for cmp_ in _get_conjunct_cmps(child, conjunctcols)]
+    idxcmp = _get_indexable_cmp(exprnode, conjunctcols)
+    if idxcmp[0] is None or idxcmp[1] == 'invert':
+        return []
+    return [idxcmp]
+
+
+class SetMembership:
+    """Membership of the values of a column in a set of values.
+
+    Instances stand for ``isin(column, values)`` calls in conditions,
+    and they are called with the values of `column` in a buffer of rows
+    to get which of them are in the set.  Dense sets of integers are
+    looked up in a table of flags, other sets with a binary search.
+
+    """
+
+    def __init__(self, column: "Column", values: Any) -> None:
+        self.column = column
+        """The column whose values are looked up."""
+        self.values = np.unique(exact_values(values, column.dtype))
+        """The sorted, unique values which may be in the column."""
+        self._flags = None
+        values = self.values
+        if values.dtype.kind in 'iu' and len(values) > 0:
+            lower, upper = int(values[0]), int(values[-1])
+            if upper - lower < 8 * len(values) + 4096:
+                flags = np.zeros(upper - lower + 1, dtype=bool)
+                flags[values - values.dtype.type(lower)] = True
+                self._flags = (lower, upper, flags)
+
+    def __call__(self, colvalues: np.ndarray) -> np.ndarray:
+        """Get which of `colvalues` are in the set (a boolean array)."""
+
+        values = self.values
+        if len(values) == 0:
+            return np.zeros(len(colvalues), dtype=bool)
+        if self._flags is not None:
+            lower, upper, flags = self._flags
+            inside = (colvalues >= lower) & (colvalues <= upper)
+            found = np.zeros(len(colvalues), dtype=bool)
+            found[inside] = flags[colvalues[inside] - lower]
+            return found
+        positions = np.searchsorted(values, colvalues)
+        positions[positions == len(values)] = 0
+        return values[positions] == colvalues
+
+
 class CompiledCondition:
     """Container for a compiled condition."""
 
@@ -353,6 +426,10 @@ class CompiledCondition:
                  params: list[str],
                  idxexprs: list[tuple[Any, tuple[str, ...], Any]],
                  strexpr: str,
+                 idxcomplete: bool=False,
+                 conjuncts: Optional[list[tuple[Any, str, Any]]]=None,
+                 memberships: Optional[dict[str, Any]]=None,
+                 required_memberships: Optional[list[str]]=None,
                  **kwargs) -> None:
         self.function = func
         """The compiled function object corresponding to this condition."""
@@ -362,6 +439,19 @@ class CompiledCondition:
         """A list of expressions in the form ``(var, (ops), (limits))``."""
         self.string_expression = strexpr
         """The indexable expression in string format."""
+        self.index_complete = idxcomplete
+        """Whether the indexable expression is the whole condition."""
+        self.conjuncts = conjuncts if conjuncts is not None else []
+        """A list of comparisons in the form ``(var, op, limit)`` required
+        by the condition, for columns in composite indexes or with zone
+        maps."""
+        self.memberships = memberships if memberships is not None else {}
+        """Maps the parameters standing for ``isin()`` calls to the names of
+        their column and values (or to `SetMembership` instances)."""
+        self.required_memberships = (
+            required_memberships if required_memberships is not None else [])
+        """The parameters in `memberships` which must be true for the
+        condition to be fulfilled."""
         self.kwargs = kwargs
         """NumExpr kwargs (used to pass ex_uses_vml to numexpr)"""
 
@@ -377,26 +467,66 @@ class CompiledCondition:
         the `condvars` mapping and converted to Python scalars.
         """
 
+        def replace(idxlim: Any) -> Any:
+            if isinstance(idxlim, tuple):  # variable
+                idxlim = condvars[idxlim[0]]  # look up value
+                idxlim = idxlim.tolist()  # convert back to Python
+            return idxlim
+
         exprs = self.index_expressions
         exprs2 = []
         for expr in exprs:
             idxlims = expr[2]  # the limits are in third place
-            limit_values = []
-            for idxlim in idxlims:
-                if isinstance(idxlim, tuple):  # variable
-                    idxlim = condvars[idxlim[0]]  # look up value
-                    idxlim = idxlim.tolist()  # convert back to Python
-                limit_values.append(idxlim)
+            limit_values = [replace(idxlim) for idxlim in idxlims]
             # Add this replaced entry to the new exprs2
             var, ops, _ = expr
             exprs2.append((var, ops, tuple(limit_values)))
+        conjuncts = [(var, op, replace(lim))
+                     for var, op, lim in self.conjuncts]
+        memberships = {}
+        for param, (colvar, valuesvar) in self.memberships.items():
+            column, values = condvars[colvar], condvars[valuesvar]
+            if not hasattr(column, 'pathname'):
+                raise TypeError("the first argument of ``isin()`` must be "
+                                "a column, not ``%s``" % colvar)
+            if hasattr(values, 'pathname'):
+                raise TypeError("the second argument of ``isin()`` can not "
+                                "be a column, like ``%s``" % valuesvar)
+            memberships[param] = SetMembership(column, values)
         # Create a new container for the converted values
         newcc = CompiledCondition(
             self.function, self.parameters, exprs2, self.string_expression,
-            **self.kwargs)
+            self.index_complete, conjuncts, memberships,
+            self.required_memberships, **self.kwargs)
         return newcc
 
 
+def _is_idx_expr_complete(exprnode: ne.expressions.ExpressionNode,
+                          indexedcols: frozenset[str]) -> bool:
+    """Is `exprnode` made only of indexable comparisons?
+
+    This is the case when `exprnode` is an indexable comparison (see
+    `_get_indexable_cmp()`), or a conjunction or disjunction of such
+    expressions.  Then the indexable expression extracted by
+    `_get_idx_expr()` is equivalent to the whole `exprnode`.
+
+    """
+
+    idxcmp = _get_indexable_cmp(exprnode, indexedcols)
+    invert = False
+    while idxcmp[1] == "invert":
+        invert ^= True
+        idxcmp = _get_indexable_cmp(idxcmp[0], indexedcols)
+    if idxcmp[0]:
+        return True
+    if invert:
+        return False
+    if exprnode.astType != 'op' or exprnode.value not in ['and', 'or']:
+        return False
+    return all(_is_idx_expr_complete(child, indexedcols)
+               for child in exprnode.children)
+
+
 def _get_variable_names(expression: ne.expressions.ExpressionNode) -> list[str]:
     """Return the list of variable names in the Numexpr `expression`."""
 
@@ -411,15 +541,48 @@ def _get_variable_names(expression: ne.expressions.ExpressionNode) -> list[str]:
     return list(set(names))  # remove repeated names
 
 
+def _replace_memberships(condition: str) -> tuple[str, dict[str, tuple[str, str]]]:
+    """Replace ``isin(column, values)`` calls in `condition`.
+
+    Every call is replaced by a new boolean variable.  A tuple with the
+    new condition and a mapping from the new variables to the names of
+    the column and values in the call is returned.
+
+    """
+
+    memberships = {}
+
+    def replace(match: re.Match) -> str:
+        param = '__isin%d' % len(memberships)
+        memberships[param] = match.groups()
+        return param
+
+    condition = _isin_call.sub(replace, condition)
+    if re.search(r"\bisin\s*\(", condition):
+        raise ValueError("the arguments of ``isin()`` in conditions must be "
+                         "the names of a column and of the values to look up")
+    return condition, memberships
+
+
 def compile_condition(condition: str,
                       typemap: dict[str, Type],
-                      indexedcols: frozenset[str]) -> CompiledCondition:
+                      indexedcols: frozenset[str],
+                      conjunctcols: frozenset[str]=frozenset(),
+                      ) -> CompiledCondition:
     """Compile a condition and extract usable index conditions.
 
     Looks for variable-constant comparisons in the `condition` string
     involving the indexed columns whose variable names appear in
     `indexedcols`.  The part of `condition` having usable indexes is
     returned as a compiled condition in a `CompiledCondition` container.
+    The comparisons required by `condition` for the columns whose
+    variable names appear in `conjunctcols` (those in composite indexes or
+    with zone maps) are extracted as well.
+
+    Calls like ``isin(column, values)`` in `condition` are replaced by
+    boolean parameters of the resulting function (see
+    `CompiledCondition.memberships`), which must be given the result of
+    the corresponding `SetMembership` instances.
 
     Expressions such as '0 < c1 <= 1' do not work as expected.  The
     Numexpr types of *all* variables must be given in the `typemap`
@@ -429,6 +592,11 @@ def compile_condition(condition: str,
 
     """
 
+    # Replace set memberships by boolean variables.
+    condition, memberships = _replace_memberships(condition)
+    if memberships:
+        typemap = dict(typemap, **{param: bool for param in memberships})
+
     # Get the expression tree and extract index conditions.
     expr = ne.necompiler.stringToExpression(condition, typemap, {})
     if expr.astKind != 'bool':
@@ -439,11 +607,18 @@ def compile_condition(condition: str,
     if isinstance(idxexprs, list):
         # Simple expression
         strexpr = ['e0']
+        idxcomplete = bool(idxexprs)
     else:
         # Complex expression
         idxexprs, strexpr = idxexprs
+        idxcomplete = bool(idxexprs) and _is_idx_expr_complete(
+            expr, indexedcols)
     # Get rid of the unnecessary list wrapper for strexpr
     strexpr = strexpr[0]
+    conjuncts = _get_conjunct_cmps(expr, conjunctcols)
+    required = [var for var, _, value in
+                _get_conjunct_cmps(expr, frozenset(memberships))
+                if value is True]
 
     # Get the variable names used in the condition.
     # At the same time, build its signature.
@@ -463,7 +638,8 @@ def compile_condition(condition: str,
 
     params = varnames
     # This is more comfortable to handle about than a tuple.
-    return CompiledCondition(func, params, idxexprs, strexpr, **kwargs)
+    return CompiledCondition(func, params, idxexprs, strexpr, idxcomplete,
+                             conjuncts, memberships, required, **kwargs)
 
 
 def call_on_recarr(func: Callable,
@@ -476,7 +652,8 @@ def call_on_recarr(func: Callable,
     The `param2arg` function, when specified, is used to get an argument
     given a parameter name; otherwise, the parameter itself is used as
     an argument.  When the argument is a `Column` object, the proper
-    column from `recarr` is used as its value.
+    column from `recarr` is used as its value.  When it is a
+    `SetMembership` object, it is called with the values of its column.
 
     """
 
@@ -488,5 +665,7 @@ def call_on_recarr(func: Callable,
             arg = param
         if hasattr(arg, 'pathname'):  # looks like a column
             arg = get_nested_field(recarr, arg.pathname)
+        elif isinstance(arg, SetMembership):
+            arg = arg(get_nested_field(recarr, arg.column.pathname))
         args.append(arg)
     return func(*args, **kwargs)
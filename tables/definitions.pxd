@@ -306,6 +306,7 @@ cdef extern from "hdf5.h" nogil:
                           unsigned *relnum )
   herr_t H5check_version(unsigned majnum, unsigned minnum,
                          unsigned relnum )
+  herr_t H5is_library_threadsafe(hbool_t *is_ts)
 
   # misc
   herr_t H5free_memory(void *buf)
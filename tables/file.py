@@ -44,6 +44,8 @@ from .table import Table
 from . import linkextension
 from .utils import detect_number_of_cores
 from . import lrucacheextension
+from . import chunkcache
+from .cachemanager import CacheManager
 from .flavor import flavor_of, array_as_internal
 from .atom import Atom
 
@@ -296,6 +298,37 @@ def open_file(filename: str, mode: Literal["r", "w", "a", "r+"]="r",
     return File(filename, mode, title, root_uep, filters, **kwargs)
 
 
+def get_cache_stats(reset: bool = False) -> dict[str, Any]:
+    """Get the statistics of the caches of PyTables.
+
+    A dictionary is returned with the statistics of the cache of chunks
+    shared by all the open files under ``'shared chunks'`` (see
+    :data:`tables.parameters.SHARED_CHUNK_CACHE_SIZE`), and a list of
+    dictionaries under ``'files'`` with the ``'filename'`` and ``'mode'``
+    of every open file handle and the statistics of its ``'caches'`` (as
+    returned by :meth:`File.cache_stats`).
+
+    Parameters
+    ----------
+    reset : bool
+        Whether to reset the counts of hits, misses and evictions after
+        getting them.
+
+    .. versionadded:: 3.9.3
+
+    """
+
+    sharedcache = chunkcache.get_shared_cache()
+    if sharedcache is not None:
+        shared = sharedcache.stats(reset)
+    else:
+        shared = lrucacheextension.ObjectCache(0, 0, 'disabled').stats()
+    files = [{'filename': h5file.filename, 'mode': h5file.mode,
+              'caches': h5file.cache_stats(reset)}
+             for h5file in list(_open_files.handlers) if h5file.isopen]
+    return {'shared chunks': shared, 'files': files}
+
+
 # A dumb class that doesn't keep anything at all
 class _NoCache:
     def __len__(self) -> int:
@@ -355,6 +388,9 @@ class NodeManager:
         # node_factory(node_path)
         self.node_factory = node_factory
 
+        # Lookups finding and not finding their nodes in the cache
+        self.nhits = self.nmisses = 0
+
     def register_node(self, node: Node, key: Optional[str]) -> None:
         if key is None:
             key = node._v_pathname
@@ -387,11 +423,14 @@ class NodeManager:
         if node is not None:
             if node._v_isopen:
                 self.cache_node(node, key)
+                self.nhits += 1
                 return node
             else:
                 # this should not happen
                 warnings.warn("a closed node found in the cache: ``%s``" % key)
 
+        self.nmisses += 1
+
         if key in self.registry:
             node = self.registry[key]
             if node is None:
@@ -415,6 +454,28 @@ class NodeManager:
 
         return node
 
+    def stats(self) -> dict[str, Any]:
+        """Get a dictionary with the statistics of the node cache.
+
+        The keys are the same as in the statistics of the LRU caches in
+        :mod:`tables.lrucacheextension`.  The size of nodes is not
+        measured, so ``nbytes`` is None.
+
+        """
+
+        cache = self.cache
+        return {'hits': self.nhits, 'misses': self.nmisses,
+                'evictions': getattr(cache, 'nevictions', 0),
+                'nslots': getattr(cache, 'nslots', 0), 'nused': len(cache),
+                'nbytes': None, 'enabled': not isinstance(cache, _NoCache)}
+
+    def resetstats(self) -> None:
+        """Reset the counts of hits, misses and evictions."""
+
+        self.nhits = self.nmisses = 0
+        if hasattr(self.cache, 'resetstats'):
+            self.cache.resetstats()
+
     def rename_node(self, oldkey: str, newkey: str) -> None:
         for cache in (self.cache, self.registry):
             if oldkey in cache:
@@ -740,6 +801,12 @@ class File(hdf5extension.File):
         if params['MAX_BLOSC_THREADS'] is None:
             params['MAX_BLOSC_THREADS'] = detect_number_of_cores()
 
+        if params['MAX_QUERY_THREADS'] is None:
+            params['MAX_QUERY_THREADS'] = detect_number_of_cores()
+
+        if params['MAX_INDEX_THREADS'] is None:
+            params['MAX_INDEX_THREADS'] = detect_number_of_cores()
+
         self.params = params
 
         # Now, it is time to initialize the File extension
@@ -761,6 +828,14 @@ class File(hdf5extension.File):
         # For the moment Undo/Redo is not enabled.
         self._undoEnabled = False
 
+        # The identity of the file in the shared cache of chunks.
+        self._chunk_cache_key = chunkcache.file_key(self)
+
+        # The manager of the budget for the caches of tables and indexes.
+        self._cache_manager = None
+        if params['CACHE_BUDGET'] > 0:
+            self._cache_manager = CacheManager(self, params['CACHE_BUDGET'])
+
         # Set the flag to indicate that the file has been opened.
         # It must be set before opening the root group
         # to allow some basic access to its attributes.
@@ -2709,6 +2784,56 @@ class File(hdf5extension.File):
         self._node_manager.flush_nodes()
         self._flush_file(0)  # 0 means local scope, 1 global (virtual) scope
 
+    def cache_stats(self, reset: bool = False) -> dict[str, dict[str, Any]]:
+        """Get the statistics of the caches of the file.
+
+        A dictionary is returned which maps the name of every cache to a
+        dictionary with its statistics: the number of lookups finding
+        (``'hits'``) and not finding (``'misses'``) their keys, the number
+        of entries evicted to make room for others or dropped when the
+        cache was disabled (``'evictions'``), the number of slots
+        (``'nslots'``), of slots in use (``'nused'``) and of bytes in use
+        (``'nbytes'``, or None if not measured), and whether the cache is
+        ``'enabled'``.  Caches may be disabled by their configuration (see
+        :ref:`parameter_files`) or, for a while, because their hit ratio
+        has been too low (see :data:`tables.parameters.LOWEST_HIT_RATIO`).
+
+        The cache of nodes is named ``'nodes'``.  The caches of the alive
+        nodes in the file are named after the path of their node, like
+        ``'/table chunks'``, ``'/table sequences'`` and ``'/table
+        conditions'`` for a table, or ``'/_i_table/col bounding limits'``
+        for the index of one of its columns.  Nodes are not loaded to get
+        their statistics, so sampling them is cheap.  The caches of tables
+        are built anew (with their statistics) when the tables are
+        modified.
+
+        Parameters
+        ----------
+        reset : bool
+            Whether to reset the counts of hits, misses and evictions
+            after getting them.
+
+        See also :func:`tables.get_cache_stats`, which includes the cache
+        of chunks shared by all the open files.
+
+        .. versionadded:: 3.9.3
+
+        """
+
+        self._check_open()
+
+        caches = {'nodes': self._node_manager}
+        for path, node in list(self._node_manager.registry.items()):
+            if node._v_isopen and hasattr(node, '_g_caches'):
+                caches.update((f'{path} {name}', cache)
+                              for name, cache in node._g_caches().items())
+        stats = {}
+        for name, cache in caches.items():
+            stats[name] = cache.stats()
+            if reset:
+                cache.resetstats()
+        return stats
+
     def close(self) -> None:
         """Flush all the alive leaves in object tree and close the file."""
 
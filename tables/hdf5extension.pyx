@@ -1220,22 +1220,25 @@ cdef class Leaf(Node):
 
     cdef hsize_t ret
 
+    # The chunks in the shared cache will be out of date
+    self._invalidate_shared_chunks()
     ret = truncate_dset(self.dataset_id, self.maindim, size)
     if ret < 0:
       raise HDF5ExtError("Problems truncating the leaf: %s" % self)
 
-    classname = self.__class__.__name__
-    if classname in ('EArray', 'CArray'):
+    # Subclasses of leaf classes are truncated like their base classes.
+    classnames = [cls.__name__ for cls in type(self).__mro__]
+    if 'EArray' in classnames or 'CArray' in classnames:
       # Update the new dimensionality
       self.dims[self.maindim] = size
       # Update the shape
       shape = list(self.shape)
       shape[self.maindim] = SizeType(size)
       self.shape = tuple(shape)
-    elif classname in ('Table', 'VLArray'):
+    elif 'Table' in classnames or 'VLArray' in classnames:
       self.nrows = size
     else:
-      raise ValueError("Unexpected classname: %s" % classname)
+      raise ValueError("Unexpected classname: %s" % self.__class__.__name__)
 
   def _g_flush(self):
     # Flush the dataset (in fact, the entire buffers in file!)
@@ -1544,6 +1547,8 @@ cdef class Array(Leaf):
     if self.atom.type == 'time64':
       self._convert_time64(nparr, 0)
 
+    # The chunks in the shared cache will be out of date
+    self._invalidate_shared_chunks()
     # Append the records
     extdim = self.extdim
     with nogil:
@@ -1861,6 +1866,8 @@ cdef class Array(Leaf):
     if self.atom.type == 'time64':
       self._convert_time64(nparr, 0)
 
+    # The chunks in the shared cache will be out of date
+    self._invalidate_shared_chunks()
     # Modify the elements:
     with nogil:
         ret = H5ARRAYwrite_records(self.dataset_id, self.type_id, self.rank,
@@ -1902,6 +1909,8 @@ cdef class Array(Leaf):
     if self.atom.type == 'time64':
       self._convert_time64(nparr, 0)
 
+    # The chunks in the shared cache will be out of date
+    self._invalidate_shared_chunks()
     # Do the actual write
     with nogil:
         ret = H5Dwrite(self.dataset_id, self.type_id, mem_space_id, space_id,
@@ -1950,6 +1959,8 @@ cdef class Array(Leaf):
     if self.atom.type == 'time64':
       self._convert_time64(nparr, 0)
 
+    # The chunks in the shared cache will be out of date
+    self._invalidate_shared_chunks()
     # Do the actual write
     with nogil:
         ret = H5Dwrite(self.dataset_id, self.type_id, mem_space_id, space_id,
@@ -2102,6 +2113,8 @@ cdef class VLArray(Leaf):
     else:
       rbuf = NULL
 
+    # The chunks in the shared cache will be out of date
+    self._invalidate_shared_chunks()
     # Append the records:
     with nogil:
         ret = H5VLARRAYappend_records(self.dataset_id, self.type_id,
@@ -2123,6 +2136,8 @@ cdef class VLArray(Leaf):
       if self.atom.type == 'time64':
         self._convert_time64(nparr, 0)
 
+    # The chunks in the shared cache will be out of date
+    self._invalidate_shared_chunks()
     # Append the records:
     with nogil:
         ret = H5VLARRAYmodify_records(self.dataset_id, self.type_id,
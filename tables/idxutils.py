@@ -1,7 +1,7 @@
 """Utilities to be used mainly by the Index class."""
 
 import math
-from typing import Literal, Optional, Union, TYPE_CHECKING
+from typing import Any, Literal, Optional, Union, TYPE_CHECKING
 
 import numpy as np
 
@@ -502,3 +502,199 @@ def nextafter(x: Union[bool, bytes, float, int],
     #        return PyNextAfter(x,x + 1)
 
     raise TypeError("data type ``%s`` is not supported" % dtype)
+
+
+
+def key_bytes(values: np.ndarray) -> np.ndarray:
+    """Encode `values` as big-endian bytes which sort like the values.
+
+    A ``(len(values), itemsize)`` array of unsigned bytes is returned.
+    Booleans, integers, floats and strings are supported.
+
+    """
+
+    dtype = values.dtype
+    kind, itemsize = dtype.kind, dtype.itemsize
+    if kind == 'S':
+        values = np.ascontiguousarray(values)
+    elif kind == 'b':
+        values = values.astype('>u1')
+    elif kind in 'iuf' and itemsize in (1, 2, 4, 8):
+        utype = np.dtype('u%d' % itemsize)
+        signbit = utype.type(1 << (8 * itemsize - 1))
+        if kind == 'f':
+            # Adding zero turns -0.0 into 0.0, so that both are equal.
+            bits = (values + dtype.type(0)).view(utype)
+            # Negative floats are ordered backwards.
+            bits = np.where(bits & signbit, ~bits, bits | signbit)
+        elif kind == 'i':
+            bits = values.view(utype) ^ signbit
+        else:
+            bits = values
+        values = bits.astype(utype.newbyteorder('>'))
+    else:
+        raise TypeError("data type ``%s`` is not supported" % dtype)
+    return values.view(np.uint8).reshape(len(values), itemsize)
+
+
+def composite_keysize(dtypes: list[np.dtype]) -> int:
+    """Get the size of the composite keys for columns of `dtypes`."""
+
+    return math.ceil(8 * sum(dtype.itemsize for dtype in dtypes) / 6)
+
+
+def _pack_keys(keybytes: np.ndarray) -> np.ndarray:
+    """Pack rows of bytes into strings of printable characters.
+
+    Every 6 bits in a row become a character from ``'0'`` to ``'o'``,
+    so that strings compare like rows of bytes.  String indexes do not
+    support null characters in values.
+
+    """
+
+    nbits = 8 * keybytes.shape[1]
+    bits = np.unpackbits(keybytes, axis=1)
+    bits = np.pad(bits, ((0, 0), (0, -nbits % 6)))
+    chars = bits.reshape(len(keybytes), -1, 6) @ np.array(
+        [32, 16, 8, 4, 2, 1], dtype=np.uint8)
+    chars += ord('0')
+    return chars.view('S%d' % chars.shape[1]).ravel()
+
+
+def composite_keys(arrays: list[np.ndarray]) -> np.ndarray:
+    """Get the keys of a composite index for the rows in `arrays`.
+
+    Every key is a string made of the values of the columns in `arrays`
+    for a row, so that keys compare like the tuples of values.
+
+    """
+
+    return _pack_keys(
+        np.concatenate([key_bytes(arr) for arr in arrays], axis=1))
+
+
+def composite_key_range(dtypes: list[np.dtype],
+                        equal: list[Any],
+                        lower: Any = None,
+                        upper: Any = None) -> tuple[bytes, bytes]:
+    """Get the range of composite keys for a prefix of columns.
+
+    The keys of rows whose first columns are equal to the values in
+    `equal`, and whose next column is within `lower` and `upper` (when
+    not None) are in the returned ``(lower, upper)`` range of keys.  The
+    range may contain other keys too.
+
+    """
+
+    def encode(value: Any, dtype: np.dtype) -> bytes:
+        if dtype.kind in 'iu':
+            info = np.iinfo(dtype)
+            value = min(max(value, info.min), info.max)
+        return key_bytes(np.array([value], dtype=dtype)).tobytes()
+
+    size = sum(dtype.itemsize for dtype in dtypes)
+    prefix = b''.join(encode(value, dtype)
+                      for value, dtype in zip(equal, dtypes))
+    dtype = dtypes[len(equal)] if len(equal) < len(dtypes) else None
+    lkey = prefix
+    if lower is not None:
+        lkey += encode(lower, dtype)
+    lkey += b'\x00' * (size - len(lkey))
+    ukey = prefix
+    if upper is not None:
+        ukey += encode(upper, dtype)
+    ukey += b'\xff' * (size - len(ukey))
+    keys = _pack_keys(np.frombuffer(lkey + ukey, dtype=np.uint8)
+                      .reshape(2, size))
+    return keys[0].tobytes(), keys[1].tobytes()
+
+
+def _mix64(h: np.ndarray) -> np.ndarray:
+    """Scramble the bits of 64-bit unsigned integers (MurmurHash3 fmix64)."""
+
+    h = h ^ (h >> np.uint64(33))
+    h = h * np.uint64(0xff51afd7ed558ccd)
+    h = h ^ (h >> np.uint64(33))
+    h = h * np.uint64(0xc4ceb9fe1a85ec53)
+    return h ^ (h >> np.uint64(33))
+
+
+def hash_values(values: np.ndarray) -> np.ndarray:
+    """Get 64-bit hashes of `values`.
+
+    Equal values (as of `key_bytes()`) get equal hashes, independently of
+    the platform.  An array of unsigned 64-bit integers is returned.
+
+    """
+
+    keybytes = key_bytes(values)
+    nwords = math.ceil(keybytes.shape[1] / 8)
+    words = np.zeros((len(keybytes), nwords * 8), dtype=np.uint8)
+    words[:, :keybytes.shape[1]] = keybytes
+    words = words.view('<u8')
+    h = np.full(len(keybytes), 0x9e3779b97f4a7c15, dtype=np.uint64)
+    for i in range(nwords):
+        h = _mix64(h ^ words[:, i])
+    return h
+
+
+def bloom_positions(values: np.ndarray, nbits: int,
+                    nhashes: int) -> np.ndarray:
+    """Get the bit positions of `values` in Bloom filters of `nbits` bits.
+
+    Double hashing is used to get `nhashes` positions for every value,
+    which are returned in an array with shape ``(len(values), nhashes)``.
+
+    """
+
+    h1 = hash_values(values)
+    h2 = _mix64(h1 ^ np.uint64(0x5bd1e9955bd1e995)) | np.uint64(1)
+    steps = np.arange(nhashes, dtype=np.uint64)
+    return (h1[:, np.newaxis] + steps * h2[:, np.newaxis]) % np.uint64(nbits)
+
+
+def exact_values(values: Any, dtype: np.dtype) -> np.ndarray:
+    """Get the `values` which may be equal to values of `dtype`.
+
+    Values which would change when converted to `dtype` (e.g. ``1.5`` or
+    ``300`` for 8-bit integers, NaN, or strings longer than the items of
+    `dtype`) can not be equal to any value of that type, so they are left
+    out.  The remaining values are returned in an array of `dtype`.
+
+    """
+
+    dtype = np.dtype(dtype)
+    numeric = dtype.kind in 'biuf'
+    if (isinstance(values, np.ndarray)
+            and (values.dtype.kind in 'biuf' if numeric
+                 else values.dtype.kind == 'S')):
+        values = values.ravel()
+        with np.errstate(invalid='ignore', over='ignore'):
+            if dtype.kind in 'iu' and values.dtype.kind in 'iuf':
+                info = np.iinfo(dtype)
+                values = values[(values >= info.min) & (values <= info.max)]
+            converted = values.astype(dtype)
+        return converted[converted == values]
+
+    if isinstance(values, np.ndarray):
+        values = values.ravel().tolist()
+    kept = []
+    for value in values:
+        if isinstance(value, (str, np.str_)):
+            continue
+        if isinstance(value, (bytes, np.bytes_)) == numeric:
+            continue
+        if dtype.kind in 'iu':
+            info = np.iinfo(dtype)
+            try:
+                if not info.min <= value <= info.max:
+                    continue
+            except TypeError:
+                continue
+        try:
+            converted = np.array(value, dtype=dtype)
+        except (OverflowError, TypeError, ValueError):
+            continue
+        if converted == value:
+            kept.append(converted)
+    return np.array(kept, dtype=dtype)
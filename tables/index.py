@@ -1,5 +1,6 @@
 """Here is defined the Index class."""
 
+import collections
 import math
 import operator
 import os
@@ -7,10 +8,12 @@ import sys
 import tempfile
 import warnings
 
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from time import perf_counter as clock
 from time import process_time as cpuclock
-from typing import Literal, Optional, Union, TYPE_CHECKING
+from typing import (Any, Callable, Iterable, Literal, Optional, Union,
+                    TYPE_CHECKING)
 
 import numpy as np
 import numpy.typing as npt
@@ -82,6 +85,30 @@ opt_search_types = ("int8", "int16", "int32", "int64",
 # The upper limit for uint32 ints
 max32 = 2**32
 
+# The maximum number of indices read at once when computing chunkmaps
+# (unless a single slice has more of them)
+max_chunkmap_batch = 2**20
+
+
+def _keysort_slice(arr: np.ndarray,
+                   idx: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Sort `arr` and `idx` in-place following the order of `arr`."""
+
+    # The GIL is released while sorting, so this may run in threads.
+    indexesextension.keysort(arr, idx)
+    return arr, idx
+
+
+def _submit(executor: Optional[ThreadPoolExecutor],
+            func: Callable, *args) -> Future:
+    """Run `func` in `executor`, or right away if there is none."""
+
+    if executor is not None:
+        return executor.submit(func, *args)
+    future = Future()
+    future.set_result(func(*args))
+    return future
+
 
 def _table_column_pathname_of_index(indexpathname: str) -> tuple[str, str]:
     names = indexpathname.split("/")
@@ -144,6 +171,10 @@ class Index(NotLoggedMixin, Group, indexesextension.Index):
         level parameter).
     new
         Whether this Index is new or has to be read from disk.
+    include
+        The pathnames of other columns in the table whose values are to be
+        stored in the index too (see :attr:`Index.include`).  Only full
+        indexes support this.
 
     """
 
@@ -155,6 +186,18 @@ class Index(NotLoggedMixin, Group, indexesextension.Index):
         return {1: 'ultralight', 2: 'light',
                 4: 'medium', 8: 'full'}[self.indsize]
 
+    @property
+    def include(self) -> tuple[str, ...]:
+        """The pathnames of the columns whose values are stored in the index.
+
+        The values of these columns are kept in the same order as the sorted
+        values of the indexed column, so that queries reading only the
+        indexed and included columns can be answered from the index alone.
+        This is empty for indexes which do not cover other columns.
+
+        """
+        return self._include
+
     @property
     def filters(self) -> Filters:
         """Filter properties for this index - see Filters in
@@ -329,7 +372,8 @@ class Index(NotLoggedMixin, Group, indexesextension.Index):
                  expectedrows: int=0,
                  byteorder: Optional[str]=None,
                  blocksizes: Optional[tuple[int, int, int, int]]=None,
-                 new: bool=True) -> None:
+                 new: bool=True,
+                 include: Optional[list[str]]=None) -> None:
 
         self._v_version: Optional[str] = None
         """The object version of this index."""
@@ -385,6 +429,7 @@ class Index(NotLoggedMixin, Group, indexesextension.Index):
         sorted index. -1 means that this number is not computed yet."""
         self.tprof = 0
         """Time counter for benchmarking purposes."""
+        self._include = tuple(include) if include else ()
 
         from .file import open_file
         self._openFile = open_file
@@ -412,6 +457,8 @@ class Index(NotLoggedMixin, Group, indexesextension.Index):
             self.blocksizes = (self.superblocksize, self.blocksize,
                                self.slicesize, self.chunksize)
             self.optlevel = int(attrs.optlevel)
+            if 'include' in attrs:
+                self._include = tuple(attrs.include)
             sorted = self.sorted
             indices = self.indices
             self.dtype = sorted.atom.dtype
@@ -533,6 +580,18 @@ class Index(NotLoggedMixin, Group, indexesextension.Index):
         sortedLR.attrs.nelements = 0
         indicesLR.attrs.nelements = 0
 
+        # Create the arrays for the values of included columns, following
+        # the order of sorted values (complete slices first, then last row)
+        if self._include:
+            self._v_attrs.include = list(self._include)
+            coldtypes = self.table.coldtypes
+            for i, colname in enumerate(self._include):
+                EArray(self, 'included%d' % i,
+                       Atom.from_dtype(coldtypes[colname]), (0,),
+                       "Values of column %s" % colname, filters,
+                       self.expectedrows, (self.chunksize,),
+                       byteorder=self.byteorder, _log=False)
+
         # All bounds values (+begin + end) are uninitialized in creation time
         self.bebounds = None
 
@@ -662,6 +721,23 @@ class Index(NotLoggedMixin, Group, indexesextension.Index):
         else:
             where = self
             reduction = self.reduction
+        nrows = where.sorted.nrows  # before sorted.append()
+        larr, arr, idx = self.initial_append(xarr, nrows, reduction)
+        self.append_sorted(where, nrows, larr, arr, idx, reduction)
+        if profile:
+            show_stats("Exiting append", tref)
+
+    def append_sorted(self,
+                      where: Union["Index", "RootGroup"],
+                      nrows: int,
+                      larr: np.generic,
+                      arr: np.ndarray,
+                      idx: np.ndarray,
+                      reduction: int) -> None:
+        """Save a slice sorted by ``initial_append()`` in `where`."""
+
+        if profile:
+            tref = clock()
         sorted = where.sorted
         indices = where.indices
         ranges = where.ranges
@@ -672,8 +748,6 @@ class Index(NotLoggedMixin, Group, indexesextension.Index):
         zbounds = where.zbounds
         sortedLR = where.sortedLR
         indicesLR = where.indicesLR
-        nrows = sorted.nrows  # before sorted.append()
-        larr, arr, idx = self.initial_append(xarr, nrows, reduction)
         # Save the sorted array
         sorted.append(arr.reshape(1, arr.size))
         cs = self.chunksize // reduction
@@ -711,7 +785,49 @@ class Index(NotLoggedMixin, Group, indexesextension.Index):
         indicesLR.attrs.nelements = self.nelementsILR
         self.dirtycache = True   # the cache is dirty now
         if profile:
-            show_stats("Exiting append", tref)
+            show_stats("Exiting append_sorted", tref)
+
+    def append_slices(self, slices: Iterable[np.ndarray],
+                      update: bool=False) -> None:
+        """Append several slices of values to the index objects.
+
+        When building full indexes, the slices are sorted by up to
+        ``MAX_INDEX_THREADS`` threads (see :mod:`tables.parameters`) while
+        the next ones are read, and saved in order.
+
+        """
+
+        nthreads = self._v_file.params['MAX_INDEX_THREADS']
+        if (nthreads <= 1 or update or not self.temp_required
+                or self.indsize != 8 or self.nelementsILR > 0):
+            for arr in slices:
+                self.append([arr], update=update)
+            return
+
+        where = self.tmp
+        ss = self.slicesize
+        nrow = where.sorted.nrows
+        pending = collections.deque()
+
+        def save(future: Future, nrow: int) -> None:
+            arr, idx = future.result()
+            self.append_sorted(where, nrow, arr[-1], arr, idx, 1)
+
+        with ThreadPoolExecutor(nthreads) as executor:
+            for arr in slices:
+                idx = np.arange(0, len(arr), dtype='uint64') + nrow * ss
+                pending.append(
+                    (executor.submit(_keysort_slice, arr, idx), nrow))
+                nrow += 1
+                # Keep a bounded number of slices in memory.
+                if len(pending) > nthreads:
+                    save(*pending.popleft())
+            while pending:
+                save(*pending.popleft())
+        # A completely sorted index is no longer possible after an
+        # append of an index with already one slice.
+        if nrow > 1:
+            self._v_attrs.is_csi = False
 
     def append_last_row(self, xarr: list[np.ndarray], update: bool=False) -> None:
         """Append the array to the last row index objects."""
@@ -729,9 +845,49 @@ class Index(NotLoggedMixin, Group, indexesextension.Index):
         else:
             where = self
             reduction = self.reduction
+        larr, arr, idx = self.initial_append(xarr, nrows, reduction)
+        self.save_last_row(where, nrows, larr, arr, idx, reduction)
+        if profile:
+            show_stats("Exiting appendLR", tref)
+
+    def extend_last_row(self, arr: np.ndarray) -> None:
+        """Add the values in `arr` to the last row of a full index.
+
+        The values in `arr` must belong to the rows which follow the ones
+        already in the last row.  Only they are sorted, and then merged
+        with the sorted values in the last row.
+
+        """
+
+        assert self.indsize == 8, "only full indexes keep row coordinates"
+        nrows = self.nslices
+        nelementsLR = self.nelementsILR
+        idx = (np.arange(nelementsLR, nelementsLR + len(arr), dtype='uint64')
+               + nrows * self.slicesize)
+        indexesextension.keysort(arr, idx)
+        sortedlr = np.empty(nelementsLR, dtype=self.dtype)
+        indiceslr = np.empty(nelementsLR, dtype='uint64')
+        self.read_slice_lr(self.sortedLR, sortedlr)
+        self.read_slice_lr(self.indicesLR, indiceslr)
+        # NaNs are sorted last, like in indexes.
+        positions = np.searchsorted(sortedlr, arr, side='right')
+        arr = np.insert(sortedlr, positions, arr)
+        idx = np.insert(indiceslr, positions, idx)
+        if nrows > 0:
+            self._v_attrs.is_csi = False
+        self.save_last_row(self, nrows, arr[-1], arr, idx, 1)
+
+    def save_last_row(self,
+                      where: Union["Index", "RootGroup"],
+                      nrows: int,
+                      larr: np.generic,
+                      arr: np.ndarray,
+                      idx: np.ndarray,
+                      reduction: int) -> None:
+        """Save a last row sorted by ``initial_append()`` in `where`."""
+
         indicesLR = where.indicesLR
         sortedLR = where.sortedLR
-        larr, arr, idx = self.initial_append(xarr, nrows, reduction)
         nelementsSLR = len(arr)
         nelementsILR = len(idx)
         # Build the cache of bounds
@@ -758,8 +914,6 @@ class Index(NotLoggedMixin, Group, indexesextension.Index):
         self.nelementsILR = nelementsILR
         self.nelementsSLR = nelementsSLR
         self.dirtycache = True   # the cache is dirty now
-        if profile:
-            show_stats("Exiting appendLR", tref)
 
     def optimize(self, verbose: bool=False) -> None:
         """Optimize an index so as to allow faster searches.
@@ -792,6 +946,11 @@ class Index(NotLoggedMixin, Group, indexesextension.Index):
         self.create_temp2()
         # Start the optimization process
         while True:
+            if self.want_complete_sort:
+                # Merging the sorted slices is cheaper than swapping
+                # chunks and slices before a complete sort.
+                self.merge_slices()
+                break
             if optfull:
                 for niter in range(optfull):
                     if self.swap('chunks', 'median'):
@@ -824,8 +983,6 @@ class Index(NotLoggedMixin, Group, indexesextension.Index):
         # been completed (this is to guarantee that the complete sort
         # does not take too much memory).
         if self.want_complete_sort:
-            if self.noverlaps > 0:
-                self.do_complete_sort()
             # Check that we have effectively achieved the complete sort
             if self.noverlaps > 0:
                 warnings.warn(
@@ -948,6 +1105,151 @@ class Index(NotLoggedMixin, Group, indexesextension.Index):
         if self.verbose:
             print(f"time: {clock() - t1:.4f}. clock: {cpuclock() - c1:.4f}")
 
+    def merge_slices(self) -> None:
+        """Bring an index with sorted slices into a complete sorted state.
+
+        This is an external k-way merge of the slices (and the last row)
+        in the temporary index.  The values in the index are split in
+        batches of about the size of a slice by the start bounds of its
+        chunks.  The values of every slice in a batch are read in whole
+        chunks, and the batch is sorted and saved in the new sorted slices.
+        Batches are sorted by up to ``MAX_INDEX_THREADS`` threads (see
+        :mod:`tables.parameters`) while the next ones are read.
+
+        """
+
+        if self.verbose:
+            t1 = clock()
+            c1 = cpuclock()
+        ss = self.slicesize
+        cs = self.chunksize
+        ncs = self.nchunkslice
+        tmp = self.tmp
+        nslices = self.nslices
+        nelementsLR = self.nelementsILR
+        idtype = np.dtype('u%d' % self.indsize)
+        nthreads = self._v_file.params['MAX_INDEX_THREADS']
+
+        # The values read from every slice which have not been merged yet,
+        # and the position of the next chunk to read.
+        nruns = nslices + (nelementsLR > 0)
+        rsorted = [np.empty(0, dtype=self.dtype)] * nslices
+        rindices = [np.empty(0, dtype=idtype)] * nslices
+        rstarts = np.zeros(nslices, dtype=np.int64)
+        if nelementsLR > 0:
+            # The last row is kept in memory, since it is overwritten
+            # with the last merged values.
+            rsorted.append(tmp.sortedLR[:nelementsLR])
+            rindices.append(tmp.indicesLR[:nelementsLR])
+        # The first values read and not merged yet, so that only the
+        # slices with values in a batch are visited.
+        rfirsts = np.empty(nruns, dtype=self.dtype)
+        rfilled = np.zeros(nruns, dtype=bool)
+        if nelementsLR > 0:
+            rfirsts[-1] = rsorted[-1][0]
+            rfilled[-1] = True
+        # Every batch ends at one of the start bounds of chunks.  NaNs are
+        # sorted last, and they all go to the last batch.
+        abounds = tmp.abounds[:].reshape(nslices, ncs)
+        limits = np.unique(abounds)[ss // cs::ss // cs]
+        limits = list(limits[limits == limits]) + [None]
+
+        # The buffers for the slice being saved
+        osorted = np.empty(ss, dtype=self.dtype)
+        oindices = np.empty(ss, dtype=idtype)
+        nsaved = 0
+        onslice = 0
+
+        def save(future: Future) -> None:
+            nonlocal nsaved, onslice
+            bsorted, bindices = future.result()
+            pos = 0
+            while pos < len(bsorted):
+                count = min(ss - nsaved, len(bsorted) - pos)
+                osorted[nsaved:nsaved + count] = bsorted[pos:pos + count]
+                oindices[nsaved:nsaved + count] = bindices[pos:pos + count]
+                nsaved += count
+                pos += count
+                if nsaved == ss:
+                    self.write_slice(tmp.sorted2, onslice, osorted)
+                    self.write_slice(tmp.indices2, onslice, oindices)
+                    self.update_caches(onslice, osorted)
+                    onslice += 1
+                    nsaved = 0
+
+        pending = collections.deque()
+        executor = ThreadPoolExecutor(nthreads) if nthreads > 1 else None
+        try:
+            for limit in limits:
+                # Read the chunks of slices which may hold values in batch
+                if limit is None:
+                    rstops = np.full(nslices, ss)
+                else:
+                    rstops = (abounds <= limit).sum(axis=1) * cs
+                for i in np.nonzero(rstops > rstarts)[0]:
+                    start, stop = rstarts[i], rstops[i]
+                    ssorted = np.empty(stop - start, dtype=self.dtype)
+                    sindices = np.empty(stop - start, dtype=idtype)
+                    self.read_slice(tmp.sorted, i, ssorted, start)
+                    self.read_slice(tmp.indices, i, sindices, start)
+                    rsorted[i] = np.concatenate((rsorted[i], ssorted))
+                    rindices[i] = np.concatenate((rindices[i], sindices))
+                    rstarts[i] = stop
+                    rfirsts[i] = rsorted[i][0]
+                    rfilled[i] = True
+                if limit is None:
+                    runs = np.nonzero(rfilled)[0]
+                else:
+                    runs = np.nonzero(rfilled & (rfirsts <= limit))[0]
+                if len(runs) == 0:
+                    continue
+                bsorted, bindices = [], []
+                for i in runs:
+                    if limit is None:
+                        n = len(rsorted[i])
+                    else:
+                        n = np.searchsorted(rsorted[i], limit, side='right')
+                    bsorted.append(rsorted[i][:n])
+                    bindices.append(rindices[i][:n])
+                    rsorted[i] = rsorted[i][n:]
+                    rindices[i] = rindices[i][n:]
+                    if len(rsorted[i]) > 0:
+                        rfirsts[i] = rsorted[i][0]
+                    else:
+                        rfilled[i] = False
+                pending.append(_submit(executor, _keysort_slice,
+                                       np.concatenate(bsorted),
+                                       np.concatenate(bindices)))
+                # Keep a bounded number of batches in memory.
+                if len(pending) > nthreads:
+                    save(pending.popleft())
+            while pending:
+                save(pending.popleft())
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        # The remaining values go to the last row
+        assert onslice == nslices and nsaved == nelementsLR
+        if nelementsLR > 0:
+            sortedlr = osorted[:nelementsLR]
+            tmp.sortedLR[:nelementsLR] = sortedlr
+            tmp.indicesLR[:nelementsLR] = oindices[:nelementsLR]
+            bebounds = np.concatenate((sortedlr[::cs], [sortedlr[-1]]))
+            tmp.sortedLR[nelementsLR:nelementsLR + len(bebounds)] = bebounds
+            self.bebounds = bebounds
+        # The merged slices replace the original ones
+        tmp.sorted._f_remove()
+        tmp.indices._f_remove()
+        tmp.sorted2._f_rename('sorted')
+        tmp.indices2._f_rename('indices')
+
+        # Compute the overlaps in order to verify that we have achieved
+        # a complete sort.
+        self.compute_overlaps(self.tmp, "merge_slices()", self.verbose)
+        if self.verbose:
+            print(f"time: {clock() - t1:.4f}. clock: {cpuclock() - c1:.4f}")
+
     def swap(self,
              what: Literal["chunks", "slices"],
              mode: Optional[Literal["start", "stop", "median"]]=None) -> bool:
@@ -1811,6 +2113,23 @@ class Index(NotLoggedMixin, Group, indexesextension.Index):
     def __len__(self) -> int:
         return self.nelements
 
+    def _g_caches(self) -> dict[str, Any]:
+        """Get the caches for searching the index by name (for
+        `File.cache_stats()`).
+
+        The caches are only there once the index has been searched.
+
+        """
+
+        caches = {}
+        for name, attrname in [('bounding limits', 'limboundscache'),
+                               ('last row chunks', 'sortedLRcache')]:
+            if attrname in self.__dict__:
+                caches[name] = self.__dict__[attrname]
+        if '_sorted' in self.__dict__:
+            caches.update(self._sorted._search_caches())
+        return caches
+
     def restorecache(self) -> None:
         """Clean the limits cache and resize starts and lengths arrays"""
 
@@ -1928,8 +2247,11 @@ class Index(NotLoggedMixin, Group, indexesextension.Index):
             # is doing a good work so as to avoid computing this
             # when it is not necessary to do it.
             startlengths = []
+            # The starts of empty ranges in reduced indexes are used
+            # for computing chunkmaps too (see get_chunkmap()).
+            keepempty = self.reduction > 1
             for nrow, length in enumerate(self.lengths):
-                if length > 0:
+                if length > 0 or keepempty:
                     startlengths.append((nrow, self.starts[nrow], length))
             # Compute the size of the recarray (aproximately)
             # The +1 at the end is important to avoid 0 lengths
@@ -2034,41 +2356,84 @@ class Index(NotLoggedMixin, Group, indexesextension.Index):
             tref = clock()
         if profile:
             show_stats("Entering get_chunkmap", tref)
-        ss = self.slicesize
-        nsb = self.nslicesblock
-        nslices = self.nslices
-        lbucket = self.lbucket
-        indsize = self.indsize
-        bucketsinblock = self.blocksize / lbucket
-        nchunks = math.ceil(self.nelements / lbucket)
+        nchunks = math.ceil(self.nelements / self.lbucket)
         chunkmap = np.zeros(shape=nchunks, dtype="bool")
         reduction = self.reduction
-        starts = (self.starts - 1) * reduction + 1
-        stops = (self.starts + self.lengths) * reduction
+        starts = (self.starts.astype(np.int64) - 1) * reduction + 1
+        stops = (self.starts.astype(np.int64) + self.lengths) * reduction
         starts[starts < 0] = 0    # All negative values set to zero
-        indices = self.indices
-        for nslice in range(self.nrows):
-            start = starts[nslice]
-            stop = stops[nslice]
-            if stop > start:
-                idx = np.empty(shape=stop - start, dtype='u%d' % indsize)
-                if nslice < nslices:
-                    indices._read_index_slice(nslice, start, stop, idx)
-                else:
-                    self.indicesLR._read_index_slice(start, stop, idx)
-                if indsize == 8:
-                    idx //= lbucket
-                elif indsize == 2:
-                    # The chunkmap size cannot be never larger than 'int_'
-                    idx = idx.astype("int_")
-                    offset = int((nslice // nsb) * bucketsinblock)
-                    idx += offset
-                elif indsize == 1:
-                    # The chunkmap size cannot be never larger than 'int_'
-                    idx = idx.astype("int_")
-                    offset = (nslice * ss) // lbucket
-                    idx += offset
-                chunkmap[idx] = True
+        lengths = np.maximum(stops - starts, 0)
+        # The indices found in complete slices are read in batches of
+        # slices, with a single call to the extension for every batch
+        # instead of looping over the slices here.
+        nslices = self.nslices
+        ends = np.cumsum(lengths[:nslices])
+        nslice = 0
+        while nslice < nslices:
+            read = ends[nslice - 1] if nslice > 0 else 0
+            stop = int(np.searchsorted(ends, read + max_chunkmap_batch,
+                                       "right"))
+            stop = max(stop, nslice + 1)
+            size = int(ends[stop - 1] - read)
+            if size > 0:
+                idx = np.empty(shape=size, dtype='u%d' % self.indsize)
+                self.indices._read_index_ranges(
+                    nslice, starts[nslice:stop], stops[nslice:stop], idx)
+                slices = np.repeat(np.arange(nslice, stop),
+                                   lengths[nslice:stop])
+                chunkmap[self._buckets_of(slices, idx)] = True
+            nslice = stop
+        if self.nrows > nslices and lengths[nslices] > 0:
+            idx = self._read_index_slice(
+                nslices, starts[nslices], stops[nslices])
+            chunkmap[self._buckets_of(nslices, idx)] = True
+        chunkmap = self._bucket_chunkmap_to_table(chunkmap)
+        if profile:
+            show_stats("Exiting get_chunkmap", tref)
+        return chunkmap
+
+    def _read_index_slice(self, nslice: int, start: int,
+                          stop: int) -> np.ndarray:
+        """Read the indices of a slice (the last row if `nslice` is
+        `nslices`) between `start` and `stop`."""
+
+        idx = np.empty(shape=stop - start, dtype='u%d' % self.indsize)
+        if nslice < self.nslices:
+            self.indices._read_index_slice(nslice, start, stop, idx)
+        else:
+            self.indicesLR._read_index_slice(start, stop, idx)
+        return idx
+
+    def _buckets_of(self, nslice: Union[int, np.ndarray],
+                    idx: np.ndarray) -> np.ndarray:
+        """Get the buckets of the rows with indices `idx` in a slice.
+
+        `nslice` may also be an array with the slice of every index.
+
+        """
+
+        lbucket = self.lbucket
+        indsize = self.indsize
+        nslice = np.asarray(nslice, dtype=np.int64)
+        if indsize == 8:
+            idx //= lbucket
+        elif indsize == 2:
+            # The chunkmap size cannot be never larger than 'int_'
+            idx = idx.astype("int_")
+            bucketsinblock = self.blocksize / lbucket
+            offset = (nslice // self.nslicesblock) * bucketsinblock
+            idx += offset.astype("int_")
+        elif indsize == 1:
+            # The chunkmap size cannot be never larger than 'int_'
+            idx = idx.astype("int_")
+            offset = (nslice * self.slicesize) // lbucket
+            idx += offset
+        return idx
+
+    def _bucket_chunkmap_to_table(self, chunkmap: np.ndarray) -> np.ndarray:
+        """Map a chunkmap of buckets into a chunkmap of the table."""
+
+        lbucket = self.lbucket
         # The case lbucket < nrowsinchunk should only happen in tests
         nrowsinchunk = self.nrowsinchunk
         if lbucket != nrowsinchunk:
@@ -2080,13 +2445,215 @@ class Index(NotLoggedMixin, Group, indexesextension.Index):
             idx = chunkmap.nonzero()[0]
             starts = (idx * ratio).astype('int_')
             stops = np.ceil((idx + 1) * ratio).astype('int_')
-            for start, stop in zip(starts, stops):
-                tchunkmap[start:stop] = True
+            stops[stops > tnchunks] = tnchunks
+            # Mark the ranges of chunks at once, by counting the ranges
+            # opened and not yet closed before every chunk
+            bounds = (np.bincount(starts, minlength=tnchunks + 1)
+                      - np.bincount(stops, minlength=tnchunks + 1))
+            tchunkmap[:] = np.cumsum(bounds[:tnchunks]) > 0
             chunkmap = tchunkmap
-        if profile:
-            show_stats("Exiting get_chunkmap", tref)
         return chunkmap
 
+    def _bisect_values(self, values: np.ndarray, bounds: np.ndarray,
+                       side: Literal["left", "right"], chunksize: int,
+                       size: int, read: Callable[[int, int], np.ndarray],
+                       ) -> np.ndarray:
+        """Find the positions of `values` in a sorted slice.
+
+        `values` must be sorted, `bounds` are the bounds of the chunks of
+        `chunksize` elements in the slice (with `size` elements), and
+        ``read(start, stop)`` gets the sorted values in the slice between
+        `start` and `stop`.  Only the chunks where `values` may be are
+        read, and consecutive ones are read at once.  The positions are
+        returned like in ``numpy.searchsorted()`` with the given `side`.
+
+        """
+
+        positions = np.empty(len(values), dtype=np.int64)
+        chunks = np.searchsorted(bounds, values, side=side)
+        nchunks, firsts = np.unique(chunks, return_index=True)
+        lasts = np.append(firsts[1:], len(values))
+        runs = np.flatnonzero(np.diff(nchunks, prepend=-2) != 1)
+        for rstart, rstop in zip(runs, np.append(runs[1:], len(nchunks))):
+            start = int(nchunks[rstart]) * chunksize
+            stop = min((int(nchunks[rstop - 1]) + 1) * chunksize, size)
+            first, last = firsts[rstart], lasts[rstop - 1]
+            positions[first:last] = start + np.searchsorted(
+                read(start, stop), values[first:last], side=side)
+        return positions
+
+    def search_values(self, values: np.ndarray) -> tuple[int, np.ndarray]:
+        """Look up several values in this index at once.
+
+        `values` must be a sorted array of unique values with the type of
+        the index.  All the values are looked up in every sorted slice
+        with a single batched binary search, which reads the chunks of
+        the slice where any of the values may be only once.  A tuple
+        with the number of candidate rows and a chunkmap (like the one
+        returned by `get_chunkmap()`) for all the values is returned.
+
+        """
+
+        if self.dirtycache:
+            self.restorecache()
+        chunkmap = np.zeros(shape=math.ceil(self.nelements / self.lbucket),
+                            dtype="bool")
+        if len(values) == 0:
+            return 0, self._bucket_chunkmap_to_table(chunkmap)
+
+        sorted = self.sorted
+        reduction = self.reduction
+        lookups = []  # (nslice, values, bounds, chunksize, size, read)
+        if self.nslices > 0:
+            ranges = self.rvcache
+            allbounds = self.bounds[:]
+            for nslice in range(self.nslices):
+
+                def read(start, stop, nslice=nslice):
+                    buffer = np.empty(stop - start, dtype=self.dtype)
+                    self.read_slice(sorted, nslice, buffer, start)
+                    return buffer
+
+                lookups.append((nslice, ranges[nslice], allbounds[nslice],
+                                sorted.chunksize, sorted.slicesize, read))
+        if self.nelementsSLR > 0:
+
+            def read_lr(start, stop):
+                buffer = np.empty(stop - start, dtype=self.dtype)
+                self.read_slice_lr(self.sortedLR, buffer, start)
+                return buffer
+
+            bebounds = self.bebounds
+            lookups.append((self.nslices, (bebounds[0], bebounds[-1]),
+                            bebounds[1:-1], self.chunksize // reduction,
+                            self.nelementsSLR, read_lr))
+
+        tlen = 0
+        for nslice, (first, last), bounds, chunksize, size, read in lookups:
+            # Only values within the range of the slice may be found.  The
+            # last values of reduced slices are not kept in sorted ones.
+            svalues = values[np.searchsorted(values, first, side='left'):]
+            if reduction == 1:
+                svalues = svalues[:np.searchsorted(svalues, last,
+                                                   side='right')]
+            if len(svalues) == 0:
+                continue
+            starts = self._bisect_values(svalues, bounds, 'left', chunksize,
+                                         size, read)
+            stops = self._bisect_values(svalues, bounds, 'right', chunksize,
+                                        size, read)
+            tlen += int((stops - starts).sum())
+            # Convert to positions in indices, like in `get_chunkmap()`
+            starts = np.maximum((starts - 1) * reduction + 1, 0)
+            stops = stops * reduction
+            keep = stops > starts
+            starts, stops = starts[keep], stops[keep]
+            if len(starts) == 0:
+                continue
+            # Ranges of indices which are close together are read at once,
+            # keeping only the indices within the ranges.
+            ends = np.maximum.accumulate(stops)
+            groups = np.flatnonzero(
+                starts[1:] > ends[:-1] + self.chunksize) + 1
+            for gfirst, glast in zip(np.append(0, groups),
+                                     np.append(groups, len(starts))):
+                gstart, gstop = int(starts[gfirst]), int(ends[glast - 1])
+                marks = np.zeros(gstop - gstart + 1, dtype=np.int64)
+                np.add.at(marks, starts[gfirst:glast] - gstart, 1)
+                np.add.at(marks, stops[gfirst:glast] - gstart, -1)
+                inside = np.cumsum(marks[:-1]) > 0
+                idx = self._read_index_slice(nslice, gstart, gstop)
+                chunkmap[self._buckets_of(nslice, idx[inside])] = True
+        return tlen, self._bucket_chunkmap_to_table(chunkmap)
+
+    def update_included(self) -> None:
+        """Store the values of included columns for the indexed rows.
+
+        Only complete slices which have been added since the last update
+        are read from the table, along with the last row (which changes as
+        a whole).  The included values must be rebuilt from scratch (by
+        truncating the arrays first) if the slices are reordered.
+
+        """
+
+        if not self._include:
+            return
+        table = self.table
+        ss = self.slicesize
+        nslices = self.nslices
+        included = [getattr(self, 'included%d' % i)
+                    for i in range(len(self._include))]
+        nstart = min(included[0].nrows // ss, nslices)
+        for values in included:
+            values.truncate(nstart * ss)
+        for nslice in range(nstart, self.nrows):
+            if nslice < nslices:
+                coords = np.empty(shape=ss, dtype='u%d' % self.indsize)
+                self.indices._read_index_slice(nslice, 0, ss, coords)
+            else:
+                coords = np.empty(shape=self.nelementsILR,
+                                  dtype='u%d' % self.indsize)
+                self.indicesLR._read_index_slice(0, self.nelementsILR, coords)
+            # Read the table in row order and put the values back in the
+            # order of the index.
+            order = np.argsort(coords, kind='stable')
+            for colname, values in zip(self._include, included):
+                rvalues = table._read_coordinates(coords[order], colname)
+                svalues = np.empty_like(rvalues)
+                svalues[order] = rvalues
+                values.append(svalues)
+
+    def read_found(self, colname: Union[str, None, bool]=None,
+                   ) -> tuple[np.ndarray, Optional[np.ndarray]]:
+        """Read the rows found in the last `search()` from the index.
+
+        A ``(coords, values)`` tuple is returned with the coordinates of
+        the rows and their values in the indexed column, or in the
+        included column `colname`.  If `colname` is False, only the
+        coordinates are read and `values` is None.  Only full indexes
+        keep the coordinates of rows, and rows are returned in index
+        order.
+
+        """
+
+        assert self.indsize == 8, "only full indexes keep row coordinates"
+        if colname:
+            included = getattr(self,
+                               'included%d' % self._include.index(colname))
+        ss = self.slicesize
+        nslices = self.nslices
+        coords, values = [], []
+        for nslice in range(self.nrows):
+            start = int(self.starts[nslice])
+            stop = start + int(self.lengths[nslice])
+            if stop <= start:
+                continue
+            idx = np.empty(shape=stop - start, dtype='u8')
+            if nslice < nslices:
+                self.indices._read_index_slice(nslice, start, stop, idx)
+            else:
+                self.indicesLR._read_index_slice(start, stop, idx)
+            coords.append(idx)
+            if colname is None:
+                buf = np.empty(shape=stop - start, dtype=self.dtype)
+                if nslice < nslices:
+                    self.sorted._read_index_slice(nslice, start, stop, buf)
+                else:
+                    self.sortedLR._read_index_slice(start, stop, buf)
+                values.append(buf)
+            elif colname:
+                offset = nslice * ss
+                values.append(included.read(offset + start, offset + stop))
+        if len(coords) == 0:
+            coords.append(np.empty(shape=0, dtype='u8'))
+            if colname is None:
+                values.append(np.empty(shape=0, dtype=self.dtype))
+            elif colname:
+                values.append(included.read(0, 0))
+        if colname is False:
+            return np.concatenate(coords), None
+        return np.concatenate(coords), np.concatenate(values)
+
     def get_lookup_range(self,
                          ops: Union[tuple[str], tuple[str, str]],
                          limits: Union[tuple[float], tuple[float, float]]) -> tuple[float, float]:
@@ -2158,11 +2725,14 @@ class Index(NotLoggedMixin, Group, indexesextension.Index):
         return (f"Index({self.optlevel}, "
                 f"{self.kind}{', '.join(filters)}).is_csi={self.is_csi}")
 
+    def _indexed_name(self) -> str:
+        """The name of the indexed column in representations."""
+        return f"column {self.table._v_pathname}.cols.{self.column.pathname}"
+
     def __repr__(self) -> str:
         """This provides more metainfo than standard __repr__"""
 
-        cpathname = f"{self.table._v_pathname}.cols.{self.column.pathname}"
-        retstr = f"""{self._v_pathname} (Index for column {cpathname})
+        retstr = f"""{self._v_pathname} (Index for {self._indexed_name()})
   optlevel := {self.optlevel}
   kind := {self.kind}
   filters := {self.filters}
@@ -2183,6 +2753,55 @@ class Index(NotLoggedMixin, Group, indexesextension.Index):
         return retstr
 
 
+class CompositeIndex(Index):
+    """Represents an index over several columns in a table.
+
+    The values in the index are keys made from the values of all the
+    `columns` in a row, which sort like the tuples of values.  The index
+    can then be used to look up conditions which compare the first
+    columns with values, and the next one with a range, e.g.
+    ``(sensor == 17) & (ts >= t0) & (ts < t1)``.
+
+    Parameters
+    ----------
+    parentnode
+        The parent :class:`Group` object.
+    name : str
+        The name of this node in its parent group.
+    columns : list of str
+        The pathnames of the indexed columns, in order.
+    kwargs
+        The rest of arguments are passed to :class:`Index`.
+
+    """
+
+    _c_classid = 'COMPOSITEINDEX'
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        """The pathnames of the indexed columns, in order."""
+        return self._columns
+
+    def __init__(self,
+                 parentnode: Group,
+                 name: str,
+                 columns: Optional[list[str]]=None,
+                 **kwargs) -> None:
+        self._columns = tuple(columns) if columns else ()
+        super().__init__(parentnode, name, **kwargs)
+
+    def _g_post_init_hook(self) -> None:
+        if self._v_new:
+            self._v_attrs.columns = list(self._columns)
+        else:
+            self._columns = tuple(self._v_attrs.columns)
+        super()._g_post_init_hook()
+
+    def _indexed_name(self) -> str:
+        return (f"columns {', '.join(self._columns)} of "
+                f"{self.table._v_pathname}")
+
+
 class IndexesDescG(NotLoggedMixin, Group):
     _c_classid = 'DINDEX'
 
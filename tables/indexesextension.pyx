@@ -147,45 +147,54 @@ def keysort(ndarray array1, ndarray array2):
     array1 can be of any type, except complex or string.  array2 may be made of
     elements on any size.
 
+    The GIL is released while sorting, so several arrays may be sorted
+    concurrently by different threads.
+
     """
     cdef size_t size = cnp.PyArray_SIZE(array1)
     cdef size_t elsize1 = cnp.PyArray_ITEMSIZE(array1)
     cdef size_t elsize2 = cnp.PyArray_ITEMSIZE(array2)
     cdef int type_num = cnp.PyArray_TYPE(array1)
+    cdef void *data1 = PyArray_DATA(array1)
+    cdef char *data2 = PyArray_BYTES(array2)
+    cdef bint known = True
 
-    # floating types
-    if type_num == cnp.NPY_FLOAT16:
-        _keysort[npy_float16](<npy_float16*>PyArray_DATA(array1), PyArray_BYTES(array2), elsize2, size)
-    elif type_num == cnp.NPY_FLOAT32:
-        _keysort[npy_float32](<npy_float32*>PyArray_DATA(array1), PyArray_BYTES(array2), elsize2, size)
-    elif type_num == cnp.NPY_FLOAT64:
-        _keysort[npy_float64](<npy_float64*>PyArray_DATA(array1), PyArray_BYTES(array2), elsize2, size)
-    elif type_num == cnp.NPY_LONGDOUBLE:
-        _keysort[npy_longdouble](<npy_longdouble*>PyArray_DATA(array1), PyArray_BYTES(array2), elsize2, size)
-    # signed integer types
-    elif type_num == cnp.NPY_INT8:
-        _keysort[npy_int8](<npy_int8*>PyArray_DATA(array1), PyArray_BYTES(array2), elsize2, size)
-    elif type_num == cnp.NPY_INT16:
-        _keysort[npy_int16](<npy_int16*>PyArray_DATA(array1), PyArray_BYTES(array2), elsize2, size)
-    elif type_num == cnp.NPY_INT32:
-        _keysort[npy_int32](<npy_int32*>PyArray_DATA(array1), PyArray_BYTES(array2), elsize2, size)
-    elif type_num == cnp.NPY_INT64:
-        _keysort[npy_int64](<npy_int64*>PyArray_DATA(array1), PyArray_BYTES(array2), elsize2, size)
-    # unsigned integer types
-    elif type_num == cnp.NPY_UINT8:
-        _keysort[npy_uint8](<npy_uint8*>PyArray_DATA(array1), PyArray_BYTES(array2), elsize2, size)
-    elif type_num == cnp.NPY_UINT16:
-        _keysort[npy_uint16](<npy_uint16*>PyArray_DATA(array1), PyArray_BYTES(array2), elsize2, size)
-    elif type_num == cnp.NPY_UINT32:
-        _keysort[npy_uint32](<npy_uint32*>PyArray_DATA(array1), PyArray_BYTES(array2), elsize2, size)
-    elif type_num == cnp.NPY_UINT64:
-        _keysort[npy_uint64](<npy_uint64*>PyArray_DATA(array1), PyArray_BYTES(array2), elsize2, size)
-    # other
-    elif type_num == cnp.NPY_BOOL:
-        _keysort[npy_bool](<npy_bool*>PyArray_DATA(array1), PyArray_BYTES(array2), elsize2, size)
-    elif type_num == cnp.NPY_STRING:
-        _keysort_string(PyArray_BYTES(array1), elsize1, PyArray_BYTES(array2), elsize2, size)
-    else:
+    with nogil:
+        # floating types
+        if type_num == cnp.NPY_FLOAT16:
+            _keysort[npy_float16](<npy_float16*>data1, data2, elsize2, size)
+        elif type_num == cnp.NPY_FLOAT32:
+            _keysort[npy_float32](<npy_float32*>data1, data2, elsize2, size)
+        elif type_num == cnp.NPY_FLOAT64:
+            _keysort[npy_float64](<npy_float64*>data1, data2, elsize2, size)
+        elif type_num == cnp.NPY_LONGDOUBLE:
+            _keysort[npy_longdouble](<npy_longdouble*>data1, data2, elsize2, size)
+        # signed integer types
+        elif type_num == cnp.NPY_INT8:
+            _keysort[npy_int8](<npy_int8*>data1, data2, elsize2, size)
+        elif type_num == cnp.NPY_INT16:
+            _keysort[npy_int16](<npy_int16*>data1, data2, elsize2, size)
+        elif type_num == cnp.NPY_INT32:
+            _keysort[npy_int32](<npy_int32*>data1, data2, elsize2, size)
+        elif type_num == cnp.NPY_INT64:
+            _keysort[npy_int64](<npy_int64*>data1, data2, elsize2, size)
+        # unsigned integer types
+        elif type_num == cnp.NPY_UINT8:
+            _keysort[npy_uint8](<npy_uint8*>data1, data2, elsize2, size)
+        elif type_num == cnp.NPY_UINT16:
+            _keysort[npy_uint16](<npy_uint16*>data1, data2, elsize2, size)
+        elif type_num == cnp.NPY_UINT32:
+            _keysort[npy_uint32](<npy_uint32*>data1, data2, elsize2, size)
+        elif type_num == cnp.NPY_UINT64:
+            _keysort[npy_uint64](<npy_uint64*>data1, data2, elsize2, size)
+        # other
+        elif type_num == cnp.NPY_BOOL:
+            _keysort[npy_bool](<npy_bool*>data1, data2, elsize2, size)
+        elif type_num == cnp.NPY_STRING:
+            _keysort_string(<char*>data1, elsize1, data2, elsize2, size)
+        else:
+            known = False
+    if not known:
         raise ValueError("Unknown array datatype")
 
 
@@ -614,6 +623,41 @@ cdef class IndexArray(Array):
       raise HDF5ExtError("Problems reading the index indices.")
 
 
+  def _read_index_ranges(self, hsize_t nrow, ndarray starts, ndarray stops,
+                         ndarray idx):
+    """Read a range of indices in consecutive rows at once.
+
+    The indices from ``starts[i]`` to ``stops[i]`` in the row ``nrow + i``
+    are put one after another in `idx`.  `starts` and `stops` are int64
+    arrays with an item per row, and empty ranges are skipped.
+
+    """
+
+    cdef hsize_t nrows, irow
+    cdef npy_int64 *rstarts = <npy_int64 *>PyArray_DATA(starts)
+    cdef npy_int64 *rstops = <npy_int64 *>PyArray_DATA(stops)
+    cdef char *buf = PyArray_BYTES(idx)
+    cdef size_t itemsize = idx.itemsize
+    cdef herr_t ret = 0
+
+    nrows = len(starts)
+    # Reading the ranges one row at a time is faster than reading a
+    # union of hyperslabs at once, but the loop is done without the GIL.
+    with nogil:
+      for irow in range(nrows):
+        if rstops[irow] <= rstarts[irow]:
+          continue
+        ret = H5ARRAYOread_readSlice(self.dataset_id, self.type_id,
+                                     nrow + irow, rstarts[irow],
+                                     rstops[irow], buf)
+        if ret < 0:
+          break
+        buf += (rstops[irow] - rstarts[irow]) * itemsize
+
+    if ret < 0:
+      raise HDF5ExtError("Problems reading the index indices.")
+
+
   def _init_sorted_slice(self, index):
     """Initialize the structures for doing a binary search."""
 
@@ -673,6 +717,17 @@ cdef class IndexArray(Array):
         (maxslots, self.chunksize), dtype, 'sorted')
 
 
+  def _search_caches(self):
+    """Get the caches for searching the index (if created) by name."""
+
+    caches = {}
+    if self.boundscache is not None:
+      caches['bounds'] = self.boundscache
+    if self.sortedcache is not None:
+      caches['sorted'] = self.sortedcache
+    return caches
+
+
 
   cdef void *_g_read_sorted_slice(self, hsize_t irow, hsize_t start,
                                 hsize_t stop):
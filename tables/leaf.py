@@ -11,6 +11,8 @@ import numpy as np
 from .flavor import (check_flavor, internal_flavor, toarray,
                      alias_map as flavor_alias_map)
 from .node import Node
+from .chunkcache import new_generation
+from .rowset import RowSet
 from .filters import Filters
 from .utils import byteorders, lazyattr, SizeType
 from .exceptions import PerformanceWarning
@@ -275,6 +277,8 @@ class Leaf(Node):
         """
         self._flavor: Literal["numpy", "python", None] = None
         """Private storage for the `flavor` property."""
+        self._chunkkey: Optional[tuple] = None
+        """The key of the leaf in the shared cache of chunks."""
 
         if new:
             # Get filter properties from parent group if not given.
@@ -569,6 +573,8 @@ very small/large chunksize, you may want to increase/decrease it."""
           through when I/O is performed. Duplicate coordinate locations
           are not checked for.
 
+        * A `RowSet` with the coordinates of a one-dimensional leaf.
+
         Return the coordinates array.  If this is not possible, raise a
         `TypeError` so that the next selection method can be tried out.
 
@@ -586,6 +592,8 @@ very small/large chunksize, you may want to increase/decrease it."""
                 key = toarray(key)
             except ValueError:
                 raise TypeError(f"Invalid index or slice: {key!r}")
+        elif isinstance(key, RowSet):
+            key = key.coords()
         elif not isinstance(key, np.ndarray):
             raise TypeError(f"Invalid index or slice: {key!r}")
 
@@ -732,6 +740,26 @@ very small/large chunksize, you may want to increase/decrease it."""
             raise TypeError("non-enlargeable datasets cannot be truncated")
         self._g_truncate(size)
 
+    def _shared_chunk_key(self) -> tuple:
+        """Get the key of the leaf in the shared cache of chunks.
+
+        The index of a chunk is appended to this key to get the key of the
+        chunk in the cache.
+
+        """
+
+        if self._chunkkey is None:
+            h5file = self._v_file
+            self._chunkkey = (h5file._chunk_cache_key,
+                              self._get_obj_info().addr,
+                              new_generation(h5file))
+        return self._chunkkey
+
+    def _invalidate_shared_chunks(self) -> None:
+        """Make the chunks of the leaf in the shared cache out of date."""
+
+        self._chunkkey = None
+
     def isvisible(self) -> bool:
         """Is this node visible?
 
@@ -14,28 +14,39 @@ from numpy cimport ndarray
 # The NodeCache class is useful for caching general objects (like Nodes).
 cdef class NodeCache:
   cdef readonly long nslots
-  cdef long nextslot
-  cdef object nodes, paths
+  cdef readonly long long nevictions
+  cdef object nodes
   cdef object setitem(self, object path, object node)
-  cdef long getslot(self, object path)
   cdef object cpop(self, object path)
 
 
 # Base class for other caches
 cdef class BaseCache:
-  cdef int iscachedisabled, incsetcount
+  cdef int iscachedisabled, incsetcount, isadaptive
   cdef long setcount, getcount, containscount
   cdef long disablecyclecount, disableeverycycles
   cdef long enablecyclecount, enableeverycycles
   cdef double nprobes, hitratio
-  cdef long seqn_, nextslot, nslots
-  cdef long *ratimes
+  cdef readonly long long nhits, nmisses, nevictions
+  cdef readonly long long nghosthits
+  cdef long maxghosts
+  cdef object ghosts
+  cdef readonly long nslots
+  cdef long nextslot
+  cdef long lruhead, lrutail
+  cdef long *rprev
+  cdef long *rnext
   cdef double lowesthr
-  cdef ndarray atimes
+  cdef ndarray prevslots, nextslots
   cdef object name
   cdef int checkhitratio(self)
   cdef int couldenablecache_(self)
-  cdef long incseqn(self)
+  cdef void setadaptive_(self)
+  cdef void ghostadd_(self, object key)
+  cdef void ghostcheck_(self, object key)
+  cdef void lrulink_(self, long nslot) noexcept
+  cdef void lruunlink_(self, long nslot) noexcept
+  cdef void lrutouch_(self, long nslot) noexcept
 
 
 #  Helper class for ObjectCache
@@ -47,10 +58,17 @@ cdef class ObjectNode:
 # The ObjectCache class is useful for general python objects
 cdef class ObjectCache(BaseCache):
   cdef long maxcachesize, cachesize, maxobjsize
+  cdef long freehead
   cdef long *rsizes
-  cdef ndarray sizes
+  cdef long *rcprev
+  cdef long *rcnext
+  cdef long *rcheads
+  cdef long *rctails
+  cdef ndarray sizes, cprevslots, cnextslots, cheads, ctails
   cdef object __list, __dict
   cdef ObjectNode mrunode
+  cdef long getfreeslot_(self)
+  cdef long largestlru_(self)
   cdef removeslot_(self, long nslot)
   cdef clearcache_(self)
   cdef updateslot_(self, long nslot, long size, object key, object value)
@@ -22,14 +22,10 @@ Misc variables:
 
 """
 
-cdef extern from "Python.h":
-    int PyUnicode_Compare(object, object)
-
-import sys
+from collections import OrderedDict
 
 import numpy as np
-from libc.string cimport memcpy, strcmp
-from cpython.unicode cimport PyUnicode_Check
+from libc.string cimport memcpy
 from numpy cimport import_array, ndarray, PyArray_DATA
 
 from .parameters import (DISABLE_EVERY_CYCLES, ENABLE_EVERY_CYCLES,
@@ -52,7 +48,8 @@ import_array()
 # "A node cannot be alive and dead at the same time."
 
 # Thanks to the above behaviour, the next code has been stripped down
-# to a bare minimum (the info in cache is kept in just 2 lists).
+# to a bare minimum (the info in cache is kept in just an ordered dict,
+# which keeps the LRU node at its start and finds paths in O(1)).
 
 #*********************** Important note! *****************************
 # The code behind has been carefully tuned to serve the needs of
@@ -76,9 +73,8 @@ cdef class NodeCache:
     if nslots < 0:
       raise ValueError("Negative number (%s) of slots!" % nslots)
     self.nslots = nslots
-    self.nextslot = 0
-    self.nodes = []
-    self.paths = []
+    self.nevictions = 0
+    self.nodes = OrderedDict()
 
   def __len__(self):
     return len(self.nodes)
@@ -91,57 +87,18 @@ cdef class NodeCache:
 
     if self.nslots == 0:   # Oops, the cache is set to empty
       return
-    # Check if we are growing out of space
-    if self.nextslot == self.nslots:
-      # It is critical to reduce nextslot *before* the preemption of
-      # the LRU node.  If not, this can lead with problems in situations
-      # with very small caches (length 1 or so).
-      # F. Alted 2008-10-22
-      self.nextslot = self.nextslot - 1
-      # Remove the LRU node and path (the start of the lists)
-      del self.nodes[0]
-      del self.paths[0]
-    # The equality protection has been put for situations in which a
-    # node is being preempted and added simultaneously (with very small
-    # caches).
-    if len(self.nodes) == len(self.paths):
-      # Add the node and path to the end of its lists
-      self.nodes.append(node)
-      self.paths.append(path)
-      self.nextslot = self.nextslot + 1
+    if path in self.nodes:
+      # Refresh the node and make it the most recently used one
+      self.nodes.move_to_end(path)
+    elif len(self.nodes) == self.nslots:
+      # Remove the LRU node (the start of the dict)
+      self.nodes.popitem(last=False)
+      self.nevictions = self.nevictions + 1
+    # Add the node and path to the end of the dict
+    self.nodes[path] = node
 
   def __contains__(self, path):
-    if self.getslot(path) == -1:
-      return 0
-    else:
-      return 1
-
-  cdef long getslot(self, object path):
-    """Checks whether path is in this cache or not."""
-
-    cdef long i, nslot, compare
-
-    nslot = -1  # -1 means not found
-    if PyUnicode_Check(path):
-        # Start looking from the trailing values (most recently used)
-        for i from self.nextslot > i >= 0:
-          #if strcmp(<char *>encoded_path, <char *>self.paths[i]) == 0:
-          if PyUnicode_Compare(path, self.paths[i]) == 0:
-            nslot = i
-            break
-    else:
-        # Start looking from the trailing values (most recently used)
-        for i from self.nextslot > i >= 0:
-          #if strcmp(<char *>path, <char *>self.paths[i]) == 0:
-          if PyUnicode_Check(self.paths[i]):
-            compare = PyUnicode_Compare(path, self.paths[i])
-          else:
-            compare = strcmp(<char *>path, <char *>self.paths[i])
-          if compare == 0:
-            nslot = i
-            break
-
-    return nslot
+    return path in self.nodes
 
   __marker = object()
 
@@ -157,32 +114,66 @@ cdef class NodeCache:
       return node
 
   cdef object cpop(self, object path):
-    cdef long nslot
-
-    nslot = self.getslot(path)
-    if nslot == -1:
-        raise KeyError(path)
-    else:
-        node = self.nodes[nslot]
-        del self.nodes[nslot]
-        del self.paths[nslot]
-        self.nextslot = self.nextslot - 1
-    return node
+    return self.nodes.pop(path)
 
   def __iter__(self):
-    # Do a copy of the paths list because it can be modified in the middle of
+    # Do a copy of the paths because they can be modified in the middle of
     # the iterator!
-    copy = self.paths[:]
+    copy = list(self.nodes)
     return iter(copy)
 
+  def resetstats(self):
+    """Reset the count of evicted nodes."""
+
+    self.nevictions = 0
+
   def __repr__(self):
-    return "<%s (%d elements)>" % (str(self.__class__), len(self.paths))
+    return "<%s (%d elements)>" % (str(self.__class__), len(self.nodes))
 
 
 ########################################################################
 # Common code for other LRU cache classes
 ########################################################################
 
+# Helpers for doubly linked lists of slots.  The links of every slot
+# are kept in the prev and next arrays, and -1 ends the lists.
+cdef inline void link_(long *prev, long *next, long *head, long *tail,
+                       long nslot) noexcept nogil:
+  prev[nslot] = tail[0];  next[nslot] = -1
+  if tail[0] >= 0:
+    next[tail[0]] = nslot
+  else:
+    head[0] = nslot
+  tail[0] = nslot
+
+
+cdef inline void unlink_(long *prev, long *next, long *head, long *tail,
+                         long nslot) noexcept nogil:
+  if prev[nslot] >= 0:
+    next[prev[nslot]] = next[nslot]
+  else:
+    head[0] = next[nslot]
+  if next[nslot] >= 0:
+    prev[next[nslot]] = prev[nslot]
+  else:
+    tail[0] = prev[nslot]
+  prev[nslot] = -1;  next[nslot] = -1
+
+
+# The number of size classes of objects (one per bit in their sizes)
+DEF NSIZECLASSES = 65
+
+
+# Size class of an object: the number of bits in its size
+cdef inline int sizeclass_(long size) noexcept nogil:
+  cdef int sizeclass = 0
+
+  while size > 0:
+    size = size >> 1
+    sizeclass = sizeclass + 1
+  return sizeclass
+
+
 cdef class BaseCache:
   """Base class that implements automatic probing/disabling of the cache."""
 
@@ -193,17 +184,30 @@ cdef class BaseCache:
     self.setcount = 0;  self.getcount = 0;  self.containscount = 0
     self.enablecyclecount = 0;  self.disablecyclecount = 0
     self.iscachedisabled = False  # Cache is enabled by default
+    # Adaptive caches are resized instead of disabled (see resize()), and
+    # they remember the keys of evicted entries (their ghosts)
+    self.isadaptive = False
+    self.ghosts = None
+    self.nghosthits = 0
     self.disableeverycycles = DISABLE_EVERY_CYCLES
     self.enableeverycycles = ENABLE_EVERY_CYCLES
     self.lowesthr = LOWEST_HIT_RATIO
     self.nprobes = 0.0;  self.hitratio = 0.0
+    # Lookups finding and not finding their keys, and entries evicted
+    # (only reset by resetstats())
+    self.nhits = 0;  self.nmisses = 0;  self.nevictions = 0
     self.nslots = nslots
-    self.seqn_ = 0;  self.nextslot = 0
+    self.nextslot = 0
     self.name = name
     self.incsetcount = False
-    # The array for keeping the access times (using long ints here)
-    self.atimes = <ndarray>np.zeros(shape=nslots, dtype=np.int_)
-    self.ratimes = <long *>PyArray_DATA(self.atimes)
+    # The links of the slots in the LRU list (using long ints here)
+    self.prevslots = <ndarray>np.full(shape=nslots, fill_value=-1,
+                                      dtype=np.int_)
+    self.rprev = <long *>PyArray_DATA(self.prevslots)
+    self.nextslots = <ndarray>np.full(shape=nslots, fill_value=-1,
+                                      dtype=np.int_)
+    self.rnext = <long *>PyArray_DATA(self.nextslots)
+    self.lruhead = -1;  self.lrutail = -1
 
   def __len__(self):
     return self.nslots
@@ -229,7 +233,7 @@ cdef class BaseCache:
       self.hitratio = self.hitratio + hitratio
       # Reset the hit counters
       self.setcount = 0;  self.getcount = 0;  self.containscount = 0
-      if (not self.iscachedisabled and
+      if (not self.iscachedisabled and not self.isadaptive and
           self.disablecyclecount >= self.disableeverycycles):
         # Check whether the cache is being effective or not
         if hitratio < self.lowesthr:
@@ -268,16 +272,89 @@ cdef class BaseCache:
     else:
       return True
 
-  # Increase the access time (implemented as a C long sequence)
-  cdef long incseqn(self):
+  # Adaptive caches remember the keys of the entries that they have
+  # evicted lately.  Misses on those keys (ghost hits) would have been
+  # hits in a larger cache, which tells whether the cache should grow.
+
+  # Start remembering evicted keys (if not done yet)
+  cdef void setadaptive_(self):
+    self.isadaptive = True
+    self.iscachedisabled = False
+    if self.ghosts is None:
+      self.ghosts = OrderedDict()
+    # Up to a cache four times as large is simulated
+    self.maxghosts = max(4 * self.nslots, 1024)
+
+  cdef void ghostadd_(self, object key):
+    if self.ghosts is None:
+      return
+    self.ghosts[key] = None
+    if len(self.ghosts) > self.maxghosts:
+      self.ghosts.popitem(last=False)
 
-    self.seqn_ = self.seqn_ + 1
-    if self.seqn_ < 0:
-      # Ooops, the counter has run out of range! Reset all the access times.
-      self.atimes[:] = sys.maxint
-      # Set the counter to 1 (to indicate that it is newer than existing ones)
-      self.seqn_ = 1
-    return self.seqn_
+  cdef void ghostcheck_(self, object key):
+    if self.ghosts is None:
+      return
+    if self.ghosts.pop(key, self) is not self:
+      self.nghosthits = self.nghosthits + 1
+
+  # The slots in use are kept in a doubly linked list going from the
+  # least recently used slot (lruhead) to the most recently used one
+  # (lrutail), with the links stored in the prevslots and nextslots
+  # arrays.  This way, both touching a slot and finding the LRU one
+  # take constant time.
+
+  # Put nslot at the MRU end of the list
+  cdef void lrulink_(self, long nslot) noexcept:
+    link_(self.rprev, self.rnext, &self.lruhead, &self.lrutail, nslot)
+
+  # Take nslot out of the list
+  cdef void lruunlink_(self, long nslot) noexcept:
+    unlink_(self.rprev, self.rnext, &self.lruhead, &self.lrutail, nslot)
+
+  # Move nslot to the MRU end of the list
+  cdef void lrutouch_(self, long nslot) noexcept:
+    if nslot != self.lrutail:
+      self.lruunlink_(nslot)
+      self.lrulink_(nslot)
+
+  # The number of slots in use and of bytes taken by them
+  property nused:
+    def __get__(self):
+      return self.nextslot
+
+  property nbytes:
+    def __get__(self):
+      return 0
+
+  # The maximum number of bytes that the cache can take
+  property maxnbytes:
+    def __get__(self):
+      return 0
+
+  def stats(self):
+    """Get a dictionary with the statistics of the cache.
+
+    The number of lookups that found (``hits``) and did not find
+    (``misses``) their keys, the number of entries evicted to make room
+    for others or dropped when the cache was disabled (``evictions``),
+    the number of slots (``nslots``), of slots in use (``nused``) and of
+    bytes in use (``nbytes``), and whether the cache is ``enabled`` are
+    reported.  The cache is disabled when it has no slots or when its
+    hit ratio has been too low (see ``LOWEST_HIT_RATIO``).
+
+    """
+
+    return {'hits': self.nhits, 'misses': self.nmisses,
+            'evictions': self.nevictions, 'nslots': self.nslots,
+            'nused': self.nused, 'nbytes': self.nbytes,
+            'enabled': self.nslots > 0 and not self.iscachedisabled}
+
+  def resetstats(self):
+    """Reset the counts of hits, misses and evictions."""
+
+    self.nhits = 0;  self.nmisses = 0;  self.nevictions = 0
+    self.nghosthits = 0
 
   def __repr__(self):
     return "<%s(%s) (%d elements)>" % (self.name, str(self.__class__),
@@ -333,19 +410,71 @@ cdef class ObjectCache(BaseCache):
     # The array for keeping the object size (using long ints here)
     self.sizes = <ndarray>np.zeros(shape=nslots, dtype=np.int_)
     self.rsizes = <long *>PyArray_DATA(self.sizes)
+    # Besides the LRU list, the slots in use are kept in a LRU list per
+    # size class (objects with the same number of bits in their sizes),
+    # so that the LRU slot among the largest ones can be found in
+    # constant time.
+    self.cprevslots = <ndarray>np.full(shape=nslots, fill_value=-1,
+                                       dtype=np.int_)
+    self.rcprev = <long *>PyArray_DATA(self.cprevslots)
+    self.cnextslots = <ndarray>np.full(shape=nslots, fill_value=-1,
+                                       dtype=np.int_)
+    self.rcnext = <long *>PyArray_DATA(self.cnextslots)
+    self.cheads = <ndarray>np.full(shape=NSIZECLASSES, fill_value=-1,
+                                   dtype=np.int_)
+    self.rcheads = <long *>PyArray_DATA(self.cheads)
+    self.ctails = <ndarray>np.full(shape=NSIZECLASSES, fill_value=-1,
+                                   dtype=np.int_)
+    self.rctails = <long *>PyArray_DATA(self.ctails)
+    # The free slots are chained through nextslots (-1 ends the chain)
+    self.freehead = -1
 
   # Clear cache
   cdef clearcache_(self):
+    self.nevictions = self.nevictions + len(self.__dict)
     self.__list = [None]*self.nslots
     self.__dict = {}
     self.mrunode = <ObjectNode>None
     self.cachesize = 0
     self.nextslot = 0
-    self.seqn_ = 0
+    self.sizes[:] = 0
+    self.prevslots[:] = -1;  self.nextslots[:] = -1
+    self.cprevslots[:] = -1;  self.cnextslots[:] = -1
+    self.cheads[:] = -1;  self.ctails[:] = -1
+    self.lruhead = -1;  self.lrutail = -1
+    self.freehead = -1
+
+  # Get a slot for a new object, evicting the LRU one if needed
+  cdef long getfreeslot_(self):
+    cdef long nslot
+
+    if self.freehead < 0:
+      if self.nextslot < self.nslots:
+        # Use a slot that has never been used
+        nslot = self.nextslot
+        self.nextslot = self.nextslot + 1
+        return nslot
+      self.ghostadd_((<ObjectNode>self.__list[self.lruhead]).key)
+      self.removeslot_(self.lruhead)
+      self.nevictions = self.nevictions + 1
+    nslot = self.freehead
+    self.freehead = self.rnext[nslot]
+    self.rnext[nslot] = -1
+    return nslot
+
+  # Get the LRU slot among the ones with the largest objects
+  cdef long largestlru_(self):
+    cdef int sizeclass
+
+    for sizeclass from NSIZECLASSES > sizeclass >= 0:
+      if self.rcheads[sizeclass] >= 0:
+        return self.rcheads[sizeclass]
+    return -1
 
   # Remove a slot (if it exists in cache)
   cdef removeslot_(self, long nslot):
     cdef ObjectNode node
+    cdef int sizeclass
 
     assert nslot < self.nslots, "Attempting to remove beyond cache capacity."
     node = self.__list[nslot]
@@ -353,38 +482,34 @@ cdef class ObjectCache(BaseCache):
       self.__list[nslot] = None
       del self.__dict[node.key]
       self.cachesize = self.cachesize - self.rsizes[nslot]
+      sizeclass = sizeclass_(self.rsizes[nslot])
+      unlink_(self.rcprev, self.rcnext, &self.rcheads[sizeclass],
+              &self.rctails[sizeclass], nslot)
+      self.lruunlink_(nslot)
       self.rsizes[nslot] = 0
       if self.mrunode and self.mrunode.nslot == nslot:
         self.mrunode = <ObjectNode>None
-    # The next slot to be updated will be this one
-    self.nextslot = nslot
+      # Return the slot to the chain of free ones
+      self.rnext[nslot] = self.freehead
+      self.freehead = nslot
 
-  # Update a slot
+  # Update a (free) slot
   cdef updateslot_(self, long nslot, long size, object key, object value):
-    cdef ObjectNode node, oldnode
-    cdef long nslot1, nslot2
-    cdef object lruidx
+    cdef ObjectNode node
+    cdef int sizeclass
 
     assert nslot < self.nslots, "Number of nodes exceeding cache capacity."
-    # Remove the previous nslot
-    self.removeslot_(nslot)
-    # Protection against too large data cache size
-    while size + self.cachesize > self.maxcachesize:
-      # Remove the LRU node among the 10 largest ones
-      largidx = self.sizes.argsort()[-10:]
-      nslot1 = self.atimes[largidx].argmin()
-      nslot2 = largidx[nslot1]
-      self.removeslot_(nslot2)
     # Insert the new one
     node = ObjectNode(key, value, nslot)
-    self.ratimes[nslot] = self.incseqn()
     self.rsizes[nslot] = size
     self.__list[nslot] = node
     self.__dict[key] = node
     self.mrunode = node
     self.cachesize = self.cachesize + size
-    # The next slot to update will be the LRU
-    self.nextslot = self.atimes.argmin()
+    sizeclass = sizeclass_(size)
+    link_(self.rcprev, self.rcnext, &self.rcheads[sizeclass],
+          &self.rctails[sizeclass], nslot)
+    self.lrulink_(nslot)
 
   # Put the object to the data in cache (for Python calls)
   def setitem(self, object key, object value, object size):
@@ -393,6 +518,7 @@ cdef class ObjectCache(BaseCache):
   # Put the object in cache (for cython calls)
   # size can be the exact size of the value object or an estimation.
   cdef long setitem_(self, object key, object value, long size):
+    cdef ObjectNode node
     cdef long nslot
 
     if self.nslots == 0:   # The cache has been set to empty
@@ -406,16 +532,27 @@ cdef class ObjectCache(BaseCache):
     if size > self.maxobjsize:  # Check if the object is too large
       return -1
     if self.checkhitratio():
-      nslot = self.nextslot
+      # Remove a previous value for the same key
+      node = self.__dict.get(key)
+      if node is not None:
+        self.removeslot_(node.nslot)
+      # Protection against too large data cache size
+      while size + self.cachesize > self.maxcachesize:
+        # Remove the LRU node among the largest ones
+        nslot = self.largestlru_()
+        self.ghostadd_((<ObjectNode>self.__list[nslot]).key)
+        self.removeslot_(nslot)
+        self.nevictions = self.nevictions + 1
+      nslot = self.getfreeslot_()
       self.updateslot_(nslot, size, key, value)
-    else:
+    elif self.nextslot > 0:
       # Empty the cache because it is not effective and it is taking space
       self.clearcache_()
     return nslot
 
   # Tells whether the key is in cache or not
   def __contains__(self, object key):
-    return self.__dict.has_key(key)
+    return key in self.__dict
 
   # Tells in which slot the key is. If not found, -1 is returned.
   def getslot(self, object key):
@@ -431,11 +568,15 @@ cdef class ObjectCache(BaseCache):
     # Give a chance to the MRU node
     node = self.mrunode
     if node and node.key == key:
+      self.nhits = self.nhits + 1
       return node.nslot
     # No luck. Look in the dictionary.
     node = self.__dict.get(key)
     if node is <ObjectNode>None:
+      self.nmisses = self.nmisses + 1
+      self.ghostcheck_(key)
       return -1
+    self.nhits = self.nhits + 1
     return node.nslot
 
   # Return the object to the data in cache (for Python calls)
@@ -446,12 +587,55 @@ cdef class ObjectCache(BaseCache):
   cdef object getitem_(self, long nslot):
     cdef ObjectNode node
 
+    cdef int sizeclass
+
     self.getcount = self.getcount + 1
     node = self.__list[nslot]
-    self.ratimes[nslot] = self.incseqn()
-    self.mrunode = node
+    if node is not self.mrunode:
+      sizeclass = sizeclass_(self.rsizes[nslot])
+      unlink_(self.rcprev, self.rcnext, &self.rcheads[sizeclass],
+              &self.rctails[sizeclass], nslot)
+      link_(self.rcprev, self.rcnext, &self.rcheads[sizeclass],
+            &self.rctails[sizeclass], nslot)
+      self.lrutouch_(nslot)
+      self.mrunode = node
     return node.obj
 
+  property nused:
+    def __get__(self):
+      return len(self.__dict)
+
+  property nbytes:
+    def __get__(self):
+      return self.cachesize
+
+  property maxnbytes:
+    def __get__(self):
+      return self.maxcachesize
+
+  def resize(self, long maxcachesize):
+    """Change the maximum size of the cache to maxcachesize bytes.
+
+    The LRU objects among the largest ones are evicted until the cache
+    fits in its new size.  The number of slots does not change.  Once
+    resized, the cache is no longer disabled when its hit ratio is low,
+    since whoever resizes it is expected to shrink it instead.
+
+    """
+
+    cdef long nslot
+
+    if maxcachesize < 0:
+      raise ValueError("Negative size (%s) of cache!" % maxcachesize)
+    self.setadaptive_()
+    self.maxcachesize = maxcachesize
+    self.maxobjsize = maxcachesize
+    while self.cachesize > self.maxcachesize:
+      nslot = self.largestlru_()
+      self.ghostadd_((<ObjectNode>self.__list[nslot]).key)
+      self.removeslot_(nslot)
+      self.nevictions = self.nevictions + 1
+
   def __repr__(self):
     if self.nprobes > 0:
       hitratio = self.hitratio / self.nprobes
@@ -460,7 +644,7 @@ cdef class ObjectCache(BaseCache):
     return """<%s(%s)
   (%d maxslots, %d slots used, %.3f KB cachesize,
   hit ratio: %.3f, disabled? %s)>
-  """ % (self.name, str(self.__class__), self.nslots, self.nextslot,
+  """ % (self.name, str(self.__class__), self.nslots, len(self.__dict),
          self.cachesize / 1024., hitratio, self.iscachedisabled)
 
 
@@ -541,7 +725,6 @@ cdef class NumCache(BaseCache):
   # aware that data in nslot cannot be overwritten!
   cdef long setitem1_(self, long long key):
     cdef long nslot
-    cdef object key2
 
     if self.nslots == 0:   # Oops, the cache is set to empty
       return -1
@@ -555,26 +738,30 @@ cdef class NumCache(BaseCache):
       # Check if we are growing out of space
       if self.nextslot == self.nslots:
         # Get the least recently used slot
-        nslot = self.atimes.argmin()
+        nslot = self.lruhead
+        self.lruunlink_(nslot)
         # Remove the slot from the dict
-        key2 = self.keys[nslot]
-        del self.__dict[key2]
-        self.nextslot = self.nextslot - 1
+        del self.__dict[self.rkeys[nslot]]
+        self.nevictions = self.nevictions + 1
+        if self.ghosts is not None:
+          self.ghostadd_(self.rkeys[nslot])
       else:
         # Get the next slot available
         nslot = self.nextslot
+        self.nextslot = self.nextslot + 1
       # Insert the slot in the dictionary
       self.__dict[key] = nslot
-      self.keys[nslot] = key
-      self.ratimes[nslot] = self.incseqn()
-      self.nextslot = self.nextslot + 1
+      self.rkeys[nslot] = key
+      self.lrulink_(nslot)
       # The next reduces the performance of the cache in scenarios where
       # the efficicency is near to zero.  I don't understand exactly why.
       # F. Alted 24-03-2008
     elif self.nextslot > 0:
       # Empty the cache if needed
+      self.nevictions = self.nevictions + self.nextslot
       self.__dict.clear()
       self.nextslot = 0
+      self.lruhead = -1;  self.lrutail = -1
     return nslot
 
   def getslot(self, long long key):
@@ -586,11 +773,18 @@ cdef class NumCache(BaseCache):
 
     self.containscount = self.containscount + 1
     if self.nextslot == 0:   # No chances for finding a slot
+      self.nmisses = self.nmisses + 1
+      if self.ghosts is not None:
+        self.ghostcheck_(key)
       return -1
     try:
       nslot = self.__dict[key]
     except KeyError:
+      self.nmisses = self.nmisses + 1
+      if self.ghosts is not None:
+        self.ghostcheck_(key)
       return -1
+    self.nhits = self.nhits + 1
     return nslot
 
   def getitem(self, long nslot, ndarray nparr, long start):
@@ -613,9 +807,80 @@ cdef class NumCache(BaseCache):
   cdef void *getitem1_(self, long nslot):
 
     self.getcount = self.getcount + 1
-    self.ratimes[nslot] = self.incseqn()
+    self.lrutouch_(nslot)
     return <char *>self.rcache + nslot * self.slotsize * self.itemsize
 
+  property nbytes:
+    def __get__(self):
+      return self.nextslot * self.slotsize * self.itemsize
+
+  property maxnbytes:
+    def __get__(self):
+      return self.nslots * self.slotsize * self.itemsize
+
+  def resize(self, long maxnbytes):
+    """Change the number of slots so that the cache takes at most
+    maxnbytes bytes.
+
+    The data of the most recently used slots is kept (as long as it
+    fits), and the rest is evicted.  Once resized, the cache is no longer
+    disabled when its hit ratio is low, since whoever resizes it is
+    expected to shrink it instead.
+
+    """
+
+    cdef long nslots, nslot, nkept
+    cdef ndarray cacheobj, keys
+
+    if maxnbytes < 0:
+      raise ValueError("Negative size (%s) of cache!" % maxnbytes)
+    nslots = maxnbytes // max(self.slotsize * self.itemsize, 1)
+    if nslots >= 1<<16:
+      nslots = <long>((1<<16)-1)
+    self.setadaptive_()
+    if nslots == self.nslots:
+      return
+    # The slots to keep, from the least to the most recently used one
+    kept = []
+    nslot = self.lrutail
+    while nslot >= 0 and len(kept) < nslots:
+      kept.append(nslot)
+      nslot = self.rprev[nslot]
+    kept.reverse()
+    # The rest are evicted
+    while nslot >= 0:
+      self.ghostadd_(self.rkeys[nslot])
+      nslot = self.rprev[nslot]
+    nkept = len(kept)
+    self.nevictions = self.nevictions + self.nextslot - nkept
+    # The last slot is the scratch area of setitem1_
+    cacheobj = <ndarray>np.empty(shape=(nslots+1, self.slotsize),
+                                 dtype=self.cacheobj.dtype)
+    keys = <ndarray>(-np.ones(shape=nslots, dtype=np.int64))
+    if nkept > 0:
+      cacheobj[:nkept] = self.cacheobj[kept]
+      keys[:nkept] = self.keys[kept]
+    self.cacheobj = cacheobj
+    self.rcache = PyArray_DATA(self.cacheobj)
+    self.keys = keys
+    self.rkeys = <long long *>PyArray_DATA(self.keys)
+    self.prevslots = <ndarray>np.full(shape=nslots, fill_value=-1,
+                                      dtype=np.int_)
+    self.rprev = <long *>PyArray_DATA(self.prevslots)
+    self.nextslots = <ndarray>np.full(shape=nslots, fill_value=-1,
+                                      dtype=np.int_)
+    self.rnext = <long *>PyArray_DATA(self.nextslots)
+    self.lruhead = -1;  self.lrutail = -1
+    self.nslots = nslots
+    self.__dict = {}
+    for nslot in range(nkept):
+      self.__dict[self.rkeys[nslot]] = nslot
+      self.lrulink_(nslot)
+    self.nextslot = nkept
+    self.setcount = 0;  self.getcount = 0;  self.containscount = 0
+    # Resize the ghosts as well
+    self.setadaptive_()
+
   def __repr__(self):
     cachesize = (self.nslots * self.slotsize * self.itemsize) / 1024.
     if self.nprobes > 0:
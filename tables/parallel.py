@@ -0,0 +1,361 @@
+"""Query tables in parallel with a pool of worker processes.
+
+Most calls to the HDF5 library are serialized, so threads alone do not
+scale when reading data.  The :class:`ShardedQuery` executor defined here
+opens the file of a table read-only in several worker processes instead,
+and splits queries into shards aligned with the chunks of the table.  The
+selected data is handed back to the main process through shared memory
+instead of being pickled.
+
+"""
+
+import atexit
+import collections
+import concurrent.futures
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Optional, Union, TYPE_CHECKING
+
+import numpy as np
+
+from .exceptions import FileModeError
+from .flavor import internal_flavor, internal_to_flavor
+from .table import _Aggregator
+from .utils import SizeType, detect_number_of_cores
+from .utilsextension import get_nested_field
+
+if TYPE_CHECKING:
+    from .table import Column, Table
+
+__all__ = ['ShardedQuery']
+
+# The file opened by the current worker process (if any).
+_worker_file = None
+
+
+class _ColumnRef(str):
+    """The pathname of a column in a condition variable.
+
+    Columns cannot be sent to worker processes, so they are replaced by
+    their pathnames and looked up again in the table of the worker.
+
+    """
+
+
+def _init_worker(filename: str) -> None:
+    """Open the file to be queried in a worker process."""
+
+    global _worker_file
+    from .file import open_file
+
+    _worker_file = open_file(filename, 'r')
+    atexit.register(_worker_file.close)
+
+
+def _worker_table(tablepath: str,
+                  condvars: dict[str, Any]) -> tuple["Table", dict[str, Any]]:
+    """Get the table and the condition variables in a worker process."""
+
+    table = _worker_file.get_node(tablepath)
+    # Results are assembled in the internal flavor, the main process
+    # converts them to the flavor of the table once merged.
+    table._flavor = internal_flavor
+    condvars = {name: table.cols._f_col(val)
+                if isinstance(val, _ColumnRef) else val
+                for name, val in condvars.items()}
+    return table, condvars
+
+
+def _shard_read(tablepath: str, condition: str, condvars: dict[str, Any],
+                start: int, stop: int, step: int, field: Optional[str],
+                sort: bool, shmname: str) -> int:
+    """Query a shard of a table and copy the result to shared memory.
+
+    Coordinates are selected when `field` is ``False``, records (or the
+    given `field` of them) otherwise.  The number of selected rows is
+    returned.
+
+    """
+
+    table, condvars = _worker_table(tablepath, condvars)
+    if field is False:
+        result = table.get_where_list(condition, condvars, sort=sort,
+                                      start=start, stop=stop, step=step)
+    else:
+        result = table.read_where(condition, condvars, field=field,
+                                  start=start, stop=stop, step=step)
+    shm = shared_memory.SharedMemory(name=shmname)
+    try:
+        out = np.ndarray(result.shape, dtype=result.dtype, buffer=shm.buf)
+        out[...] = result
+        del out  # release the buffer before closing the segment
+    finally:
+        shm.close()
+    return len(result)
+
+
+def _shard_aggregate(tablepath: str, condition: str,
+                     condvars: dict[str, Any], start: int, stop: int,
+                     step: int, aggregations: dict[str, str],
+                     by: Optional[str]) -> _Aggregator:
+    """Aggregate the rows of a shard of a table."""
+
+    table, condvars = _worker_table(tablepath, condvars)
+    aggregator = _Aggregator(table, aggregations, by)
+    for _, recs in table._where_buffers(condition, condvars,
+                                        start, stop, step):
+        aggregator.update(recs)
+    table._where_condition = None
+    return aggregator
+
+
+class ShardedQuery:
+    """Query tables with a pool of worker processes.
+
+    Each worker process opens the file hosting `table` in read-only
+    mode.  Queries are split in shards covering ranges of rows aligned
+    with the chunks of the table (see :attr:`Leaf.chunkshape`), which
+    are evaluated by the workers with :meth:`Table.read_where` and
+    :meth:`Table.get_where_list`.  Selected rows are copied back to the
+    main process through shared memory, and merged in row order.
+
+    As the workers open the file on their own, the file hosting `table`
+    must be opened in read-only mode, otherwise a
+    :exc:`FileModeError` is raised.
+
+    ShardedQuery instances are context managers which shut down the
+    worker processes on exit::
+
+        from tables.parallel import ShardedQuery
+
+        with ShardedQuery(table, max_workers=4) as query:
+            rows = query.read_where('(x > 0) & (y < 10)')
+            stats = query.aggregate('x > 0', {'y': 'mean', 'z': 'max'})
+
+    Parameters
+    ----------
+    table : Table
+        The table to be queried.
+    max_workers : int
+        The number of worker processes.  The number of cores of the
+        machine is used if not specified.
+    mp_context : multiprocessing context
+        The context used to start the worker processes.  The ``spawn``
+        method is used by default, since forked processes would share the
+        state of the HDF5 library with the main process.
+
+    """
+
+    def __init__(self,
+                 table: "Table",
+                 max_workers: Optional[int] = None,
+                 mp_context: Optional[Any] = None) -> None:
+        table._g_check_open()
+        if table._v_file.mode != 'r':
+            raise FileModeError(
+                "the file hosting the table must be opened in read-only "
+                "mode ('r') to be queried by worker processes")
+        if max_workers is None:
+            max_workers = detect_number_of_cores()
+        if max_workers < 1:
+            raise ValueError("``max_workers`` must be greater than 0")
+        if mp_context is None:
+            mp_context = multiprocessing.get_context('spawn')
+
+        self.table = table
+        """The table being queried."""
+        self.max_workers = max_workers
+        """The number of worker processes."""
+
+        self._executor = ProcessPoolExecutor(
+            max_workers, mp_context=mp_context, initializer=_init_worker,
+            initargs=(table._v_file.filename,))
+
+    def __enter__(self) -> "ShardedQuery":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the worker processes."""
+
+        self._executor.shutdown()
+
+    def _condvars(self, condition: str,
+                  condvars: Optional[dict[str, Union["Column", np.ndarray]]],
+                  depth: int) -> dict[str, Any]:
+        """Get the variables in `condition` to be sent to the workers."""
+
+        reqvars = self.table._required_expr_vars(condition, condvars,
+                                                 depth=depth + 2)
+        return {name: _ColumnRef(val.pathname)
+                if hasattr(val, 'pathname') else val
+                for name, val in reqvars.items()}
+
+    def _shards(self, start: Optional[int], stop: Optional[int],
+                step: Optional[int]) -> list[tuple[int, int, int]]:
+        """Split a range of rows into shards aligned with chunks.
+
+        A list of ``(start, stop, step)`` tuples is returned, which
+        select together the same rows as the given range.
+
+        """
+
+        table = self.table
+        start, stop, step = table._process_range_read(start, stop, step)
+        if start >= stop:
+            return []
+        # Give a few shards to every worker, so that they are kept busy
+        # when the selectivity of the condition is uneven.
+        chunkrows = table.chunkshape[0]
+        nchunks = -(-(stop - start) // chunkrows)
+        shardsize = -(-nchunks // (self.max_workers * 4)) * chunkrows
+        bounds = [start]
+        bounds.extend(range((start // shardsize + 1) * shardsize,
+                            stop, shardsize))
+        bounds.append(stop)
+        shards = []
+        for sstart, sstop in zip(bounds[:-1], bounds[1:]):
+            # The first row in the shard which is selected by ``step``
+            sstart += (start - sstart) % step
+            if sstart < sstop:
+                shards.append((sstart, sstop, step))
+        return shards
+
+    def _read(self, condition: str, condvars: dict[str, Any],
+              field: Union[str, None, bool], sort: bool,
+              shards: list[tuple[int, int, int]]) -> np.ndarray:
+        table = self.table
+        if field is False:
+            template = np.empty(0, dtype=SizeType)
+        elif field:
+            template = get_nested_field(table._get_container(0), field)
+        else:
+            template = table._get_container(0)
+        rowsize = template.itemsize * int(np.prod(template.shape[1:]))
+        # Keep a bounded number of shards in flight, so that memory
+        # usage does not depend on the size of the table.
+        pending = collections.deque()
+        shards = iter(shards)
+        results = []
+
+        def submit():
+            shard = next(shards, None)
+            if shard is None:
+                return
+            sstart, sstop, sstep = shard
+            nrows = len(range(sstart, sstop, sstep))
+            # The segment is sized for every row being selected, but pages
+            # which are not written are not actually allocated.
+            shm = shared_memory.SharedMemory(
+                create=True, size=max(1, nrows * rowsize))
+            future = self._executor.submit(
+                _shard_read, table._v_pathname, condition, condvars,
+                sstart, sstop, sstep, field, sort, shm.name)
+            pending.append((future, shm))
+
+        try:
+            for _ in range(2 * self.max_workers):
+                submit()
+            while pending:
+                future, shm = pending[0]
+                count = future.result()
+                out = np.ndarray((count,) + template.shape[1:],
+                                 dtype=template.dtype, buffer=shm.buf)
+                if count > 0:
+                    results.append(out.copy())
+                del out  # release the buffer before closing the segment
+                pending.popleft()
+                shm.close()
+                shm.unlink()
+                submit()
+        finally:
+            # Do not free segments which may still be in use by workers.
+            for future, shm in pending:
+                if not future.cancel():
+                    concurrent.futures.wait([future])
+                shm.close()
+                shm.unlink()
+
+        if len(results) == 0:
+            return template
+        return np.concatenate(results) if len(results) > 1 else results[0]
+
+    def read_where(self,
+                   condition: str,
+                   condvars: Optional[dict[str, Union["Column", np.ndarray]]] = None,
+                   field: Optional[str] = None,
+                   start: Optional[int] = None,
+                   stop: Optional[int] = None,
+                   step: Optional[int] = None) -> np.ndarray:
+        """Read table data fulfilling the given *condition* in parallel.
+
+        The arguments and the result have the same meanings as in
+        :meth:`Table.read_where`.
+
+        """
+
+        table = self.table
+        table._g_check_open()
+        if field:
+            table._check_column(field)
+        condvars = self._condvars(condition, condvars, depth=1)
+        result = self._read(condition, condvars, field, False,
+                            self._shards(start, stop, step))
+        return internal_to_flavor(result, table.flavor)
+
+    def get_where_list(self,
+                       condition: str,
+                       condvars: Optional[dict[str, Union["Column", np.ndarray]]] = None,
+                       sort: bool = False,
+                       start: Optional[int] = None,
+                       stop: Optional[int] = None,
+                       step: Optional[int] = None) -> np.ndarray:
+        """Get the row coordinates fulfilling the given *condition* in
+        parallel.
+
+        The arguments and the result have the same meanings as in
+        :meth:`Table.get_where_list`.
+
+        """
+
+        table = self.table
+        table._g_check_open()
+        condvars = self._condvars(condition, condvars, depth=1)
+        # Shards are merged in order, so sorting each of them is enough.
+        result = self._read(condition, condvars, False, sort,
+                            self._shards(start, stop, step))
+        return internal_to_flavor(result, table.flavor)
+
+    def aggregate(self,
+                  condition: str,
+                  aggregations: dict[str, str],
+                  by: Optional[str] = None,
+                  condvars: Optional[dict[str, Union["Column", np.ndarray]]] = None,
+                  start: Optional[int] = None,
+                  stop: Optional[int] = None,
+                  step: Optional[int] = None) -> dict[Any, Any]:
+        """Aggregate columns over the rows fulfilling the *condition* in
+        parallel.
+
+        Every worker aggregates the rows of its shards, and partial results
+        are combined in the main process, so no rows are transferred.  The
+        arguments and the result have the same meanings as in
+        :meth:`Table.aggregate`.
+
+        """
+
+        table = self.table
+        table._g_check_open()
+        aggregator = _Aggregator(table, aggregations, by)
+        condvars = self._condvars(condition, condvars, depth=1)
+        futures = [
+            self._executor.submit(
+                _shard_aggregate, table._v_pathname, condition, condvars,
+                sstart, sstop, sstep, aggregator.aggregations, by)
+            for sstart, sstop, sstep in self._shards(start, stop, step)]
+        for future in futures:
+            aggregator.merge(future.result())
+        return aggregator.result()
@@ -55,6 +55,24 @@ bytes)."""
 SORTEDLR_MAX_SLOTS = 1 * _KB
 """The maximum number of chunks for SORTEDLR cache."""
 
+CACHE_BUDGET = 0
+"""The maximum size (in bytes) of the caches of tables and indexes in a
+file taken together.
+
+When positive, the sizes given by ``TABLE_MAX_SIZE``, ``ITERSEQ_MAX_SIZE``,
+``LIMBOUNDS_MAX_SIZE``, ``SORTEDLR_MAX_SIZE``, ``BOUNDS_MAX_SIZE`` and
+``SORTED_MAX_SIZE`` are only the initial ones.  Every few queries, the
+budget is redistributed among the caches of the tables and indexes in use,
+giving more memory to the caches with more hits (weighted by the bytes
+read again on a miss) and shrinking the ones which do not get hits, like
+the caches used by scans.  Caches are then resized instead of being
+disabled when their hit ratio is lower than ``LOWEST_HIT_RATIO``.  Zero
+keeps the sizes of caches fixed.
+
+.. versionadded:: 3.9.3
+
+"""
+
 
 # Parameters for general cache behaviour
 # --------------------------------------
@@ -79,6 +97,29 @@ LOWEST_HIT_RATIO = 0.6
 """The minimum acceptable hit ratio for a cache to avoid disabling (and
 freeing) it."""
 
+SHARED_CHUNK_CACHE_SIZE = 0
+"""The maximum size (in bytes) of the cache of decompressed chunks shared
+by all the files open in the process.
+
+Chunks read by indexed table queries, by slices of chunked arrays and by
+reads of variable length arrays are kept in this cache, with a single
+memory budget for all of them.  Chunks of files opened in read-only mode
+are found again after reopening the files (as long as they are not
+modified in between).  Zero disables the shared cache, and then the
+``TABLE_MAX_SIZE`` cache of every table is used instead.
+
+.. versionadded:: 3.9.3
+
+"""
+
+SHARED_CHUNK_CACHE_SLOTS = 4 * _KB
+"""The maximum number of chunks in the shared cache of decompressed
+chunks.
+
+.. versionadded:: 3.9.3
+
+"""
+
 
 # Tunable parameters
 # ==================
@@ -198,6 +239,45 @@ EXPECTED_ROWS_VLARRAY = 1000
 EXPECTED_ROWS_TABLE = 10_000
 """Default expected number of rows for :class:`Table` objects."""
 
+MAX_UNINDEXED_ROWS = 0
+"""The maximum number of rows at the end of a table which may be left
+out of its indexes when the table is flushed (see
+:attr:`Table.autoindex`).  Indexes are only updated once more rows are
+waiting to be indexed, so that flushing a few rows at a time does not
+rewrite the last row of the indexes every time.  Queries scan the rows
+not indexed yet, and they are always added to the indexes when the
+table is closed, so indexes in files are complete.  The default of 0
+updates indexes on every flush.
+
+.. versionadded:: 3.9.3
+
+"""
+
+BACKGROUND_REINDEX = False
+"""Rebuild the indexes made dirty by modifying or removing rows in a
+background thread (see :attr:`Table.autoindex`), instead of blocking
+until they are rebuilt.  Queries do not use dirty indexes until the
+rebuilt ones replace them.  See :meth:`Table.reindex_dirty` for more
+information.
+
+.. versionadded:: 3.9.3
+
+"""
+
+QUERY_RESULTS_SLOTS = 0
+"""The maximum number of query results kept in the file of every table.
+The row coordinates selected by :meth:`Table.read_where` and
+:meth:`Table.get_where_list` are stored along with the table (in files
+opened for writing), so that repeating the same queries after reopening
+the file reads them instead of evaluating the condition again.  Stored
+results are out of date once rows are appended, modified or removed.
+The default of 0 stores no results, but those already stored are still
+used.
+
+.. versionadded:: 3.9.3
+
+"""
+
 PYTABLES_SYS_ATTRS = True
 """Set this to ``False`` if you don't want to create PyTables system
 attributes in datasets.  Also, if set to ``False`` the possible existing
@@ -221,6 +301,34 @@ is 1.  In other cases a value of 2 or 4 could make sense.
 
 """
 
+MAX_QUERY_THREADS = 1
+"""The maximum number of threads that PyTables should use for scanning
+tables in queries that cannot use indexes.  When larger than 1, the
+query range is split in chunk-aligned pieces that are read and
+evaluated concurrently, and the results are merged in row order.  Reads
+from Blosc2 tables can be decompressed in parallel without holding any
+lock, while other reads are serialized and only the evaluation of the
+condition is done in parallel.  If `None`, it is automatically set to
+the number of cores in your machine.  The default of 1 does serial
+scans.
+
+.. versionadded:: 3.9.3
+
+"""
+
+MAX_INDEX_THREADS = 1
+"""The maximum number of threads that PyTables should use for sorting
+values when building full indexes.  When larger than 1, the slices of
+the index are sorted concurrently while the next ones are read, and so
+are the batches of values merged into completely sorted indexes (see
+:meth:`Column.create_csindex`).  If `None`, it is automatically set to
+the number of cores in your machine.  The default of 1 sorts values
+serially.
+
+.. versionadded:: 3.9.3
+
+"""
+
 USER_BLOCK_SIZE = 0
 """Sets the user block size of a file.
 
@@ -0,0 +1,273 @@
+"""Here is defined the RowSet class."""
+
+from typing import Iterable, Iterator, Union
+
+import numpy as np
+
+# Coordinates are split into a key (the high bits) and a 16-bit value.
+_bits = 16
+_mask = (1 << _bits) - 1
+# Containers with more values than this are kept as bitmaps.
+_maxarray = 1 << (_bits - 4)
+# Number of bits set in every byte value.
+_popcount = np.array([bin(i).count('1') for i in range(256)], dtype=np.int64)
+
+
+def _is_bitmap(container: np.ndarray) -> bool:
+    return container.dtype == np.uint8
+
+
+def _cardinality(container: np.ndarray) -> int:
+    if _is_bitmap(container):
+        return int(_popcount[container].sum())
+    return len(container)
+
+
+def _values_of(container: np.ndarray) -> np.ndarray:
+    """Get the sorted 16-bit values kept in a `container`."""
+
+    if _is_bitmap(container):
+        bits = np.unpackbits(container, bitorder='little')
+        return np.flatnonzero(bits).astype(np.uint16)
+    return container
+
+
+def _bitmap_of(container: np.ndarray) -> np.ndarray:
+    if _is_bitmap(container):
+        return container
+    bits = np.zeros(1 << _bits, dtype=bool)
+    bits[container] = True
+    return np.packbits(bits, bitorder='little')
+
+
+def _container_of(values: np.ndarray) -> np.ndarray:
+    """Get the container for the sorted and unique 16-bit `values`."""
+
+    if len(values) > _maxarray:
+        return _bitmap_of(values)
+    return values.astype(np.uint16, copy=False)
+
+
+def _compact(bitmap: np.ndarray) -> Union[np.ndarray, None]:
+    """Turn a `bitmap` into an array container if it is small enough,
+    or into None if it is empty."""
+
+    ncoords = _cardinality(bitmap)
+    if ncoords == 0:
+        return None
+    if ncoords <= _maxarray:
+        return _values_of(bitmap)
+    return bitmap
+
+
+def _combine(first: np.ndarray, second: np.ndarray,
+             op: str) -> Union[np.ndarray, None]:
+    """Combine two containers with the set operation `op` (``'or'``,
+    ``'and'`` or ``'sub'``).  None is returned for empty results."""
+
+    if not (_is_bitmap(first) or _is_bitmap(second)):
+        if op == 'or':
+            result = _container_of(np.union1d(first, second))
+        elif op == 'and':
+            result = np.intersect1d(first, second, assume_unique=True)
+        else:
+            result = np.setdiff1d(first, second, assume_unique=True)
+        return result if len(result) > 0 else None
+    if op == 'and' and not _is_bitmap(second):
+        first, second = second, first
+    if op == 'and' and not _is_bitmap(first):
+        # Only the values in the array need to be checked.
+        bits = np.unpackbits(second, bitorder='little')
+        result = first[bits[first].astype(bool)]
+        return result if len(result) > 0 else None
+    first, second = _bitmap_of(first), _bitmap_of(second)
+    if op == 'or':
+        return first | second  # never smaller than its operands
+    if op == 'and':
+        return _compact(first & second)
+    return _compact(first & ~second)
+
+
+class RowSet:
+    """A compressed set of row coordinates.
+
+    Coordinates are grouped in ranges of 65536 rows, and the coordinates
+    in every range are kept as a sorted array of 16-bit offsets if there
+    are a few of them, or as a bitmap otherwise (like in roaring
+    bitmaps).  Thus, a set takes at most a bit per row in the ranges
+    where it has coordinates, much less than an array of 64-bit
+    coordinates for large query results.
+
+    Row sets are returned by :meth:`Table.get_where_rowset`, and they can
+    be used as the coordinates passed to :meth:`Table.read_coordinates`,
+    :meth:`Table.itersequence` or :meth:`Table.modify_coordinates`.  The
+    results of several queries can be combined with the ``|``, ``&`` and
+    ``-`` operators (or the :meth:`union`, :meth:`intersection` and
+    :meth:`difference` methods) far more cheaply than by querying for the
+    combined condition.  Iterating over a row set yields its coordinates
+    in ascending order.
+
+    Parameters
+    ----------
+    coords
+        The row coordinates in the set, in any order and possibly
+        repeated.
+
+    .. versionadded:: 3.9.3
+
+    """
+
+    def __init__(self, coords: Iterable[int]=()) -> None:
+        self._containers: dict[int, np.ndarray] = {}
+        self._update(np.asarray(
+            coords if hasattr(coords, '__len__') else list(coords),
+            dtype=np.int64))
+
+    @property
+    def nbytes(self) -> int:
+        """The number of bytes taken by the coordinates in the set."""
+
+        return sum(c.nbytes for c in self._containers.values())
+
+    def _update(self, coords: np.ndarray) -> None:
+        """Add the array of `coords` to the set."""
+
+        if len(coords) == 0:
+            return
+        if coords.ndim != 1:
+            raise ValueError("row coordinates must be one-dimensional")
+        if not (coords[1:] > coords[:-1]).all():
+            coords = np.unique(coords)
+        if coords[0] < 0:
+            raise ValueError("row coordinates can not be negative")
+        keys, starts = np.unique(coords >> _bits, return_index=True)
+        values = (coords & _mask).astype(np.uint16)
+        containers = self._containers
+        for key, kvalues in zip(keys.tolist(),
+                                np.split(values, starts[1:])):
+            container = _container_of(kvalues)
+            if key in containers:
+                container = _combine(containers[key], container, 'or')
+            containers[key] = container
+
+    def _sorted_keys(self) -> list[int]:
+        return sorted(self._containers)
+
+    def chunks(self) -> Iterator[np.ndarray]:
+        """Iterate over the coordinates in the set in ascending order.
+
+        Coordinates are yielded as arrays of at most 65536 coordinates
+        (all of them in the same range of 65536 rows).
+
+        """
+
+        for key in self._sorted_keys():
+            values = _values_of(self._containers[key])
+            yield (np.int64(key) << _bits) + values.astype(np.int64)
+
+    def coords(self) -> np.ndarray:
+        """Get an array with the coordinates in the set in ascending
+        order."""
+
+        chunks = list(self.chunks())
+        if len(chunks) == 0:
+            return np.array([], dtype=np.int64)
+        return np.concatenate(chunks)
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        coords = self.coords()
+        return coords if dtype is None else coords.astype(dtype)
+
+    def __len__(self) -> int:
+        return sum(_cardinality(c) for c in self._containers.values())
+
+    def __bool__(self) -> bool:
+        return len(self._containers) > 0
+
+    def __iter__(self) -> Iterator[int]:
+        for chunk in self.chunks():
+            yield from chunk.tolist()
+
+    def __contains__(self, coord: int) -> bool:
+        coord = int(coord)
+        container = self._containers.get(coord >> _bits)
+        if container is None:
+            return False
+        value = coord & _mask
+        if _is_bitmap(container):
+            return bool(container[value >> 3] & (1 << (value & 7)))
+        pos = np.searchsorted(container, value)
+        return pos < len(container) and container[pos] == value
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, RowSet):
+            return NotImplemented
+        return (self._sorted_keys() == other._sorted_keys()
+                and all(np.array_equal(_values_of(c),
+                                       _values_of(other._containers[key]))
+                        for key, c in self._containers.items()))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(<{len(self)} coordinates>)"
+
+    def _combined(self, other: "RowSet", op: str) -> "RowSet":
+        if not isinstance(other, RowSet):
+            other = RowSet(other)
+        mine, others = self._containers, other._containers
+        if op == 'or':
+            keys = mine.keys() | others.keys()
+        elif op == 'and':
+            keys = mine.keys() & others.keys()
+        else:
+            keys = mine.keys()
+        result = RowSet()
+        for key in keys:
+            if key not in others:
+                container = mine[key]
+            elif key not in mine:
+                container = others[key]
+            else:
+                container = _combine(mine[key], others[key], op)
+            if container is not None:
+                result._containers[key] = container
+        return result
+
+    def _reduced(self, others: tuple, op: str) -> "RowSet":
+        if len(others) == 0:
+            return self._combined(RowSet(), 'or')  # a copy
+        result = self
+        for other in others:
+            result = result._combined(other, op)
+        return result
+
+    def union(self, *others: Union["RowSet", Iterable[int]]) -> "RowSet":
+        """Get the coordinates in this set or in any of the `others`."""
+
+        return self._reduced(others, 'or')
+
+    def intersection(self, *others: Union["RowSet", Iterable[int]]
+                     ) -> "RowSet":
+        """Get the coordinates in this set and in all of the `others`."""
+
+        return self._reduced(others, 'and')
+
+    def difference(self, *others: Union["RowSet", Iterable[int]]
+                   ) -> "RowSet":
+        """Get the coordinates in this set but in none of the `others`."""
+
+        return self._reduced(others, 'sub')
+
+    def __or__(self, other: "RowSet") -> "RowSet":
+        if not isinstance(other, RowSet):
+            return NotImplemented
+        return self._combined(other, 'or')
+
+    def __and__(self, other: "RowSet") -> "RowSet":
+        if not isinstance(other, RowSet):
+            return NotImplemented
+        return self._combined(other, 'and')
+
+    def __sub__(self, other: "RowSet") -> "RowSet":
+        if not isinstance(other, RowSet):
+            return NotImplemented
+        return self._combined(other, 'sub')
@@ -1,13 +1,18 @@
 """Here is defined the Table class."""
 
+import collections
 import functools
+import hashlib
+import itertools
 import math
 import operator
 import sys
+import threading
 import warnings
 from pathlib import Path
 import weakref
 
+from concurrent.futures import Future, ThreadPoolExecutor
 from time import perf_counter as clock
 from typing import (
     Any, Callable, Generator, Iterator, Literal, Optional, Sequence, Type,
@@ -18,21 +23,30 @@ import numpy as np
 
 from . import tableextension
 from .lrucacheextension import ObjectCache, NumCache
-from .atom import Atom
-from .conditions import compile_condition
+from .chunkcache import get_shared_cache
+from .atom import Atom, Int64Atom, UInt8Atom
+from .conditions import compile_condition, call_on_recarr
 from .flavor import flavor_of, array_as_internal, internal_to_flavor
 from .utils import is_idx, lazyattr, SizeType, NailedDict as CacheDict
+from .group import Group
 from .leaf import Leaf
-from .description import (IsDescription, Description, Col, descr_from_dtype)
+from .earray import EArray
+from .node import NotLoggedMixin
+from .rowset import RowSet
+from .description import (
+    IsDescription, Description, Col, UInt32Col, descr_from_dtype)
 from .exceptions import (
     NodeError, HDF5ExtError, PerformanceWarning, OldIndexWarning,
     NoSuchNodeError)
-from .utilsextension import get_nested_field
+from .utilsextension import get_nested_field, is_hdf5_threadsafe
 
 from .path import join_path, split_path
+from .idxutils import (
+    bloom_positions, composite_key_range, composite_keys, composite_keysize,
+    exact_values)
 from .index import (
-    OldIndex, default_index_filters, default_auto_index, Index, IndexesDescG,
-    IndexesTableG)
+    OldIndex, default_index_filters, default_auto_index, CompositeIndex,
+    Index, IndexesDescG, IndexesTableG)
 
 
 profile = False
@@ -43,7 +57,6 @@ if profile:
 if TYPE_CHECKING:
     from .conditions import CompiledCondition
     from .filters import Filters
-    from .group import Group
     from .misc.enum import Enum
     from .node import Node
 
@@ -92,6 +105,15 @@ if hasattr(np, 'complex256'):
 # The NumPy scalar type corresponding to `SizeType`.
 _npsizetype = np.array(SizeType(0)).dtype.type
 
+# Serializes the HDF5 calls done by the threads in parallel queries.
+_hdf5_lock = threading.Lock()
+
+# Prefix of the names of indexes being rebuilt in the background.
+_rebuilt_prefix = '__rebuilt_'
+
+# Name of the group keeping query results in the indexes group of a table.
+_query_results_name = '__queryresults'
+
 
 def _index_name_of(node: "Node") -> str:
     return '_i_%s' % node._v_name
@@ -128,7 +150,14 @@ def restorecache(self: "Table") -> None:
     # Define a cache for sparse table reads
     params = self._v_file.params
     chunksize = self._v_chunkshape[0]
-    nslots = params['TABLE_MAX_SIZE'] / (chunksize * self._v_dtype.itemsize)
+    # Chunks go to the shared chunk cache instead, if it is enabled
+    self._sharedchunks = get_shared_cache()
+    self._invalidate_shared_chunks()
+    if self._sharedchunks is not None:
+        nslots = 0
+    else:
+        nslots = params['TABLE_MAX_SIZE'] / (chunksize
+                                             * self._v_dtype.itemsize)
     self._chunkcache = NumCache((nslots, chunksize), self._v_dtype,
                                 'table chunk cache')
     self._seqcache = ObjectCache(params['ITERSEQ_MAX_SLOTS'],
@@ -143,7 +172,22 @@ def _table__where_indexed(self: "Table",
                           condvars: dict[str, Union["Column", np.ndarray]],
                           start: int,
                           stop: int,
-                          step: int) -> Union[Iterator[tableextension.Row], np.ndarray]:
+                          step: int,
+                          composite: Optional[tuple] = None,
+                          memberships: Sequence[tuple[Index, np.ndarray]] = (),
+                          ) -> np.ndarray:
+    """Compute the chunkmap for the indexed part of a condition.
+
+    A boolean chunkmap is returned when the table has to be scanned.
+    When the result is already known (it is empty or it is in the
+    sequence cache), an array of row coordinates is returned instead.
+    The chunkmap of the `composite` index lookup (as returned by
+    `_table__composite_lookup()`), if given, is used as well, and so are
+    the chunkmaps of the set `memberships` (as returned by
+    `_table__membership_lookups()`).
+
+    """
+
     if profile:
         tref = clock()
     if profile:
@@ -157,7 +201,9 @@ def _table__where_indexed(self: "Table",
     values = []
     for key, value in condvars.items():
         if isinstance(value, np.ndarray):
-            values.append((key, value.item()))
+            # Arrays of values are used by ``isin()`` calls.
+            values.append((key, value.item() if value.ndim == 0
+                           else tuple(value.tolist())))
     # Build a key for the sequence cache
     seqkey = (condition, tuple(values), (start, stop, step))
     # Do a lookup in sequential cache for this query
@@ -165,15 +211,13 @@ def _table__where_indexed(self: "Table",
     if nslot >= 0:
         # Get the row sequence from the cache
         seq = self._seqcache.getitem(nslot)
-        if len(seq) == 0:
-            return iter([])
         # seq is a list.
         seq = np.array(seq, dtype='int64')
         # Correct the ranges in cached sequence
-        if (start, stop, step) != (0, self.nrows, 1):
+        if len(seq) > 0 and (start, stop, step) != (0, self.nrows, 1):
             seq = seq[(seq >= start) & (
                 seq < stop) & ((seq - start) % step == 0)]
-        return self.itersequence(seq)
+        return seq
     else:
         # No luck.  self._seqcache will be populated
         # in the iterator if possible. (Row._finish_riterator)
@@ -184,6 +228,30 @@ def _table__where_indexed(self: "Table",
     strexpr = compiled.string_expression
     cmvars = {}
     tcoords = 0
+    # Whether the indexes of all the indexed expressions cover every row
+    complete = True
+    if composite is not None:
+        # Rows fulfilling the condition are found by the composite index
+        # lookup as well, so its chunkmap is ANDed with the final one.
+        index, _, range_ = composite
+        ncoords = index.search(range_)
+        if (index.reduction == 1 and ncoords == 0
+                and index.nelements == self.nrows):
+            self._seqcache.setitem(seqkey, [], 1)
+            return np.array([], dtype='int64')
+        cmvars["c"] = _table__fit_chunkmap(self, index, index.get_chunkmap())
+        strexpr = "(%s & c)" % strexpr if idxexprs else "c"
+    for i, (index, keys) in enumerate(memberships):
+        # Rows fulfilling the condition have one of the values looked up.
+        ncoords, chunkmap = index.search_values(keys)
+        if (index.reduction == 1 and ncoords == 0
+                and index.nelements == self.nrows):
+            self._seqcache.setitem(seqkey, [], 1)
+            return np.array([], dtype='int64')
+        cmvars["m%d" % i] = _table__fit_chunkmap(self, index, chunkmap)
+        strexpr = ("(%s & m%d)" % (strexpr, i)
+                   if idxexprs or composite is not None or i > 0
+                   else "m%d" % i)
     for i, idxexpr in enumerate(idxexprs):
         var, ops, lims = idxexpr
         col = condvars[var]
@@ -195,34 +263,464 @@ def _table__where_indexed(self: "Table",
         range_ = index.get_lookup_range(ops, lims)
         ncoords = index.search(range_)
         tcoords += ncoords
+        complete = complete and index.nelements == self.nrows
         if index.reduction == 1 and ncoords == 0:
             # No values from index condition, thus the chunkmap should be empty
             nrowsinchunk = self.chunkshape[0]
-            nchunks = math.ceil(self.nrows / nrowsinchunk)
+            nchunks = math.ceil(index.nelements / nrowsinchunk)
             chunkmap = np.zeros(shape=nchunks, dtype="bool")
         else:
             # Get the chunkmap from the index
             chunkmap = index.get_chunkmap()
         # Assign the chunkmap to the cmvars dictionary
-        cmvars["e%d" % i] = chunkmap
+        cmvars["e%d" % i] = _table__fit_chunkmap(self, index, chunkmap)
 
-    if index.reduction == 1 and tcoords == 0:
+    if idxexprs and index.reduction == 1 and tcoords == 0 and complete:
         # No candidates found in any indexed expression component, so leave now
         self._seqcache.setitem(seqkey, [], 1)
-        return iter([])
+        return np.array([], dtype='int64')
 
     # Compute the final chunkmap
     chunkmap = ne.evaluate(strexpr, cmvars)
     if not chunkmap.any():
         # The chunkmap is all False, so the result is empty
         self._seqcache.setitem(seqkey, [], 1)
-        return iter([])
+        return np.array([], dtype='int64')
 
     if profile:
         show_stats("Exiting table_whereIndexed", tref)
     return chunkmap
 
 
+def _table__fit_chunkmap(self: "Table", index: Index,
+                         chunkmap: np.ndarray) -> np.ndarray:
+    """Fit the chunkmap of `index` to the chunks of the table.
+
+    Rows appended after the last ones in `index` have not been indexed
+    yet (see ``MAX_UNINDEXED_ROWS`` in :mod:`tables.parameters`), so the
+    chunks holding them are always selected.
+
+    """
+
+    if index.nelements == self.nrows:
+        return chunkmap
+    nrowsinchunk = self.chunkshape[0]
+    nindexed = index.nelements // nrowsinchunk
+    fitted = np.ones(shape=math.ceil(self.nrows / nrowsinchunk), dtype="bool")
+    fitted[:nindexed] = chunkmap[:nindexed]
+    return fitted
+
+
+def _table__index_lookup(self: "Table",
+                         compiled: "CompiledCondition",
+                         condvars: dict[str, Union["Column", np.ndarray]],
+                         ) -> Optional[tuple["Column", tuple]]:
+    """Get the column and the index lookup range answering a condition.
+
+    This is only possible when the whole condition is a single indexable
+    expression over a column with a non-reduced index (i.e. a medium or
+    full one) covering all the rows in the table.  Otherwise, None is
+    returned.
+
+    """
+
+    if not compiled.index_complete or len(compiled.index_expressions) != 1:
+        return None
+    var, ops, lims = compiled.index_expressions[0]
+    col = condvars[var]
+    index = col.index
+    if index.reduction != 1 or index.nelements != self.nrows:
+        return None
+    # The limits of the lookup range must be exact for the column type
+    # (e.g. ``c_int < 1.5`` can not be looked up as ``c_int < 1``), which
+    # is not the case for strings or booleans.
+    kind = col.dtype.base.kind
+    if kind not in 'iuf':
+        return None
+    for lim in lims:
+        if kind in 'iu' and not isinstance(lim, (int, np.integer)):
+            return None
+        if kind == 'f' and not isinstance(lim, (int, float, np.number)):
+            return None
+
+    return col, index.get_lookup_range(ops, lims)
+
+
+def _table__composite_lookup(self: "Table",
+                             compiled: "CompiledCondition",
+                             condvars: dict[str, Union["Column", np.ndarray]],
+                             ) -> Optional[tuple[CompositeIndex,
+                                                 tuple[str, ...],
+                                                 tuple[bytes, bytes]]]:
+    """Choose a composite index for looking up a condition.
+
+    Composite indexes are looked up with the comparisons required by the
+    condition, when these compare their first columns with values for
+    equality and (optionally) the next column with a range.  The index
+    with most columns taking part in the lookup is chosen.
+
+    A tuple with the index, the pathnames of the columns taking part in
+    the lookup and the range of keys to look up is returned, or None if
+    no composite index can be used.
+
+    """
+
+    if not compiled.conjuncts:
+        return None
+    equal, lower, upper = {}, {}, {}
+    for var, op, lim in compiled.conjuncts:
+        if isinstance(lim, float) and math.isnan(lim):
+            return None  # nothing can be looked up
+        colname = condvars[var].pathname
+        if op == 'eq':
+            equal.setdefault(colname, lim)
+        elif op in ('gt', 'ge'):
+            lower[colname] = max(lower.get(colname, lim), lim)
+        else:
+            upper[colname] = min(upper.get(colname, lim), lim)
+
+    best = None
+    for columns, index in self.composite_indexes.items():
+        if index.dirty:
+            continue
+        nequal = 0
+        while nequal < len(columns) and columns[nequal] in equal:
+            nequal += 1
+        used = columns[:nequal]
+        limits = (None, None)
+        if nequal < len(columns):
+            colname = columns[nequal]
+            limits = (lower.get(colname), upper.get(colname))
+            if limits != (None, None):
+                used += (colname,)
+        if used and (best is None or len(used) > len(best[1])):
+            best = (index, used, nequal, limits)
+    if best is None:
+        return None
+
+    index, used, nequal, limits = best
+    columns = index.columns
+    range_ = composite_key_range(
+        [self.coldtypes[colname] for colname in columns],
+        [equal[colname] for colname in columns[:nequal]], *limits)
+    return index, used, range_
+
+
+def _table__membership_lookups(self: "Table",
+                               compiled: "CompiledCondition",
+                               ) -> list[tuple[Index, np.ndarray]]:
+    """Get the indexes for looking up the set memberships of a condition.
+
+    A list of ``(index, values)`` tuples is returned for the ``isin()``
+    calls required by the condition on columns with usable indexes.
+
+    """
+
+    if not self._enabled_indexing_in_queries:
+        return []
+    lookups = []
+    for param in compiled.required_memberships:
+        membership = compiled.memberships[param]
+        column = membership.column
+        if column.is_indexed and not column.index.dirty:
+            lookups.append((column.index, membership.values))
+    return lookups
+
+
+def _table__summary_chunkmap(self: "Table",
+                             compiled: "CompiledCondition",
+                             condvars: dict[str, Union["Column", np.ndarray]],
+                             ) -> Optional[np.ndarray]:
+    """Compute a chunkmap for a condition from per-chunk column summaries.
+
+    Chunks where some comparison or ``isin()`` call required by the
+    condition can not be fulfilled according to the zone map or the
+    Bloom filter of its column are left out.  None is returned if no summary can be used.
+
+    """
+
+    if (not (compiled.conjuncts or compiled.required_memberships)
+            or not (self._zonemaps or self._bloomfilters)):
+        return None
+    zonemaps = self._zonemap_nodes()
+    bloomfilters = self._bloomfilter_nodes()
+    nchunks = math.ceil(self.nrows / self.chunkshape[0])
+    chunkmap = None
+    for var, op, lim in compiled.conjuncts:
+        colpath = condvars[var].pathname
+        cmaps = []
+        if colpath in zonemaps:
+            cmaps.append(zonemaps[colpath].get_chunkmap(op, lim, nchunks))
+        if op == 'eq' and colpath in bloomfilters:
+            cmaps.append(bloomfilters[colpath].get_chunkmap([lim], nchunks))
+        for cmap in cmaps:
+            chunkmap = cmap if chunkmap is None else chunkmap & cmap
+    for param in compiled.required_memberships:
+        membership = compiled.memberships[param]
+        colpath, values = membership.column.pathname, membership.values
+        cmaps = []
+        if colpath in zonemaps:
+            if len(values) == 0:
+                cmaps.append(np.zeros(nchunks, dtype=bool))
+            else:
+                zonemap = zonemaps[colpath]
+                cmaps.append(zonemap.get_chunkmap('ge', values[0], nchunks)
+                             & zonemap.get_chunkmap('le', values[-1], nchunks))
+        if colpath in bloomfilters:
+            cmaps.append(bloomfilters[colpath].get_chunkmap(values, nchunks))
+        for cmap in cmaps:
+            chunkmap = cmap if chunkmap is None else chunkmap & cmap
+    return chunkmap
+
+
+def _table__count_indexed(self: "Table",
+                          compiled: "CompiledCondition",
+                          condvars: dict[str, Union["Column", np.ndarray]],
+                          ) -> Optional[int]:
+    """Count the rows fulfilling a condition using only its index.
+
+    None is returned if the condition can not be answered by the index
+    alone (see `_table__index_lookup()`).
+
+    """
+
+    lookup = _table__index_lookup(self, compiled, condvars)
+    if lookup is None:
+        return None
+    col, range_ = lookup
+    return int(col.index.search(range_))
+
+
+def _table__read_covered(self: "Table",
+                         condition: str,
+                         condvars: dict[str, Union["Column", np.ndarray]],
+                         start: Optional[int],
+                         stop: Optional[int],
+                         step: Optional[int],
+                         field: Union[str, bool],
+                         ) -> Optional[tuple[np.ndarray, Optional[np.ndarray]]]:
+    """Read the rows fulfilling a condition from a full index alone.
+
+    The ``(coords, values)`` of the selected rows are returned in row
+    order, with `values` being those of the `field` column, which must
+    be the indexed column or one included in the index (see
+    `Index.include`).  If `field` is False, only coordinates are read
+    and `values` is None.  None is returned if the condition can not be
+    answered by a full index alone.
+
+    """
+
+    (start, stop, step) = self._process_range_read(start, stop, step)
+    if start >= stop:
+        return None
+    compiled = self._compile_condition(condition, condvars)
+    lookup = _table__index_lookup(self, compiled, condvars)
+    if lookup is None:
+        return None
+    col, range_ = lookup
+    index = col.index
+    if index.indsize != 8:
+        return None  # only full indexes keep the coordinates of rows
+    if field is False:
+        colname = False
+    elif field == col.pathname:
+        colname = None
+    elif field in index.include:
+        colname = field
+        if index.included0.nrows != index.nelements:
+            return None
+    else:
+        return None
+
+    index.search(range_)
+    coords, values = index.read_found(colname)
+    if (start, stop, step) != (0, self.nrows, 1):
+        selected = (coords >= start) & (coords < stop)
+        if step > 1:
+            selected &= (coords - start) % step == 0
+        coords = coords[selected]
+        if values is not None:
+            values = values[selected]
+    order = np.argsort(coords, kind='stable')
+    if values is not None:
+        values = values[order]
+    return coords[order].astype(SizeType, copy=False), values
+
+
+def _table__where_parallel(self: "Table",
+                           start: int,
+                           stop: int,
+                           step: int,
+                           records: bool,
+                           field: Optional[str],
+                           ) -> Iterator[tuple[np.ndarray, Optional[np.ndarray]]]:
+    """Scan the table for the current condition using several threads.
+
+    This is the parallel counterpart of ``Row._iter_where_buffers()``
+    for in-kernel queries.  The ``[start, stop)`` range is split in
+    pieces aligned with the I/O buffer (and hence, with chunks) that are
+    read and evaluated by a pool of threads.  The ``(coords, recs)``
+    results are yielded in row order.
+
+    """
+
+    condfunc, condargs, condkwargs = self._where_condition
+    self._where_condition = None  # reset the conditions
+    nthreads = self._v_file.params['MAX_QUERY_THREADS']
+    nrowsinbuf = self.nrowsinbuf
+    # The chunk addresses must be cached before starting the threads
+    self._fill_chunk_addrs()
+
+    def scan(rstart: int) -> Optional[tuple[np.ndarray, Optional[np.ndarray]]]:
+        rstop = min((rstart // nrowsinbuf + 1) * nrowsinbuf, stop)
+        # First row in this piece that is reachable with step
+        first = rstart + (start - rstart) % step
+        if first >= rstop:
+            return None
+        buf = self._get_container(rstop - rstart)
+        nrecords = self._read_records_blosc2(rstart, rstop - rstart, buf)
+        if nrecords < 0:
+            with _hdf5_lock:
+                nrecords = self._read_records(rstart, rstop - rstart, buf)
+        buf = buf[:nrecords]
+        valid = call_on_recarr(condfunc, condargs, buf, **condkwargs)
+        if step > 1:
+            offsets = np.arange(first - rstart, nrecords, step)
+            offsets = offsets[valid[offsets]]
+        else:
+            offsets = np.flatnonzero(valid)
+        if len(offsets) == 0:
+            return None
+        if not records:
+            return offsets + rstart, None
+        if field:
+            buf = get_nested_field(buf, field)
+        return offsets + rstart, buf[offsets]
+
+    rstarts = itertools.chain(
+        [start], range((start // nrowsinbuf + 1) * nrowsinbuf, stop, nrowsinbuf))
+    with ThreadPoolExecutor(nthreads) as executor:
+        # Only keep a few pieces in flight, so that memory consumption
+        # is bounded by a small number of I/O buffers per thread.
+        pending = collections.deque(
+            executor.submit(scan, rstart)
+            for rstart in itertools.islice(rstarts, 2 * nthreads))
+        while pending:
+            result = pending.popleft().result()
+            for rstart in itertools.islice(rstarts, 1):
+                pending.append(executor.submit(scan, rstart))
+            if result is not None:
+                yield result
+
+
+def _table__query_caches(self: "Table",
+                         indexes: dict[Union[str, tuple[str, ...]], Index],
+                         ) -> dict[str, Union[NumCache, ObjectCache]]:
+    """Get the caches used by queries on the table and `indexes` by name."""
+
+    caches = {}
+    if not self._dirtycache:
+        if self._sharedchunks is not None:
+            caches['chunks'] = self._sharedchunks.cache
+        else:
+            caches['chunks'] = self._chunkcache
+        caches['sequences'] = self._seqcache
+    for target, index in indexes.items():
+        name = target if isinstance(target, str) else ','.join(target)
+        for cachename, attrname in [('bounding limits', 'limboundscache'),
+                                    ('last row chunks', 'sortedLRcache')]:
+            # Index caches are only created when the index is searched.
+            cache = index.__dict__.get(attrname)
+            if cache is not None:
+                caches[f'{name} {cachename}'] = cache
+    return caches
+
+
+def _table__analyze_query(self: "Table",
+                          condition: str,
+                          condvars: dict[str, Union["Column", np.ndarray]],
+                          range_: tuple[int, int, int],
+                          strategy: str,
+                          indexes: dict[Union[str, tuple[str, ...]], Index],
+                          ) -> dict[str, Any]:
+    """Run a query and measure it for `Table.explain()`."""
+
+    if self._dirtycache:
+        restorecache(self)
+    before = {name: (cache, cache.nhits, cache.nmisses) for name, cache
+              in _table__query_caches(self, indexes).items()}
+    (start, stop, step) = range_
+    tref = clock()
+    if strategy == 'covering index':
+        chunkmap, _ = _table__read_covered(
+            self, condition, condvars, start, stop, step, False)
+        tsetup = clock()
+        nreturned = len(chunkmap)
+    else:
+        where_range, chunkmap = self._where_setup(
+            condition, condvars, start, stop, step, depth=4)
+        self._results_key = None  # the result is not stored
+        tsetup = clock()
+        nreturned = sum(len(coords) for coords, _ in self._chunkmap_buffers(
+            where_range, chunkmap, records=False, field=None))
+        self._where_condition = None  # reset the conditions
+    tscan = clock()
+
+    chunkrows = self.chunkshape[0]
+    first, last = start // chunkrows, (stop - 1) // chunkrows
+    nchunks = max(0, last - first + 1)
+    if nchunks == 0 or (chunkmap is not None
+                        and chunkmap.dtype != np.bool_):
+        # The coordinates were known in advance.
+        nselected, nevaluated = None, 0
+    elif chunkmap is None:
+        nselected, nevaluated = nchunks, len(range(start, stop, step))
+    else:
+        selected = np.flatnonzero(chunkmap[first:last + 1]) + first
+        # The rows ``start + k * step`` in the selected chunks
+        lows = np.maximum(selected * chunkrows, start) - start
+        highs = np.minimum((selected + 1) * chunkrows, stop) - start
+        nselected = len(selected)
+        nevaluated = int((-(-highs // step) - -(-lows // step)).sum())
+
+    caches = {}
+    for name, cache in _table__query_caches(self, indexes).items():
+        hits, misses = cache.nhits, cache.nmisses
+        if name in before and before[name][0] is cache:
+            hits -= before[name][1]
+            misses -= before[name][2]
+        caches[name] = {'hits': hits, 'misses': misses}
+    return {
+        'chunks': nchunks,
+        'chunks_selected': nselected,
+        'rows_evaluated': nevaluated,
+        'rows_returned': nreturned,
+        'caches': caches,
+        'timings': {'setup': tsetup - tref, 'scan': tscan - tsetup,
+                    'total': tscan - tref},
+    }
+
+
+def _table__query_results_key(condition: str,
+                              condvars: dict[str, Union["Column", np.ndarray]],
+                              range_: tuple[int, int, int]) -> tuple:
+    """Get the key of the results of a query in `QueryResultsG`.
+
+    Columns are identified by their pathnames and other variables by
+    their values, so the key is the same in different sessions.
+
+    """
+
+    values = []
+    for name, value in sorted(condvars.items()):
+        if hasattr(value, 'pathname'):  # column
+            values.append((name, value.pathname))
+        else:
+            values.append((name, value.dtype.str, value.shape,
+                           value.tolist()))
+    return (condition, tuple(values), range_)
+
+
 def create_indexes_table(table: "Table") -> IndexesTableG:
     itgroup = IndexesTableG(
         table._v_parent, _index_name_of(table),
@@ -245,13 +743,12 @@ def _column__create_index(self: "Column",
                           filters: Optional["Filters"],
                           tmp_dir: str,
                           blocksizes: tuple[int, int, int, int],
-                          verbose: bool) -> int:
+                          verbose: bool,
+                          include: Optional[list[str]]=None) -> int:
     name = self.name
     table = self.table
     dtype = self.dtype
-    descr = self.descr
     index = self.index
-    get_node = table._v_file._get_node
 
     # Warn if the index already exists
     if index:
@@ -269,6 +766,58 @@ def _column__create_index(self: "Column",
     if dtype.shape != ():
         raise TypeError("multidimensional columns can not be indexed")
 
+    # Check the columns to be stored in a covering index
+    if include:
+        if kind != 'full':
+            raise ValueError("only full indexes can include other columns")
+        include = list(include)
+        for colname in include:
+            if colname not in table.coldtypes:
+                table._check_column(colname)  # raises for missing columns
+                raise TypeError("nested column ``%s`` can not be included "
+                                "in an index" % colname)
+            if colname == self.pathname:
+                raise ValueError("the indexed column ``%s`` can not be "
+                                 "included in its own index" % colname)
+        if len(set(include)) != len(include):
+            raise ValueError("columns can only be included once in an index")
+
+    indexedrows = _column__build_index(
+        self, name, optlevel, kind, filters, tmp_dir, blocksizes, verbose,
+        include)
+    table._set_column_indexing(self.pathname, True)
+    table._indexedrows = indexedrows
+    table._unsaved_indexedrows = table.nrows - indexedrows
+
+    # We cannot do a flush here because when reindexing during a
+    # flush, the indexes are created anew, and that creates a nested
+    # call to flush().
+    # table.flush()
+
+    return indexedrows
+
+
+def _column__build_index(self: "Column",
+                         name: str,
+                         optlevel: int,
+                         kind: str,
+                         filters: Optional["Filters"],
+                         tmp_dir: str,
+                         blocksizes: tuple[int, int, int, int],
+                         verbose: bool,
+                         include: Optional[list[str]]=None) -> int:
+    """Create an index for the column in the node called `name`.
+
+    The index is filled with the rows in the table and optimized.  The
+    number of indexed rows is returned.
+
+    """
+
+    table = self.table
+    dtype = self.dtype
+    descr = self.descr
+    get_node = table._v_file._get_node
+
     # Get the indexes group for table, and if not exists, create it
     try:
         itgroup = get_node(_index_pathname_of(table))
@@ -304,40 +853,362 @@ def _column__create_index(self: "Column",
     # Create the index itself
     index = Index(
         idgroup, name, atom=atom,
-        title="Index for %s column" % name,
+        title="Index for %s column" % self.name,
         kind=kind,
         optlevel=optlevel,
         filters=filters,
         tmp_dir=tmp_dir,
         expectedrows=expectedrows,
         byteorder=table.byteorder,
-        blocksizes=blocksizes)
-
-    table._set_column_indexing(self.pathname, True)
+        blocksizes=blocksizes,
+        include=include)
 
     # Feed the index with values
 
     # Add rows to the index if necessary
     if table.nrows > 0:
         indexedrows = table._add_rows_to_index(
-            self.pathname, 0, table.nrows, lastrow=True, update=False)
+            self.pathname, 0, table.nrows, lastrow=True, update=False,
+            index=index)
     else:
         indexedrows = 0
     index.dirty = False
-    table._indexedrows = indexedrows
-    table._unsaved_indexedrows = table.nrows - indexedrows
 
     # Optimize the index that has been already filled-up
     index.optimize(verbose=verbose)
-
-    # We cannot do a flush here because when reindexing during a
-    # flush, the indexes are created anew, and that creates a nested
-    # call to flush().
-    # table.flush()
+    # Values of included columns follow the final order of the index
+    index.update_included()
 
     return indexedrows
 
 
+def _rebuild_indexes(filename: str, root_uep: str, params: dict[str, Any],
+                     tablepath: str,
+                     indexes: list[tuple[Union[str, tuple[str, ...]],
+                                         str, dict[str, Any]]]) -> int:
+    """Build new indexes for the table in `tablepath` of a file.
+
+    This runs in a background thread with its own handle of the file.
+    Every item in `indexes` has the indexed column (or the tuple of
+    columns of a composite index), the path of the new index node, and
+    the arguments for building it.  The number of indexed rows is
+    returned.
+
+    """
+
+    from .file import open_file
+
+    h5file = open_file(filename, 'a', root_uep=root_uep, **params)
+    table = None
+    try:
+        table = h5file._get_node(tablepath)
+        indexedrows = 0
+        for target, path, kwargs in indexes:
+            # Remove the leftovers of a rebuild which did not finish
+            if path in h5file:
+                h5file._get_node(path)._f_remove()
+            name = split_path(path)[1]
+            if isinstance(target, tuple):
+                indexedrows = table._build_composite_index(
+                    target, name, **kwargs)
+            else:
+                indexedrows = _column__build_index(
+                    table.cols._g_col(target), name, **kwargs)
+        return SizeType(indexedrows)
+    finally:
+        # The table must neither index nor flush rows on its own here.
+        if table is not None:
+            table._f_close(flush=False)
+        h5file.close()
+
+
+class _ReindexJob:
+    """A rebuild of the indexes of a table running in the background."""
+
+    def __init__(self, table: "Table",
+                 targets: list[Union[str, tuple[str, ...]]]) -> None:
+        h5file = table._v_file
+        tmp_dir = str(Path(h5file.filename).parent)
+        self.generation = table._indexgeneration
+        """The index generation of the table when the rebuild started."""
+        self.indexes = []
+        """The indexed column (or columns), the path of the current index
+        and the path of the new one, for every index being rebuilt."""
+        specs = []
+        for target in targets:
+            index = table._target_index(target)
+            kwargs = dict(optlevel=index.optlevel, kind=index.kind,
+                          filters=index.filters, tmp_dir=tmp_dir,
+                          blocksizes=None, verbose=False)
+            if not isinstance(target, tuple):
+                kwargs['include'] = list(index.include)
+            parentpath, name = split_path(index._v_pathname)
+            newpath = join_path(parentpath, _rebuilt_prefix + name)
+            self.indexes.append((target, index._v_pathname, newpath))
+            specs.append((target, newpath, kwargs))
+        params = {key.lower(): value for key, value in h5file.params.items()}
+        executor = ThreadPoolExecutor(1)
+        self.future = executor.submit(
+            _rebuild_indexes, h5file.filename, h5file.root_uep, params,
+            table._v_pathname, specs)
+        """The future of the rebuild."""
+        # The thread of the executor ends along with the rebuild.
+        executor.shutdown(wait=False)
+
+
+class _SortedCursor:
+    """A cursor walking the sorted values of a CSI index in order."""
+
+    def __init__(self, index: Index, nbuf: int) -> None:
+        self.index = index
+        self.nbuf = nbuf
+        """The number of values read at once."""
+        self.pos = 0
+        """The position of the next value in the index."""
+
+    def next_run(self) -> tuple[np.ndarray, np.ndarray]:
+        """Read about `nbuf` values and coordinates from the cursor.
+
+        Runs of equal values are never split, so the last run is left
+        for the next call unless the read ends with the index.
+
+        """
+
+        index = self.index
+        nelements = index.nelements
+        start = self.pos
+        stop = min(start + self.nbuf, nelements)
+        values = index.read_sorted(start, stop)
+        while stop < nelements:
+            cut = int(np.searchsorted(values, values[-1], 'left'))
+            if cut > 0:
+                stop = start + cut
+                values = values[:cut]
+                break
+            # A single value in the whole read, keep reading
+            more = index.read_sorted(stop, min(stop + self.nbuf, nelements))
+            values = np.concatenate([values, more])
+            stop += len(more)
+        self.pos = stop
+        return values, index.read_indices(start, stop)
+
+    def read_until(self, low: Any,
+                   high: Any) -> tuple[np.ndarray, np.ndarray]:
+        """Skip the values below `low` and read those up to `high`."""
+
+        index = self.index
+        nelements = index.nelements
+        while self.pos < nelements:
+            values = index.read_sorted(
+                self.pos, min(self.pos + self.nbuf, nelements))
+            skip = int(np.searchsorted(values, low, 'left'))
+            self.pos += skip
+            if skip < len(values):
+                break
+        start = self.pos
+        parts = []
+        while self.pos < nelements:
+            values = index.read_sorted(
+                self.pos, min(self.pos + self.nbuf, nelements))
+            nread = int(np.searchsorted(values, high, 'right'))
+            parts.append(values[:nread])
+            self.pos += nread
+            if nread < len(values):
+                break
+        if not parts:
+            return index.read_sorted(0, 0), np.empty(0, dtype=SizeType)
+        return np.concatenate(parts), index.read_indices(start, self.pos)
+
+
+def _table__complete_csindex(table: "Table", colname: str) -> Index:
+    """Get the CSI index of a column, which must cover every row."""
+
+    index = table._check_sortby_csi(colname, True)
+    if index.nelements != table.nrows:
+        raise ValueError(
+            "the index of column ``%s`` in table ``%s`` does not cover all "
+            "of its rows; please flush the rows to the index"
+            % (index.column.pathname, table._v_pathname))
+    return index
+
+
+def _table__row_filter(table: "Table",
+                       condition: Optional[str],
+                       condvars: dict[str, Union["Column", np.ndarray]],
+                       ) -> Optional[Callable[[np.ndarray], np.ndarray]]:
+    """Get a function telling which records fulfill a condition.
+
+    The function gets an array of records of the table and returns a
+    boolean array.  None is returned if there is no `condition`.
+
+    """
+
+    if condition is None:
+        return None
+    compiled = table._compile_condition(condition, condvars)
+    args = [compiled.memberships[param] if param in compiled.memberships
+            else condvars[param] for param in compiled.parameters]
+
+    def rowfilter(recs: np.ndarray) -> np.ndarray:
+        return call_on_recarr(compiled.function, args, recs,
+                              **compiled.kwargs)
+
+    return rowfilter
+
+
+def _table__join_rows(table: "Table", coords: np.ndarray) -> np.ndarray:
+    """Read the rows at `coords` of a table joined with another one.
+
+    Rows are read in increasing order of coordinates, so that chunks are
+    visited sequentially, and returned in the order of `coords`.
+
+    """
+
+    order = np.argsort(coords, kind='stable')
+    recs = table._read_coordinates(coords[order].astype(SizeType))
+    result = np.empty_like(recs)
+    result[order] = recs
+    return result
+
+
+class _Aggregator:
+    """Running aggregations of table columns, optionally by groups.
+
+    Only one accumulator per aggregation (and group) is kept, so
+    selected rows can be fed one buffer at a time with `update()`.
+    Aggregators over different rows of the same table can be combined
+    with `merge()`.  The final values are returned by `result()`.
+
+    """
+
+    ops = ('count', 'sum', 'min', 'max', 'mean')
+    """The supported aggregations."""
+
+    def __init__(self,
+                 table: "Table",
+                 aggregations: dict[str, str],
+                 by: Optional[str]=None) -> None:
+        for colname, op in aggregations.items():
+            self._check_scalar_column(table, colname, allow_shape=True)
+            if op not in self.ops:
+                raise ValueError("unsupported aggregation ``%s``; use one "
+                                 "of: %s" % (op, ", ".join(self.ops)))
+        if by is not None:
+            self._check_scalar_column(table, by, allow_shape=False)
+
+        self.aggregations = dict(aggregations)
+        self.by = by
+        self.dtypes = {colname: table.coldtypes[colname]
+                       for colname in aggregations}
+        # Mapping from group keys (``None`` when not grouping) to the
+        # ``(count, value)`` accumulators of every aggregation.
+        self.groups: dict[Any, dict[str, tuple]] = {}
+
+    @staticmethod
+    def _check_scalar_column(table: "Table", colname: str,
+                             allow_shape: bool) -> None:
+        if colname not in table.coldtypes:
+            table._check_column(colname)  # raises for missing columns
+            raise TypeError("nested column ``%s`` can not be aggregated"
+                            % colname)
+        if not allow_shape and table.coldtypes[colname].shape != ():
+            raise TypeError("rows can not be grouped by multidimensional "
+                            "column ``%s``" % colname)
+
+    def update(self, recs: np.ndarray) -> None:
+        """Accumulate the aggregations over the records in `recs`."""
+
+        nrecs = len(recs)
+        if nrecs == 0:
+            return
+        if self.by is None:
+            keys = [None]
+            starts = np.zeros(1, dtype=np.intp)
+            order = slice(None)
+        else:
+            # Sort records by group so that every group can be reduced
+            # with a single call to ``ufunc.reduceat()``.
+            groupcol = get_nested_field(recs, self.by)
+            keys, inverse = np.unique(groupcol, return_inverse=True)
+            order = np.argsort(inverse, kind='stable')
+            starts = np.searchsorted(inverse[order], np.arange(len(keys)))
+            keys = keys.tolist()
+        counts = np.diff(np.append(starts, nrecs))
+
+        values = {}
+        for colname, op in self.aggregations.items():
+            if op == 'count':
+                continue
+            col = get_nested_field(recs, colname)[order]
+            if op in ('sum', 'mean'):
+                # Use the same accumulator type as ``numpy.sum()``.
+                sumtype = np.empty(0, dtype=col.dtype).sum().dtype
+                values[colname] = np.add.reduceat(col, starts, axis=0,
+                                                  dtype=sumtype)
+            elif op == 'min':
+                values[colname] = np.minimum.reduceat(col, starts, axis=0)
+            else:
+                values[colname] = np.maximum.reduceat(col, starts, axis=0)
+
+        for i, key in enumerate(keys):
+            group = self.groups.setdefault(key, {})
+            for colname, op in self.aggregations.items():
+                value = values[colname][i] if colname in values else None
+                group[colname] = self._combine(
+                    group.get(colname, (0, None)), (counts[i], value), op)
+
+    def merge(self, other: "_Aggregator") -> None:
+        """Accumulate the aggregations of the `other` aggregator."""
+
+        for key, othergroup in other.groups.items():
+            group = self.groups.setdefault(key, {})
+            for colname, op in self.aggregations.items():
+                group[colname] = self._combine(
+                    group.get(colname, (0, None)), othergroup[colname], op)
+
+    @staticmethod
+    def _combine(a: tuple, b: tuple, op: str) -> tuple:
+        (acount, avalue), (bcount, bvalue) = a, b
+        if avalue is None:
+            value = bvalue
+        elif bvalue is None:
+            value = avalue
+        elif op in ('sum', 'mean'):
+            value = avalue + bvalue
+        elif op == 'min':
+            value = np.minimum(avalue, bvalue)
+        else:
+            value = np.maximum(avalue, bvalue)
+        return (int(acount + bcount), value)
+
+    def _final(self, group: dict[str, tuple]) -> dict[str, Any]:
+        result = {}
+        for colname, op in self.aggregations.items():
+            count, value = group.get(colname, (0, None))
+            if op == 'count':
+                value = count
+            elif op == 'sum' and value is None:
+                value = np.empty(0, dtype=self.dtypes[colname]).sum(axis=0)
+            elif op == 'mean' and value is not None:
+                value = value / count
+            result[colname] = value
+        return result
+
+    def result(self) -> dict[Any, Any]:
+        """Get the final values of the aggregations.
+
+        Without grouping, a dictionary mapping every aggregated column to
+        its value is returned.  Otherwise, a dictionary mapping every
+        group key (in increasing order) to such a dictionary is returned.
+
+        """
+
+        if self.by is None:
+            return self._final(self.groups.get(None, {}))
+        return {key: self._final(self.groups[key])
+                for key in sorted(self.groups)}
+
+
 class _ColIndexes(dict):
     """Provides a nice representation of column indexes."""
 
@@ -598,7 +1469,10 @@ class Table(tableextension.Table, Leaf):
         Setting this value states whether existing indexes should be
         automatically updated after an append operation or recomputed
         after an index-invalidating operation (i.e. removal and
-        modification of rows).  The default is true.
+        modification of rows).  The default is true.  Up to
+        ``MAX_UNINDEXED_ROWS`` rows (see :mod:`tables.parameters`) may be
+        left out of indexes when the table is flushed; queries still
+        see them.
 
         This value gets into effect whenever a column is altered.  If you
         don't have automatic indexing activated and you want to do an
@@ -642,6 +1516,95 @@ class Table(tableextension.Table, Leaf):
                 for _colpname in self.colpathnames
                 if self.colindexed[_colpname]]
 
+    @property
+    def composite_indexes(self) -> dict[tuple[str, ...], CompositeIndex]:
+        """A dictionary with the composite indexes of the table.
+
+        Keys are tuples with the pathnames of the indexed columns (see
+        :meth:`Table.create_composite_index`).
+
+        """
+        itgpathname = _index_pathname_of(self)
+        return {columns: self._v_file._get_node(join_path(itgpathname, name))
+                for columns, name in self._compositeindexes.items()}
+
+    def _zonemap_nodes(self) -> dict[str, "ZoneMap"]:
+        """Get the zone maps of the table by column pathname."""
+
+        itgpathname = _index_pathname_of(self)
+        return {colname: self._v_file._get_node(join_path(itgpathname, name))
+                for colname, name in self._zonemaps.items()}
+
+    def _bloomfilter_nodes(self) -> dict[str, "BloomFilter"]:
+        """Get the Bloom filters of the table by column pathname."""
+
+        itgpathname = _index_pathname_of(self)
+        return {colname: self._v_file._get_node(join_path(itgpathname, name))
+                for colname, name in self._bloomfilters.items()}
+
+    def _query_results_node(self,
+                            create: bool=False) -> Optional["QueryResultsG"]:
+        """Get the query results kept along with the table, if any.
+
+        If `create` is true, the group for them is created if missing.
+
+        """
+
+        itgpathname = _index_pathname_of(self)
+        if self._queryresults:
+            return self._v_file._get_node(
+                join_path(itgpathname, _query_results_name))
+        if not create:
+            return None
+        try:
+            itgroup = self._v_file._get_node(itgpathname)
+        except NoSuchNodeError:
+            itgroup = create_indexes_table(self)
+        results = QueryResultsG(itgroup, _query_results_name,
+                                "Query results for table " + self._v_pathname,
+                                new=True)
+        self._queryresults = True
+        return results
+
+    def _store_query_result(self, coords: list[np.ndarray]) -> None:
+        """Keep the `coords` selected by the last query set up, if asked
+        to by `_where_setup()`."""
+
+        key, self._results_key = self._results_key, None
+        if key is None:
+            return
+        coords = (np.concatenate(coords) if len(coords) > 0
+                  else np.array([], dtype='int64'))
+        self._query_results_node(create=True).put(
+            key, self.nrows, coords,
+            self._v_file.params['QUERY_RESULTS_SLOTS'])
+
+    def _invalidate_query_results(self) -> None:
+        """Make the query results kept along with the table out of date."""
+
+        if self._queryresults:
+            self._query_results_node().invalidate()
+
+    def _update_chunk_summaries(self, colnames: Optional[list[str]]=None,
+                                start: Optional[int]=None) -> None:
+        """Bring the zone maps and Bloom filters of columns up to date.
+
+        Only the summaries of columns in `colnames` (or under them) are
+        updated if given.  If `start` is given, the chunks from the one
+        containing that row on are computed anew.
+
+        """
+
+        # The table caches for chunked reads are dirty now
+        self._dirtycache = True
+        summaries = [*self._zonemap_nodes().items(),
+                     *self._bloomfilter_nodes().items()]
+        for colname, summary in summaries:
+            if colnames is None or any(
+                    colname == name or colname.startswith(name + '/')
+                    for name in colnames):
+                summary.update(start)
+
     @property
     def colindexes(self) -> _ColIndexes:
         """A dictionary with the indexes of the indexed columns."""
@@ -654,6 +1617,16 @@ class Table(tableextension.Table, Leaf):
         """Whether some index in table is dirty."""
         return self._condition_cache._nailcount > 0
 
+    @property
+    def _unindexed_nrows(self) -> int:
+        """The number of rows at the end of the table which are missing
+        in some clean index."""
+        if not self.indexed:
+            return 0
+        indexes = [*self.colindexes.values(), *self.composite_indexes.values()]
+        return self.nrows - min((index.nelements for index in indexes
+                                 if not index.dirty), default=self.nrows)
+
     def __init__(self,
                  parentnode: "Group",
                  name: str,
@@ -698,6 +1671,20 @@ class Table(tableextension.Table, Leaf):
 
         self.indexed = False
         """Does this table have any indexed columns?"""
+        self._compositeindexes: dict[tuple[str, ...], str] = {}
+        """Maps the columns of composite indexes to their node names."""
+        self._zonemaps: dict[str, str] = {}
+        """Maps the pathnames of columns with zone maps to their node
+        names."""
+        self._bloomfilters: dict[str, str] = {}
+        """Maps the pathnames of columns with Bloom filters to their node
+        names."""
+        self._queryresults = False
+        """Does the table keep query results (see `QueryResultsG`)?"""
+        self._reindexjob: Optional[_ReindexJob] = None
+        """The rebuild of indexes running in the background (if any)."""
+        self._indexgeneration = 0
+        """Incremented whenever modified rows make some index dirty."""
         self._indexedrows = 0
         """Number of rows indexed in disk."""
         self._unsaved_indexedrows = 0
@@ -741,6 +1728,9 @@ class Table(tableextension.Table, Leaf):
         self._seqcache_key = None
         """The key under which to save a query's results (list of row indexes)
         or None to not save."""
+        self._results_key = None
+        """The key under which to keep a query's results in the file or None
+        to not keep them."""
         max_slots = parentnode._v_file.params['COND_CACHE_SLOTS']
         self._condition_cache = CacheDict(max_slots)
         """Cache of already compiled conditions."""
@@ -889,6 +1879,26 @@ class Table(tableextension.Table, Leaf):
             if indexed:
                 self.indexed = True
 
+        if igroup:
+            itgroup = self._v_file._get_node(indexesgrouppath)
+            for name in list(itgroup._v_groups):
+                if name.startswith(_rebuilt_prefix):
+                    continue  # unfinished rebuild of an index
+                indexobj = itgroup._f_get_child(name)
+                if isinstance(indexobj, CompositeIndex):
+                    self._compositeindexes[indexobj.columns] = name
+                    if indexobj.dirty:
+                        self._condition_cache.nail()
+                    self.indexed = True
+                elif isinstance(indexobj, QueryResultsG):
+                    self._queryresults = True
+            for name in list(itgroup._v_leaves):
+                zonemap = itgroup._f_get_child(name)
+                if isinstance(zonemap, ZoneMap):
+                    self._zonemaps[zonemap.column] = name
+                elif isinstance(zonemap, BloomFilter):
+                    self._bloomfilters[zonemap.column] = name
+
         if oldindexes:  # this should only appear under 2.x Pro
             warnings.warn(
                 "table ``%s`` has column indexes with PyTables 1.x format. "
@@ -1219,7 +2229,7 @@ very small/large chunksize, you may want to increase/decrease it."""
                     del exprvarscache[k]
             cexpr = compile(expression, '<string>', 'eval')
             exprvars = [var for var in cexpr.co_names
-                        if var not in ['None', 'False', 'True']
+                        if var not in ['None', 'False', 'True', 'isin']
                         and var not in ne.expressions.functions]
             exprvarscache[expression] = exprvars
         else:
@@ -1233,9 +2243,10 @@ very small/large chunksize, you may want to increase/decrease it."""
             # callable using this method is called.  For instance:
             #
             # * ``table._required_expr_vars()`` (depth 0) is called by
-            # * ``table._where()`` (depth 1) is called by
-            # * ``table.where()`` (depth 2) is called by
-            # * user-space functions (depth 3)
+            # * ``table._where_setup()`` (depth 1) is called by
+            # * ``table._where()`` (depth 2) is called by
+            # * ``table.where()`` (depth 3) is called by
+            # * user-space functions (depth 4)
             user_frame = sys._getframe(depth)
             user_locals = user_frame.f_locals
             user_globals = user_frame.f_globals
@@ -1285,6 +2296,8 @@ very small/large chunksize, you may want to increase/decrease it."""
                 # XXX: not 100% sure about this
                 if isinstance(val, str):
                     val = np.asarray(val.encode('ascii'))
+                elif isinstance(val, (set, frozenset)):  # for ``isin()``
+                    val = np.asarray(list(val))
                 else:
                     val = np.asarray(val)
             reqvars[var] = val
@@ -1337,6 +2350,13 @@ very small/large chunksize, you may want to increase/decrease it."""
 
         """
 
+        # Switch to indexes rebuilt in the background (if any).
+        self._commit_reindex()
+
+        # Give the cache budget of the file to the caches in use.
+        if self._v_file._cache_manager is not None:
+            self._v_file._cache_manager.note_query()
+
         # Look up the condition in the condition cache.
         condcache = self._condition_cache
         condkey = self._get_condition_key(condition, condvars)
@@ -1353,6 +2373,16 @@ very small/large chunksize, you may want to increase/decrease it."""
         # start with normal variables
         typemap = dict(list(zip(varnames, vartypes)))
         indexedcols = []
+        conjunctcols = []
+        # Columns whose comparisons may be looked up in composite indexes,
+        # zone maps or Bloom filters
+        conjunctpaths = set()
+        if self._enabled_indexing_in_queries:
+            for columns, index in self.composite_indexes.items():
+                if not index.dirty:
+                    conjunctpaths.update(columns)
+            conjunctpaths.update(self._zonemaps)
+            conjunctpaths.update(self._bloomfilters)
         for colname in colnames:
             col = condvars[colname]
 
@@ -1364,13 +2394,19 @@ very small/large chunksize, you may want to increase/decrease it."""
             if (self._enabled_indexing_in_queries  # no in-kernel searches
                     and self.colindexed[col.pathname] and not col.index.dirty):
                 indexedcols.append(colname)
+            if col.pathname in conjunctpaths:
+                conjunctcols.append(colname)
 
         indexedcols = frozenset(indexedcols)
+        conjunctcols = frozenset(conjunctcols)
         # Now let ``compile_condition()`` do the Numexpr-related job.
-        compiled = compile_condition(condition, typemap, indexedcols)
+        compiled = compile_condition(condition, typemap, indexedcols,
+                                     conjunctcols)
 
         # Check that there actually are columns in the condition.
-        if not set(compiled.parameters).intersection(set(colnames)):
+        params = set(compiled.parameters)
+        params.update(colvar for colvar, _ in compiled.memberships.values())
+        if not params.intersection(set(colnames)):
             raise ValueError("there are no columns taking part "
                              "in condition ``%s``" % (condition,))
 
@@ -1400,8 +2436,147 @@ very small/large chunksize, you may want to increase/decrease it."""
         compiled = self._compile_condition(condition, condvars)
         # Return the columns in indexed expressions
         idxcols = [condvars[var].pathname for var in compiled.index_variables]
+        composite = _table__composite_lookup(self, compiled, condvars)
+        if composite is not None:
+            idxcols.extend(composite[1])
+        idxcols.extend(index.column.pathname for index, _ in
+                       _table__membership_lookups(self, compiled))
         return frozenset(idxcols)
 
+    def explain(self,
+                condition: str,
+                condvars: Optional[dict[str, Union["Column", np.ndarray]]]=None,
+                start: Optional[int]=None,
+                stop: Optional[int]=None,
+                step: Optional[int]=None,
+                analyze: bool=False) -> dict[str, Any]:
+        """Describe how a query for the condition is carried out.
+
+        A dictionary (the query plan) is returned with these items:
+
+        ``strategy``
+            How the rows fulfilling the condition are found.  It is
+            ``'empty range'`` if there are no rows in the range;
+            ``'covering index'`` if the whole condition is looked up in a
+            full index (this is done by :meth:`Table.get_where_list`,
+            :meth:`Table.count_where` and :meth:`Table.read_where` of a
+            column in the index); ``'stored result'`` if the result is kept
+            in the file (see ``QUERY_RESULTS_SLOTS`` in
+            :mod:`tables.parameters`);
+            ``'indexes'`` or ``'chunk summaries'`` if the chunks to be
+            scanned are selected with indexes or with zone maps and Bloom
+            filters; and ``'in-kernel'`` (or ``'parallel in-kernel'``) if
+            all the rows in the range are scanned.
+        ``index_expressions``
+            A list with a dictionary for every comparison extracted from
+            the condition to be looked up in the index of a column, with
+            the ``column`` pathname, the ``kind`` and ``optlevel`` of the
+            index, the ``operators`` and ``limits`` of the comparison, the
+            ``lookup_range`` in the index and the number of
+            ``indexed_rows``.
+        ``composite_index``
+            A dictionary with the ``columns``, ``kind``, ``lookup_range``
+            and ``indexed_rows`` of the composite index looked up, or None.
+        ``memberships``
+            A list with a dictionary for every ``isin()`` call looked up in
+            the index of a column, with the ``column`` pathname, the index
+            ``kind``, the number of ``values`` and of ``indexed_rows``.
+        ``chunk_summaries``
+            The pathnames of the columns whose zone maps or Bloom filters
+            may leave chunks out of the scan.
+        ``index_complete``
+            Whether the comparisons looked up in indexes are the whole
+            condition.  Otherwise, the condition is evaluated over the
+            rows in the chunks selected by them.
+
+        If *analyze* is true, the query is run as well (reading no
+        records) and the following items are added:
+
+        ``chunks``
+            The number of chunks with rows in the range.
+        ``chunks_selected``
+            The number of those chunks which are scanned, or None if the
+            rows fulfilling the condition are known without a scan.
+        ``rows_evaluated``
+            The number of rows where the condition is evaluated.
+        ``rows_returned``
+            The number of rows fulfilling the condition.
+        ``caches``
+            Maps the names of the caches of the table and of the indexes
+            looked up to the number of ``hits`` and ``misses`` of their
+            lookups during the query.
+        ``timings``
+            The seconds spent in the ``setup`` of the query (compiling the
+            condition and looking up indexes), the ``scan`` of the table
+            and in ``total``.
+
+        The meaning of the other arguments is the same as in the
+        :meth:`Table.where` method.
+
+        .. versionadded:: 3.9.3
+
+        """
+
+        self._g_check_open()
+        condvars = self._required_expr_vars(condition, condvars, depth=2)
+        range_ = self._process_range_read(start, stop, step)
+        compiled = self._compile_condition(condition, condvars)
+        composite = _table__composite_lookup(self, compiled, condvars)
+        memberships = _table__membership_lookups(self, compiled)
+        indexes = {}
+        plan = {'strategy': None, 'index_expressions': []}
+        for var, ops, lims in compiled.index_expressions:
+            col = condvars[var]
+            indexes[col.pathname] = index = col.index
+            plan['index_expressions'].append({
+                'column': col.pathname, 'kind': index.kind,
+                'optlevel': index.optlevel, 'operators': ops,
+                'limits': lims,
+                'lookup_range': index.get_lookup_range(ops, lims),
+                'indexed_rows': int(index.nelements)})
+        plan['composite_index'] = None
+        if composite is not None:
+            index, columns, lookup_range = composite
+            indexes[columns] = index
+            plan['composite_index'] = {
+                'columns': columns, 'kind': index.kind,
+                'lookup_range': lookup_range,
+                'indexed_rows': int(index.nelements)}
+        plan['memberships'] = []
+        for index, values in memberships:
+            indexes[index.column.pathname] = index
+            plan['memberships'].append({
+                'column': index.column.pathname, 'kind': index.kind,
+                'values': len(values), 'indexed_rows': int(index.nelements)})
+        summarized = {*self._zonemaps, *self._bloomfilters}
+        colpaths = [condvars[var].pathname for var, _, _ in compiled.conjuncts]
+        colpaths.extend(compiled.memberships[param].column.pathname
+                        for param in compiled.required_memberships)
+        plan['chunk_summaries'] = sorted(set(colpaths) & summarized)
+        plan['index_complete'] = compiled.index_complete
+
+        lookup = _table__index_lookup(self, compiled, condvars)
+        if range_[0] >= range_[1]:
+            plan['strategy'] = 'empty range'
+        elif lookup is not None and lookup[0].index.indsize == 8:
+            plan['strategy'] = 'covering index'
+        elif self._queryresults and self._query_results_node().entry(
+                _table__query_results_key(condition, condvars, range_),
+                self.nrows) is not None:
+            plan['strategy'] = 'stored result'
+        elif indexes:
+            plan['strategy'] = 'indexes'
+        elif plan['chunk_summaries']:
+            plan['strategy'] = 'chunk summaries'
+        elif self._v_file.params['MAX_QUERY_THREADS'] > 1:
+            plan['strategy'] = 'parallel in-kernel'
+        else:
+            plan['strategy'] = 'in-kernel'
+        if analyze:
+            plan.update(_table__analyze_query(
+                self, condition, condvars, range_, plan['strategy'], indexes))
+        return plan
+
     def where(self,
               condition: str,
               condvars: Optional[dict[str, Union["Column", np.ndarray]]]=None,
@@ -1443,6 +2618,13 @@ very small/large chunksize, you may want to increase/decrease it."""
         pass the most restrictive condition as the parameter to this method if
         you want to achieve maximum performance.
 
+        The condition may check whether the values of a column are in a set
+        of values with ``isin(column, values)``, where values is a sequence
+        or set of values given as a condition variable.  Values which can
+        not be stored in the column are ignored.  Indexes, zone maps and
+        Bloom filters of the column are used to only look for the rows with
+        the given values, e.g. ``isin(uid, wanted) & (ts > t0)``.
+
         .. warning::
 
             When in the middle of a table row iterator, you should not
@@ -1512,37 +2694,162 @@ very small/large chunksize, you may want to increase/decrease it."""
             tref = clock()
         if profile:
             show_stats("Entering table._where", tref)
+        (start, stop, step), chunkmap = self._where_setup(
+            condition, condvars, start, stop, step, depth=4)
+        if (chunkmap is None
+                and self._v_file.params['MAX_QUERY_THREADS'] > 1):
+            # Scan in parallel, but only iterate over the rows afterwards,
+            # so that HDF5 is not used by the user code meanwhile.
+            chunkmap = [c for c, _ in _table__where_parallel(
+                self, start, stop, step, records=False, field=None)]
+            chunkmap = np.concatenate(chunkmap) if chunkmap else np.array(
+                [], dtype='int64')
+        if chunkmap is not None and chunkmap.dtype != np.bool_:
+            # The coordinates are already known
+            if len(chunkmap) == 0:
+                return iter([])
+            return self.itersequence(chunkmap)
+        row = tableextension.Row(self)
+        if profile:
+            show_stats("Exiting table._where", tref)
+        return row._iter(start, stop, step, chunkmap=chunkmap)
+
+    def _where_setup(self,
+                     condition: str,
+                     condvars: Optional[dict[str, Union["Column", np.ndarray]]],
+                     start: Optional[int],
+                     stop: Optional[int],
+                     step: Optional[int],
+                     depth: int) -> tuple[tuple[int, int, int], Optional[np.ndarray]]:
+        """Prepare the table for iterating over a condition.
+
+        The adjusted ``(start, stop, step)`` range is returned together
+        with the chunkmap to be used (None for in-kernel queries).  When
+        the result is known in advance, an array of row coordinates is
+        returned instead of a boolean chunkmap, and the table conditions
+        are reset.  `depth` is passed to `_required_expr_vars()`.
+
+        """
+
+        self._results_key = None
         # Adjust the slice to be used.
         (start, stop, step) = self._process_range_read(start, stop, step)
         if start >= stop:  # empty range, reset conditions
             self._use_index = False
             self._where_condition = None
-            return iter([])
+            return (start, stop, step), np.array([], dtype='int64')
+
+        condvars = self._required_expr_vars(condition, condvars, depth=depth)
+
+        # Are the results of the query kept in the file?
+        slots = self._v_file.params['QUERY_RESULTS_SLOTS']
+        if self._queryresults or slots > 0:
+            key = _table__query_results_key(
+                condition, condvars, (start, stop, step))
+            if self._queryresults:
+                coords = self._query_results_node().get(key, self.nrows)
+                if coords is not None:
+                    # Reset conditions
+                    self._use_index = False
+                    self._where_condition = None
+                    return (start, stop, step), coords
+            if slots > 0 and self._v_file._iswritable():
+                # Keep them when read (see `_store_query_result()`).
+                self._results_key = key
 
         # Compile the condition and extract usable index conditions.
-        condvars = self._required_expr_vars(condition, condvars, depth=3)
         compiled = self._compile_condition(condition, condvars)
 
         # Can we use indexes?
-        if compiled.index_expressions:
+        composite = _table__composite_lookup(self, compiled, condvars)
+        memberships = _table__membership_lookups(self, compiled)
+        if compiled.index_expressions or composite is not None or memberships:
             chunkmap = _table__where_indexed(
-                self, compiled, condition, condvars, start, stop, step)
-            if not isinstance(chunkmap, np.ndarray):
-                # If it is not a NumPy array it should be an iterator
+                self, compiled, condition, condvars, start, stop, step,
+                composite, memberships)
+            if chunkmap.dtype != np.bool_:
+                # Not a chunkmap, but the resulting coordinates
                 # Reset conditions
                 self._use_index = False
                 self._where_condition = None
-                # ...and return the iterator
-                return chunkmap
+                return (start, stop, step), chunkmap
         else:
-            chunkmap = None  # default to an in-kernel query
-
-        args = [condvars[param] for param in compiled.parameters]
+            # Skip the chunks which zone maps or Bloom filters tell can
+            # not match, or
+            # default to an in-kernel query (no chunkmap).
+            chunkmap = _table__summary_chunkmap(self, compiled, condvars)
+            if chunkmap is not None:
+                if not chunkmap.any():
+                    self._where_condition = None
+                    return (start, stop, step), np.array([], dtype='int64')
+                self._use_index = True
+                if self._dirtycache:
+                    restorecache(self)
+
+        args = [compiled.memberships[param] if param in compiled.memberships
+                else condvars[param] for param in compiled.parameters]
         self._where_condition = (compiled.function, args, compiled.kwargs)
+        return (start, stop, step), chunkmap
+
+    def _where_buffers(self,
+                       condition: str,
+                       condvars: Optional[dict[str, Union["Column", np.ndarray]]],
+                       start: Optional[int]=None,
+                       stop: Optional[int]=None,
+                       step: Optional[int]=None,
+                       records: bool=True,
+                       field: Optional[str]=None,
+                       ) -> Iterator[tuple[np.ndarray, Optional[np.ndarray]]]:
+        """Iterate over the rows fulfilling a condition in blocks.
+
+        This is a buffered counterpart of `self._where()` that yields a
+        ``(coords, recs)`` tuple of arrays per I/O buffer instead of a
+        Row per selected row.  `coords` are the row coordinates, and
+        `recs` the selected records (or only their `field` column), or
+        None if `records` is false.  It must be called directly from an
+        API callable (see `_required_expr_vars()`).
+
+        """
+
+        range_, chunkmap = self._where_setup(
+            condition, condvars, start, stop, step, depth=4)
+        return self._chunkmap_buffers(range_, chunkmap, records, field)
+
+    def _chunkmap_buffers(self,
+                          range_: tuple[int, int, int],
+                          chunkmap: Optional[np.ndarray],
+                          records: bool,
+                          field: Optional[str],
+                          ) -> Iterator[tuple[np.ndarray, Optional[np.ndarray]]]:
+        """Iterate over the rows selected by `self._where_setup()` like
+        `self._where_buffers()`."""
+
+        (start, stop, step) = range_
+        if chunkmap is not None and chunkmap.dtype != np.bool_:
+            # The coordinates are already known
+            return self._coords_buffers(chunkmap, records, field)
+        if (chunkmap is None
+                and self._v_file.params['MAX_QUERY_THREADS'] > 1):
+            return _table__where_parallel(
+                self, start, stop, step, records, field)
         row = tableextension.Row(self)
-        if profile:
-            show_stats("Exiting table._where", tref)
-        return row._iter(start, stop, step, chunkmap=chunkmap)
+        return row._iter_where_buffers(start, stop, step, chunkmap=chunkmap,
+                                       records=records, field=field)
+
+    def _coords_buffers(self,
+                        coords: np.ndarray,
+                        records: bool,
+                        field: Optional[str],
+                        ) -> Iterator[tuple[np.ndarray, Optional[np.ndarray]]]:
+        """Iterate over known `coords` like `self._where_buffers()`."""
+
+        nrowsinbuf = self.nrowsinbuf
+        for i in range(0, len(coords), nrowsinbuf):
+            bufcoords = coords[i:i + nrowsinbuf]
+            if records:
+                yield bufcoords, self._read_coordinates(bufcoords, field)
+            else:
+                yield bufcoords, None
 
     def read_where(self,
                    condition: str,
@@ -1557,23 +2864,39 @@ very small/large chunksize, you may want to increase/decrease it."""
         arguments and return values the same meanings. However, only the rows
         fulfilling the *condition* are included in the result.
 
+        When a single *field* is read and the whole condition can be looked
+        up in the full index of a column, the result is read from the index
+        alone if *field* is the indexed column or one of the columns
+        included in the index (see :meth:`Column.create_index`).
+
         The meaning of the other arguments is the same as in the
         :meth:`Table.where` method.
 
         """
 
         self._g_check_open()
-        coords = [p.nrow for p in
-                  self._where(condition, condvars, start, stop, step)]
+        if field:
+            self._check_column(field)
+        condvars = self._required_expr_vars(condition, condvars, depth=2)
+        if field:
+            # Single columns may be read from a covering index alone.
+            covered = _table__read_covered(
+                self, condition, condvars, start, stop, step, field)
+            if covered is not None:
+                return internal_to_flavor(covered[1], self.flavor)
+        # The selected records are collected one I/O buffer at a time,
+        # so no Row object is created for them.
+        coords, recs = [], []
+        for c, r in self._where_buffers(
+                condition, condvars, start, stop, step, field=field):
+            coords.append(c)
+            recs.append(r)
         self._where_condition = None  # reset the conditions
-        if len(coords) > 1:
-            cstart, cstop = coords[0], coords[-1] + 1
-            if cstop - cstart == len(coords):
-                # Chances for monotonically increasing row values. Refine.
-                inc_seq = np.all(np.arange(cstart, cstop) == np.array(coords))
-                if inc_seq:
-                    return self.read(cstart, cstop, field=field)
-        return self.read_coordinates(coords, field)
+        self._store_query_result(coords)
+        if len(recs) == 0:
+            return self.read_coordinates([], field)
+        result = np.concatenate(recs) if len(recs) > 1 else recs[0]
+        return internal_to_flavor(result, self.flavor)
 
     def append_where(self,
                      dstTable: "Table",
@@ -1638,22 +2961,224 @@ very small/large chunksize, you may want to increase/decrease it."""
         """
 
         self._g_check_open()
-
-        coords = [p.nrow for p in
-                  self._where(condition, condvars, start, stop, step)]
-        coords = np.array(coords, dtype=SizeType)
-        # Reset the conditions
-        self._where_condition = None
+        condvars = self._required_expr_vars(condition, condvars, depth=2)
+        covered = _table__read_covered(
+            self, condition, condvars, start, stop, step, False)
+        if covered is not None:
+            coords = covered[0]
+        else:
+            coords = [c for c, _ in self._where_buffers(
+                condition, condvars, start, stop, step, records=False)]
+            self._store_query_result(coords)
+            if len(coords) > 0:
+                coords = np.concatenate(coords).astype(SizeType, copy=False)
+            else:
+                coords = np.array([], dtype=SizeType)
+            # Reset the conditions
+            self._where_condition = None
         if sort:
             coords = np.sort(coords)
         return internal_to_flavor(coords, self.flavor)
 
-    def itersequence(self, sequence: Sequence) -> Iterator[tableextension.Row]:
-        """Iterate over a sequence of row coordinates."""
+    def get_where_rowset(self,
+                         condition: str,
+                         condvars: Optional[dict[str, Union["Column", np.ndarray]]]=None,
+                         start: Optional[int]=None,
+                         stop: Optional[int]=None,
+                         step: Optional[int]=None) -> RowSet:
+        """Get the row coordinates fulfilling the given condition as a set.
 
-        if not hasattr(sequence, '__getitem__'):
-            raise TypeError("Wrong 'sequence' parameter type. Only sequences "
-                            "are suported.")
+        This method is like :meth:`Table.get_where_list`, but the
+        coordinates are returned in a compressed :class:`RowSet`, which
+        takes far less memory for large results, and the results of
+        different conditions can be combined with set operations.
+
+        The meaning of the arguments is the same as in the
+        :meth:`Table.where` method.
+
+        .. versionadded:: 3.9.3
+
+        """
+
+        self._g_check_open()
+        condvars = self._required_expr_vars(condition, condvars, depth=2)
+        covered = _table__read_covered(
+            self, condition, condvars, start, stop, step, False)
+        if covered is not None:
+            return RowSet(covered[0])
+        rowset = RowSet()
+        # Coordinates are added one I/O buffer at a time.
+        for coords, _ in self._where_buffers(
+                condition, condvars, start, stop, step, records=False):
+            rowset._update(coords)
+        self._where_condition = None  # reset the conditions
+        return rowset
+
+    def count_where(self,
+                    condition: str,
+                    condvars: Optional[dict[str, Union["Column", np.ndarray]]]=None,
+                    start: Optional[int]=None,
+                    stop: Optional[int]=None,
+                    step: Optional[int]=None) -> int:
+        """Count the rows fulfilling the given *condition*.
+
+        When the whole condition can be looked up in the index of a
+        column (e.g. ``(c1 > 3) & (c1 <= 10)`` with ``c1`` having a medium
+        or full index) and no range of rows is given, the count is taken
+        from the index alone, without reading the table.  Otherwise, the
+        table is scanned (using indexes if available) with no rows being
+        loaded into memory.
+
+        The meaning of the arguments is the same as in the
+        :meth:`Table.where` method.
+
+        .. versionadded:: 3.9.3
+
+        """
+
+        self._g_check_open()
+        condvars = self._required_expr_vars(condition, condvars, depth=2)
+        if self._process_range_read(start, stop, step) == (0, self.nrows, 1):
+            compiled = self._compile_condition(condition, condvars)
+            count = _table__count_indexed(self, compiled, condvars)
+            if count is not None:
+                return count
+
+        count = sum(len(coords) for coords, _ in self._where_buffers(
+            condition, condvars, start, stop, step, records=False))
+        self._where_condition = None  # reset the conditions
+        return count
+
+    def aggregate(self,
+                  condition: str,
+                  aggregations: dict[str, str],
+                  by: Optional[str]=None,
+                  condvars: Optional[dict[str, Union["Column", np.ndarray]]]=None,
+                  start: Optional[int]=None,
+                  stop: Optional[int]=None,
+                  step: Optional[int]=None) -> dict[Any, Any]:
+        """Aggregate columns over the rows fulfilling the given *condition*.
+
+        The `aggregations` mapping goes from column pathnames to the name
+        of the aggregation to compute over them, one of ``'count'``,
+        ``'sum'``, ``'min'``, ``'max'`` and ``'mean'``.  The condition
+        and the aggregations are evaluated one I/O buffer at a time (using
+        indexes if available), and only the running aggregates are kept in
+        memory, so the selected rows are never loaded all at once.
+
+        A dictionary mapping every column in `aggregations` to its
+        aggregated value is returned.  When no rows are selected, sums are
+        zero and minimum, maximum and mean values are ``None``.
+
+        If the pathname of a column is given as `by`, the selected rows
+        are grouped by the values in that column, and a dictionary
+        mapping every value (in increasing order) to the aggregations over
+        its rows is returned instead.
+
+        The meaning of the other arguments is the same as in the
+        :meth:`Table.where` method.
+
+        Examples
+        --------
+
+        ::
+
+            stats = table.aggregate('temperature > 30',
+                                    {'humidity': 'mean',
+                                     'temperature': 'max'},
+                                    by='station')
+            for station, values in stats.items():
+                print(station, values['humidity'], values['temperature'])
+
+        .. versionadded:: 3.9.3
+
+        """
+
+        self._g_check_open()
+        aggregator = _Aggregator(self, aggregations, by)
+        for _, recs in self._where_buffers(condition, condvars,
+                                           start, stop, step):
+            aggregator.update(recs)
+        self._where_condition = None  # reset the conditions
+        return aggregator.result()
+
+    def groupby(self,
+                by: str,
+                aggregations: dict[str, str],
+                condition: Optional[str]=None,
+                condvars: Optional[dict[str, Union["Column", np.ndarray]]]=None,
+                ) -> Iterator[tuple[Any, dict[str, Any]]]:
+        """Aggregate columns over the rows with every value of column by.
+
+        This works like :meth:`Table.aggregate` with the by argument, but
+        the by column must have associated a CSI index, which already keeps
+        rows with equal values together.  The index is walked in order, the
+        rows of a few groups are read at a time (in the order of the table)
+        and aggregated, so only the aggregations of those groups are kept
+        in memory, however many groups there are.
+
+        An iterator over ``(value, aggregations)`` tuples is returned, with
+        a tuple for every value of the by column (in increasing order) and
+        a dictionary mapping every column in `aggregations` to its
+        aggregated value, like in :meth:`Table.aggregate`.  If a condition
+        is given, only the rows fulfilling it are aggregated, and values
+        with no such rows are skipped.
+
+        Examples
+        --------
+
+        ::
+
+            for customer, totals in table.groupby('customer',
+                                                  {'amount': 'sum'}):
+                print(customer, totals['amount'])
+
+        .. versionadded:: 3.9.3
+
+        """
+
+        self._g_check_open()
+        if condition is not None:
+            condvars = self._required_expr_vars(condition, condvars, depth=2)
+        aggregator = _Aggregator(self, aggregations, by)
+        index = _table__complete_csindex(self, by)
+        rowfilter = _table__row_filter(self, condition, condvars)
+        return self._groupby_sorted(index, aggregator, rowfilter)
+
+    def _groupby_sorted(self,
+                        index: Index,
+                        aggregator: _Aggregator,
+                        rowfilter: Optional[Callable[[np.ndarray], np.ndarray]],
+                        ) -> Iterator[tuple[Any, dict[str, Any]]]:
+        """Iterate over the groups of `self.groupby()`."""
+
+        cursor = _SortedCursor(index, self.nrowsinbuf)
+        while cursor.pos < index.nelements:
+            # Runs of equal values are read whole, so every group is
+            # aggregated at once.
+            _, coords = cursor.next_run()
+            recs = self._read_coordinates(np.sort(coords).astype(SizeType))
+            if rowfilter is not None:
+                recs = recs[rowfilter(recs)]
+            aggregator.groups.clear()
+            aggregator.update(recs)
+            yield from aggregator.result().items()
+
+    def itersequence(self, sequence: Sequence) -> Iterator[tableextension.Row]:
+        """Iterate over a sequence of row coordinates.
+
+        The sequence may also be a :class:`RowSet`, whose coordinates are
+        iterated over in ascending order.
+
+        """
+
+        if isinstance(sequence, RowSet):
+            # Coordinates are expanded one range of rows at a time.
+            return itertools.chain.from_iterable(
+                map(self.itersequence, sequence.chunks()))
+        if not hasattr(sequence, '__getitem__'):
+            raise TypeError("Wrong 'sequence' parameter type. Only sequences "
+                            "are suported.")
         # start, stop and step are necessary for the new iterator for
         # coordinates, and perhaps it would be useful to add them as
         # parameters in the future (not now, because I've just removed
@@ -1680,7 +3205,12 @@ very small/large chunksize, you may want to increase/decrease it."""
             raise TypeError(
                 "`sortby` can only be a `Column` or string object, "
                 "but you passed an object of type: %s" % type(sortby))
+        self._commit_reindex()
         if icol.is_indexed and icol.index.kind == "full":
+            if (self._v_file._iswritable() and self.autoindex
+                    and self._unindexed_nrows > 0):
+                # Sorted reads need every row in the index.
+                self.flush_rows_to_index()
             if checkCSI and not icol.index.is_csi:
                 # The index exists, but it is not a CSI one.
                 raise ValueError(
@@ -1760,6 +3290,224 @@ very small/large chunksize, you may want to increase/decrease it."""
         coords = index[start:stop:step]
         return self.read_coordinates(coords, field)
 
+    def top_k(self,
+              sortby: Union["Column", str],
+              k: int,
+              condition: Optional[str]=None,
+              condvars: Optional[dict[str, Union["Column", np.ndarray]]]=None,
+              field: Optional[str]=None,
+              reverse: bool=True) -> np.ndarray:
+        """Read the k rows with the largest values in the sortby column.
+
+        The sortby column must have associated a CSI index, which is walked
+        from its end (or from its beginning if reverse is false, so as to
+        get the k smallest values instead).  If a condition is given, the
+        rows are read and checked in batches as the index is walked, and
+        the walk stops as soon as k rows fulfilling the condition are
+        found.  Rows not in the index yet are also checked.
+
+        The rows are returned in decreasing order of the sortby column (or
+        in increasing order if reverse is false), and fewer than k rows
+        are returned if not enough of them fulfill the condition.  The
+        meaning of the field argument is the same as in
+        :meth:`Table.read_sorted`, and that of condvars is the same as in
+        :meth:`Table.where`.
+
+        Examples
+        --------
+
+        ::
+
+            leaders = table.top_k('score', 100, 'country == b"ES"')
+
+        .. versionadded:: 3.9.3
+
+        """
+
+        self._g_check_open()
+        if condition is not None:
+            condvars = self._required_expr_vars(condition, condvars, depth=2)
+        if field:
+            self._check_column(field)
+        index = self._check_sortby_csi(sortby, True)
+        k = operator.index(k)
+        if k < 0:
+            raise ValueError("`k` can not be negative: %d" % k)
+        rowfilter = _table__row_filter(self, condition, condvars)
+
+        def select(coords: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+            recs = self._read_coordinates(coords)
+            if rowfilter is not None and len(recs) > 0:
+                valid = rowfilter(recs)
+                coords, recs = coords[valid], recs[valid]
+            return coords, recs
+
+        # Walk the index from the proper end in growing batches.
+        nelements = index.nelements
+        nrowsinbuf = self.nrowsinbuf
+        batch = max(k, 1)
+        found = []
+        nfound = pos = 0
+        while nfound < k and pos < nelements:
+            nread = min(batch, nelements - pos)
+            if reverse:
+                coords = index.read_indices(
+                    nelements - pos - nread, nelements - pos)[::-1]
+            else:
+                coords = index.read_indices(pos, pos + nread)
+            coords, recs = select(coords.astype(SizeType))
+            found.append(recs[:k - nfound])
+            nfound += len(found[-1])
+            pos += nread
+            batch = max(min(2 * batch, nrowsinbuf), batch)
+        result = np.concatenate(found) if found else self._v_iobuf[:0].copy()
+
+        if nelements < self.nrows:
+            # Rows not indexed yet may have larger values.
+            colpath = index.column.pathname
+            tail = [result]
+            for rstart in range(nelements, self.nrows, nrowsinbuf):
+                rstop = min(rstart + nrowsinbuf, self.nrows)
+                tail.append(select(np.arange(rstart, rstop,
+                                             dtype=SizeType))[1])
+            result = np.concatenate(tail)
+            order = np.argsort(get_nested_field(result, colpath),
+                               kind='stable')
+            if reverse:
+                order = order[::-1]
+            result = result[order[:k]]
+
+        if field:
+            result = get_nested_field(result, field)
+        return internal_to_flavor(result, self.flavor)
+
+    def join(self,
+             other: "Table",
+             on: Union[str, tuple[str, str]],
+             how: Literal["inner", "left"]="inner",
+             columns: Optional[Sequence[str]]=None,
+             dest: Optional["Table"]=None) -> Union[np.ndarray, int]:
+        """Join the rows of this table with those of other table.
+
+        Rows are joined when their values in the on column are equal.  If
+        on is a ``(column, other_column)`` pair, the column of this table
+        is compared with other_column of the other table.  Both columns
+        must have associated CSI indexes, which are walked in order
+        (a sort-merge join), so only a few I/O buffers of each table need
+        to be kept in memory besides the result.
+
+        When how is ``'inner'``, only rows with matches in both tables are
+        joined.  When it is ``'left'``, rows of this table with no matches
+        in the other one are also included, with the default values of the
+        columns of the other table.
+
+        The columns argument is a sequence with the pathnames of the
+        columns in the result, which are looked up in this table first and
+        then in the other one.  By default, all the columns of this table
+        are included, followed by the columns of the other table not in
+        this one.
+
+        The joined rows are returned as a structured array of the current
+        flavor, in the order of the joined column.  If a dest table is
+        given, the joined rows are appended to it instead, and the number
+        of rows appended is returned.
+
+        Examples
+        --------
+
+        ::
+
+            orders.cols.customer.create_csindex()
+            customers.cols.id.create_csindex()
+            rows = orders.join(customers, on=('customer', 'id'),
+                               columns=['order', 'customer', 'name'])
+
+        .. versionadded:: 3.9.3
+
+        """
+
+        self._g_check_open()
+        other._g_check_open()
+        if isinstance(on, str):
+            lon = ron = on
+        else:
+            lon, ron = on
+        if how not in ('inner', 'left'):
+            raise ValueError("unsupported join ``%s``; use one of: "
+                             "inner, left" % how)
+        lindex = _table__complete_csindex(self, lon)
+        rindex = _table__complete_csindex(other, ron)
+        if columns is None:
+            columns = list(self.colpathnames) + [
+                name for name in other.colpathnames
+                if name not in self.coldtypes]
+        lnames, rnames, dtype = [], [], []
+        for name in columns:
+            if name in self.coldtypes:
+                lnames.append(name)
+                dtype.append((name, self.coldtypes[name]))
+            elif name in other.coldtypes:
+                rnames.append(name)
+                dtype.append((name, other.coldtypes[name]))
+            else:
+                other._check_column(name)  # raises for missing columns
+                raise TypeError("nested column ``%s`` can not be joined"
+                                % name)
+        dtype = np.dtype(dtype)
+
+        nbuf = self.nrowsinbuf
+        lcursor = _SortedCursor(lindex, nbuf)
+        rcursor = _SortedCursor(rindex, other.nrowsinbuf)
+        results = []
+        nrows = 0
+        while lcursor.pos < lindex.nelements:
+            # Runs of equal values are read whole, so the values of the
+            # other table needed for them are never needed again.
+            lvalues, lcoords = lcursor.next_run()
+            rvalues, rcoords = rcursor.read_until(lvalues[0], lvalues[-1])
+            first = np.searchsorted(rvalues, lvalues, 'left')
+            counts = np.searchsorted(rvalues, lvalues, 'right') - first
+            if lvalues.dtype.kind in 'fc':
+                counts[np.isnan(lvalues)] = 0  # NaNs never match
+            if how == 'left':
+                matched = counts > 0
+                counts[~matched] = 1
+            # Pair every row of this table with its matches in the other.
+            lpos = np.repeat(np.arange(len(lvalues)), counts)
+            rpos = (np.arange(len(lpos))
+                    - np.repeat(np.cumsum(counts) - counts, counts)
+                    + np.repeat(first, counts))
+            if how == 'left':
+                rpos[~np.repeat(matched, counts)] = -1
+            for i in range(0, len(lpos), nbuf):
+                result = np.empty(min(nbuf, len(lpos) - i), dtype=dtype)
+                if lnames:
+                    recs = _table__join_rows(self, lcoords[lpos[i:i + nbuf]])
+                    for name in lnames:
+                        result[name] = get_nested_field(recs, name)
+                if rnames:
+                    brpos = rpos[i:i + nbuf]
+                    found = brpos >= 0
+                    recs = _table__join_rows(other, rcoords[brpos[found]])
+                    for name in rnames:
+                        values = result[name]
+                        values[found] = get_nested_field(recs, name)
+                        values[~found] = other.coldflts[name]
+                if dest is not None:
+                    dest.append(result)
+                else:
+                    results.append(result)
+                nrows += len(result)
+
+        if dest is not None:
+            dest.flush()
+            return nrows
+        if results:
+            result = np.concatenate(results)
+        else:
+            result = np.empty(0, dtype=dtype)
+        return internal_to_flavor(result, self.flavor)
+
     def iterrows(self,
                  start: Optional[int]=None,
                  stop: Optional[int]=None,
@@ -2215,6 +3963,8 @@ very small/large chunksize, you may want to increase/decrease it."""
         self._open_append(wbufRA)
         self._append_records(lenrows)
         self._close_append()
+        if self._zonemaps or self._bloomfilters:
+            self._update_chunk_summaries()
         if self.indexed:
             self._unsaved_indexedrows += lenrows
             # The table caches for indexed queries are dirty now
@@ -2346,6 +4096,7 @@ very small/large chunksize, you may want to increase/decrease it."""
         if len(coords) > 0:
             # Do the actual update of rows
             self._update_elements(lcoords, coords, recarr)
+            self._update_chunk_summaries(start=int(coords.min()))
 
         # Redo the index if needed
         self._reindex(self.colpathnames)
@@ -2405,6 +4156,7 @@ very small/large chunksize, you may want to increase/decrease it."""
 
         # Do the actual update
         self._update_records(start, stop, step, recarr)
+        self._update_chunk_summaries(start=start)
 
         # Redo the index if needed
         self._reindex(self.colpathnames)
@@ -2491,6 +4243,7 @@ very small/large chunksize, you may want to increase/decrease it."""
         mod_col[:] = column
         # save this modified rows in table
         self._update_records(start, stop, step, mod_recarr)
+        self._update_chunk_summaries([colname], start)
         # Redo the index if needed
         self._reindex([colname])
 
@@ -2571,6 +4324,7 @@ very small/large chunksize, you may want to increase/decrease it."""
             mod_col[:] = recarray[name].squeeze()
         # save this modified rows in table
         self._update_records(start, stop, step, mod_recarr)
+        self._update_chunk_summaries(names, start)
         # Redo the index if needed
         self._reindex(names)
 
@@ -2582,6 +4336,8 @@ very small/large chunksize, you may want to increase/decrease it."""
         This can be useful when you have chosen non-automatic indexing
         for the table (see the :attr:`Table.autoindex` property in
         :class:`Table`) and you want to update the indexes on it.
+        It also adds the rows left out of indexes by the
+        ``MAX_UNINDEXED_ROWS`` parameter (see :mod:`tables.parameters`).
 
         """
 
@@ -2596,37 +4352,66 @@ very small/large chunksize, you may want to increase/decrease it."""
                     if nrows > 0 and not col.index.dirty:
                         rowsadded = self._add_rows_to_index(
                             colname, start, nrows, _lastrow, update=True)
+                        col.index.update_included()
+            for columns, index in self.composite_indexes.items():
+                if nrows > 0 and not index.dirty:
+                    rowsadded = self._add_rows_to_index(
+                        columns, start, nrows, _lastrow, update=True)
             self._unsaved_indexedrows -= rowsadded
             self._indexedrows += rowsadded
         return rowsadded
 
-    def _add_rows_to_index(self, colname: str, start: int, nrows: int,
-                           lastrow: bool, update: bool) -> int:
-        """Add more elements to the existing index."""
+    def _add_rows_to_index(self, colname: Union[str, tuple[str, ...]],
+                           start: int, nrows: int,
+                           lastrow: bool, update: bool,
+                           index: Optional[Index]=None) -> int:
+        """Add more elements to the existing index.
+
+        A tuple of column names in `colname` refers to a composite index.
+        Rows are added to `index` instead of the index of `colname` if
+        it is given.
+
+        """
 
         # This method really belongs to Column, but since it makes extensive
         # use of the table, it gets dangerous when closing the file, since the
         # column may be accessing a table which is being destroyed.
-        index = self.cols._g_col(colname).index
+        if isinstance(colname, tuple):
+            columns = colname
+            if index is None:
+                index = self.composite_indexes[columns]
+
+            def read(start: int, stop: int) -> np.ndarray:
+                return composite_keys([self._read(start, stop, 1, colname)
+                                       for colname in columns])
+        else:
+            if index is None:
+                index = self.cols._g_col(colname).index
+
+            def read(start: int, stop: int) -> np.ndarray:
+                return self._read(start, stop, 1, colname)
         slicesize = index.slicesize
-        # The next loop does not rely on xrange so that it can
-        # deal with long ints (i.e. more than 32-bit integers)
-        # This allows to index columns with more than 2**31 rows
-        # F. Alted 2005-05-09
+        # Complete slices are read lazily while the index appends them.
         startLR = index.sorted.nrows * slicesize
         indexedrows = startLR - start
         stop = start + nrows - slicesize + 1
-        while startLR < stop:
-            index.append(
-                [self._read(startLR, startLR + slicesize, 1, colname)],
-                update=update)
-            indexedrows += slicesize
-            startLR += slicesize
+        starts = range(startLR, max(startLR, stop), slicesize)
+        index.append_slices((read(rstart, rstart + slicesize)
+                             for rstart in starts), update=update)
+        indexedrows += len(starts) * slicesize
+        startLR += len(starts) * slicesize
         # index the remaining rows in last row
         if lastrow and startLR < self.nrows:
-            index.append_last_row(
-                [self._read(startLR, self.nrows, 1, colname)],
-                update=update)
+            startILR = startLR + index.nelementsILR
+            if (update and index.indsize == 8 and index.nelementsILR > 0
+                    and index.nelements == startILR):
+                # Only sort the new rows and merge them with the ones
+                # already sorted in the last row.
+                if startILR < self.nrows:
+                    index.extend_last_row(read(startILR, self.nrows))
+            else:
+                index.append_last_row([read(startLR, self.nrows)],
+                                      update=update)
             indexedrows += self.nrows - startLR
         return indexedrows
 
@@ -2684,6 +4469,7 @@ very small/large chunksize, you may want to increase/decrease it."""
 
         (start, stop, step) = self._process_range(start, stop, step)
         nrows = self._remove_rows(start, stop, step)
+        self._update_chunk_summaries(start=start)
         # remove_rows is an invalidating index operation
         self._reindex(self.colpathnames)
 
@@ -2721,6 +4507,25 @@ very small/large chunksize, you may want to increase/decrease it."""
 
         self.remove_rows(start=n, stop=n + 1)
 
+    def _g_truncate(self, size: int) -> None:
+        super()._g_truncate(size)
+        # Rows appended later may differ from the truncated ones.
+        self._invalidate_query_results()
+
+    def _g_caches(self) -> dict[str, Any]:
+        """Get the caches of the table by name (for `File.cache_stats()`).
+
+        The caches for chunked reads are only there once the table has
+        been read.
+
+        """
+
+        caches = {'conditions': self._condition_cache}
+        if '_chunkcache' in self.__dict__:
+            caches['chunks'] = self._chunkcache
+            caches['sequences'] = self._seqcache
+        return caches
+
     def _g_update_dependent(self) -> None:
         super()._g_update_dependent()
 
@@ -2740,6 +4545,9 @@ very small/large chunksize, you may want to increase/decrease it."""
 
         itgpathname = _index_pathname_of(self)
 
+        # Indexes being rebuilt in the background must be in place before.
+        self._commit_reindex(wait=True)
+
         # First, move the table to the new location.
         super()._g_move(newparent, newname)
 
@@ -2754,6 +4562,9 @@ very small/large chunksize, you may want to increase/decrease it."""
             itgroup._g_move(newigroup, newiname)
 
     def _g_remove(self, recursive: bool=False, force: bool=False) -> None:
+        # Let indexes being rebuilt in the background be removed, too.
+        self._commit_reindex(wait=True)
+
         # Remove the associated index group (if any).
         itgpathname = _index_pathname_of(self)
         try:
@@ -2778,46 +4589,269 @@ very small/large chunksize, you may want to increase/decrease it."""
         # Changing the set of indexed columns invalidates the condition cache
         self._condition_cache.clear()
         colindexed[colpathname] = isindexed
-        self.indexed = max(colindexed.values())  # this is an OR :)
+        # this is an OR :)
+        self.indexed = max(colindexed.values()) or bool(self._compositeindexes)
+
+    def _indexes_using(self, colnames: list[str]) -> list[str]:
+        """Get the indexed columns whose indexes use `colnames`.
+
+        These are the indexed columns in `colnames`, plus those whose
+        (covering) indexes include any column in `colnames`.
+
+        """
+
+        colnames = set(colnames)
+        return [colname for (colname, colindexed) in self.colindexed.items()
+                if colindexed and (
+                    colname in colnames
+                    or not colnames.isdisjoint(
+                        self.cols._g_col(colname).index.include))]
+
+    def _composite_indexes_using(self,
+                                 colnames: list[str]) -> list[CompositeIndex]:
+        """Get the composite indexes over any column in `colnames`."""
+
+        colnames = set(colnames)
+        return [index for columns, index in self.composite_indexes.items()
+                if not colnames.isdisjoint(columns)]
 
     def _mark_columns_as_dirty(self, colnames: list[str]) -> None:
         """Mark column indexes in `colnames` as dirty."""
 
         assert len(colnames) > 0
+        self._invalidate_query_results()
         if self.indexed:
-            colindexed, cols = self.colindexed, self.cols
+            cols = self.cols
+            dirtyindexes = self._indexes_using(colnames)
             # Mark the proper indexes as dirty
-            for colname in colnames:
-                if colindexed[colname]:
-                    col = cols._g_col(colname)
-                    col.index.dirty = True
+            for colname in dirtyindexes:
+                col = cols._g_col(colname)
+                col.index.dirty = True
+            for index in self._composite_indexes_using(colnames):
+                index.dirty = True
+                dirtyindexes.append(index.columns)
+            if dirtyindexes:
+                # Rebuilds running in the background are out of date now
+                self._indexgeneration += 1
 
     def _reindex(self, colnames: list[str]) -> None:
         """Re-index columns in `colnames` if automatic indexing is true."""
 
+        self._invalidate_query_results()
         if self.indexed:
-            colindexed, cols = self.colindexed, self.cols
+            cols = self.cols
             colstoindex = []
             # Mark the proper indexes as dirty
-            for colname in colnames:
-                if colindexed[colname]:
-                    col = cols._g_col(colname)
-                    col.index.dirty = True
-                    colstoindex.append(colname)
+            for colname in self._indexes_using(colnames):
+                col = cols._g_col(colname)
+                col.index.dirty = True
+                colstoindex.append(colname)
+            for index in self._composite_indexes_using(colnames):
+                index.dirty = True
+                colstoindex.append(index.columns)
+            if colstoindex:
+                # Rebuilds running in the background are out of date now
+                self._indexgeneration += 1
             # Now, re-index the dirty ones
             if self.autoindex and colstoindex:
-                self._do_reindex(dirty=True)
+                self._reindex_dirty_auto()
             # The table caches for indexed queries are dirty now
             self._dirtycache = True
 
-    def _do_reindex(self, dirty: bool) -> int:
-        """Common code for `reindex()` and `reindex_dirty()`."""
+    def create_composite_index(self,
+                               colnames: list[str],
+                               optlevel: int=6,
+                               kind: str="medium",
+                               filters: Optional["Filters"]=None,
+                               tmp_dir: Optional[str]=None,
+                               _blocksizes: Optional[tuple[int, int, int, int]]=None,
+                               _verbose: bool=False) -> int:
+        """Create an index over several columns of the table.
+
+        The index sorts the rows by the values of the first column in
+        `colnames`, then by the values of the second one, and so on.  It
+        is used by queries comparing the first columns for equality and
+        the next one with a range (the rest of columns may be left out),
+        like ``(sensor == 17) & (ts >= t0) & (ts < t1)`` for an index on
+        ``['sensor', 'ts']``, where no single-column index can narrow
+        down the rows to be read as much.  The whole condition is still
+        evaluated on the rows read from the table.
+
+        Only scalar boolean, integer, floating point and string columns
+        can be indexed together.  The number of indexed rows is returned.
+
+        For the meaning of the optlevel, kind, filters and tmp_dir
+        arguments see :meth:`Column.create_index`.
+
+        .. versionadded:: 3.9.3
+
+        """
+
+        self._v_file._check_writable()
+        kinds = ['ultralight', 'light', 'medium', 'full']
+        if kind not in kinds:
+            raise ValueError("Kind must have any of these values: %s" % kinds)
+        if (not isinstance(optlevel, int) or
+                (optlevel < 0 or optlevel > 9)):
+            raise ValueError("Optimization level must be an integer in the "
+                             "range 0-9")
+        if filters is None:
+            filters = default_index_filters
+        if tmp_dir is None:
+            tmp_dir = str(Path(self._v_file.filename).parent)
+        elif not Path(tmp_dir).is_dir():
+            raise ValueError(f"Temporary directory '{tmp_dir}' does not exist")
+
+        columns = tuple(colnames)
+        if len(columns) < 2:
+            raise ValueError("composite indexes need at least two columns")
+        if len(set(columns)) != len(columns):
+            raise ValueError("columns can only appear once in an index")
+        for colname in columns:
+            if colname not in self.coldtypes:
+                self._check_column(colname)  # raises for missing columns
+                raise TypeError("nested column ``%s`` can not be indexed"
+                                % colname)
+        dtypes = [self.coldtypes[colname] for colname in columns]
+        for colname, dtype in zip(columns, dtypes):
+            if dtype.shape != () or not (
+                    dtype.kind in 'bS' or (dtype.kind in 'iuf' and
+                                           dtype.itemsize in (1, 2, 4, 8))):
+                raise TypeError("column ``%s`` can not be part of a "
+                                "composite index" % colname)
+        if columns in self._compositeindexes:
+            raise ValueError("a composite index on columns %s already exists"
+                             % (columns,))
+
+        names = set(self._compositeindexes.values())
+        name = next(f'__composite{i}' for i in itertools.count()
+                    if f'__composite{i}' not in names)
+        indexedrows = self._build_composite_index(
+            columns, name, optlevel, kind, filters, tmp_dir, _blocksizes,
+            _verbose)
+
+        self._compositeindexes[columns] = name
+        self._condition_cache.clear()
+        self.indexed = True
+        self._indexedrows = indexedrows
+        self._unsaved_indexedrows = self.nrows - indexedrows
+
+        return SizeType(indexedrows)
+
+    def _build_composite_index(self,
+                               columns: tuple[str, ...],
+                               name: str,
+                               optlevel: int,
+                               kind: str,
+                               filters: "Filters",
+                               tmp_dir: str,
+                               blocksizes: Optional[tuple[int, int, int, int]],
+                               verbose: bool) -> int:
+        """Create an index over `columns` in the node called `name`.
+
+        The index is filled with the rows in the table and optimized.  The
+        number of indexed rows is returned.
+
+        """
+
+        # Get the indexes group for table, and if not exists, create it
+        try:
+            itgroup = self._v_file._get_node(_index_pathname_of(self))
+        except NoSuchNodeError:
+            itgroup = create_indexes_table(self)
+
+        # Protection on tables larger than the expected rows
+        expectedrows = max(self._v_expectedrows, self.nrows)
+        dtypes = [self.coldtypes[colname] for colname in columns]
+        index = CompositeIndex(
+            itgroup, name, columns=columns,
+            atom=Atom.from_dtype(
+                np.dtype(('S%d' % composite_keysize(dtypes), (0,)))),
+            title="Index for columns %s" % ", ".join(columns),
+            kind=kind,
+            optlevel=optlevel,
+            filters=filters,
+            tmp_dir=tmp_dir,
+            expectedrows=expectedrows,
+            byteorder=self.byteorder,
+            blocksizes=blocksizes)
+
+        # Feed the index with values
+        if self.nrows > 0:
+            indexedrows = self._add_rows_to_index(
+                columns, 0, self.nrows, lastrow=True, update=False,
+                index=index)
+        else:
+            indexedrows = 0
+        index.dirty = False
+        index.optimize(verbose=verbose)
+
+        return indexedrows
+
+    def remove_composite_index(self, colnames: list[str]) -> None:
+        """Remove the composite index over the columns in `colnames`.
+
+        The columns must be given in the same order as in
+        :meth:`Table.create_composite_index`.  This method does nothing
+        if there is no such index.
+
+        .. versionadded:: 3.9.3
+
+        """
+
+        self._v_file._check_writable()
+        self._commit_reindex(wait=True)
+        columns = tuple(colnames)
+        index = self.composite_indexes.get(columns)
+        if index is None:
+            return
+        # Remove the nail in the condition cache of dirty indexes
+        index.dirty = False
+        index._f_remove()
+        del self._compositeindexes[columns]
+        self._condition_cache.clear()
+        self.indexed = max(self.colindexed.values(), default=False) or bool(
+            self._compositeindexes)
+
+    def _index_targets(self) -> list[Union[str, tuple[str, ...]]]:
+        """Get the indexed columns and the columns of composite indexes."""
 
+        return ([colname for (colname, colindexed) in self.colindexed.items()
+                 if colindexed] + list(self._compositeindexes))
+
+    def _target_index(self, target: Union[str, tuple[str, ...]]) -> Index:
+        """Get the index of a column or the composite index of columns."""
+
+        if isinstance(target, tuple):
+            return self.composite_indexes[target]
+        return self.cols._g_col(target).index
+
+    def _do_reindex(self, dirty: bool,
+                    targets: Optional[list[Union[str, tuple[str, ...]]]]=None
+                    ) -> int:
+        """Common code for `reindex()` and `reindex_dirty()`.
+
+        Only the indexes of `targets` (as returned by `_index_targets()`)
+        are recomputed if given.
+
+        """
+
+        self._commit_reindex(wait=True)
+        if targets is None:
+            targets = self._index_targets()
         indexedrows = 0
-        for (colname, colindexed) in self.colindexed.items():
-            if colindexed:
-                indexcol = self.cols._g_col(colname)
+        for target in targets:
+            if not isinstance(target, tuple):
+                indexcol = self.cols._g_col(target)
                 indexedrows = indexcol._do_reindex(dirty)
+                continue
+            index = self.composite_indexes[target]
+            if dirty and not index.dirty:
+                continue
+            kind, optlevel, filters = index.kind, index.optlevel, index.filters
+            self.remove_composite_index(target)
+            indexedrows = self.create_composite_index(
+                target, optlevel=optlevel, kind=kind, filters=filters)
         # Update counters in case some column has been updated
         if indexedrows > 0:
             self._indexedrows = indexedrows
@@ -2825,18 +4859,27 @@ very small/large chunksize, you may want to increase/decrease it."""
 
         return SizeType(indexedrows)
 
-    def reindex(self) -> None:
+    def reindex(self, background: bool=False) -> Optional[Future]:
         """Recompute all the existing indexes in the table.
 
         This can be useful when you suspect that, for any reason, the
         index information for columns is no longer valid and want to
         rebuild the indexes on it.
 
+        If `background` is true, the indexes are rebuilt in another
+        thread, and a :class:`concurrent.futures.Future` is returned
+        (see :meth:`Table.reindex_dirty`).
+
+        .. versionchanged:: 3.9.3
+           The `background` argument was added.
+
         """
 
+        if background:
+            return self._reindex_in_background(dirty=False)
         self._do_reindex(dirty=False)
 
-    def reindex_dirty(self) -> None:
+    def reindex_dirty(self, background: bool=False) -> Optional[Future]:
         """Recompute the existing indexes in table, *if* they are dirty.
 
         This can be useful when you have set :attr:`Table.autoindex`
@@ -2844,10 +4887,132 @@ very small/large chunksize, you may want to increase/decrease it."""
         update the indexes after an invalidating index operation
         (:meth:`Table.remove_rows`, for example).
 
+        If `background` is true, the indexes are rebuilt in another
+        thread (with another handle of the file) while this method
+        returns a :class:`concurrent.futures.Future` at once.  Dirty
+        indexes are not used by queries in the meanwhile.  The rebuilt
+        indexes replace the old ones the next time that the table is
+        queried, flushed or closed after the future is done.  The result
+        of the future is the number of indexed rows.
+
+        If rows are modified or removed while the indexes are being
+        rebuilt, the rebuilt indexes are out of date, and they are
+        discarded.  Only one rebuild may run in the background for each
+        table, so this method waits for the previous one (if any) to
+        finish.  Rows appended in the meanwhile are added to the rebuilt
+        indexes when they replace the old ones.  See also the
+        ``BACKGROUND_REINDEX`` parameter in :mod:`tables.parameters`.
+
+        .. versionchanged:: 3.9.3
+           The `background` argument was added.
+
         """
 
+        if background:
+            return self._reindex_in_background(dirty=True)
         self._do_reindex(dirty=True)
 
+    def _reindex_dirty_auto(self) -> None:
+        """Recompute dirty indexes for automatic indexing.
+
+        The indexes are rebuilt in the background if the
+        ``BACKGROUND_REINDEX`` parameter is true.
+
+        """
+
+        if not self._v_file.params['BACKGROUND_REINDEX']:
+            self._do_reindex(dirty=True)
+        elif self._reindexjob is None:
+            self._reindex_in_background(dirty=True)
+        # Otherwise, the running rebuild is started again once it is
+        # done, since it is out of date.
+
+    def _reindex_in_background(
+            self, dirty: bool,
+            targets: Optional[list[Union[str, tuple[str, ...]]]]=None
+    ) -> Future:
+        """Start rebuilding the indexes of `targets` in another thread.
+
+        The returned future gives the number of indexed rows.  Indexes
+        are rebuilt right away if the HDF5 library is not thread safe or
+        the file can not be opened again (e.g. with in-memory drivers).
+
+        """
+
+        h5file = self._v_file
+        h5file._check_writable()
+        self._commit_reindex(wait=True)
+        if targets is None:
+            targets = self._index_targets()
+        indexes = [self._target_index(target) for target in targets]
+        targets = [target for (target, index) in zip(targets, indexes)
+                   if index is not None and (index.dirty or not dirty)]
+        future = Future()
+        if not targets:
+            future.set_result(SizeType(0))
+            return future
+        from .file import _FILE_OPEN_POLICY
+        if (_FILE_OPEN_POLICY == 'strict' or not is_hdf5_threadsafe() or
+                h5file.params['DRIVER'] not in (None, 'H5FD_SEC2')):
+            future.set_result(self._do_reindex(dirty, targets))
+            return future
+
+        # Make buffered rows visible to the file handle of the rebuild
+        if 'row' in self.__dict__:
+            self.row._flush_buffered_rows()
+        self._g_flush()
+        self._reindexjob = _ReindexJob(self, targets)
+        return self._reindexjob.future
+
+    def _commit_reindex(self, wait: bool=False) -> None:
+        """Replace indexes with the ones rebuilt in the background.
+
+        Nothing is done if no rebuild is running, or if it is not done
+        yet and `wait` is false.  Out of date rebuilds are started again
+        for automatic indexing, unless `wait` is true, so that no rebuild
+        is left running then.
+
+        """
+
+        job = self._reindexjob
+        if job is None or not (wait or job.future.done()):
+            return
+        self._reindexjob = None
+        error = job.future.exception()
+        outdated = job.generation != self._indexgeneration
+        get_node = self._v_file._get_node
+        for target, path, newpath in job.indexes:
+            try:
+                newindex = get_node(newpath)
+            except NoSuchNodeError:
+                continue  # the rebuild failed before
+            # The new node was created with another handle of the file
+            newindex._v_parent._g_add_children_names()
+            if error is not None or outdated or path not in self._v_file:
+                newindex._f_remove()
+                continue
+            index = get_node(path)
+            # Remove the nail in the condition cache of dirty indexes
+            index.dirty = False
+            index._f_remove()
+            newindex._f_rename(split_path(path)[1])
+            # Add the rows appended since the rebuild started
+            nelements = newindex.nelements
+            if nelements < self.nrows:
+                self._add_rows_to_index(target, nelements,
+                                        self.nrows - nelements,
+                                        lastrow=True, update=True)
+                newindex.update_included()
+        self._condition_cache.clear()
+        self._dirtycache = True
+        if error is not None:
+            warnings.warn("rebuilding the indexes of table ``%s`` in the "
+                          "background failed: %s"
+                          % (self._v_pathname, error))
+        elif (outdated and not wait and self.autoindex and self._dirtyindexes
+                and self._v_file.params['BACKGROUND_REINDEX']):
+            self._reindex_in_background(dirty=True)
+
     def _g_copy_rows(self, object: "Table", start: int, stop: int, step: int,
                      sortby: Union["Column", str, None], checkCSI: bool) -> None:
         """Copy rows from self to object"""
@@ -2908,6 +5073,17 @@ very small/large chunksize, you may want to increase/decrease it."""
                     newcol.create_index(
                         kind=oldcolindex.kind, optlevel=oldcolindex.optlevel,
                         filters=oldcolindex.filters, tmp_dir=None)
+        for columns, index in self.composite_indexes.items():
+            other.create_composite_index(
+                columns, kind=index.kind, optlevel=index.optlevel,
+                filters=index.filters, tmp_dir=None)
+        for colname, zonemap in self._zonemap_nodes().items():
+            other.cols._f_col(colname).create_zonemap(
+                filters=zonemap.filters)
+        for colname, bloomfilter in self._bloomfilter_nodes().items():
+            other.cols._f_col(colname).create_bloomfilter(
+                bits_per_row=bloomfilter.nbits // self.chunkshape[0],
+                filters=bloomfilter.filters)
 
     def _g_copy_with_stats(self, group: "Group", name: str, start: int, stop: int, step: int,
                            title: str, filters: Optional["Filters"],
@@ -2932,7 +5108,8 @@ very small/large chunksize, you may want to increase/decrease it."""
         self._g_copy_rows(newtable, start, stop, step, sortby, checkCSI)
         nbytes = newtable.nrows * newtable.rowsize
         # Generate equivalent indexes in the new table, if required.
-        if propindexes and self.indexed:
+        if propindexes and (
+                self.indexed or self._zonemaps or self._bloomfilters):
             self._g_prop_indexes(newtable)
         return (newtable, nbytes)
 
@@ -2974,20 +5151,28 @@ very small/large chunksize, you may want to increase/decrease it."""
         """Flush the table buffers."""
 
         if self._v_file._iswritable():
+            # Switch to indexes rebuilt in the background (if any).
+            self._commit_reindex()
             # Flush rows that remains to be appended
             if 'row' in self.__dict__:
                 self.row._flush_buffered_rows()
+            if self._zonemaps or self._bloomfilters:
+                self._update_chunk_summaries()
             if self.indexed and self.autoindex:
-                # Flush any unindexed row
-                rowsadded = self.flush_rows_to_index(_lastrow=True)
-                assert rowsadded <= 0 or self._indexedrows == self.nrows, \
+                # Flush any unindexed row, unless only a few of them are
+                # left out of the last row of indexes.
+                maxunindexed = self._v_file.params['MAX_UNINDEXED_ROWS']
+                lastrow = self._unindexed_nrows > maxunindexed
+                rowsadded = self.flush_rows_to_index(_lastrow=lastrow)
+                assert (not lastrow or rowsadded <= 0
+                        or self._indexedrows == self.nrows), \
                     ("internal error: the number of indexed rows (%d) "
                      "and rows in the table (%d) is not equal; "
                      "please report this to the authors."
                      % (self._indexedrows, self.nrows))
                 if self._dirtyindexes:
                     # Finally, re-index any dirty column
-                    self.reindex_dirty()
+                    self._reindex_dirty_auto()
 
         super().flush()
 
@@ -3011,9 +5196,12 @@ very small/large chunksize, you may want to increase/decrease it."""
         # I've added a Performance warning in order to compel the user to
         # call self.flush() before the table is being preempted.
         # F. Alted 2006-08-03
+        # Rows may be left out of indexes on purpose by MAX_UNINDEXED_ROWS.
+        lazyindex = self._v_file.params['MAX_UNINDEXED_ROWS'] > 0
         if (('row' in self.__dict__ and self.row._get_unsaved_nrows() > 0) or
             (self.indexed and self.autoindex and
-             (self._unsaved_indexedrows > 0 or self._dirtyindexes))):
+             ((self._unsaved_indexedrows > 0 and not lazyindex)
+              or self._dirtyindexes))):
             warnings.warn(("table ``%s`` is being preempted from alive nodes "
                            "without its buffers being flushed or with some "
                            "index being dirty.  This may lead to very "
@@ -3042,7 +5230,17 @@ very small/large chunksize, you may want to increase/decrease it."""
 
         # Flush right now so the row object does not get in the middle.
         if flush:
+            # Indexes rebuilt in the background must be in place before.
+            self._commit_reindex(wait=True)
             self.flush()
+            # Index the rows left out by ``MAX_UNINDEXED_ROWS``, so that
+            # the indexes stored in the file are complete.
+            if (self._v_file._iswritable() and self.autoindex
+                    and self._unindexed_nrows > 0):
+                self.flush_rows_to_index()
+
+        # Wait for the indexes being rebuilt in the background (if any).
+        self._commit_reindex(wait=True)
 
         # Some warnings can be issued after calling `self._g_set_location()`
         # in `self.__init__()`.  If warnings are turned into exceptions,
@@ -3082,6 +5280,437 @@ very small/large chunksize, you may want to increase/decrease it."""
                 (str(self), self.description, self.byteorder, self.chunkshape)
 
 
+class _ChunkSummary:
+    """Mixin for leaves keeping a summary of a column for every chunk.
+
+    Every row of the leaf summarizes the values of the column in a chunk
+    of the table (see :attr:`Leaf.chunkshape`).  Subclasses compute the
+    summaries in :meth:`_summarize`.
+
+    """
+
+    @property
+    def column(self) -> str:
+        """The pathname of the summarized column."""
+        return self._v_attrs.COLUMN
+
+    @property
+    def nrowsmapped(self) -> int:
+        """The number of rows of the table which are summarized."""
+        return int(self._v_attrs.NROWSMAPPED)
+
+    @property
+    def table(self) -> Table:
+        """The table whose column is summarized."""
+        itgroup = self._v_parent
+        return itgroup._v_parent._f_get_child(itgroup._v_name[3:])
+
+    def _g_post_init_hook(self) -> None:
+        super()._g_post_init_hook()
+        if self._v_new:
+            self._v_attrs.COLUMN = self._v_new_column
+            self._v_attrs.NROWSMAPPED = 0
+
+    def _summarize(self, values: np.ndarray, chunkrows: int) -> np.ndarray:
+        """Get the summaries of `values` for every `chunkrows` rows."""
+
+        raise NotImplementedError
+
+    def _nvalid(self, nchunks: int) -> int:
+        """Get the number of chunks (up to `nchunks`) summarized up to
+        date."""
+
+        table = self.table
+        if self.nrowsmapped == table.nrows:
+            nvalid = self.nrows
+        else:
+            # The last chunk summarized may have changed since.
+            nvalid = min(self.nrowsmapped, table.nrows) // table.chunkshape[0]
+        return min(nvalid, nchunks)
+
+    def update(self, start: Optional[int]=None) -> None:
+        """Summarize the rows of the table which are not summarized yet.
+
+        If `start` is given, the chunks from the one containing that row
+        on are summarized anew.
+
+        """
+
+        table = self.table
+        chunkrows = table.chunkshape[0]
+        # The table may have been truncated since the last update.
+        nmapped = min(self.nrowsmapped, table.nrows)
+        if start is not None:
+            nmapped = min(nmapped, start)
+        if nmapped == table.nrows == self.nrowsmapped:
+            return  # up to date
+        # The last chunk summarized may have not been complete.
+        first = nmapped // chunkrows
+        if first < self.nrows:
+            self.truncate(first)
+        nrowsinbuf = table.nrowsinbuf  # a multiple of chunkrows
+        for bstart in range(first * chunkrows, table.nrows, nrowsinbuf):
+            bstop = min(bstart + nrowsinbuf, table.nrows)
+            values = table._read(bstart, bstop, 1, self.column)
+            self.append(self._summarize(values, chunkrows))
+        self._v_attrs.NROWSMAPPED = table.nrows
+
+
+class ZoneMap(_ChunkSummary, NotLoggedMixin, Table):
+    """Per-chunk statistics of a table column.
+
+    A zone map keeps a row for every chunk of a table (see
+    :attr:`Leaf.chunkshape`) with the minimum (``min``) and maximum
+    (``max``) values of a column in the chunk, and its number of NaN
+    values (``nans``).  Queries requiring the column to be compared with
+    a value skip the chunks whose values can not fulfill the comparison,
+    without the cost of building and keeping a full index.  NaN values
+    are left out of minimums and maximums, since comparisons with them
+    are always false.
+
+    Zone maps are created with :meth:`Column.create_zonemap` and kept up
+    to date as rows are appended to or modified in the table.
+
+    Parameters
+    ----------
+    parentnode
+        The parent :class:`Group` object.
+    name : str
+        The name of this node in its parent group.
+    column : Column
+        The column to be summarized, only when the zone map is created.
+    filters : Filters
+        The filters used to compress the zone map.
+
+    """
+
+    _c_classid = 'ZONEMAP'
+
+    def __init__(self,
+                 parentnode: "Group",
+                 name: str,
+                 column: Optional["Column"]=None,
+                 filters: Optional["Filters"]=None) -> None:
+        description = expectedrows = None
+        if column is not None:
+            table = column.table
+            self._v_new_column = column.pathname
+            description = {
+                'min': Col.from_dtype(column.dtype, pos=0),
+                'max': Col.from_dtype(column.dtype, pos=1),
+                'nans': UInt32Col(pos=2),
+            }
+            expectedrows = math.ceil(max(table._v_expectedrows, table.nrows)
+                                     / table.chunkshape[0])
+        super().__init__(parentnode, name, description,
+                         title="Zone map for %s column" % (
+                             column.pathname if column is not None else ''),
+                         filters=filters, expectedrows=expectedrows)
+
+    def _summarize(self, values: np.ndarray, chunkrows: int) -> np.ndarray:
+        """Get the statistics of `values` for every `chunkrows` rows."""
+
+        starts = np.arange(0, len(values), chunkrows)
+        stats = np.empty(len(starts), dtype=self.dtype)
+        if values.dtype.kind == 'f':
+            # NaNs are ignored unless all the values in the chunk are NaN.
+            stats['min'] = np.fmin.reduceat(values, starts)
+            stats['max'] = np.fmax.reduceat(values, starts)
+            stats['nans'] = np.add.reduceat(np.isnan(values), starts,
+                                            dtype='u4')
+        else:
+            stats['min'] = np.minimum.reduceat(values, starts)
+            stats['max'] = np.maximum.reduceat(values, starts)
+            stats['nans'] = 0
+        return stats
+
+    def get_chunkmap(self, op: str, limit: Any, nchunks: int) -> np.ndarray:
+        """Get the chunks which may have values fulfilling a comparison.
+
+        A boolean array with `nchunks` elements is returned, with false
+        values for the chunks where no value of the column can fulfill
+        the comparison `op` (one of ``'eq'``, ``'lt'``, ``'le'``,
+        ``'gt'`` or ``'ge'``) with `limit`.  Chunks which are not
+        summarized are always included.
+
+        """
+
+        nvalid = self._nvalid(nchunks)
+        chunkmap = np.ones(nchunks, dtype=bool)
+        if nvalid > 0:
+            stats = self.read(0, nvalid)
+            mins, maxs = stats['min'], stats['max']
+            with np.errstate(invalid='ignore'):
+                if op == 'eq':
+                    valid = (mins <= limit) & (maxs >= limit)
+                elif op == 'lt':
+                    valid = mins < limit
+                elif op == 'le':
+                    valid = mins <= limit
+                elif op == 'gt':
+                    valid = maxs > limit
+                else:
+                    valid = maxs >= limit
+            chunkmap[:nvalid] = valid
+        return chunkmap
+
+
+class BloomFilter(_ChunkSummary, NotLoggedMixin, EArray):
+    """Per-chunk Bloom filters of a table column.
+
+    A Bloom filter keeps a row of bits for every chunk of a table (see
+    :attr:`Leaf.chunkshape`), where a few bits chosen by hashing every
+    value of a column in the chunk are set.  Queries requiring the column
+    to be equal to some value skip the chunks where any of the bits of
+    that value is not set, since the value can not be in them.  Chunks
+    where all the bits are set may still have no matching rows (a false
+    positive), which happens with a probability of about ``0.6185 **
+    bits_per_row``.
+
+    Unlike zone maps (see :ref:`ZoneMapClassDescr`), Bloom filters are
+    useful for columns with many distinct values in no particular order,
+    like identifiers, and they take far less space than a full index.
+
+    Bloom filters are created with :meth:`Column.create_bloomfilter` and
+    kept up to date as rows are appended to or modified in the table.
+
+    Parameters
+    ----------
+    parentnode
+        The parent :class:`Group` object.
+    name : str
+        The name of this node in its parent group.
+    column : Column
+        The column to be summarized, only when the Bloom filter is
+        created.
+    bits_per_row : int
+        The number of bits in the filter of a chunk for every row in it,
+        only when the Bloom filter is created.
+    filters : Filters
+        The filters used to compress the Bloom filter.
+
+    """
+
+    _c_classid = 'BLOOMFILTER'
+
+    @property
+    def nbits(self) -> int:
+        """The number of bits in the filter of every chunk."""
+        return int(self._v_attrs.NBITS)
+
+    @property
+    def nhashes(self) -> int:
+        """The number of bits set for every value."""
+        return int(self._v_attrs.NHASHES)
+
+    def __init__(self,
+                 parentnode: "Group",
+                 name: str,
+                 column: Optional["Column"]=None,
+                 bits_per_row: int=10,
+                 filters: Optional["Filters"]=None) -> None:
+        atom = shape = expectedrows = chunkshape = None
+        if column is not None:
+            table = column.table
+            chunkrows = table.chunkshape[0]
+            nbytes = math.ceil(chunkrows * bits_per_row / 8)
+            self._v_new_column = column.pathname
+            self._v_new_nbits = nbytes * 8
+            # The optimal number of hashes for the given bits per value
+            self._v_new_nhashes = max(1, round(bits_per_row * math.log(2)))
+            atom = UInt8Atom()
+            shape = (0, nbytes)
+            expectedrows = math.ceil(max(table._v_expectedrows, table.nrows)
+                                     / chunkrows)
+            # Lookups only read a few bytes of every filter.
+            chunkshape = (max(1, 2**14 // min(nbytes, 64)), min(nbytes, 64))
+        super().__init__(parentnode, name, atom, shape,
+                         title="Bloom filter for %s column" % (
+                             column.pathname if column is not None else ''),
+                         filters=filters, expectedrows=expectedrows,
+                         chunkshape=chunkshape)
+
+    def _g_post_init_hook(self) -> None:
+        super()._g_post_init_hook()
+        if self._v_new:
+            self._v_attrs.NBITS = self._v_new_nbits
+            self._v_attrs.NHASHES = self._v_new_nhashes
+
+    def _summarize(self, values: np.ndarray, chunkrows: int) -> np.ndarray:
+        """Get the Bloom filters of `values` for every `chunkrows` rows."""
+
+        nbits = self.nbits
+        bits = np.zeros((math.ceil(len(values) / chunkrows), nbits),
+                        dtype=bool)
+        if values.dtype.kind == 'f':
+            # NaNs never compare equal, so they are left out.
+            notnan = ~np.isnan(values)
+            chunks = np.flatnonzero(notnan) // chunkrows
+            values = values[notnan]
+        else:
+            chunks = np.arange(len(values)) // chunkrows
+        positions = bloom_positions(values, nbits, self.nhashes)
+        bits[chunks[:, np.newaxis], positions] = True
+        return np.packbits(bits, axis=1, bitorder='little')
+
+    def get_chunkmap(self, values: Sequence[Any], nchunks: int) -> np.ndarray:
+        """Get the chunks which may have some of the given values.
+
+        A boolean array with `nchunks` elements is returned, with false
+        values for the chunks where the column has none of the `values`
+        for sure.  Chunks which are not summarized are always included.
+
+        """
+
+        nvalid = self._nvalid(nchunks)
+        chunkmap = np.ones(nchunks, dtype=bool)
+        if nvalid == 0:
+            return chunkmap
+        keys = exact_values(values, self.table.coldtypes[self.column])
+        if len(keys) == 0:
+            chunkmap[:nvalid] = False
+            return chunkmap
+        positions = bloom_positions(keys, self.nbits, self.nhashes)
+        # Only the bytes holding the bits of the values are read.
+        bytecols, where = np.unique(positions // np.uint64(8),
+                                    return_inverse=True)
+        where = where.reshape(positions.shape)
+        masks = np.left_shift(1, positions % np.uint64(8)).astype(np.uint8)
+        # Keep the temporary arrays below about a million elements.
+        nrowsinbuf = max(1, 2**20 // max(len(bytecols), where.size))
+        for bstart in range(0, nvalid, nrowsinbuf):
+            bstop = min(bstart + nrowsinbuf, nvalid)
+            filters = self[bstart:bstop, bytecols.tolist()]
+            hits = (filters[:, where] & masks) == masks
+            chunkmap[bstart:bstop] = hits.all(axis=2).any(axis=1)
+        return chunkmap
+
+
+class QueryResult(NotLoggedMixin, EArray):
+    """The row coordinates selected by a query on a table.
+
+    Coordinates are kept as ``(start, length)`` pairs of runs of
+    consecutive rows, so that large selections of contiguous rows take
+    little space.  See `QueryResultsG`.
+
+    """
+
+    _c_classid = 'QUERYRESULT'
+
+    @staticmethod
+    def _runs_of(coords: np.ndarray) -> np.ndarray:
+        """Get the ``(start, length)`` runs of consecutive `coords`."""
+
+        if len(coords) == 0:
+            return np.empty((0, 2), dtype='int64')
+        breaks = np.flatnonzero(np.diff(coords) != 1) + 1
+        bounds = np.concatenate(([0], breaks, [len(coords)]))
+        runs = np.empty((len(bounds) - 1, 2), dtype='int64')
+        runs[:, 0] = coords[bounds[:-1]]
+        runs[:, 1] = np.diff(bounds)
+        return runs
+
+    def coords(self) -> np.ndarray:
+        """Read the row coordinates kept in this node."""
+
+        runs = self.read()
+        starts, lengths = runs[:, 0], runs[:, 1]
+        # Every coordinate is its position plus the offset of its run.
+        offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+        return offsets + np.arange(len(offsets), dtype='int64')
+
+
+class QueryResultsG(NotLoggedMixin, Group):
+    """Query results kept along with a table.
+
+    Every child is a :class:`QueryResult` node named after a hash of the
+    query key (the condition, its variables and the range of rows).
+    Results are only valid for the generation of the table they were
+    stored at (which :meth:`invalidate` increments whenever rows are
+    modified or removed) and for its number of rows, so that appending
+    rows also invalidates them.
+
+    """
+
+    _c_classid = 'QUERYRESULTS'
+
+    def _g_post_init_hook(self) -> None:
+        super()._g_post_init_hook()
+        if self._v_new:
+            self._v_attrs.GENERATION = 0
+            self._v_attrs.STAMP = 0
+
+    @staticmethod
+    def _name_of(key: tuple) -> str:
+        return 'q' + hashlib.sha1(repr(key).encode()).hexdigest()
+
+    def _is_valid(self, entry: QueryResult, nrows: int) -> bool:
+        attrs = entry._v_attrs
+        return (attrs.GENERATION == self._v_attrs.GENERATION
+                and attrs.NROWS == nrows)
+
+    def _next_stamp(self) -> int:
+        stamp = int(self._v_attrs.STAMP) + 1
+        self._v_attrs.STAMP = stamp
+        return stamp
+
+    def entry(self, key: tuple, nrows: int) -> Optional[QueryResult]:
+        """Get the result stored for `key` in a table with `nrows` rows, or
+        None if it is not stored or is out of date."""
+
+        name = self._name_of(key)
+        if name not in self:
+            return None
+        entry = self._f_get_child(name)
+        return entry if self._is_valid(entry, nrows) else None
+
+    def get(self, key: tuple, nrows: int) -> Optional[np.ndarray]:
+        """Get the coordinates stored for `key` in a table with `nrows`
+        rows, or None if they are not stored or are out of date."""
+
+        entry = self.entry(key, nrows)
+        if entry is None:
+            return None
+        if self._v_file._iswritable():
+            # Recently used results are the last ones to be evicted.
+            entry._v_attrs.STAMP = self._next_stamp()
+        return entry.coords()
+
+    def put(self, key: tuple, nrows: int, coords: np.ndarray,
+            slots: int) -> None:
+        """Store the `coords` selected for `key` in a table with `nrows`
+        rows, keeping at most `slots` results.
+
+        Results out of date are evicted first, and then the least
+        recently used ones.
+
+        """
+
+        name = self._name_of(key)
+        if name in self:
+            self._f_get_child(name)._f_remove()
+        entries = list(self._v_leaves.values())
+        if len(entries) >= slots:
+            entries.sort(key=lambda entry: (self._is_valid(entry, nrows),
+                                            entry._v_attrs.STAMP))
+            for entry in entries[:len(entries) - slots + 1]:
+                entry._f_remove()
+        runs = QueryResult._runs_of(np.asarray(coords, dtype='int64'))
+        entry = QueryResult(self, name, Int64Atom(), (0, 2),
+                            filters=default_index_filters,
+                            expectedrows=max(1, len(runs)))
+        entry.append(runs)
+        attrs = entry._v_attrs
+        attrs.GENERATION = self._v_attrs.GENERATION
+        attrs.NROWS = nrows
+        attrs.STAMP = self._next_stamp()
+
+    def invalidate(self) -> None:
+        """Make all the stored results out of date."""
+
+        self._v_attrs.GENERATION += 1
+
+
 class Cols:
     """Container for columns in a table or nested column.
 
@@ -3419,6 +6048,26 @@ class Column:
             index = None  # The column is not indexed
         return index
 
+    @property
+    def zonemap(self) -> Optional[ZoneMap]:
+        """The ZoneMap instance (see :ref:`ZoneMapClassDescr`) of this
+        column (None if the column has no zone map).
+
+        .. versionadded:: 3.9.3
+
+        """
+        return self.table._zonemap_nodes().get(self.pathname)
+
+    @property
+    def bloomfilter(self) -> Optional[BloomFilter]:
+        """The BloomFilter instance (see :ref:`BloomFilterClassDescr`) of
+        this column (None if the column has no Bloom filter).
+
+        .. versionadded:: 3.9.3
+
+        """
+        return self.table._bloomfilter_nodes().get(self.pathname)
+
     @lazyattr
     def _itemtype(self) -> np.dtype:
         return self.descr._v_dtypes[self.name]
@@ -3618,6 +6267,7 @@ class Column:
                      kind: str="medium",
                      filters: Optional["Filters"]=None,
                      tmp_dir: Optional[str]=None,
+                     include: Optional[list[str]]=None,
                      _blocksizes: Optional[tuple[int, int, int, int]]=None,
                      _testmode: bool=False,
                      _verbose: bool=False) -> int:
@@ -3662,6 +6312,17 @@ class Column:
             to specify the directory for this temporary file.  The default is
             to create it in the same directory as the file containing the
             original table.
+        include : list of str
+            The pathnames of other columns whose values are to be stored in
+            the index too, in the same order as the sorted values of this
+            column.  Queries on this column which only read the indexed or
+            the included columns (e.g. ``table.read_where('x > 3',
+            field='price')``) are then answered from the index alone,
+            without reading the table.  Only full indexes can include other
+            columns, and the index becomes dirty when included columns are
+            modified.
+
+            .. versionadded:: 3.9.3
 
         """
 
@@ -3686,12 +6347,14 @@ class Column:
             raise ValueError("_blocksizes must be a tuple with exactly 4 "
                              "elements")
         idxrows = _column__create_index(self, optlevel, kind, filters,
-                                        tmp_dir, _blocksizes, _verbose)
+                                        tmp_dir, _blocksizes, _verbose,
+                                        include)
         return SizeType(idxrows)
 
     def create_csindex(self,
                        filters: Optional["Filters"]=None,
                        tmp_dir: Optional[str]=None,
+                       include: Optional[list[str]]=None,
                        _blocksizes: Optional[tuple[int, int, int, int]]=None,
                        _testmode: bool=False,
                        _verbose: bool=False) -> int:
@@ -3704,9 +6367,13 @@ class Column:
         :meth:`Table.itersorted` or :meth:`Table.read_sorted`) in order to
         ensure completely sorted results.
 
-        For the meaning of filters and tmp_dir arguments see
+        For the meaning of filters, tmp_dir and include arguments see
         :meth:`Column.create_index`.
 
+        The sorted slices of the index are merged into a complete sort with
+        an external merge, using up to :data:`parameters.MAX_INDEX_THREADS`
+        threads for sorting values.
+
         Notes
         -----
         This method is equivalent to
@@ -3716,11 +6383,12 @@ class Column:
 
         return self.create_index(
             kind='full', optlevel=9, filters=filters, tmp_dir=tmp_dir,
-            _blocksizes=_blocksizes, _testmode=_testmode, _verbose=_verbose)
+            include=include, _blocksizes=_blocksizes, _testmode=_testmode, _verbose=_verbose)
 
     def _do_reindex(self, dirty: bool) -> int:
         """Common code for reindex() and reindex_dirty() codes."""
 
+        self.table._commit_reindex(wait=True)
         index = self.index
         dodirty = True
         if dirty and not index.dirty:
@@ -3731,6 +6399,7 @@ class Column:
             kind = index.kind
             optlevel = index.optlevel
             filters = index.filters
+            include = list(index.include)
             # We *need* to tell the index that it is going to be undirty.
             # This is needed here so as to unnail() the condition cache.
             index.dirty = False
@@ -3738,33 +6407,52 @@ class Column:
             index._f_remove()
             # Create a new Index with the previous parameters
             return SizeType(self.create_index(
-                kind=kind, optlevel=optlevel, filters=filters))
+                kind=kind, optlevel=optlevel, filters=filters,
+                include=include))
         else:
             return SizeType(0)  # The column is not intended for indexing
 
-    def reindex(self) -> None:
+    def reindex(self, background: bool=False) -> Optional[Future]:
         """Recompute the index associated with this column.
 
         This can be useful when you suspect that, for any reason,
         the index information is no longer valid and you want to rebuild it.
 
-        This method does nothing if the column is not indexed.
+        This method does nothing if the column is not indexed.  If
+        `background` is true, the index is rebuilt in another thread, and
+        a :class:`concurrent.futures.Future` is returned (see
+        :meth:`Table.reindex_dirty`).
+
+        .. versionchanged:: 3.9.3
+           The `background` argument was added.
 
         """
 
+        if background:
+            return self.table._reindex_in_background(
+                dirty=False, targets=[self.pathname])
         self._do_reindex(dirty=False)
 
-    def reindex_dirty(self) -> None:
+    def reindex_dirty(self, background: bool=False) -> Optional[Future]:
         """Recompute the associated index only if it is dirty.
 
         This can be useful when you have set :attr:`Table.autoindex` to false
         for the table and you want to update the column's index after an
         invalidating index operation (like :meth:`Table.remove_rows`).
 
-        This method does nothing if the column is not indexed.
+        This method does nothing if the column is not indexed.  If
+        `background` is true, the index is rebuilt in another thread, and
+        a :class:`concurrent.futures.Future` is returned (see
+        :meth:`Table.reindex_dirty`).
+
+        .. versionchanged:: 3.9.3
+           The `background` argument was added.
 
         """
 
+        if background:
+            return self.table._reindex_in_background(
+                dirty=True, targets=[self.pathname])
         self._do_reindex(dirty=True)
 
     def remove_index(self) -> None:
@@ -3777,6 +6465,7 @@ class Column:
         """
 
         self._table_file._check_writable()
+        self.table._commit_reindex(wait=True)
 
         # Remove the index if existing.
         if self.is_indexed:
@@ -3784,6 +6473,140 @@ class Column:
             index._f_remove()
             self.table._set_column_indexing(self.pathname, False)
 
+    def create_zonemap(self, filters: Optional["Filters"]=None) -> int:
+        """Create a zone map for this column.
+
+        A zone map (see :ref:`ZoneMapClassDescr`) keeps the minimum and maximum
+        values of the column in every chunk of the table, so that queries
+        comparing the column with values (e.g. ``'ts >= t0'``) only read
+        the chunks which may hold matching rows.  It is a lightweight
+        alternative to indexes for columns whose values are roughly
+        sorted, like timestamps, since it takes a few bytes per chunk
+        and it is kept up to date on appends at a small cost.  Zone maps
+        are not used by queries which can use indexes.
+
+        Only scalar boolean, integer and floating point columns can have
+        a zone map.  If filters is None, default index filters are used.
+        The number of chunks summarized is returned.
+
+        .. versionadded:: 3.9.3
+
+        """
+
+        table = self.table
+        table._v_file._check_writable()
+        if self.pathname in table._zonemaps:
+            raise ValueError("column ``%s`` already has a zone map"
+                             % self.pathname)
+        dtype = table.coldtypes[self.pathname]
+        if dtype.shape != () or dtype.kind not in 'biuf':
+            raise TypeError("only scalar boolean, integer and floating point "
+                            "columns can have a zone map")
+        if filters is None:
+            filters = default_index_filters
+
+        # Get the indexes group for table, and if not exists, create it
+        try:
+            itgroup = table._v_file._get_node(_index_pathname_of(table))
+        except NoSuchNodeError:
+            itgroup = create_indexes_table(table)
+        names = set(table._zonemaps.values())
+        name = next(f'__zonemap{i}' for i in itertools.count()
+                    if f'__zonemap{i}' not in names)
+        zonemap = ZoneMap(itgroup, name, column=self, filters=filters)
+        table._zonemaps[self.pathname] = name
+        table._condition_cache.clear()
+        zonemap.update()
+        return SizeType(zonemap.nrows)
+
+    def remove_zonemap(self) -> None:
+        """Remove the zone map of this column.
+
+        This method does nothing if the column has no zone map.
+
+        .. versionadded:: 3.9.3
+
+        """
+
+        self._table_file._check_writable()
+        zonemap = self.zonemap
+        if zonemap is not None:
+            table = self.table
+            zonemap._f_remove()
+            del table._zonemaps[self.pathname]
+            table._condition_cache.clear()
+
+    def create_bloomfilter(self, bits_per_row: int=10,
+                           filters: Optional["Filters"]=None) -> int:
+        """Create a Bloom filter for this column.
+
+        A Bloom filter (see :ref:`BloomFilterClassDescr`) tells which
+        chunks of the table may have a given value in the column, so that
+        queries looking for rows equal to values (e.g. ``'uid == 1234'``)
+        only read a few chunks.  It suits columns with many distinct
+        values in no particular order, where zone maps are useless and
+        full indexes are too large.  Bloom filters are not used by
+        queries which can use indexes.
+
+        The bits_per_row argument sets the size of the filter of every
+        chunk.  Larger values make false positives (chunks read in vain)
+        less likely: about 1% of the chunks without a value are read for
+        the default of 10 bits, and about 0.1% for 15 bits.
+
+        Only scalar integer, floating point and string columns can have
+        a Bloom filter.  If filters is None, default index filters are
+        used.  The number of chunks summarized is returned.
+
+        .. versionadded:: 3.9.3
+
+        """
+
+        table = self.table
+        table._v_file._check_writable()
+        if self.pathname in table._bloomfilters:
+            raise ValueError("column ``%s`` already has a Bloom filter"
+                             % self.pathname)
+        dtype = table.coldtypes[self.pathname]
+        if dtype.shape != () or dtype.kind not in 'iufS':
+            raise TypeError("only scalar integer, floating point and string "
+                            "columns can have a Bloom filter")
+        if bits_per_row < 1:
+            raise ValueError("``bits_per_row`` must be greater than 0")
+        if filters is None:
+            filters = default_index_filters
+
+        # Get the indexes group for table, and if not exists, create it
+        try:
+            itgroup = table._v_file._get_node(_index_pathname_of(table))
+        except NoSuchNodeError:
+            itgroup = create_indexes_table(table)
+        names = set(table._bloomfilters.values())
+        name = next(f'__bloomfilter{i}' for i in itertools.count()
+                    if f'__bloomfilter{i}' not in names)
+        bloomfilter = BloomFilter(itgroup, name, column=self,
+                                  bits_per_row=bits_per_row, filters=filters)
+        table._bloomfilters[self.pathname] = name
+        table._condition_cache.clear()
+        bloomfilter.update()
+        return SizeType(bloomfilter.nrows)
+
+    def remove_bloomfilter(self) -> None:
+        """Remove the Bloom filter of this column.
+
+        This method does nothing if the column has no Bloom filter.
+
+        .. versionadded:: 3.9.3
+
+        """
+
+        self._table_file._check_writable()
+        bloomfilter = self.bloomfilter
+        if bloomfilter is not None:
+            table = self.table
+            bloomfilter._f_remove()
+            del table._bloomfilters[self.pathname]
+            table._condition_cache.clear()
+
     def close(self) -> None:
         """Close this column."""
 
@@ -94,6 +94,11 @@ cdef extern from "H5TB-opt.h" nogil:
                             hid_t dataset_id, hid_t mem_type_id,
                             hsize_t start, hsize_t nrecords, void *data )
 
+  herr_t read_records_blosc2( char* filename, chunk_iter_op chunk_op,
+                              hid_t dataset_id, hid_t mem_type_id,
+                              hid_t space_id, hsize_t start,
+                              hsize_t nrecords, unsigned char *data )
+
   herr_t H5TBOread_elements( hid_t dataset_id, hid_t mem_type_id,
                              hsize_t nrecords, void *coords, void *data )
 
@@ -649,12 +654,58 @@ cdef class Table(Leaf):
 
     return nrecords
 
+  def _read_records_blosc2(self, hsize_t start, hsize_t nrecords,
+                           ndarray recarr):
+    """Read records straight from Blosc2 chunks, with no HDF5 calls.
+
+    As the HDF5 library is not used at all, this can be called from
+    several threads at the same time.  The chunk addresses must have
+    been cached before (with ``_fill_chunk_addrs()``).  If this is not
+    possible, -1 is returned and ``_read_records()`` should be used
+    instead.
+
+    """
+
+    cdef int ret = -1
+    cdef bytes fname = self._v_file.filename.encode('utf8')
+    cdef char* filename = fname
+
+    if (not self.blosc2_support_read or self.chunk_op.addrs == NULL
+        or int(os.environ.get("BLOSC2_FILTER", "0"))):
+      return -1
+
+    # Correct the number of records to read, if needed
+    if (start + nrecords) > self.nrows:
+      nrecords = self.nrows - start
+
+    with nogil:
+        ret = read_records_blosc2(filename, self.chunk_op, self.dataset_id,
+                                  self.type_id, -1, start, nrecords,
+                                  <unsigned char *>PyArray_DATA(recarr))
+
+    if ret < 0:
+      return -1
+
+    # Convert some HDF5 types to NumPy after reading.
+    self._convert_types(recarr, nrecords, 1)
+
+    return nrecords
+
+  def _fill_chunk_addrs(self):
+    """Cache the addresses of Blosc2 chunks, if supported."""
+
+    if self.blosc2_support_read:
+      nchunks = math.ceil(self.nrows / self.chunkshape[0])
+      fill_chunk_addrs(self.dataset_id, nchunks, &self.chunk_op)
+
   cdef hsize_t _read_chunk(self, hsize_t nchunk, ndarray iobuf, long cstart):
     cdef long nslot
     cdef hsize_t start, nrecords, chunkshape
     cdef int ret
     cdef void *rbuf
     cdef NumCache chunkcache
+    cdef ndarray chunk
+    cdef object sharedchunks, key
     cdef bytes fname = self._v_file.filename.encode('utf8')
     cdef char* filename = fname
 
@@ -671,19 +722,32 @@ cdef class Table(Leaf):
     if (start + nrecords) > self.nrows:
       nrecords = self.nrows - start
     rbuf = PyArray_BYTES(iobuf) + cstart * chunkcache.itemsize
-    # Try to see if the chunk is in cache
-    nslot = chunkcache.getslot_(nchunk)
-    if nslot >= 0:
-      chunkcache.getitem_(nslot, rbuf, 0)
+    sharedchunks = self._sharedchunks
+    if sharedchunks is not None:
+      # Try to see if the chunk is in the shared cache
+      key = self._shared_chunk_key() + (nchunk,)
+      chunk = sharedchunks.get(key)
+      if chunk is not None:
+        memcpy(rbuf, PyArray_DATA(chunk), nrecords * chunkcache.itemsize)
+        return nrecords
     else:
-      # Chunk is not in cache. Read it and put it in the LRU cache.
-      with nogil:
-          ret = H5TBOread_records(filename, self.blosc2_support_read, self.chunk_op,
-                                  self.dataset_id, self.type_id, start,
-                                  nrecords, rbuf)
+      # Try to see if the chunk is in cache
+      nslot = chunkcache.getslot_(nchunk)
+      if nslot >= 0:
+        chunkcache.getitem_(nslot, rbuf, 0)
+        return nrecords
+    # Chunk is not in cache. Read it and put it in the LRU cache.
+    with nogil:
+        ret = H5TBOread_records(filename, self.blosc2_support_read, self.chunk_op,
+                                self.dataset_id, self.type_id, start,
+                                nrecords, rbuf)
 
-      if ret < 0:
-        raise HDF5ExtError("Problems reading chunk records.")
+    if ret < 0:
+      raise HDF5ExtError("Problems reading chunk records.")
+    if sharedchunks is not None:
+      chunk = iobuf[cstart:cstart + nrecords].copy()
+      sharedchunks.put(key, chunk, chunk.nbytes)
+    else:
       nslot = chunkcache.setitem_(nchunk, rbuf, 0)
     return nrecords
 
@@ -1359,6 +1423,109 @@ cdef class Row:
     self._riterator = 0  # out of iterator
     return
 
+  def _iter_where_buffers(self, start, stop, step, chunkmap=None,
+                          records=True, field=None):
+    """Iterate over the rows fulfilling the current condition in blocks.
+
+    This is the buffered counterpart of ``_iter()`` for queries: instead
+    of returning a Row per selected row, a ``(coords, recs)`` tuple of
+    NumPy arrays is yielded per I/O buffer.  `coords` holds the row
+    coordinates fulfilling the condition and `recs` their records (or
+    only their `field` column), or None when `records` is false.
+
+    The condition is taken from the table as in ``_iter()``, and both
+    the in-kernel and the indexed (`chunkmap`) paths are supported.
+
+    """
+
+    cdef Table table
+    cdef ObjectCache seqcache
+    cdef long long cs, nchunk, lastchunk, j, nrecords, rstart, first
+    cdef ndarray iobuf, bufcoords, valid, offsets, tmp_range
+
+    self._init_loop(start, stop, step, None, chunkmap)
+    table = self.table
+    iobuf = self.iobuf
+    try:
+      if self.indexed:
+        cs = self.chunksize
+        tmp_range = np.arange(0, cs, dtype='int64')
+        bufcoords = np.empty(self.nrowsinbuf, dtype='int64')
+        nchunk = self.start // cs
+        lastchunk = (self.stop - 1) // cs
+        while nchunk <= lastchunk:
+          # Fetch valid chunks until the I/O buffer is full
+          j = 0;  nrecords = 0
+          while nchunk <= lastchunk and j < self.nchunksinbuf:
+            if self.chunkmap_data[nchunk]:
+              bufcoords[j*cs:(j+1)*cs] = tmp_range + nchunk*cs
+              nrecords = nrecords + table._read_chunk(nchunk, iobuf, j*cs)
+              j = j + 1
+            nchunk = nchunk + 1
+          if nrecords == 0:
+            continue
+          buf = iobuf[:nrecords]
+          table._convert_types(buf, nrecords, 1)
+          valid = call_on_recarr(
+            self.condfunc, self.condargs, buf, **self.condkwargs)
+          coords = bufcoords[:nrecords]
+          if self.sss_on:
+            valid &= (coords >= self.start) & (coords < self.stop)
+            if self.step > 1:
+              valid &= (coords - self.start) % self.step == 0
+          offsets = np.flatnonzero(valid)
+          if len(offsets) > 0:
+            yield self._where_buffer_result(
+              coords[offsets], buf, offsets, records, field)
+      else:
+        rstart = self.start
+        while rstart < self.stop:
+          nrecords = min(self.nrowsinbuf, self.stop - rstart)
+          # First row in this buffer that is reachable with step
+          first = rstart + (self.start - rstart) % self.step
+          if first >= rstart + nrecords:
+            rstart = rstart + nrecords
+            continue
+          nrecords = table._read_records(rstart, nrecords, iobuf)
+          buf = iobuf[:nrecords]
+          valid = call_on_recarr(
+            self.condfunc, self.condargs, buf, **self.condkwargs)
+          if self.step > 1:
+            offsets = np.arange(first - rstart, nrecords, self.step)
+            offsets = offsets[valid[offsets]]
+          else:
+            offsets = np.flatnonzero(valid)
+          if len(offsets) > 0:
+            yield self._where_buffer_result(
+              offsets + rstart, buf, offsets, records, field)
+          rstart = rstart + nrecords
+      if self._write_to_seqcache:
+        seqcache = table._seqcache
+        # Each element in self.iterseq should take at least 8 bytes
+        seqcache.setitem_(self.seqcache_key, self.iterseq,
+                          len(self.iterseq) * 8)
+    finally:
+      self._riterator = 0      # out of iterator
+      self._write_to_seqcache = 0
+      self.iterseq = None      # empty seqcache-related things
+      self.seqcache_key = None
+
+  cdef _where_buffer_result(self, ndarray coords, object buf,
+                            ndarray offsets, object records, object field):
+    """Build the ``(coords, recs)`` tuple for ``_iter_where_buffers()``."""
+
+    if self._write_to_seqcache:
+      # Feed the coordinates into the seqcache
+      if len(coords) + len(self.iterseq) < self.iterseq_max_elements:
+        self.iterseq.extend(coords)
+      else:
+        self.iterseq = None
+        self._write_to_seqcache = 0
+    if not records:
+      return (coords, None)
+    if field:
+      buf = get_nested_field(buf, field)
+    return (coords, buf[offsets])
 
   def append(self):
     """Add a new row of data to the end of the dataset.
@@ -1,10 +1,15 @@
+import contextlib
 import copy
+import math
 import tempfile
+import threading
+from unittest import mock
 from pathlib import Path
 
 import numpy as np
 
 import tables as tb
+from tables.idxutils import composite_key_range, composite_keys
 from tables.tests import common
 
 # Sensible parameters for indexing with small blocksizes
@@ -2659,6 +2664,1110 @@ class TestIndexingNans(common.TempFileMixin, common.PyTablesTestCase):
         self.assertEqual(len(results), 100*2)
 
 
+class CoveringIndexTestCase(common.TempFileMixin, common.PyTablesTestCase):
+    nrows = 500
+    csi = False
+    include = ['price', 'qty', 'name']
+
+    class Record(tb.IsDescription):
+        x = tb.Int32Col(pos=0)
+        price = tb.Float64Col(pos=1)
+        qty = tb.Int16Col(shape=(2,), pos=2)
+        name = tb.StringCol(itemsize=4, pos=3)
+
+    def setUp(self):
+        super().setUp()
+        self.table = self.h5file.create_table('/', 'table', self.Record,
+                                              chunkshape=(10,))
+        self.rows = self.make_rows(0, self.nrows)
+        self.table.append(self.rows)
+        if self.csi:
+            self.table.cols.x.create_csindex(include=self.include,
+                                             _blocksizes=small_blocksizes)
+        else:
+            self.table.cols.x.create_index(kind='full', include=self.include,
+                                           _blocksizes=small_blocksizes)
+
+    def make_rows(self, start, stop):
+        rows = np.empty(stop - start, dtype=self.table.dtype)
+        coords = np.arange(start, stop)
+        rows['x'] = (coords * 37) % 101
+        rows['price'] = coords * 1.5
+        rows['qty'][:, 0] = coords % 7
+        rows['qty'][:, 1] = -coords
+        rows['name'] = [b'%d' % i for i in coords]
+        return rows
+
+    def check_reads(self, from_index=True, **kwargs):
+        table = self.table
+        coords = np.arange(*table._process_range_read(
+            kwargs.get('start'), kwargs.get('stop'), kwargs.get('step')))
+        rows = self.rows[coords]
+        selected = (rows['x'] > 20) & (rows['x'] <= 60)
+        if from_index:
+            # The table must not be scanned.
+            scan = mock.patch.object(tb.Table, '_where_buffers',
+                                     side_effect=AssertionError)
+        else:
+            scan = contextlib.nullcontext()
+        with scan:
+            for field in ['x'] + self.include:
+                result = table.read_where('(x > 20) & (x <= 60)',
+                                          field=field, **kwargs)
+                self.assertTrue(common.areArraysEqual(
+                    result, rows[field][selected]))
+            result = table.get_where_list('(x > 20) & (x <= 60)', **kwargs)
+            self.assertTrue(common.areArraysEqual(
+                result, coords[selected].astype(result.dtype)))
+
+    def test_include(self):
+        index = self.table.cols.x.index
+        self.assertEqual(index.include, tuple(self.include))
+        self._reopen()
+        self.table = self.h5file.root.table
+        self.assertEqual(self.table.cols.x.index.include, tuple(self.include))
+        self.assertEqual(self.table.cols.price.index, None)
+
+    def test_read_where(self):
+        self.check_reads()
+        self.check_reads(start=3, stop=477, step=4)
+        self.check_reads(start=250)
+
+    def test_not_covered(self):
+        table = self.table
+        # Whole records, conditions not answered by the index alone and
+        # columns not included must still work.
+        rows = self.rows
+        result = table.read_where('x > 90')
+        self.assertTrue(common.areArraysEqual(result, rows[rows['x'] > 90]))
+        result = table.read_where('(x > 90) & (price < 300)', field='qty')
+        self.assertTrue(common.areArraysEqual(
+            result, rows['qty'][(rows['x'] > 90) & (rows['price'] < 300)]))
+        self.assertEqual(len(table.read_where('x > 200', field='price')), 0)
+
+    def test_append(self):
+        self.rows = np.concatenate([self.rows, self.make_rows(500, 537)])
+        self.table.append(self.rows[500:])
+        self.table.flush()
+        index = self.table.cols.x.index
+        self.assertEqual(index.included0.nrows, len(self.rows))
+        self.check_reads()
+
+    def test_modify_included(self):
+        self.rows['price'][10:20] = -1
+        self.table.modify_column(10, 20, column=self.rows['price'][10:20],
+                                 colname='price')
+        self.check_reads()
+        self.table.autoindex = False
+        self.rows['price'][:10] = -2
+        self.table.modify_column(0, 10, column=self.rows['price'][:10],
+                                 colname='price')
+        self.assertTrue(self.table.cols.x.index.dirty)
+        self.check_reads(from_index=False)
+        self.table.reindex_dirty()
+        self.assertEqual(self.table.cols.x.index.include, tuple(self.include))
+        self.check_reads()
+
+    def test_errors(self):
+        table = self.table
+        table.cols.x.remove_index()
+        self.assertRaises(ValueError, table.cols.x.create_index,
+                          kind='medium', include=['price'])
+        self.assertRaises(KeyError, table.cols.x.create_index,
+                          kind='full', include=['nothere'])
+        self.assertRaises(ValueError, table.cols.x.create_index,
+                          kind='full', include=['x'])
+        self.assertRaises(ValueError, table.cols.x.create_index,
+                          kind='full', include=['price', 'price'])
+
+
+class CoveringCSIndexTestCase(CoveringIndexTestCase):
+    csi = True
+
+
+class CompositeIndexTestCase(common.TempFileMixin, common.PyTablesTestCase):
+    nrows = 1000
+    kind = 'medium'
+    conditions = [
+        '(sensor == 17) & (ts >= 10) & (ts < 30)',
+        '(sensor == 17) & (ts > 95)',
+        '(sensor == 5) & (ts <= 3.5) & (name != b"b2")',
+        '(ts < 50) & (sensor == 30)',
+        '(sensor == 3) & (ts == 0)',
+        '(sensor == 40) & (ts > 10)',
+        'sensor == 10',
+        '(sensor >= 30) & (ts < 5)',
+    ]
+
+    class Record(tb.IsDescription):
+        sensor = tb.Int16Col(pos=0)
+        ts = tb.Float64Col(pos=1)
+        name = tb.StringCol(itemsize=4, pos=2)
+
+    def setUp(self):
+        super().setUp()
+        self.table = self.h5file.create_table('/', 'table', self.Record,
+                                              chunkshape=(10,))
+        self.rows = self.make_rows(0, self.nrows)
+        self.table.append(self.rows)
+        self.table.create_composite_index(['sensor', 'ts'], kind=self.kind,
+                                          _blocksizes=small_blocksizes)
+
+    def make_rows(self, start, stop):
+        rows = np.empty(stop - start, dtype=self.table.dtype)
+        coords = np.arange(start, stop)
+        rows['sensor'] = (coords * 7) % 37
+        rows['ts'] = (coords * 13) % 200 / 2 - 1
+        rows['name'] = [b'b%d' % (i % 5) for i in coords]
+        return rows
+
+    def check_queries(self):
+        rows = self.rows
+        for condition in self.conditions:
+            expected = np.nonzero(eval(condition, {}, {
+                'sensor': rows['sensor'], 'ts': rows['ts'],
+                'name': rows['name']}))[0]
+            result = self.table.get_where_list(condition, sort=True)
+            self.assertTrue(common.areArraysEqual(
+                result, expected.astype(result.dtype)), condition)
+
+    def test_keys(self):
+        sensor = np.array([-3, 2, -3, 0, 2, 2], dtype='i2')
+        ts = np.array([1.5, -0.0, -2.0, np.inf, 0.0, -np.inf])
+        keys = composite_keys([sensor, ts])
+        self.assertTrue(common.areArraysEqual(
+            np.argsort(keys, kind='stable'),
+            np.lexsort((ts, sensor))))
+        self.assertEqual(keys[1], keys[4])
+        lower, upper = composite_key_range(
+            [sensor.dtype, ts.dtype], [2], lower=-1.0)
+        self.assertTrue(np.all((keys[[1, 4]] >= lower)
+                               & (keys[[1, 4]] <= upper)))
+        self.assertTrue(np.all(keys[[0, 2, 3, 5]] < lower))
+
+    def test_use_indexing(self):
+        table = self.table
+        self.assertEqual(table.will_query_use_indexing(self.conditions[0]),
+                         frozenset(['sensor', 'ts']))
+        self.assertEqual(table.will_query_use_indexing('sensor == 10'),
+                         frozenset(['sensor']))
+        self.assertEqual(table.will_query_use_indexing('ts > 10'),
+                         frozenset())
+        index = table.composite_indexes[('sensor', 'ts')]
+        self.assertEqual(index.columns, ('sensor', 'ts'))
+        self.assertIsNone(table.cols.sensor.index)
+
+    def test_queries(self):
+        self.check_queries()
+        result = self.table.read_where(self.conditions[0], field='ts')
+        rows = self.rows
+        selected = ((rows['sensor'] == 17) & (rows['ts'] >= 10)
+                    & (rows['ts'] < 30))
+        self.assertTrue(common.areArraysEqual(result, rows['ts'][selected]))
+
+    def test_reopen(self):
+        self._reopen(mode='a')
+        self.table = self.h5file.root.table
+        self.assertTrue(self.table.indexed)
+        self.assertEqual(list(self.table.composite_indexes),
+                         [('sensor', 'ts')])
+        self.check_queries()
+
+    def test_append(self):
+        self.rows = np.concatenate([self.rows, self.make_rows(1000, 1037)])
+        self.table.append(self.rows[1000:])
+        self.table.flush()
+        index = self.table.composite_indexes[('sensor', 'ts')]
+        self.assertEqual(index.nelements, len(self.rows))
+        self.check_queries()
+
+    def test_modify(self):
+        table = self.table
+        self.rows['ts'][10:20] = 20
+        table.modify_column(10, 20, column=self.rows['ts'][10:20],
+                            colname='ts')
+        self.check_queries()
+        table.autoindex = False
+        self.rows['sensor'][:10] = 17
+        table.modify_column(0, 10, column=self.rows['sensor'][:10],
+                            colname='sensor')
+        self.assertTrue(table.composite_indexes[('sensor', 'ts')].dirty)
+        self.assertEqual(table.will_query_use_indexing(self.conditions[0]),
+                         frozenset())
+        self.check_queries()
+        table.reindex_dirty()
+        self.assertFalse(table.composite_indexes[('sensor', 'ts')].dirty)
+        self.check_queries()
+
+    def test_copy(self):
+        newtable = self.table.copy('/', 'table2', propindexes=True)
+        self.assertEqual(list(newtable.composite_indexes),
+                         [('sensor', 'ts')])
+        self.table = newtable
+        self.check_queries()
+
+    def test_remove(self):
+        table = self.table
+        table.remove_composite_index(['sensor', 'ts'])
+        self.assertEqual(table.composite_indexes, {})
+        self.assertFalse(table.indexed)
+        self.check_queries()
+        # Removing a missing index does nothing.
+        table.remove_composite_index(['sensor', 'ts'])
+
+    def test_errors(self):
+        table = self.table
+        self.assertRaises(ValueError, table.create_composite_index,
+                          ['sensor', 'ts'])
+        self.assertRaises(ValueError, table.create_composite_index,
+                          ['sensor'])
+        self.assertRaises(ValueError, table.create_composite_index,
+                          ['ts', 'ts'])
+        self.assertRaises(KeyError, table.create_composite_index,
+                          ['ts', 'nothere'])
+
+
+class FullCompositeIndexTestCase(CompositeIndexTestCase):
+    kind = 'full'
+
+
+class ZoneMapTestCase(common.TempFileMixin, common.PyTablesTestCase):
+    nrows = 1000
+    conditions = [
+        '(ts >= 10) & (ts < 30)',
+        'ts > 95',
+        '(ts == 50) & (flag)',
+        '(ts < 5) | (ts > 98)',
+        'ts != ts',
+        '(sensor == 3) & (ts <= 20.5)',
+        '~flag & (ts > 99)',
+    ]
+
+    class Record(tb.IsDescription):
+        ts = tb.Float64Col(pos=0)
+        sensor = tb.Int16Col(pos=1)
+        flag = tb.BoolCol(pos=2)
+
+    def setUp(self):
+        super().setUp()
+        self.table = self.h5file.create_table('/', 'table', self.Record,
+                                              chunkshape=(10,))
+        self.rows = self.make_rows(0, self.nrows)
+        self.table.append(self.rows)
+        self.table.cols.ts.create_zonemap()
+        self.table.cols.flag.create_zonemap()
+
+    def make_rows(self, start, stop):
+        rows = np.empty(stop - start, dtype=self.table.dtype)
+        coords = np.arange(start, stop)
+        rows['ts'] = coords / 10
+        rows['ts'][(coords >= 200) & (coords < 215)] = np.nan
+        rows['sensor'] = coords % 7
+        rows['flag'] = (coords // 100) % 2 == 0
+        return rows
+
+    def check_queries(self):
+        rows = self.rows
+        for condition in self.conditions:
+            expected = np.nonzero(eval(condition, {}, {
+                'ts': rows['ts'], 'sensor': rows['sensor'],
+                'flag': rows['flag']}))[0]
+            result = self.table.get_where_list(condition, sort=True)
+            self.assertTrue(common.areArraysEqual(
+                result, expected.astype(result.dtype)), condition)
+            for kwargs in [dict(start=3, stop=887, step=4), dict(start=500)]:
+                coords = np.arange(*self.table._process_range_read(
+                    kwargs.get('start'), kwargs.get('stop'),
+                    kwargs.get('step')))
+                result = self.table.read_where(condition, **kwargs)
+                # Compare the bytes of the records, as NaN != NaN
+                self.assertEqual(
+                    result.tobytes(),
+                    rows[np.intersect1d(coords, expected)].tobytes())
+
+    def test_zonemap(self):
+        zonemap = self.table.cols.ts.zonemap
+        self.assertEqual(zonemap.column, 'ts')
+        self.assertEqual(zonemap.nrows, 100)
+        self.assertEqual(zonemap.nrowsmapped, self.nrows)
+        self.assertEqual(zonemap[2].tolist(), (2.0, 2.9, 0))
+        self.assertEqual(zonemap[20]['nans'], 10)
+        self.assertTrue(np.isnan(zonemap[20]['min']))
+        self.assertEqual(zonemap[21].tolist(), (21.5, 21.9, 5))
+        self.assertIsNone(self.table.cols.sensor.zonemap)
+
+    def test_chunkmap(self):
+        chunkmap = self.table._where_setup(
+            '(ts >= 10) & (ts < 30) & (sensor > 2)', None,
+            None, None, None, depth=1)[1]
+        self.table._where_condition = None
+        self.table._use_index = False
+        # The chunk with only NaN values is left out too.
+        self.assertTrue(common.areArraysEqual(
+            np.flatnonzero(chunkmap), np.setdiff1d(np.arange(10, 30), [20])))
+        # Conditions which may match anywhere do not use zone maps.
+        chunkmap = self.table._where_setup(
+            '(ts < 5) | (ts > 98)', None, None, None, None, depth=1)[1]
+        self.table._where_condition = None
+        self.assertIsNone(chunkmap)
+
+    def test_queries(self):
+        self.check_queries()
+        self.assertEqual(self.table.count_where('ts > 1000'), 0)
+
+    def test_reopen(self):
+        self._reopen(mode='a')
+        self.table = self.h5file.root.table
+        self.assertEqual(self.table.cols.ts.zonemap.nrows, 100)
+        self.check_queries()
+
+    def test_append(self):
+        table = self.table
+        self.rows = np.concatenate([self.rows, self.make_rows(1000, 1005)])
+        table.append(self.rows[1000:])
+        self.assertEqual(table.cols.ts.zonemap.nrows, 101)
+        self.check_queries()
+        # Rows appended through the Row are summarized on flush.
+        row = table.row
+        for i in range(1005, 1013):
+            row['ts'] = -i
+            row.append()
+        table.flush()
+        self.rows = table.read()
+        self.assertEqual(table.cols.ts.zonemap.nrowsmapped, 1013)
+        self.assertEqual(table.cols.ts.zonemap[100]['min'], -1009)
+        self.check_queries()
+
+    def test_modify(self):
+        table = self.table
+        self.rows['ts'][500:510] = -1
+        table.modify_column(500, 510, column=self.rows['ts'][500:510],
+                            colname='ts')
+        self.check_queries()
+        self.rows['ts'][[3, 997]] = 50
+        table.modify_coordinates([3, 997], self.rows[[3, 997]])
+        self.check_queries()
+        table.remove_rows(100, 300)
+        self.rows = np.delete(self.rows, np.s_[100:300])
+        self.assertEqual(table.cols.ts.zonemap.nrows, 80)
+        self.check_queries()
+        table.truncate(655)
+        self.rows = self.rows[:655]
+        self.check_queries()
+
+    def test_copy(self):
+        newtable = self.table.copy('/', 'table2', propindexes=True)
+        self.assertEqual(newtable.cols.ts.zonemap.nrows, 100)
+        self.table = newtable
+        self.check_queries()
+
+    def test_remove(self):
+        self.table.cols.ts.remove_zonemap()
+        self.assertIsNone(self.table.cols.ts.zonemap)
+        self.check_queries()
+        # Removing a missing zone map does nothing.
+        self.table.cols.ts.remove_zonemap()
+
+    def test_errors(self):
+        self.assertRaises(ValueError, self.table.cols.ts.create_zonemap)
+        table = self.h5file.create_table(
+            '/', 'strings', {'s': tb.StringCol(4), 'c': tb.ComplexCol(16),
+                             'a': tb.Int32Col(shape=2)})
+        self.assertRaises(TypeError, table.cols.s.create_zonemap)
+        self.assertRaises(TypeError, table.cols.c.create_zonemap)
+        self.assertRaises(TypeError, table.cols.a.create_zonemap)
+
+
+class BloomFilterTestCase(common.TempFileMixin, common.PyTablesTestCase):
+    nrows = 1000
+    conditions = [
+        'uid == 2021',
+        '(uid == 2021) | (uid == 14)',
+        '(uid == 7) & (x > 0.5)',
+        'name == b"u42"',
+        '(x == 0.25) & (name == b"u25")',
+        'uid == -1',
+        'uid > 6990',
+        'x != x',
+    ]
+
+    class Record(tb.IsDescription):
+        uid = tb.Int32Col(pos=0)
+        x = tb.Float64Col(pos=1)
+        name = tb.StringCol(6, pos=2)
+
+    def setUp(self):
+        super().setUp()
+        self.table = self.h5file.create_table('/', 'table', self.Record,
+                                              chunkshape=(10,))
+        self.rows = self.make_rows(0, self.nrows)
+        self.table.append(self.rows)
+        self.table.cols.uid.create_bloomfilter()
+        self.table.cols.x.create_bloomfilter(bits_per_row=16)
+        self.table.cols.name.create_bloomfilter()
+
+    def make_rows(self, start, stop):
+        rows = np.empty(stop - start, dtype=self.table.dtype)
+        coords = np.arange(start, stop)
+        # Scatter the identifiers, so that zone maps would not help.
+        rows['uid'] = (coords * 389) % 1000 * 7
+        rows['x'] = coords / 100
+        rows['x'][coords % 50 == 3] = np.nan
+        rows['name'] = [b'u%d' % i for i in coords]
+        return rows
+
+    def check_queries(self):
+        rows = self.rows
+        for condition in self.conditions:
+            expected = np.nonzero(eval(condition, {}, {
+                'uid': rows['uid'], 'x': rows['x'],
+                'name': rows['name']}))[0]
+            result = self.table.get_where_list(condition, sort=True)
+            self.assertTrue(common.areArraysEqual(
+                result, expected.astype(result.dtype)), condition)
+            kwargs = dict(start=3, stop=887, step=4)
+            coords = np.arange(*self.table._process_range_read(
+                kwargs['start'], kwargs['stop'], kwargs['step']))
+            result = self.table.read_where(condition, **kwargs)
+            # Compare the bytes of the records, as NaN != NaN
+            self.assertEqual(
+                result.tobytes(),
+                rows[np.intersect1d(coords, expected)].tobytes())
+
+    def test_bloomfilter(self):
+        bloomfilter = self.table.cols.uid.bloomfilter
+        self.assertEqual(bloomfilter.column, 'uid')
+        self.assertEqual(bloomfilter.shape, (100, 13))
+        self.assertEqual(bloomfilter.nbits, 104)
+        self.assertEqual(bloomfilter.nhashes, 7)
+        self.assertEqual(bloomfilter.nrowsmapped, self.nrows)
+        self.assertEqual(self.table.cols.x.bloomfilter.nbits, 160)
+        self.assertIsNone(self.table.cols.uid.zonemap)
+
+    def test_chunkmap(self):
+        bloomfilter = self.table.cols.uid.bloomfilter
+        for coord in [0, 17, 555, 999]:
+            value = self.rows['uid'][coord]
+            chunkmap = bloomfilter.get_chunkmap([value], 100)
+            # No false negatives, and only a few false positives
+            self.assertTrue(chunkmap[coord // 10])
+            self.assertLess(chunkmap.sum(), 10)
+        chunkmap = bloomfilter.get_chunkmap(self.rows['uid'][:50], 100)
+        self.assertTrue(chunkmap[:5].all())
+        # Values which can not be in the column are never looked up.
+        chunkmap = bloomfilter.get_chunkmap([1.5, 2**40, b'x'], 100)
+        self.assertFalse(chunkmap.any())
+        chunkmap = self.table._where_setup(
+            'uid == 2021', None, None, None, None, depth=1)[1]
+        self.table._where_condition = None
+        self.table._use_index = False
+        self.assertTrue(chunkmap[np.flatnonzero(self.rows['uid'] == 2021)
+                                 // 10].all())
+        self.assertLess(chunkmap.sum(), 10)
+        # Conditions which may match anywhere do not use Bloom filters.
+        chunkmap = self.table._where_setup(
+            'uid > 6990', None, None, None, None, depth=1)[1]
+        self.table._where_condition = None
+        self.assertIsNone(chunkmap)
+
+    def test_queries(self):
+        self.check_queries()
+
+    def test_reopen(self):
+        self._reopen(mode='a')
+        self.table = self.h5file.root.table
+        self.assertEqual(self.table.cols.uid.bloomfilter.nrows, 100)
+        self.check_queries()
+
+    def test_append(self):
+        table = self.table
+        self.rows = np.concatenate([self.rows, self.make_rows(1000, 1005)])
+        table.append(self.rows[1000:])
+        self.assertEqual(table.cols.uid.bloomfilter.nrows, 101)
+        self.check_queries()
+        # Rows appended through the Row are summarized on flush.
+        row = table.row
+        for i in range(1005, 1013):
+            row['uid'] = 2021
+            row.append()
+        table.flush()
+        self.rows = table.read()
+        self.assertEqual(table.cols.uid.bloomfilter.nrowsmapped, 1013)
+        self.check_queries()
+
+    def test_modify(self):
+        table = self.table
+        self.rows['uid'][500:510] = 14
+        table.modify_column(500, 510, column=self.rows['uid'][500:510],
+                            colname='uid')
+        self.check_queries()
+        self.rows['name'][[3, 997]] = b'u42'
+        table.modify_coordinates([3, 997], self.rows[[3, 997]])
+        self.check_queries()
+        table.remove_rows(100, 300)
+        self.rows = np.delete(self.rows, np.s_[100:300])
+        self.assertEqual(table.cols.uid.bloomfilter.nrows, 80)
+        self.check_queries()
+        table.truncate(655)
+        self.rows = self.rows[:655]
+        self.check_queries()
+
+    def test_copy(self):
+        newtable = self.table.copy('/', 'table2', propindexes=True)
+        self.assertEqual(newtable.cols.uid.bloomfilter.nrows, 100)
+        self.assertEqual(newtable.cols.x.bloomfilter.nbits, 160)
+        self.table = newtable
+        self.check_queries()
+
+    def test_remove(self):
+        self.table.cols.uid.remove_bloomfilter()
+        self.assertIsNone(self.table.cols.uid.bloomfilter)
+        self.check_queries()
+        # Removing a missing Bloom filter does nothing.
+        self.table.cols.uid.remove_bloomfilter()
+
+    def test_errors(self):
+        self.assertRaises(ValueError, self.table.cols.uid.create_bloomfilter)
+        table = self.h5file.create_table(
+            '/', 'others', {'b': tb.BoolCol(), 'c': tb.ComplexCol(16),
+                            'a': tb.Int32Col(shape=2), 'i': tb.Int32Col()})
+        self.assertRaises(TypeError, table.cols.b.create_bloomfilter)
+        self.assertRaises(TypeError, table.cols.c.create_bloomfilter)
+        self.assertRaises(TypeError, table.cols.a.create_bloomfilter)
+        self.assertRaises(ValueError, table.cols.i.create_bloomfilter, 0)
+
+
+class ThreadedCompletelySortedIndexTestCase(CompletelySortedIndexTestCase):
+    open_kwargs = {'max_index_threads': 3}
+
+
+class MergeSlicesTestCase(common.TempFileMixin, common.PyTablesTestCase):
+    """Test the merge of the sorted slices of completely sorted indexes."""
+
+    open_kwargs = {'max_index_threads': 1}
+
+    class Record(tb.IsDescription):
+        i = tb.Int32Col(pos=0)
+        f = tb.Float64Col(pos=1)
+        s = tb.StringCol(3, pos=2)
+
+    def check_index(self, nrows, blocksizes):
+        rng = np.random.default_rng(nrows)
+        table = self.h5file.create_table('/', 'table%d' % nrows,
+                                         self.Record)
+        rows = np.empty(nrows, dtype=table.dtype)
+        rows['i'] = rng.integers(0, nrows // 10 + 1, nrows)
+        rows['f'] = rng.random(nrows)
+        rows['f'][rng.random(nrows) < 0.05] = np.nan
+        rows['s'] = [b'%d' % i for i in rows['i'] % 997]
+        table.append(rows)
+        for colname in ['i', 'f', 's']:
+            column = table.colinstances[colname]
+            column.create_csindex(_blocksizes=blocksizes)
+            index = column.index
+            self.assertTrue(index.is_csi)
+            values = rows[colname]
+            order = np.argsort(values, kind='stable')
+            # NaNs are sorted last and compared as equal here.
+            np.testing.assert_array_equal(index.read_sorted(), values[order])
+            coords = index.read_indices()
+            np.testing.assert_array_equal(np.sort(coords), np.arange(nrows))
+            np.testing.assert_array_equal(values[coords], values[order])
+            # Lookups in the merged index work as usual.
+            limit = values[nrows // 3]
+            self.assertEqual(
+                sorted(table.get_where_list('%s <= limit' % colname)),
+                np.flatnonzero(values <= limit).tolist())
+
+    def test_last_row(self):
+        self.check_index(1000, small_blocksizes)
+
+    def test_no_last_row(self):
+        self.check_index(900, small_blocksizes)
+
+    def test_many_slices(self):
+        self.check_index(1234, (96, 24, 6, 3))
+
+
+class ThreadedMergeSlicesTestCase(MergeSlicesTestCase):
+    open_kwargs = {'max_index_threads': 3}
+
+
+class IncrementalIndexTestCase(common.TempFileMixin, common.PyTablesTestCase):
+    """Test the upkeep of indexes when appending a few rows at a time."""
+
+    open_kwargs = {'max_unindexed_rows': 0}
+
+    class Record(tb.IsDescription):
+        i = tb.Int32Col(pos=0)
+        f = tb.Float64Col(pos=1)
+
+    def setUp(self):
+        super().setUp()
+        self.table = self.h5file.create_table('/', 'table', self.Record,
+                                              chunkshape=(16,))
+        self.table.cols.i.create_index(kind='full',
+                                       _blocksizes=small_blocksizes)
+        self.table.cols.f.create_index(kind='light',
+                                       _blocksizes=small_blocksizes)
+        self.table.create_composite_index(['i', 'f'],
+                                          _blocksizes=small_blocksizes)
+        self.rows = np.empty(0, dtype=self.table.dtype)
+        self.rng = np.random.default_rng(1)
+
+    def append(self, nrows):
+        rows = np.empty(nrows, dtype=self.table.dtype)
+        rows['i'] = self.rng.integers(0, 50, nrows)
+        rows['f'] = self.rng.random(nrows)
+        self.table.append(rows)
+        self.table.flush()
+        self.rows = np.concatenate([self.rows, rows])
+
+    def check_queries(self):
+        table, rows = self.table, self.rows
+        conditions = {
+            'i == 7': rows['i'] == 7,
+            '(i > 10) & (i <= 12)': (rows['i'] > 10) & (rows['i'] <= 12),
+            '(i == 3) & (f < 0.5)': (rows['i'] == 3) & (rows['f'] < 0.5),
+            'f > 0.9': rows['f'] > 0.9,
+            'i > 100': rows['i'] > 100,
+            'isin(i, values)': np.isin(rows['i'], [5, 9, 77]),
+        }
+        condvars = {'values': np.array([5, 9, 77])}
+        for condition, expected in conditions.items():
+            self.assertTrue(table.will_query_use_indexing(condition,
+                                                          condvars))
+            coords = table.get_where_list(condition, condvars, sort=True)
+            np.testing.assert_array_equal(coords, np.flatnonzero(expected))
+            self.assertEqual(table.count_where(condition, condvars),
+                             expected.sum())
+
+    def check_index(self, index):
+        nelements = index.nelements
+        maxunindexed = self.h5file.params['MAX_UNINDEXED_ROWS']
+        self.assertLessEqual(self.table.nrows - nelements, maxunindexed)
+        values = self.rows['i'][:nelements]
+        coords = index.read_indices()
+        np.testing.assert_array_equal(np.sort(coords), np.arange(nelements))
+        np.testing.assert_array_equal(index.read_sorted(), values[coords])
+        # Every slice (and the last row) is sorted.
+        for start in range(0, nelements, index.slicesize):
+            svalues = index.read_sorted(
+                start, min(start + index.slicesize, nelements))
+            np.testing.assert_array_equal(svalues, np.sort(svalues))
+
+    def test_appends(self):
+        for nrows in [5, 1, 30, 7, 100, 3, 200, 11, 1, 60]:
+            self.append(nrows)
+            self.check_index(self.table.cols.i.index)
+            self.check_queries()
+
+    def test_close(self):
+        for nrows in [20, 7, 150, 3]:
+            self.append(nrows)
+        self._reopen()
+        self.table = self.h5file.root.table
+        for index in [self.table.cols.i.index, self.table.cols.f.index,
+                      *self.table.composite_indexes.values()]:
+            self.assertEqual(index.nelements, len(self.rows))
+        self.check_queries()
+
+    def test_read_sorted(self):
+        for nrows in [20, 7, 150, 3]:
+            self.append(nrows)
+        values = self.table.read_sorted('i')['i']
+        index = self.table.cols.i.index
+        self.assertEqual(index.nelements, len(self.rows))
+        self.check_index(index)
+        np.testing.assert_array_equal(values, index.read_sorted())
+
+
+class LazyIncrementalIndexTestCase(IncrementalIndexTestCase):
+    open_kwargs = {'max_unindexed_rows': 20}
+
+    def test_unindexed_rows(self):
+        index = self.table.cols.i.index
+        self.assertEqual(index.slicesize, 32)
+        # Complete slices are always indexed, and the last row once more
+        # than ``max_unindexed_rows`` are left out.
+        for nrows, nelements in [(10, 0), (20, 30), (10, 32), (5, 32),
+                                 (10, 55)]:
+            self.append(nrows)
+            self.assertEqual(index.nelements, nelements)
+            self.check_queries()
+
+
+
+class BackgroundReindexTestCase(common.TempFileMixin,
+                                common.PyTablesTestCase):
+    """Test rebuilding indexes in a background thread."""
+
+    open_kwargs = {'background_reindex': True}
+    nrows = 10_000
+
+    def setUp(self):
+        super().setUp()
+        rows = np.empty(self.nrows, dtype=[('i', 'i4'), ('f', 'f8')])
+        rows['i'] = np.arange(self.nrows) % 100
+        rows['f'] = np.arange(self.nrows)
+        self.table = self.h5file.create_table('/', 'table', rows)
+        self.table.cols.i.create_index(kind='full')
+        self.table.create_composite_index(['i', 'f'])
+        self.rows = rows
+
+    def indexes(self):
+        return [self.table.cols.i.index,
+                *self.table.composite_indexes.values()]
+
+    def check_queries(self, indexed=True):
+        table, rows = self.table, self.rows
+        conditions = {
+            'i == 7': rows['i'] == 7,
+            '(i == 3) & (f < 5000)': (rows['i'] == 3) & (rows['f'] < 5000),
+            'i > 1000': rows['i'] > 1000,
+        }
+        for condition, expected in conditions.items():
+            self.assertEqual(bool(table.will_query_use_indexing(condition)),
+                             indexed)
+            coords = table.get_where_list(condition, sort=True)
+            np.testing.assert_array_equal(coords, np.flatnonzero(expected))
+
+    @contextlib.contextmanager
+    def blocked_rebuild(self):
+        """Make rebuilds in the background wait for the returned events.
+
+        The first event is set when the rebuild is about to build a column
+        index, and the second one lets it go on.
+
+        """
+
+        started, release = threading.Event(), threading.Event()
+        build_index = tb.table._column__build_index
+
+        def blocked_build_index(*args, **kwargs):
+            started.set()
+            release.wait()
+            return build_index(*args, **kwargs)
+
+        with mock.patch('tables.table._column__build_index',
+                        blocked_build_index):
+            yield started, release
+
+    def check_reindexed(self, future):
+        future.result()
+        self.check_queries()
+        for index in self.indexes():
+            self.assertFalse(index.dirty)
+            self.assertEqual(index.nelements, len(self.rows))
+        for name in self.h5file.root._i_table._v_children:
+            self.assertFalse(name.startswith('__rebuilt_'))
+
+    def modify(self, start, values):
+        self.table.modify_column(start, start + len(values), column=values,
+                                 colname='i')
+        self.rows['i'][start:start + len(values)] = values
+
+    def append(self, nrows):
+        rows = np.empty(nrows, dtype=self.rows.dtype)
+        rows['i'] = 2000
+        rows['f'] = -1
+        self.table.append(rows)
+        self.table.flush()
+        self.rows = np.concatenate([self.rows, rows])
+
+    def test_reindex_dirty(self):
+        self.table.autoindex = False
+        self.modify(10, [2000] * 5)
+        for index in self.indexes():
+            self.assertTrue(index.dirty)
+        with self.blocked_rebuild() as (started, release):
+            future = self.table.reindex_dirty(background=True)
+            # Dirty indexes are not used until the new ones replace them.
+            self.check_queries(indexed=False)
+            release.set()
+            self.check_reindexed(future)
+
+    def test_reindex(self):
+        with self.blocked_rebuild() as (started, release):
+            future = self.table.reindex(background=True)
+            self.check_queries()
+            release.set()
+            self.assertEqual(future.result(), self.nrows)
+            self.check_reindexed(future)
+
+    def test_column_reindex(self):
+        future = self.table.cols.i.reindex(background=True)
+        self.check_reindexed(future)
+        future = self.table.cols.f.reindex_dirty(background=True)
+        self.assertEqual(future.result(), 0)
+
+    def test_autoindex(self):
+        self.modify(0, [2000])
+        job = self.table._reindexjob
+        self.assertIsNotNone(job)
+        self.check_reindexed(job.future)
+
+    def test_append(self):
+        with self.blocked_rebuild() as (started, release):
+            self.modify(0, [2000])
+            future = self.table._reindexjob.future
+            started.wait()
+            self.append(100)
+            release.set()
+            # Appended rows are indexed when the new indexes are in place.
+            self.assertEqual(future.result(), self.nrows)
+            self.check_reindexed(future)
+        self.append(100)
+        self.check_queries()
+
+    def test_modify(self):
+        with self.blocked_rebuild() as (started, release):
+            self.modify(0, [2000])
+            job = self.table._reindexjob
+            self.modify(1, [2001])
+            self.assertIs(self.table._reindexjob, job)
+            release.set()
+            job.future.result()
+        # The rebuilt indexes were out of date, so they are built again.
+        self.check_queries(indexed=False)
+        self.assertIsNot(self.table._reindexjob, job)
+        self.check_reindexed(self.table._reindexjob.future)
+
+    def test_close(self):
+        self.modify(0, [2000])
+        self._reopen()
+        self.table = self.h5file.root.table
+        for index in self.indexes():
+            self.assertFalse(index.dirty)
+        self.check_queries()
+
+    def test_not_threadsafe(self):
+        with mock.patch('tables.table.is_hdf5_threadsafe',
+                        return_value=False):
+            self.modify(0, [2000])
+        self.assertIsNone(self.table._reindexjob)
+        self.check_queries()
+
+    def test_failure(self):
+        with mock.patch('tables.table._column__build_index',
+                        side_effect=RuntimeError("boom")):
+            future = self.table.reindex(background=True)
+            self.assertRaises(RuntimeError, future.result)
+        with self.assertWarns(UserWarning):
+            self.check_queries()
+        for name in self.h5file.root._i_table._v_children:
+            self.assertFalse(name.startswith('__rebuilt_'))
+
+
+class ChunkmapTestCase(common.TempFileMixin, common.PyTablesTestCase):
+    """Test the chunkmaps computed from the indices of every slice."""
+
+    nrows = 5000
+
+    def setUp(self):
+        super().setUp()
+        rng = np.random.default_rng(self.nrows)
+        self.values = rng.integers(0, 1000, self.nrows).astype('int32')
+        self.table = self.h5file.create_table(
+            '/', 'table', {'i': tb.Int32Col()}, chunkshape=16)
+        self.table.append([(v,) for v in self.values])
+
+    def expected_chunkmap(self, index):
+        """Compute the chunkmap of the last lookup slice by slice."""
+
+        nchunks = math.ceil(index.nelements / index.lbucket)
+        chunkmap = np.zeros(shape=nchunks, dtype="bool")
+        starts = (index.starts.astype(np.int64) - 1) * index.reduction + 1
+        stops = ((index.starts.astype(np.int64) + index.lengths)
+                 * index.reduction)
+        starts[starts < 0] = 0
+        for nslice in range(index.nrows):
+            if stops[nslice] > starts[nslice]:
+                idx = index._read_index_slice(
+                    nslice, starts[nslice], stops[nslice])
+                chunkmap[index._buckets_of(nslice, idx)] = True
+        return index._bucket_chunkmap_to_table(chunkmap)
+
+    def check_chunkmap(self, kind):
+        self.table.cols.i.create_index(kind=kind, _blocksizes=small_blocksizes)
+        index = self.table.cols.i.index
+        for lo, hi in [(0, 999), (100, 110), (500, 500), (2000, 3000)]:
+            index.search(index.get_lookup_range(('ge', 'le'), (lo, hi)))
+            chunkmap = index.get_chunkmap()
+            np.testing.assert_array_equal(
+                chunkmap, self.expected_chunkmap(index))
+            # Every chunk with matching rows is in the chunkmap
+            selected = (self.values >= lo) & (self.values <= hi)
+            chunks = np.unique(np.flatnonzero(selected) // 16)
+            self.assertTrue(chunkmap[chunks].all())
+
+    def test_ultralight(self):
+        self.check_chunkmap('ultralight')
+
+    def test_light(self):
+        self.check_chunkmap('light')
+
+    def test_medium(self):
+        self.check_chunkmap('medium')
+
+    def test_full(self):
+        self.check_chunkmap('full')
+
+    def test_batches(self):
+        with mock.patch('tables.index.max_chunkmap_batch', 100):
+            self.check_chunkmap('full')
+
+
+class TopKTestCase(common.TempFileMixin, common.PyTablesTestCase):
+    """Test reading the rows with the largest values of a CSI column."""
+
+    nrows = 3000
+
+    class Record(tb.IsDescription):
+        i = tb.Int32Col(pos=0)
+        f = tb.Float64Col(pos=1)
+
+    def setUp(self):
+        super().setUp()
+        rng = np.random.default_rng(self.nrows)
+        self.rows = np.empty(self.nrows, dtype=[('i', 'i4'), ('f', 'f8')])
+        self.rows['i'] = rng.integers(0, 100, self.nrows)
+        self.rows['f'] = rng.permutation(self.nrows)
+        self.table = self.h5file.create_table('/', 'table', self.Record)
+        self.table.append(self.rows)
+        self.table.cols.f.create_csindex(_blocksizes=small_blocksizes)
+
+    def expected(self, k, selected=None, reverse=True):
+        rows = self.rows if selected is None else self.rows[selected]
+        order = np.argsort(rows['f'])
+        if reverse:
+            order = order[::-1]
+        return rows[order[:k]]
+
+    def test_top(self):
+        for k in [0, 1, 10, 500]:
+            result = self.table.top_k('f', k)
+            np.testing.assert_array_equal(result, self.expected(k))
+
+    def test_bottom(self):
+        result = self.table.top_k('f', 10, reverse=False)
+        np.testing.assert_array_equal(
+            result, self.expected(10, reverse=False))
+
+    def test_condition(self):
+        result = self.table.top_k(self.table.cols.f, 20, 'i == 3')
+        np.testing.assert_array_equal(
+            result, self.expected(20, self.rows['i'] == 3))
+        limit = 5
+        result = self.table.top_k('f', 20, '(i < limit) & (f > 2)',
+                                  field='i', reverse=False)
+        selected = (self.rows['i'] < limit) & (self.rows['f'] > 2)
+        np.testing.assert_array_equal(
+            result, self.expected(20, selected, reverse=False)['i'])
+
+    def test_few_rows(self):
+        result = self.table.top_k('f', 100, 'f < 5')
+        np.testing.assert_array_equal(result['f'], [4, 3, 2, 1, 0])
+        self.assertEqual(len(self.table.top_k('f', 10, 'i > 1000')), 0)
+
+    def test_unindexed_rows(self):
+        self.table.autoindex = False
+        more = np.array([(3, 5000.), (4, -1.), (3, 4000.)],
+                        dtype=self.rows.dtype)
+        self.table.append(more)
+        self.table.flush()
+        self.rows = np.concatenate([self.rows, more])
+        self.assertEqual(self.table.cols.f.index.nelements, self.nrows)
+        result = self.table.top_k('f', 5)
+        np.testing.assert_array_equal(result, self.expected(5))
+        result = self.table.top_k('f', 5, 'i == 4', reverse=False)
+        np.testing.assert_array_equal(
+            result, self.expected(5, self.rows['i'] == 4, reverse=False))
+
+    def test_not_csi(self):
+        self.table.cols.i.create_index(kind='full', optlevel=0,
+                                       _blocksizes=small_blocksizes)
+        self.assertFalse(self.table.cols.i.index.is_csi)
+        self.assertRaises(ValueError, self.table.top_k, 'i', 10)
+        self.assertRaises(ValueError, self.table.top_k, 'f', -1)
+
+
+class JoinTestCase(common.TempFileMixin, common.PyTablesTestCase):
+    """Test sort-merge joins of tables with CSI indexes."""
+
+    # Tiny I/O buffers, so that the indexes are walked in many steps.
+    open_kwargs = {'io_buffer_size': 64}
+
+    def setUp(self):
+        super().setUp()
+        rng = np.random.default_rng(1234)
+        self.left = np.empty(500, dtype=[('key', 'i4'), ('x', 'f8')])
+        self.left['key'] = rng.integers(0, 60, len(self.left))
+        self.left['x'] = np.arange(len(self.left))
+        self.right = np.empty(300, dtype=[('id', 'i8'), ('y', 'S4')])
+        self.right['id'] = rng.integers(0, 100, len(self.right))
+        self.right['y'] = [b'%d' % i for i in range(len(self.right))]
+        self.ltable = self.h5file.create_table('/', 'left', self.left,
+                                               chunkshape=4)
+        self.rtable = self.h5file.create_table('/', 'right', self.right,
+                                               chunkshape=4)
+        self.ltable.cols.key.create_csindex(_blocksizes=small_blocksizes)
+        self.rtable.cols.id.create_csindex(_blocksizes=small_blocksizes)
+
+    def expected(self, how):
+        rows = []
+        for lrow in self.left:
+            matches = self.right[self.right['id'] == lrow['key']]
+            if len(matches) == 0 and how == 'left':
+                rows.append((lrow['key'], lrow['x'], 0, b''))
+            for rrow in matches:
+                rows.append((lrow['key'], lrow['x'], rrow['id'], rrow['y']))
+        return sorted(rows)
+
+    def check_join(self, how):
+        result = self.ltable.join(self.rtable, ('key', 'id'), how=how)
+        self.assertEqual(result.dtype.names, ('key', 'x', 'id', 'y'))
+        self.assertTrue(np.all(np.diff(result['key']) >= 0))
+        self.assertEqual(sorted(result.tolist()), self.expected(how))
+
+    def test_inner(self):
+        self.check_join('inner')
+
+    def test_left(self):
+        self.check_join('left')
+
+    def test_columns(self):
+        result = self.ltable.join(self.rtable, ('key', 'id'),
+                                  columns=['y', 'key'])
+        self.assertEqual(result.dtype.names, ('y', 'key'))
+        self.assertEqual(sorted(result.tolist()),
+                         sorted((r[3], r[0]) for r in self.expected('inner')))
+
+    def test_dest(self):
+        dest = self.h5file.create_table(
+            '/', 'dest', {'x': tb.Float64Col(pos=0), 'y': tb.StringCol(4)})
+        nrows = self.ltable.join(self.rtable, ('key', 'id'),
+                                 columns=['x', 'y'], dest=dest)
+        expected = sorted((r[1], r[3]) for r in self.expected('inner'))
+        self.assertEqual(nrows, len(expected))
+        self.assertEqual(sorted(dest.read().tolist()), expected)
+
+    def test_self_join(self):
+        result = self.ltable.join(self.ltable, 'key', columns=['key', 'x'])
+        counts = np.bincount(self.left['key'])
+        self.assertEqual(len(result), np.sum(counts ** 2))
+        np.testing.assert_array_equal(
+            np.bincount(result['key']), counts ** 2)
+
+    def test_errors(self):
+        self.assertRaises(ValueError, self.ltable.join, self.rtable,
+                          ('key', 'id'), how='outer')
+        self.assertRaises(ValueError, self.ltable.join, self.rtable,
+                          ('x', 'id'))
+        self.assertRaises(KeyError, self.ltable.join, self.rtable,
+                          ('key', 'id'), columns=['z'])
+
+
 def suite():
     theSuite = common.unittest.TestSuite()
 
@@ -2697,6 +3806,22 @@ def suite():
         theSuite.addTest(common.make_suite(Issue119Time32ColTestCase))
         theSuite.addTest(common.make_suite(Issue119Time64ColTestCase))
         theSuite.addTest(common.make_suite(TestIndexingNans))
+        theSuite.addTest(common.make_suite(CoveringIndexTestCase))
+        theSuite.addTest(common.make_suite(CoveringCSIndexTestCase))
+        theSuite.addTest(common.make_suite(CompositeIndexTestCase))
+        theSuite.addTest(common.make_suite(FullCompositeIndexTestCase))
+        theSuite.addTest(common.make_suite(ZoneMapTestCase))
+        theSuite.addTest(common.make_suite(BloomFilterTestCase))
+        theSuite.addTest(
+            common.make_suite(ThreadedCompletelySortedIndexTestCase))
+        theSuite.addTest(common.make_suite(MergeSlicesTestCase))
+        theSuite.addTest(common.make_suite(ThreadedMergeSlicesTestCase))
+        theSuite.addTest(common.make_suite(IncrementalIndexTestCase))
+        theSuite.addTest(common.make_suite(LazyIncrementalIndexTestCase))
+        theSuite.addTest(common.make_suite(BackgroundReindexTestCase))
+        theSuite.addTest(common.make_suite(ChunkmapTestCase))
+        theSuite.addTest(common.make_suite(TopKTestCase))
+        theSuite.addTest(common.make_suite(JoinTestCase))
     if common.heavy:
         # These are too heavy for normal testing
         theSuite.addTest(common.make_suite(AI4bTestCase))
@@ -0,0 +1,423 @@
+"""Test module for the LRU caches."""
+
+import sys
+from collections import OrderedDict
+from unittest import mock
+
+import numpy as np
+
+import tables as tb
+from tables.chunkcache import get_shared_cache
+from tables.lrucacheextension import NodeCache, NumCache, ObjectCache
+from tables.tests import common
+
+
+class NodeCacheTestCase(common.PyTablesTestCase):
+    """Test for the cache of nodes."""
+
+    def test_lru(self):
+        cache = NodeCache(3)
+        for i in range(4):
+            cache[f'/n{i}'] = i
+        self.assertEqual(len(cache), 3)
+        self.assertEqual(list(cache), ['/n1', '/n2', '/n3'])
+        self.assertNotIn('/n0', cache)
+        self.assertIn('/n1', cache)
+        # Setting a path again makes it the most recently used one
+        cache['/n1'] = 10
+        cache['/n4'] = 4
+        self.assertEqual(list(cache), ['/n3', '/n1', '/n4'])
+
+    def test_pop(self):
+        cache = NodeCache(3)
+        cache['/a'] = 1
+        cache['/b'] = 2
+        self.assertEqual(cache.pop('/a'), 1)
+        self.assertNotIn('/a', cache)
+        self.assertIsNone(cache.pop('/a', None))
+        self.assertRaises(KeyError, cache.pop, '/a')
+        self.assertEqual(len(cache), 1)
+
+    def test_empty(self):
+        cache = NodeCache(0)
+        cache['/a'] = 1
+        self.assertEqual(len(cache), 0)
+        self.assertRaises(ValueError, NodeCache, -1)
+
+
+class ObjectCacheTestCase(common.PyTablesTestCase):
+    """Test for the cache of Python objects."""
+
+    def put(self, cache, key, size=1):
+        if cache.getslot(key) < 0:
+            cache.setitem(key, f'value {key}', size)
+
+    def get(self, cache, key):
+        nslot = cache.getslot(key)
+        return None if nslot < 0 else cache.getitem(nslot)
+
+    def test_lru(self):
+        nslots = 50
+        cache = ObjectCache(nslots, 10**6, 'test')
+        model = OrderedDict()
+        rng = np.random.default_rng(2)
+        for key in rng.integers(0, 2 * nslots, 400).tolist():
+            if key in model:
+                model.move_to_end(key)
+                self.assertEqual(self.get(cache, key), f'value {key}')
+                continue
+            self.assertIsNone(self.get(cache, key))
+            self.put(cache, key)
+            model[key] = True
+            if len(model) > nslots:
+                model.popitem(last=False)
+        for key in range(2 * nslots):
+            self.assertEqual(key in cache, key in model)
+
+    def test_size(self):
+        cache = ObjectCache(10, 100, 'test')
+        self.put(cache, 'small1', 10)
+        self.put(cache, 'large1', 40)
+        self.put(cache, 'large2', 40)
+        self.put(cache, 'small2', 10)
+        # The LRU among the largest objects goes away first
+        self.get(cache, 'small1')
+        self.get(cache, 'large1')
+        self.put(cache, 'large3', 40)
+        self.assertEqual(sorted(k for k in ['small1', 'small2', 'large1',
+                                            'large2', 'large3']
+                                if k in cache),
+                         ['large1', 'large3', 'small1', 'small2'])
+        self.put(cache, 'large4', 50)
+        self.assertNotIn('large1', cache)
+        self.assertNotIn('large3', cache)
+        self.assertIn('small1', cache)
+        # Objects larger than the cache are not kept
+        self.assertEqual(cache.setitem('huge', 'value', 101), -1)
+        self.assertNotIn('huge', cache)
+
+    def test_replace(self):
+        cache = ObjectCache(2, 100, 'test')
+        cache.setitem('a', 1, 10)
+        cache.setitem('a', 2, 10)
+        self.assertEqual(self.get(cache, 'a'), 2)
+        self.put(cache, 'b')
+        self.put(cache, 'c')
+        self.assertNotIn('a', cache)
+        self.assertEqual(self.get(cache, 'b'), 'value b')
+        self.assertEqual(self.get(cache, 'c'), 'value c')
+
+    def test_resize(self):
+        cache = ObjectCache(10, 100, 'test')
+        for key in 'abcd':
+            self.put(cache, key, 20)
+        self.get(cache, 'a')
+        cache.resize(50)
+        self.assertEqual(cache.maxnbytes, 50)
+        self.assertEqual([k for k in 'abcd' if k in cache], ['a', 'd'])
+        self.assertEqual(cache.stats()['evictions'], 2)
+        # Evicted keys are remembered as ghosts
+        self.assertIsNone(self.get(cache, 'b'))
+        self.assertEqual(cache.nghosthits, 1)
+        self.assertIsNone(self.get(cache, 'e'))
+        self.assertEqual(cache.nghosthits, 1)
+
+
+class NumCacheTestCase(common.PyTablesTestCase):
+    """Test for the cache of numerical data."""
+
+    def test_lru(self):
+        nslots, slotsize = 40, 3
+        cache = NumCache((nslots, slotsize), np.dtype('int64'), 'test')
+        model = OrderedDict()
+        out = np.empty(slotsize, dtype='int64')
+        rng = np.random.default_rng(3)
+        for key in rng.integers(0, 2 * nslots, 300).tolist():
+            nslot = cache.getslot(key)
+            if key in model:
+                model.move_to_end(key)
+                self.assertGreaterEqual(nslot, 0)
+                cache.getitem(nslot, out, 0)
+                np.testing.assert_array_equal(out, [key] * slotsize)
+                continue
+            self.assertEqual(nslot, -1)
+            cache.setitem(key, np.array([key] * slotsize, dtype='int64'), 0)
+            model[key] = True
+            if len(model) > nslots:
+                model.popitem(last=False)
+        for key in range(2 * nslots):
+            self.assertEqual(cache.getslot(key) >= 0, key in model)
+
+    def test_resize(self):
+        slotsize = 3
+        cache = NumCache((10, slotsize), np.dtype('int64'), 'test')
+        out = np.empty(slotsize, dtype='int64')
+        for key in range(10):
+            cache.setitem(key, np.array([key] * slotsize, dtype='int64'), 0)
+        cache.getitem(cache.getslot(2), out, 0)
+        slotbytes = slotsize * 8
+        cache.resize(4 * slotbytes + 1)
+        self.assertEqual(cache.stats()['nslots'], 4)
+        self.assertEqual(cache.maxnbytes, 4 * slotbytes)
+        self.assertEqual(cache.stats()['evictions'], 6)
+        self.assertEqual([key for key in range(10) if cache.getslot(key) >= 0],
+                         [2, 7, 8, 9])
+        # Evicted keys are remembered as ghosts
+        self.assertEqual(cache.nghosthits, 6)
+        cache.resize(20 * slotbytes)
+        for key in [2, 7, 8, 9]:
+            cache.getitem(cache.getslot(key), out, 0)
+            np.testing.assert_array_equal(out, [key] * slotsize)
+        for key in range(10, 27):
+            cache.setitem(key, np.array([key] * slotsize, dtype='int64'), 0)
+        self.assertEqual(cache.stats()['nused'], 20)
+        self.assertEqual(cache.getslot(2), -1)
+        self.assertEqual(cache.nghosthits, 7)
+
+
+class CacheBudgetTestCase(common.TempFileMixin, common.PyTablesTestCase):
+    """Test for the budget shared by the caches of a file."""
+
+    budget = 2**18
+
+    def setUp(self):
+        super().setUp()
+        for name in ['hot', 'cold']:
+            table = self.h5file.create_table(
+                '/', name, {'c1': tb.Int32Col(), 'c2': tb.Float64Col()},
+                chunkshape=(100,))
+            table.append([(i // 100, i / 2) for i in range(20_000)])
+            table.cols.c1.create_index()
+        self._reopen(CACHE_BUDGET=self.budget)
+
+    def test_disabled(self):
+        self._reopen()
+        self.assertIsNone(self.h5file._cache_manager)
+
+    def test_rebalance(self):
+        manager = self.h5file._cache_manager
+        self.assertIsNotNone(manager)
+        manager.rebalance_every = 10**6  # only rebalance here
+        hot, cold = self.h5file.root.hot, self.h5file.root.cold
+        cold.get_where_list('c1 >= 0')
+        manager.rebalance()
+        rng = np.random.default_rng(4)
+        for value in rng.integers(0, 50, 100):
+            hot.get_where_list(f'c1 == {value}')
+        sizes = manager.rebalance()
+        self.assertLessEqual(sum(sizes.values()), self.budget)
+        self.assertGreater(sizes['/hot sequences'], sizes['/cold sequences'])
+        stats = self.h5file.cache_stats()
+        for name, size in sizes.items():
+            self.assertLessEqual(stats[name]['nbytes'], size)
+            # Caches are shrunk instead of disabled
+            self.assertTrue(stats[name]['enabled'])
+        # Queries give the same results as with fixed sizes
+        coords = [hot.get_where_list(f'c1 == {value}') for value in range(60)]
+        self._reopen()
+        for value in range(60):
+            np.testing.assert_array_equal(
+                self.h5file.root.hot.get_where_list(f'c1 == {value}'),
+                coords[value])
+
+
+class CacheStatsTestCase(common.TempFileMixin, common.PyTablesTestCase):
+    """Test for the statistics of caches."""
+
+    def setUp(self):
+        super().setUp()
+        table = self.h5file.create_table(
+            '/', 'table', {'c1': tb.Int32Col(), 'c2': tb.Float64Col()},
+            chunkshape=(10,))
+        table.append([(i % 37, i / 2) for i in range(1000)])
+        table.cols.c1.create_index()
+        self.h5file.create_group('/', 'group')
+        self._reopen()
+
+    def test_cache(self):
+        cache = ObjectCache(2, 100, 'test')
+        cache.getslot('a')
+        for key in 'abc':
+            cache.setitem(key, key, 10)
+        cache.getslot('c')
+        self.assertEqual(cache.stats(), {
+            'hits': 1, 'misses': 1, 'evictions': 1, 'nslots': 2,
+            'nused': 2, 'nbytes': 20, 'enabled': True})
+        cache.resetstats()
+        self.assertEqual(cache.stats()['hits'], 0)
+        self.assertEqual(cache.stats()['nused'], 2)
+        self.assertFalse(ObjectCache(0, 0, 'test').stats()['enabled'])
+
+    def test_file(self):
+        stats = self.h5file.cache_stats()
+        self.assertEqual(list(stats), ['nodes'])
+        for _ in range(3):
+            self.h5file.get_node('/group')
+        table = self.h5file.root.table
+        for _ in range(2):
+            table.get_where_list('(c1 > 3) & (c1 < 6)')
+        stats = self.h5file.cache_stats()
+        self.assertGreaterEqual(stats['nodes']['hits'], 2)
+        self.assertEqual(stats['/table conditions']['misses'], 1)
+        self.assertGreater(stats['/table conditions']['hits'], 0)
+        self.assertIn('/table chunks', stats)
+        self.assertIn('/table sequences', stats)
+        self.assertIn('/_i_table/c1 bounding limits', stats)
+        self.assertTrue(any(s['misses'] > 0 for name, s in stats.items()
+                            if name.startswith('/_i_table/c1 ')))
+        for cachestats in stats.values():
+            self.assertEqual(sorted(cachestats),
+                             ['enabled', 'evictions', 'hits', 'misses',
+                              'nbytes', 'nslots', 'nused'])
+
+    def test_reset(self):
+        self.h5file.root.table.get_where_list('c1 > 3')
+        stats = self.h5file.cache_stats(reset=True)
+        self.assertGreater(stats['/table conditions']['misses'], 0)
+        stats = self.h5file.cache_stats()
+        for cachestats in stats.values():
+            self.assertEqual(cachestats['hits'], 0)
+            self.assertEqual(cachestats['misses'], 0)
+            self.assertEqual(cachestats['evictions'], 0)
+
+    def test_get_cache_stats(self):
+        stats = tb.get_cache_stats()
+        self.assertEqual(sorted(stats), ['files', 'shared chunks'])
+        self.assertEqual(stats['shared chunks']['enabled'],
+                         get_shared_cache() is not None)
+        handles = [fstats for fstats in stats['files']
+                   if fstats['filename'] == self.h5fname]
+        self.assertEqual(len(handles), 1)
+        self.assertEqual(handles[0]['mode'], 'r')
+        self.assertIn('nodes', handles[0]['caches'])
+
+
+class SharedChunkCacheTestCase(common.TempFileMixin,
+                               common.PyTablesTestCase):
+    """Test for the cache of chunks shared by open files."""
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.multiple(tb.parameters,
+                                      SHARED_CHUNK_CACHE_SIZE=2**20,
+                                      SHARED_CHUNK_CACHE_SLOTS=256)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = get_shared_cache()
+        self.data = np.arange(60 * 70).reshape(60, 70)
+        self.h5file.create_carray('/', 'carray', obj=self.data,
+                                  chunkshape=(7, 9))
+        self.h5file.create_earray('/', 'earray', obj=self.data,
+                                  chunkshape=(5, 70))
+        vlarray = self.h5file.create_vlarray('/', 'vlarray', tb.Int32Atom(),
+                                             chunkshape=4)
+        for i in range(30):
+            vlarray.append(np.arange(i))
+        table = self.h5file.create_table(
+            '/', 'table', {'c1': tb.Int32Col(), 'c2': tb.Float64Col()},
+            chunkshape=(10,))
+        table.append([(i % 37, i / 2) for i in range(1000)])
+        table.cols.c1.create_index()
+
+    def counts(self):
+        return self.cache.cache.nhits, self.cache.cache.nmisses
+
+    def test_stats(self):
+        self.h5file.root.carray[:10]
+        stats = tb.get_cache_stats()['shared chunks']
+        self.assertTrue(stats['enabled'])
+        self.assertEqual(stats['misses'], self.counts()[1])
+        self.assertGreater(stats['nbytes'], 0)
+
+    def test_disabled(self):
+        with mock.patch.object(tb.parameters, 'SHARED_CHUNK_CACHE_SIZE', 0):
+            self.assertIsNone(get_shared_cache())
+        self.assertIs(get_shared_cache(), self.cache)
+
+    def test_array_slices(self):
+        carray = self.h5file.root.carray
+        keys = [(slice(3, 40), slice(5, 61)), (5, slice(None, None, 4)),
+                (slice(2, 60, 11), 65), (slice(None), slice(None)),
+                (slice(56, None), slice(0, 3))]
+        for key in keys:
+            np.testing.assert_array_equal(carray[key], self.data[key])
+        hits, misses = self.counts()
+        self.assertGreater(misses, 0)
+        for key in keys:
+            np.testing.assert_array_equal(carray[key], self.data[key])
+        self.assertEqual(self.counts()[1], misses)
+        self.assertGreater(self.counts()[0], hits)
+
+    def test_array_writes(self):
+        carray, earray = self.h5file.root.carray, self.h5file.root.earray
+        carray[:10, :10]
+        earray[-3:]
+        carray[4, 4:6] = -1
+        self.data[4, 4:6] = -1
+        np.testing.assert_array_equal(carray[:10, :10], self.data[:10, :10])
+        earray.append(self.data[:2])
+        np.testing.assert_array_equal(earray[-3:], self.data[[-1, 0, 1]])
+        earray.truncate(59)
+        np.testing.assert_array_equal(earray[-3:], self.data[-4:-1])
+
+    def test_vlarray(self):
+        vlarray = self.h5file.root.vlarray
+        for start, stop, step in [(0, 30, 1), (3, 22, 5), (9, 10, 1)]:
+            rows = vlarray.read(start, stop, step)
+            self.assertEqual(len(rows), len(range(start, stop, step)))
+            for nrow, row in zip(range(start, stop, step), rows):
+                np.testing.assert_array_equal(row, np.arange(nrow))
+        misses = self.counts()[1]
+        vlarray[5][:] = -1  # changes to rows do not reach the cache
+        np.testing.assert_array_equal(vlarray[5], np.arange(5))
+        self.assertEqual(self.counts()[1], misses)
+        vlarray[5] = np.zeros(5)
+        np.testing.assert_array_equal(vlarray[5], np.zeros(5))
+
+    def test_table(self):
+        table = self.h5file.root.table
+        condition = '(c1 > 3) & (c1 < 6)'
+        expected = [row.nrow for row in table if 3 < row['c1'] < 6]
+        self.assertEqual(table.get_where_list(condition).tolist(), expected)
+        table.modify_column(0, 10, column=[5] * 10, colname='c1')
+        expected = [row.nrow for row in table if 3 < row['c1'] < 6]
+        self.assertEqual(table.get_where_list(condition).tolist(), expected)
+
+    def test_reopen(self):
+        condition = '(c1 > 3) & (c1 < 6)'
+        self._reopen()
+        carray = self.h5file.root.carray
+        np.testing.assert_array_equal(carray[:20, :20], self.data[:20, :20])
+        coords = self.h5file.root.table.get_where_list(condition)
+        self._reopen()
+        h5file2 = tb.open_file(self.h5fname)
+        try:
+            misses = self.counts()[1]
+            np.testing.assert_array_equal(h5file2.root.carray[:20, :20],
+                                          self.data[:20, :20])
+            np.testing.assert_array_equal(self.h5file.root.carray[:20, :20],
+                                          self.data[:20, :20])
+            np.testing.assert_array_equal(
+                h5file2.root.table.get_where_list(condition), coords)
+            self.assertEqual(self.counts()[1], misses)
+        finally:
+            h5file2.close()
+
+
+def suite():
+    theSuite = common.unittest.TestSuite()
+
+    theSuite.addTest(common.make_suite(NodeCacheTestCase))
+    theSuite.addTest(common.make_suite(ObjectCacheTestCase))
+    theSuite.addTest(common.make_suite(NumCacheTestCase))
+    theSuite.addTest(common.make_suite(CacheBudgetTestCase))
+    theSuite.addTest(common.make_suite(CacheStatsTestCase))
+    theSuite.addTest(common.make_suite(SharedChunkCacheTestCase))
+
+    return theSuite
+
+
+if __name__ == '__main__':
+    common.parse_argv(sys.argv)
+    common.print_versions()
+    common.unittest.main(defaultTest='suite')
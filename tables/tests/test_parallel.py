@@ -0,0 +1,174 @@
+"""Test module for querying tables with worker processes."""
+
+import numpy as np
+
+import tables as tb
+from tables.parallel import ShardedQuery
+from tables.tests import common
+
+small_blocksizes = (300, 60, 20, 5)
+
+
+class Record(tb.IsDescription):
+    c1 = tb.Int32Col(pos=0)
+    c2 = tb.Float64Col(shape=(2,), pos=1)
+
+    class nested(tb.IsDescription):
+        c3 = tb.Int16Col(pos=0)
+
+
+class ShardedQueryTestCase(common.TempFileMixin, common.PyTablesTestCase):
+    nrows = 1000
+    indexed = False
+    ranges = [(None, None, None), (3, None, None), (5, 997, 7),
+              (15, 16, None), (999, None, 3)]
+
+    def setUp(self):
+        super().setUp()
+        table = self.h5file.create_table('/', 'table', Record,
+                                         chunkshape=(10,))
+        rows = np.empty(self.nrows, dtype=table.dtype)
+        rows['c1'] = np.arange(self.nrows) % 97
+        rows['c2'][:, 0] = np.arange(self.nrows) / 2
+        rows['c2'][:, 1] = -np.arange(self.nrows)
+        rows['nested']['c3'] = np.arange(self.nrows) % 13
+        table.append(rows)
+        if self.indexed:
+            table.cols.c1.create_index(_blocksizes=small_blocksizes)
+        self._reopen()
+        self.table = self.h5file.root.table
+        self.query = ShardedQuery(self.table, max_workers=2)
+
+    def tearDown(self):
+        self.query.close()
+        super().tearDown()
+
+    def test_shards(self):
+        for start, stop, step in self.ranges:
+            shards = self.query._shards(start, stop, step)
+            coords = np.concatenate([np.arange(*s) for s in shards])
+            expected = np.arange(
+                *self.table._process_range_read(start, stop, step))
+            self.assertTrue(common.areArraysEqual(coords, expected))
+            # Shards end at the boundary of a chunk.
+            for _, sstop, _ in shards[:-1]:
+                self.assertEqual(sstop % self.table.chunkshape[0], 0)
+
+    def test_read_where(self):
+        condition = '(c1 > lim) & (c3 < 7)'
+        condvars = {'lim': 50, 'c3': self.table.cols.nested.c3}
+        for start, stop, step in self.ranges:
+            kwargs = dict(start=start, stop=stop, step=step)
+            expected = self.table.read_where(condition, condvars, **kwargs)
+            result = self.query.read_where(condition, condvars, **kwargs)
+            self.assertTrue(common.areArraysEqual(result, expected))
+            for field in ['c2', 'nested/c3']:
+                expected = self.table.read_where(condition, condvars,
+                                                 field=field, **kwargs)
+                result = self.query.read_where(condition, condvars,
+                                               field=field, **kwargs)
+                self.assertTrue(common.areArraysEqual(result, expected))
+
+    def test_user_vars(self):
+        lim = 90
+        result = self.query.read_where('c1 >= lim')
+        self.assertTrue(common.areArraysEqual(
+            result, self.table.read_where('c1 >= lim')))
+        self.assertTrue(np.all(result['c1'] >= lim))
+
+    def test_get_where_list(self):
+        for start, stop, step in self.ranges:
+            kwargs = dict(start=start, stop=stop, step=step)
+            for sort in [False, True]:
+                expected = self.table.get_where_list('c1 < 10', sort=sort,
+                                                     **kwargs)
+                result = self.query.get_where_list('c1 < 10', sort=sort,
+                                                   **kwargs)
+                self.assertTrue(common.areArraysEqual(np.sort(result),
+                                                      np.sort(expected)))
+        self.assertTrue(common.areArraysEqual(
+            self.query.get_where_list('c1 < 10', sort=True),
+            self.table.get_where_list('c1 < 10', sort=True)))
+
+    def test_no_matches(self):
+        result = self.query.read_where('c1 > 1000')
+        self.assertEqual(len(result), 0)
+        self.assertEqual(result.dtype, self.table.dtype)
+        result = self.query.read_where('c1 > 1000', field='c2')
+        self.assertEqual(result.shape, (0, 2))
+        result = self.query.get_where_list('c1 > 1000')
+        self.assertEqual(len(result), 0)
+
+    def test_aggregate(self):
+        aggregations = {'c1': 'sum', 'c2': 'mean', 'nested/c3': 'max'}
+        for start, stop, step in self.ranges:
+            kwargs = dict(start=start, stop=stop, step=step)
+            rows = self.table.read_where('c1 > 50', **kwargs)
+            result = self.query.aggregate('c1 > 50', aggregations, **kwargs)
+            self.assertEqual(result['c1'], rows['c1'].sum())
+            if len(rows) > 0:
+                np.testing.assert_allclose(result['c2'],
+                                           rows['c2'].mean(axis=0))
+                self.assertEqual(result['nested/c3'],
+                                 rows['nested']['c3'].max())
+            else:
+                self.assertIsNone(result['c2'])
+                self.assertIsNone(result['nested/c3'])
+
+        result = self.query.aggregate('c1 > 1000', {'c1': 'count'})
+        self.assertEqual(result, {'c1': 0})
+        result = self.query.aggregate('c1 < 10', {'c1': 'count',
+                                                  'c2': 'min'})
+        c2 = self.table.read_where('c1 < 10', field='c2')
+        self.assertEqual(result['c1'], len(c2))
+        self.assertTrue(common.areArraysEqual(result['c2'], c2.min(axis=0)))
+
+    def test_aggregate_by(self):
+        aggregations = {'c1': 'count', 'c2': 'max'}
+        for start, stop, step in self.ranges:
+            kwargs = dict(start=start, stop=stop, step=step)
+            expected = self.table.aggregate('c1 > 50', aggregations,
+                                            by='nested/c3', **kwargs)
+            result = self.query.aggregate('c1 > 50', aggregations,
+                                          by='nested/c3', **kwargs)
+            self.assertEqual(list(result), list(expected))
+            for key, values in expected.items():
+                self.assertEqual(result[key]['c1'], values['c1'])
+                self.assertTrue(common.areArraysEqual(result[key]['c2'],
+                                                      values['c2']))
+
+    def test_aggregate_errors(self):
+        self.assertRaises(ValueError, self.query.aggregate,
+                          'c1 > 50', {'c1': 'median'})
+        self.assertRaises(KeyError, self.query.aggregate,
+                          'c1 > 50', {'c4': 'sum'})
+
+
+class IndexedShardedQueryTestCase(ShardedQueryTestCase):
+    indexed = True
+
+
+class ShardedQueryModeTestCase(common.TempFileMixin,
+                               common.PyTablesTestCase):
+    def test_writable_file(self):
+        table = self.h5file.create_table('/', 'table', Record)
+        self.assertRaises(tb.FileModeError, ShardedQuery, table)
+
+
+def suite():
+    theSuite = common.unittest.TestSuite()
+    niter = 1
+
+    for i in range(niter):
+        theSuite.addTest(common.make_suite(ShardedQueryTestCase))
+        theSuite.addTest(common.make_suite(IndexedShardedQueryTestCase))
+        theSuite.addTest(common.make_suite(ShardedQueryModeTestCase))
+
+    return theSuite
+
+
+if __name__ == '__main__':
+    import sys
+    common.parse_argv(sys.argv)
+    common.print_versions()
+    common.unittest.main(defaultTest='suite')
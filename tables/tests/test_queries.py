@@ -4,6 +4,7 @@ import re
 import sys
 import warnings
 import functools
+from unittest import mock
 
 import numpy as np
 
@@ -1221,6 +1222,602 @@ class IndexedTableUsage32(IndexedTableUsage):
 
 # Main part
 # ---------
+class BufferedQueryTestCase(common.TempFileMixin, common.PyTablesTestCase):
+    """Test for queries returning arrays one I/O buffer at a time."""
+
+    nrows = 1000
+    filters = None
+
+    def setUp(self):
+        super().setUp()
+        self.table = self.h5file.create_table(
+            '/', 'test', {'c1': tb.Int32Col(), 'c2': tb.Float64Col()},
+            filters=self.filters, chunkshape=(10,))
+        self.table.append([(i % 37, i / 2) for i in range(self.nrows)])
+        self.table.nrowsinbuf = 30
+
+    def check_queries(self):
+        table = self.table
+        cond = 'c1 < 5'
+        for start, stop, step in [(None, None, None), (3, 997, 1),
+                                  (7, 811, 4), (1, 1000, 61), (500, 10, 1)]:
+            pyrownos = [n for n in range(self.nrows)[start:stop:step]
+                        if n % 37 < 5]
+            rownos = table.get_where_list(cond, start=start, stop=stop,
+                                          step=step)
+            self.assertEqual(rownos.tolist(), pyrownos)
+            self.assertEqual(rownos.dtype, np.int64)
+            recs = table.read_where(cond, start=start, stop=stop, step=step)
+            self.assertEqual(recs.dtype, table.dtype)
+            np.testing.assert_array_equal(recs, table.read()[pyrownos])
+            c2 = table.read_where(cond, start=start, stop=stop, step=step,
+                                  field='c2')
+            np.testing.assert_array_equal(c2, np.array(pyrownos) / 2)
+            iterrownos = [r.nrow for r in table.where(
+                cond, start=start, stop=stop, step=step)]
+            self.assertEqual(iterrownos, pyrownos)
+
+    def test_inkernel(self):
+        self.check_queries()
+
+    def test_indexed(self):
+        self.table.cols.c1.create_index(_blocksizes=small_blocksizes)
+        self.assertTrue(self.table.will_query_use_indexing('c1 < 5'))
+        # Query twice to check the result caching too.
+        self.check_queries()
+        self.check_queries()
+
+    def test_no_matches(self):
+        self.assertEqual(len(self.table.get_where_list('c1 < 0')), 0)
+        self.assertEqual(len(self.table.read_where('c1 < 0')), 0)
+        self.assertEqual(len(self.table.read_where('c1 < 0', field='c2')), 0)
+
+
+class ParallelBufferedQueryTestCase(BufferedQueryTestCase):
+    """Test for queries scanning the table with several threads."""
+
+    open_kwargs = {'max_query_threads': 4}
+
+
+@common.unittest.skipIf(not common.blosc2_avail,
+                        'BLOSC2 compression library not available')
+class ParallelBlosc2BufferedQueryTestCase(ParallelBufferedQueryTestCase):
+    """Test for parallel queries on Blosc2 tables."""
+
+    filters = tb.Filters(complevel=1, complib='blosc2')
+
+
+class CountWhereTestCase(common.TempFileMixin, common.PyTablesTestCase):
+    """Test for counting the rows fulfilling a condition."""
+
+    nrows = 1000
+    kind = None
+    conditions = ['c1 < 5', 'c1 == 7', '(c1 > 3) & (c1 <= 10)',
+                  '~(c1 < 20)', 'c1 > 100', '(c1 < 3) | (c1 > 30)',
+                  'c1 < 5.5', '(c1 < 5) & (c2 > 100)', 'c2 > 251.5']
+
+    def setUp(self):
+        super().setUp()
+        self.table = self.h5file.create_table(
+            '/', 'test', {'c1': tb.Int32Col(), 'c2': tb.Float64Col()},
+            chunkshape=(10,))
+        self.table.append([(i % 37, i / 2) for i in range(self.nrows)])
+        self.table.nrowsinbuf = 30
+        if self.kind is not None:
+            self.table.cols.c1.create_index(kind=self.kind,
+                                            _blocksizes=small_blocksizes)
+
+    def test_count_where(self):
+        for cond in self.conditions:
+            for start, stop, step in [(None, None, None), (7, 811, 4),
+                                      (500, 10, 1)]:
+                count = self.table.count_where(cond, start=start, stop=stop,
+                                               step=step)
+                self.assertEqual(count, len(self.table.get_where_list(
+                    cond, start=start, stop=stop, step=step)))
+
+    def test_count_from_index(self):
+        table = self.table
+        for cond in self.conditions:
+            condvars = table._required_expr_vars(cond, None, depth=1)
+            compiled = table._compile_condition(cond, condvars)
+            count = tb.table._table__count_indexed(table, compiled, condvars)
+            if (self.kind in ('medium', 'full')
+                    and cond in self.conditions[:5]):
+                self.assertEqual(count, len(table.get_where_list(cond)))
+            else:
+                self.assertIsNone(count)
+
+
+class MediumIndexCountWhereTestCase(CountWhereTestCase):
+    kind = 'medium'
+
+
+class FullIndexCountWhereTestCase(CountWhereTestCase):
+    kind = 'full'
+
+
+class LightIndexCountWhereTestCase(CountWhereTestCase):
+    kind = 'light'
+
+
+class AggregateTestCase(common.TempFileMixin, common.PyTablesTestCase):
+    """Test for aggregations over the rows fulfilling a condition."""
+
+    nrows = 1000
+    indexed = False
+
+    def setUp(self):
+        super().setUp()
+        self.table = self.h5file.create_table(
+            '/', 'test', {'c1': tb.Int32Col(pos=0), 'c2': tb.Float64Col(pos=1),
+                          'c3': tb.Int16Col(shape=(2,), pos=2),
+                          'g': tb.StringCol(4, pos=3)},
+            chunkshape=(10,))
+        self.table.append([(i % 37, i / 2, (i % 11, -i), b'g%d' % (i % 3))
+                           for i in range(self.nrows)])
+        self.table.nrowsinbuf = 30
+        if self.indexed:
+            self.table.cols.c1.create_index(_blocksizes=small_blocksizes)
+
+    def test_aggregate(self):
+        aggregations = {'c1': 'sum', 'c2': 'mean', 'c3': 'min', 'g': 'count'}
+        for start, stop, step in [(None, None, None), (7, 811, 4),
+                                  (500, 10, 1)]:
+            rows = self.table.read_where('c1 < 5', start=start, stop=stop,
+                                         step=step)
+            result = self.table.aggregate('c1 < 5', aggregations,
+                                          start=start, stop=stop, step=step)
+            self.assertEqual(result['g'], len(rows))
+            self.assertEqual(result['c1'], rows['c1'].sum())
+            if len(rows) > 0:
+                self.assertAlmostEqual(result['c2'], rows['c2'].mean())
+                np.testing.assert_array_equal(result['c3'],
+                                              rows['c3'].min(axis=0))
+            else:
+                self.assertIsNone(result['c2'])
+                self.assertIsNone(result['c3'])
+
+    def test_aggregate_by(self):
+        aggregations = {'c1': 'max', 'c2': 'sum', 'c3': 'max', 'g': 'count'}
+        rows = self.table.read_where('c1 > 30')
+        result = self.table.aggregate('c1 > 30', aggregations, by='g')
+        self.assertEqual(list(result), [b'g0', b'g1', b'g2'])
+        for key, values in result.items():
+            group = rows[rows['g'] == key]
+            self.assertEqual(values['g'], len(group))
+            self.assertEqual(values['c1'], group['c1'].max())
+            self.assertAlmostEqual(values['c2'], group['c2'].sum())
+            np.testing.assert_array_equal(values['c3'],
+                                          group['c3'].max(axis=0))
+
+        result = self.table.aggregate('c1 < 5', {'c2': 'mean'}, by='c1')
+        self.assertEqual(list(result), [0, 1, 2, 3, 4])
+        for key, values in result.items():
+            c2 = self.table.read_where('c1 == key', field='c2')
+            self.assertAlmostEqual(values['c2'], c2.mean())
+
+    def test_no_matches(self):
+        result = self.table.aggregate('c1 < 0', {'c1': 'sum', 'c2': 'max',
+                                                 'g': 'count'})
+        self.assertEqual(result, {'c1': 0, 'c2': None, 'g': 0})
+        self.assertEqual(self.table.aggregate('c1 < 0', {'c1': 'sum'},
+                                              by='g'), {})
+
+    def test_errors(self):
+        self.assertRaises(ValueError, self.table.aggregate,
+                          'c1 < 5', {'c1': 'median'})
+        self.assertRaises(KeyError, self.table.aggregate,
+                          'c1 < 5', {'c4': 'sum'})
+        self.assertRaises(TypeError, self.table.aggregate,
+                          'c1 < 5', {'c1': 'sum'}, by='c3')
+
+
+class IndexedAggregateTestCase(AggregateTestCase):
+    """Test for aggregations using indexes."""
+
+    indexed = True
+
+
+class GroupbyTestCase(common.TempFileMixin, common.PyTablesTestCase):
+    """Test for aggregations grouped by a column with a CSI index."""
+
+    nrows = 1000
+
+    def setUp(self):
+        super().setUp()
+        self.table = self.h5file.create_table(
+            '/', 'test', {'c1': tb.Int32Col(pos=0), 'c2': tb.Float64Col(pos=1),
+                          'c3': tb.Int16Col(shape=(2,), pos=2),
+                          'g': tb.StringCol(4, pos=3)},
+            chunkshape=(10,))
+        self.table.append([(i % 37, i / 2, (i % 11, -i), b'g%d' % (i % 3))
+                           for i in range(self.nrows)])
+        self.table.nrowsinbuf = 30
+        for colname in ['c1', 'g']:
+            self.table.colinstances[colname].create_csindex(
+                _blocksizes=small_blocksizes)
+
+    def test_groupby(self):
+        aggregations = {'c1': 'max', 'c2': 'mean', 'c3': 'min', 'g': 'count'}
+        for by in ['c1', 'g']:
+            expected = self.table.aggregate('c1 >= 0', aggregations, by=by)
+            result = list(self.table.groupby(by, aggregations))
+            self.assertEqual([key for key, _ in result], list(expected))
+            for key, values in result:
+                self.assertEqual(values['c1'], expected[key]['c1'])
+                self.assertAlmostEqual(values['c2'], expected[key]['c2'])
+                np.testing.assert_array_equal(values['c3'],
+                                              expected[key]['c3'])
+                self.assertEqual(values['g'], expected[key]['g'])
+
+    def test_condition(self):
+        limit = 30
+        expected = self.table.aggregate('(c1 > limit) & (c2 < 400)',
+                                        {'c2': 'sum'}, by='c1')
+        result = dict(self.table.groupby('c1', {'c2': 'sum'},
+                                         '(c1 > limit) & (c2 < 400)'))
+        self.assertEqual(list(result), list(range(31, 37)))
+        self.assertEqual(result, expected)
+
+    def test_errors(self):
+        self.assertRaises(ValueError, self.table.groupby, 'c2',
+                          {'c1': 'sum'})
+        self.assertRaises(ValueError, self.table.groupby, 'c1',
+                          {'c1': 'median'})
+        self.table.autoindex = False
+        self.table.append([(1, 2., (3, 4), b'g5')])
+        self.assertRaises(ValueError, self.table.groupby, 'c1',
+                          {'c2': 'sum'})
+
+
+class QueryResultsTestCase(common.TempFileMixin, common.PyTablesTestCase):
+    """Test for query results kept in the file."""
+
+    open_kwargs = {'QUERY_RESULTS_SLOTS': 2}
+    nrows = 1000
+
+    def setUp(self):
+        super().setUp()
+        self.table = self.h5file.create_table(
+            '/', 'test', {'c1': tb.Int32Col(pos=0), 'c2': tb.Float64Col(pos=1)},
+            chunkshape=(10,))
+        self.table.append([(i % 37, i / 2) for i in range(self.nrows)])
+        self.table.nrowsinbuf = 30
+
+    def _reopen(self, mode='r', **kwargs):
+        super()._reopen(mode, **kwargs)
+        self.table = self.h5file.root.test
+
+    def _nresults(self):
+        results = self.table._query_results_node()
+        return 0 if results is None else len(results._v_leaves)
+
+    def _expected(self, condition, condvars=None, stop=None):
+        return [r.nrow
+                for r in self.table.where(condition, condvars, stop=stop)]
+
+    def _stored(self, method, *args, **kwargs):
+        """Call `method` and tell whether its result was stored."""
+
+        with mock.patch.object(self.table, '_coords_buffers',
+                               wraps=self.table._coords_buffers) as read:
+            result = method(*args, **kwargs)
+        return read.called, result
+
+    def test_reopen(self):
+        limit = 10
+        condition = '(c1 < limit) | (c2 > 400)'
+        coords = self.table.get_where_list(condition)
+        recs = self.table.read_where('c1 == 3', field='c2', start=1, step=2)
+        self.assertEqual(self._nresults(), 2)
+        self._reopen()
+        stored, result = self._stored(self.table.get_where_list, condition,
+                                      {'limit': limit})
+        self.assertTrue(stored)
+        np.testing.assert_array_equal(result, coords)
+        stored, result = self._stored(self.table.read_where, 'c1 == 3',
+                                      field='c2', start=1, step=2)
+        self.assertTrue(stored)
+        np.testing.assert_array_equal(result, recs)
+        stored, result = self._stored(self.table.read_where, condition,
+                                      {'limit': limit})
+        self.assertTrue(stored)
+        np.testing.assert_array_equal(result,
+                                      self.table.read_coordinates(coords))
+
+    def test_keys(self):
+        condition = 'c1 < limit'
+        for limit in [10, 20, 50]:
+            self.assertEqual(
+                list(self.table.get_where_list(condition, {'limit': limit})),
+                self._expected(condition, {'limit': limit}))
+        stored, result = self._stored(self.table.get_where_list, condition,
+                                      {'limit': 10})
+        self.assertFalse(stored)
+        self.assertEqual(list(result),
+                         self._expected(condition, {'limit': 10}))
+        stored, result = self._stored(self.table.get_where_list, 'c1 < 20',
+                                      stop=500)
+        self.assertFalse(stored)
+        self.assertEqual(list(result), self._expected('c1 < 20', stop=500))
+        self.assertEqual(len(self.table.get_where_list('c1 < 0')), 0)
+        stored, result = self._stored(self.table.get_where_list, 'c1 < 0')
+        self.assertTrue(stored)
+        self.assertEqual(len(result), 0)
+
+    def test_eviction(self):
+        conditions = ['c1 < 5', 'c1 > 30', 'c1 == 7']
+        self.table.get_where_list(conditions[0])
+        self.table.get_where_list(conditions[1])
+        self.table.get_where_list(conditions[0])  # last used now
+        self.table.get_where_list(conditions[2])
+        self.assertEqual(self._nresults(), 2)
+        self._reopen()
+        for condition, expected in zip(conditions, [True, False, True]):
+            stored, _ = self._stored(self.table.get_where_list, condition)
+            self.assertEqual(stored, expected)
+
+    def test_invalidation(self):
+        condition = '(c1 < 5) | (c1 > 30)'
+        modifications = [
+            lambda: self.table.append([(1, 2.)] * 10),
+            lambda: self.table.modify_column(0, 10, colname='c1',
+                                             column=np.full(10, 20, 'i4')),
+            lambda: self.table.modify_rows(990, 995, rows=[(40, 0.)] * 5),
+            lambda: self.table.modify_coordinates([3, 50], [(4, 1.)] * 2),
+            lambda: self.table.remove_rows(100, 200),
+            lambda: self.table.truncate(500),
+            lambda: self.table.append([(3, 3.)] * 100),
+        ]
+        for modify in modifications:
+            self.table.get_where_list(condition)
+            modify()
+            self.assertEqual(list(self.table.get_where_list(condition)),
+                             self._expected(condition))
+        for row in self.table.where('c1 == 3'):
+            row['c1'] = 10
+            row.update()
+        self.assertEqual(list(self.table.get_where_list(condition)),
+                         self._expected(condition))
+
+    def test_disabled(self):
+        self._reopen('a')
+        self.table.get_where_list('c1 < 5')
+        self.assertIsNone(self.table._query_results_node())
+        self.assertNotIn('_i_test', self.h5file.root)
+
+
+class ExplainTestCase(common.TempFileMixin, common.PyTablesTestCase):
+    """Test for query plans."""
+
+    nrows = 1000
+
+    def setUp(self):
+        super().setUp()
+        self.table = self.h5file.create_table(
+            '/', 'test', {'c1': tb.Int32Col(pos=0), 'c2': tb.Float64Col(pos=1),
+                          'c3': tb.Int32Col(pos=2)},
+            chunkshape=(10,))
+        self.table.append([(i % 37, i / 2, i) for i in range(self.nrows)])
+        self.table.nrowsinbuf = 30
+
+    def _check_analysis(self, plan, condition, **kwargs):
+        expected = self.table.get_where_list(condition, **kwargs)
+        self.assertEqual(plan['rows_returned'], len(expected))
+        if plan['chunks_selected'] is not None:
+            self.assertGreaterEqual(plan['rows_evaluated'], len(expected))
+        self.assertGreaterEqual(plan['timings']['total'],
+                                plan['timings']['scan'])
+
+    def test_in_kernel(self):
+        plan = self.table.explain('c2 < 100', analyze=True)
+        self.assertEqual(plan['strategy'], 'in-kernel')
+        self.assertEqual(plan['index_expressions'], [])
+        self.assertEqual(plan['chunks'], 100)
+        self.assertEqual(plan['chunks_selected'], 100)
+        self.assertEqual(plan['rows_evaluated'], self.nrows)
+        self._check_analysis(plan, 'c2 < 100')
+        plan = self.table.explain('c2 < 100', start=5, stop=500, step=3,
+                                  analyze=True)
+        self.assertEqual(plan['chunks'], 50)
+        self.assertEqual(plan['rows_evaluated'], len(range(5, 500, 3)))
+        self._check_analysis(plan, 'c2 < 100', start=5, stop=500, step=3)
+        plan = self.table.explain('c2 < 100')
+        self.assertEqual(plan['strategy'], 'in-kernel')
+        self.assertNotIn('timings', plan)
+
+    def test_indexes(self):
+        self.table.cols.c1.create_index(_blocksizes=small_blocksizes)
+        condition = '(c1 < limit) & (c2 > 100)'
+        plan = self.table.explain(condition, {'limit': 3}, analyze=True)
+        self.assertEqual(plan['strategy'], 'indexes')
+        self.assertFalse(plan['index_complete'])
+        [expr] = plan['index_expressions']
+        self.assertEqual(expr['column'], 'c1')
+        self.assertEqual(expr['kind'], 'medium')
+        self.assertEqual(expr['operators'], ('lt',))
+        self.assertEqual(expr['limits'], (3,))
+        self.assertEqual(expr['indexed_rows'], self.nrows)
+        self.assertLess(plan['chunks_selected'], plan['chunks'])
+        self.assertEqual(plan['rows_evaluated'],
+                         plan['chunks_selected'] * 10)
+        self._check_analysis(plan, condition, condvars={'limit': 3})
+        self.assertGreater(plan['caches']['chunks']['misses'], 0)
+        self.assertIn('c1 bounding limits', plan['caches'])
+        # The coordinates are known from the sequence cache now.
+        plan = self.table.explain(condition, {'limit': 3}, analyze=True)
+        self.assertEqual(plan['caches']['sequences'],
+                         {'hits': 1, 'misses': 0})
+        self.assertIsNone(plan['chunks_selected'])
+        self.assertEqual(plan['rows_evaluated'], 0)
+        self._check_analysis(plan, condition, condvars={'limit': 3})
+
+    def test_covering_index(self):
+        self.table.cols.c1.create_csindex()
+        plan = self.table.explain('(c1 > 3) & (c1 < 8)', analyze=True)
+        self.assertEqual(plan['strategy'], 'covering index')
+        self.assertTrue(plan['index_complete'])
+        self._check_analysis(plan, '(c1 > 3) & (c1 < 8)')
+
+    def test_chunk_summaries(self):
+        self.table.cols.c3.create_zonemap()
+        plan = self.table.explain('(c3 >= 100) & (c3 < 150)', analyze=True)
+        self.assertEqual(plan['strategy'], 'chunk summaries')
+        self.assertEqual(plan['chunk_summaries'], ['c3'])
+        self.assertEqual(plan['chunks_selected'], 5)
+        self.assertEqual(plan['rows_evaluated'], 50)
+        self._check_analysis(plan, '(c3 >= 100) & (c3 < 150)')
+
+    def test_empty_range(self):
+        plan = self.table.explain('c2 < 100', start=10, stop=10,
+                                  analyze=True)
+        self.assertEqual(plan['strategy'], 'empty range')
+        self.assertEqual(plan['chunks'], 0)
+        self.assertEqual(plan['rows_returned'], 0)
+
+
+class IsinTestCase(common.TempFileMixin, common.PyTablesTestCase):
+    """Test for set membership of column values in conditions."""
+
+    nrows = 1000
+    kind = None
+
+    def setUp(self):
+        super().setUp()
+        self.table = self.h5file.create_table(
+            '/', 'test', {'c1': tb.Int32Col(pos=0), 'c2': tb.Float64Col(pos=1),
+                          'c3': tb.StringCol(4, pos=2)},
+            chunkshape=(10,))
+        self.rows = rows = np.empty(self.nrows, dtype=self.table.dtype)
+        coords = np.arange(self.nrows)
+        rows['c1'] = (coords * 389) % 1000
+        rows['c2'] = rows['c1'] / 4
+        rows['c3'] = [b'%d' % i for i in rows['c1'] % 100]
+        self.table.append(rows)
+        self.table.nrowsinbuf = 30
+        if self.kind is not None:
+            for colname in ['c1', 'c2', 'c3']:
+                self.table.colinstances[colname].create_index(
+                    kind=self.kind, _blocksizes=small_blocksizes)
+
+    def check_where(self, condition, expected, condvars):
+        table = self.table
+        coords = table.get_where_list(condition, condvars, sort=True)
+        self.assertTrue(common.areArraysEqual(
+            coords, np.nonzero(expected)[0]), condition)
+        self.assertEqual(
+            [row.nrow for row in table.where(condition, condvars)],
+            coords.tolist())
+        self.assertEqual(table.count_where(condition, condvars),
+                         len(coords))
+
+    def test_values(self):
+        c1 = self.rows['c1']
+        for values in [[7], [0, 999, 3, 3, 500], list(range(0, 1000, 7)),
+                       set(range(990, 1010)), np.arange(-5, 5), [],
+                       [1.5, 2.0], [2**40]]:
+            expected = np.isin(c1, list(values))
+            self.check_where('isin(c1, values)', expected,
+                             {'values': values})
+            self.check_where('~isin(c1, values)', ~expected,
+                             {'values': values})
+
+    def test_conditions(self):
+        rows = self.rows
+        values = np.arange(0, 1000, 3)
+        expected = np.isin(rows['c1'], values)
+        condvars = {'values': values, 'svalues': [b'3', b'45', b'x'],
+                    'fvalues': values / 4}
+        self.check_where('isin(c1, values) & (c2 < 100)',
+                         expected & (rows['c2'] < 100), condvars)
+        self.check_where('isin(c1, values) | (c2 < 100)',
+                         expected | (rows['c2'] < 100), condvars)
+        self.check_where('isin(c3, svalues)',
+                         np.isin(rows['c3'], [b'3', b'45']), condvars)
+        self.check_where('isin(c2, fvalues) & isin(c3, svalues)',
+                         expected & np.isin(rows['c3'], [b'3', b'45']),
+                         condvars)
+        self.check_where('(c2 > 10) & isin(c1, values) & (c1 < 500)',
+                         expected & (rows['c2'] > 10) & (rows['c1'] < 500),
+                         condvars)
+
+    def test_range(self):
+        values = [3, 500, 998, 999]
+        for start, stop, step in [(7, 811, 4), (500, 10, 1), (990, None, 1)]:
+            coords = self.table.get_where_list(
+                'isin(c1, values)', start=start, stop=stop, step=step)
+            expected = [i for i in range(*slice(start, stop, step).indices(
+                self.nrows)) if self.rows['c1'][i] in values]
+            self.assertEqual(sorted(coords.tolist()), expected)
+
+    def test_indexed(self):
+        table = self.table
+        values = [3, 500]
+        self.assertEqual(
+            table.will_query_use_indexing('isin(c1, values)'),
+            frozenset(['c1'] if self.kind is not None else []))
+        self.assertEqual(
+            table.will_query_use_indexing('~isin(c1, values)'), frozenset())
+        self.assertEqual(
+            table.will_query_use_indexing('isin(c1, values) | (c2 > 0)'),
+            frozenset())
+
+    def test_summaries(self):
+        table = self.table
+        table.cols.c1.create_zonemap()
+        table.cols.c3.create_bloomfilter()
+        rows = self.rows
+        condvars = {'values': [7, 8], 'svalues': [b'5', b'11']}
+        self.check_where('isin(c1, values)', np.isin(rows['c1'], [7, 8]),
+                         condvars)
+        self.check_where('isin(c3, svalues)',
+                         np.isin(rows['c3'], [b'5', b'11']), condvars)
+        self.check_where('isin(c1, values) & isin(c3, svalues)',
+                         np.zeros(self.nrows, dtype=bool), condvars)
+
+    def test_errors(self):
+        table = self.table
+        condvars = {'c1': table.cols.c1, 'values': [1, 2]}
+        self.assertRaises(TypeError, table.get_where_list,
+                          'isin(values, values) & (c1 > 0)', condvars)
+        self.assertRaises(TypeError, table.get_where_list,
+                          'isin(c1, c1)', condvars)
+        self.assertRaises(ValueError, table.get_where_list,
+                          'isin(c1 + 1, values)', condvars)
+        self.assertRaises(ValueError, table.get_where_list,
+                          'isin(c1, [1, 2])', condvars)
+
+    def test_set_membership(self):
+        from tables.conditions import SetMembership
+
+        colvalues = np.array([-3, 0, 5, 6, 1000, 2**31 - 1], dtype='i4')
+        for values in [[5, 0, 5], [5, 2**31 - 1, -2**31],
+                       [0.0, 5.5, 2**40, 'x', b'5'], []]:
+            membership = SetMembership(self.table.cols.c1, values)
+            self.assertEqual(membership.values.dtype, np.dtype('i4'))
+            expected = np.isin(colvalues, [v for v in values
+                                           if v in (0, 5, 2**31 - 1)])
+            self.assertTrue(common.areArraysEqual(membership(colvalues),
+                                                  expected))
+
+
+class MediumIndexIsinTestCase(IsinTestCase):
+    kind = 'medium'
+
+
+class FullIndexIsinTestCase(IsinTestCase):
+    kind = 'full'
+
+
+class LightIndexIsinTestCase(IsinTestCase):
+    kind = 'light'
+
+
+class UltraLightIndexIsinTestCase(IsinTestCase):
+    kind = 'ultralight'
+
+
 def suite():
     """Return a test suite consisting of all the test cases in the module."""
 
@@ -1280,6 +1877,24 @@ def suite():
         testSuite.addTest(common.make_suite(IndexedTableUsage30))
         testSuite.addTest(common.make_suite(IndexedTableUsage31))
         testSuite.addTest(common.make_suite(IndexedTableUsage32))
+        testSuite.addTest(common.make_suite(BufferedQueryTestCase))
+        testSuite.addTest(common.make_suite(ParallelBufferedQueryTestCase))
+        testSuite.addTest(
+            common.make_suite(ParallelBlosc2BufferedQueryTestCase))
+        testSuite.addTest(common.make_suite(CountWhereTestCase))
+        testSuite.addTest(common.make_suite(MediumIndexCountWhereTestCase))
+        testSuite.addTest(common.make_suite(FullIndexCountWhereTestCase))
+        testSuite.addTest(common.make_suite(LightIndexCountWhereTestCase))
+        testSuite.addTest(common.make_suite(AggregateTestCase))
+        testSuite.addTest(common.make_suite(IndexedAggregateTestCase))
+        testSuite.addTest(common.make_suite(GroupbyTestCase))
+        testSuite.addTest(common.make_suite(QueryResultsTestCase))
+        testSuite.addTest(common.make_suite(ExplainTestCase))
+        testSuite.addTest(common.make_suite(IsinTestCase))
+        testSuite.addTest(common.make_suite(MediumIndexIsinTestCase))
+        testSuite.addTest(common.make_suite(FullIndexIsinTestCase))
+        testSuite.addTest(common.make_suite(LightIndexIsinTestCase))
+        testSuite.addTest(common.make_suite(UltraLightIndexIsinTestCase))
 
     return testSuite
 
@@ -0,0 +1,143 @@
+"""Test module for compressed sets of row coordinates."""
+
+import sys
+
+import numpy as np
+
+import tables as tb
+from tables.tests import common
+
+
+class RowSetTestCase(common.PyTablesTestCase):
+    """Test for the set operations of row sets."""
+
+    def setUp(self):
+        super().setUp()
+        rng = np.random.default_rng(1)
+        # Sparse, dense and contiguous coordinates over a few ranges
+        self.coords = [
+            rng.integers(0, 300_000, 2000),
+            rng.integers(0, 300_000, 250_000),
+            np.arange(60_000, 200_000),
+            np.array([], dtype='int64'),
+        ]
+
+    def test_coords(self):
+        for coords in self.coords:
+            rowset = tb.RowSet(coords)
+            expected = np.unique(coords)
+            self.assertEqual(len(rowset), len(expected))
+            self.assertEqual(bool(rowset), len(expected) > 0)
+            np.testing.assert_array_equal(rowset.coords(), expected)
+            np.testing.assert_array_equal(np.asarray(rowset), expected)
+            self.assertEqual(list(rowset), expected.tolist())
+            self.assertEqual(len(list(rowset.chunks())),
+                             len(np.unique(expected >> 16)))
+            for coord in expected[::97]:
+                self.assertIn(coord, rowset)
+            self.assertNotIn(300_001, rowset)
+
+    def test_operations(self):
+        for first in self.coords:
+            for second in self.coords:
+                a, b = tb.RowSet(first), tb.RowSet(second)
+                first_, second_ = np.unique(first), np.unique(second)
+                np.testing.assert_array_equal(
+                    (a | b).coords(), np.union1d(first_, second_))
+                np.testing.assert_array_equal(
+                    (a & b).coords(), np.intersect1d(first_, second_))
+                np.testing.assert_array_equal(
+                    (a - b).coords(), np.setdiff1d(first_, second_))
+                self.assertEqual(a.union(b, second), a | b)
+                self.assertEqual(a.intersection(b, a), a & b)
+                self.assertEqual(a.difference(b, [0]),
+                                 a - b - tb.RowSet([0]))
+
+    def test_size(self):
+        rowset = tb.RowSet(np.arange(10 * 2**16))
+        self.assertEqual(rowset.nbytes, 10 * 2**16 // 8)
+        self.assertEqual(tb.RowSet([1, 2, 2**20]).nbytes, 3 * 2)
+
+    def test_errors(self):
+        self.assertRaises(ValueError, tb.RowSet, [3, -1])
+        self.assertRaises(ValueError, tb.RowSet, [[1, 2]])
+
+
+class TableRowSetTestCase(common.TempFileMixin, common.PyTablesTestCase):
+    """Test for row sets of table queries."""
+
+    nrows = 1000
+
+    def setUp(self):
+        super().setUp()
+        self.table = self.h5file.create_table(
+            '/', 'test', {'c1': tb.Int32Col(pos=0), 'c2': tb.Float64Col(pos=1)},
+            chunkshape=(10,))
+        self.table.append([(i % 37, i / 2) for i in range(self.nrows)])
+        self.table.nrowsinbuf = 30
+
+    def test_get_where_rowset(self):
+        limit = 10
+        rowset = self.table.get_where_rowset('c1 < limit')
+        self.assertIsInstance(rowset, tb.RowSet)
+        np.testing.assert_array_equal(
+            rowset.coords(), self.table.get_where_list('c1 < limit'))
+        rowset = self.table.get_where_rowset('c1 < limit', start=5, stop=500,
+                                             step=3)
+        np.testing.assert_array_equal(
+            rowset.coords(),
+            self.table.get_where_list('c1 < limit', start=5, stop=500,
+                                      step=3))
+        self.assertEqual(len(self.table.get_where_rowset('c1 < 0')), 0)
+
+    def test_combine(self):
+        rowset = (self.table.get_where_rowset('c1 < 10')
+                  & self.table.get_where_rowset('c2 > 100'))
+        rowset |= self.table.get_where_rowset('c1 == 30')
+        np.testing.assert_array_equal(
+            rowset.coords(),
+            self.table.get_where_list('((c1 < 10) & (c2 > 100)) | (c1 == 30)'))
+
+    def test_indexed(self):
+        self.table.cols.c1.create_csindex()
+        np.testing.assert_array_equal(
+            self.table.get_where_rowset('(c1 > 3) & (c1 < 8)').coords(),
+            self.table.get_where_list('(c1 > 3) & (c1 < 8)', sort=True))
+
+    def test_read_coordinates(self):
+        rowset = self.table.get_where_rowset('c1 == 5')
+        coords = rowset.coords()
+        np.testing.assert_array_equal(self.table.read_coordinates(rowset),
+                                      self.table.read_coordinates(coords))
+        np.testing.assert_array_equal(
+            self.table.read_coordinates(rowset, field='c2'), coords / 2)
+        self.assertEqual(len(self.table.read_coordinates(tb.RowSet())), 0)
+
+    def test_itersequence(self):
+        rowset = tb.RowSet([900, 3, 70_000 % self.nrows, 5])
+        self.assertEqual([row.nrow for row in self.table.itersequence(rowset)],
+                         sorted(rowset))
+        self.assertEqual(list(self.table.itersequence(tb.RowSet())), [])
+
+    def test_modify_coordinates(self):
+        rowset = self.table.get_where_rowset('c1 == 5')
+        nrows = self.table.modify_coordinates(rowset, [(-1, 0.)] * len(rowset))
+        self.assertEqual(nrows, len(rowset))
+        self.assertEqual(len(self.table.get_where_list('c1 == 5')), 0)
+        np.testing.assert_array_equal(
+            self.table.get_where_list('c1 == -1'), rowset.coords())
+
+
+def suite():
+    theSuite = common.unittest.TestSuite()
+
+    theSuite.addTest(common.make_suite(RowSetTestCase))
+    theSuite.addTest(common.make_suite(TableRowSetTestCase))
+
+    return theSuite
+
+
+if __name__ == '__main__':
+    common.parse_argv(sys.argv)
+    common.print_versions()
+    common.unittest.main(defaultTest='suite')
@@ -28,7 +28,10 @@ def suite():
         'tables.tests.test_hdf5compat',
         'tables.tests.test_numpy',
         'tables.tests.test_queries',
+        'tables.tests.test_rowset',
+        'tables.tests.test_lrucache',
         'tables.tests.test_expression',
+        'tables.tests.test_parallel',
         'tables.tests.test_links',
         'tables.tests.test_indexes',
         'tables.tests.test_indexvalues',
@@ -360,6 +360,8 @@ class NailedDict:
         self.maxentries = maxentries
         self._cache: dict = {}
         self._nailcount = 0
+        # Lookups finding and not finding their keys, and entries evicted
+        self.nhits = self.nmisses = self.nevictions = 0
 
     # Only a restricted set of dictionary methods are supported.  That
     # is why we buy instead of inherit.
@@ -370,6 +372,26 @@ class NailedDict:
     def clear(self) -> None:
         self._cache.clear()
 
+    def stats(self) -> dict[str, Any]:
+        """Get a dictionary with the statistics of the cache.
+
+        The keys are the same as in the statistics of the LRU caches in
+        :mod:`tables.lrucacheextension`.  The size of the entries is not
+        measured, so ``nbytes`` is None.  Lookups while the dictionary
+        has nails on it count as misses.
+
+        """
+
+        return {'hits': self.nhits, 'misses': self.nmisses,
+                'evictions': self.nevictions, 'nslots': self.maxentries,
+                'nused': len(self._cache), 'nbytes': None,
+                'enabled': self.maxentries > 0 and self._nailcount == 0}
+
+    def resetstats(self) -> None:
+        """Reset the counts of hits, misses and evictions."""
+
+        self.nhits = self.nmisses = self.nevictions = 0
+
     def nail(self) -> None:
         self._nailcount += 1
 
@@ -385,14 +407,18 @@ class NailedDict:
         return key in self._cache
 
     def __getitem__(self, key: Any) -> Any:
-        if self._nailcount > 0:
+        if self._nailcount > 0 or key not in self._cache:
+            self.nmisses += 1
             raise KeyError(key)
+        self.nhits += 1
         return self._cache[key]
 
     def get(self, key: Any, default: Optional[Any]=None) -> Any:
-        if self._nailcount > 0:
+        if self._nailcount > 0 or key not in self._cache:
+            self.nmisses += 1
             return default
-        return self._cache.get(key, default)
+        self.nhits += 1
+        return self._cache[key]
 
     def __setitem__(self, key: Any, value: Any) -> None:
         if self._nailcount > 0:
@@ -404,6 +430,7 @@ class NailedDict:
             entries_to_remove = max(self.maxentries // 10, 1)
             for k in list(cache)[:entries_to_remove]:
                 del cache[k]
+            self.nevictions += entries_to_remove
         cache[key] = value
 
 
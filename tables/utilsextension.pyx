@@ -62,7 +62,8 @@ from .definitions cimport (H5ARRAYget_info, H5ARRAYget_ndims,
   H5D_layout_t, H5Dclose, H5Dget_type, H5Dopen, H5E_DEFAULT,
   H5E_WALK_DOWNWARD, H5E_auto_t, H5E_error_t, H5E_walk_t, H5Eget_msg,
   H5Eprint, H5Eset_auto, H5Ewalk, H5F_ACC_RDONLY, H5Fclose, H5Fis_hdf5,
-  H5Fopen, H5Gclose, H5Gopen, H5P_DEFAULT, H5T_ARRAY, H5T_BITFIELD,
+  H5Fopen, H5Gclose, H5Gopen, H5is_library_threadsafe, H5P_DEFAULT,
+  H5T_ARRAY, H5T_BITFIELD,
   H5T_COMPOUND, H5T_CSET_ASCII, H5T_CSET_UTF8, H5T_C_S1, H5T_DIR_DEFAULT,
   H5T_ENUM, H5T_FLOAT, H5T_IEEE_F32BE, H5T_IEEE_F32LE, H5T_IEEE_F64BE,
   H5T_IEEE_F64LE, H5T_INTEGER, H5T_NATIVE_DOUBLE, H5T_NATIVE_LDOUBLE,
@@ -83,7 +84,7 @@ from .definitions cimport (H5ARRAYget_info, H5ARRAYget_ndims,
   H5Zunregister, FILTER_BLOSC, FILTER_BLOSC2,
   PyArray_Scalar, create_ieee_complex128, create_ieee_complex64,
   create_ieee_float16, create_ieee_complex192, create_ieee_complex256,
-  get_len_of_range, get_order, herr_t, hid_t, hsize_t,
+  get_len_of_range, get_order, hbool_t, herr_t, hid_t, hsize_t,
   hssize_t, htri_t, is_complex, register_blosc, register_blosc2, set_order,
   H5free_memory, H5T_STD_REF_OBJ, H5Rdereference, H5R_OBJECT, H5I_DATASET, H5I_REFERENCE,
   H5Iget_type, hobj_ref_t, H5Oclose)
@@ -595,6 +596,16 @@ def get_hdf5_version():
   return getHDF5VersionInfo()[1]
 
 
+def is_hdf5_threadsafe():
+  """Whether the underlying HDF5 library can be used by several threads"""
+
+  cdef hbool_t is_ts = 0
+
+  if H5is_library_threadsafe(&is_ts) < 0:
+    return False
+  return bool(is_ts)
+
+
 def which_lib_version(str name):
   """which_lib_version(name)
 
@@ -8,6 +8,7 @@ import numpy as np
 import numpy.typing as npt
 
 from . import hdf5extension
+from .chunkcache import get_shared_cache
 from .atom import ObjectAtom, VLStringAtom, VLUnicodeAtom
 from .flavor import internal_to_flavor
 from .leaf import Leaf, calc_chunksize
@@ -821,7 +822,9 @@ class VLArray(hdf5extension.VLArray, Leaf):
         if start == stop:
             listarr = []
         else:
-            listarr = self._read_array(start, stop, step)
+            listarr = self._read_cached_array(start, stop, step)
+            if listarr is None:
+                listarr = self._read_array(start, stop, step)
 
         atom = self.atom
         if not hasattr(atom, 'size'):  # it is a pseudo-atom
@@ -832,6 +835,47 @@ class VLArray(hdf5extension.VLArray, Leaf):
             outlistarr = [internal_to_flavor(arr, flavor) for arr in listarr]
         return outlistarr
 
+    def _read_cached_array(self,
+                           start: int,
+                           stop: int,
+                           step: int) -> Optional[list[np.ndarray]]:
+        """Read a range of rows through the shared cache of chunks.
+
+        The chunks in the range are read whole and kept in the cache.  None
+        is returned (and nothing is read) if the cache is disabled or the
+        range spans too many chunks.
+
+        """
+
+        cache = get_shared_cache()
+        if cache is None:
+            return None
+        rows = range(start, stop, step)
+        chunksize = self.chunkshape[0]
+        chunks = range(rows[0] // chunksize, rows[-1] // chunksize + 1)
+        if not cache.fits(len(chunks)):
+            return None
+
+        listarr = []
+        leafkey = self._shared_chunk_key()
+        for nchunk in chunks:
+            cstart = nchunk * chunksize
+            # The rows of the range in the chunk
+            chunkrows = rows[max(0, -((start - cstart) // step)):
+                             -((start - cstart - chunksize) // step)]
+            if len(chunkrows) == 0:
+                continue  # the range steps over the chunk
+            key = leafkey + (nchunk,)
+            chunk = cache.get(key)
+            if chunk is None:
+                cstop = min(cstart + chunksize, self.nrows)
+                chunk = self._read_array(cstart, cstop, 1)
+                cache.put(key, chunk, sum(arr.nbytes for arr in chunk))
+            # Rows are copied so that changes to them do not reach the cache
+            listarr.extend(chunk[nrow - cstart].copy()
+                           for nrow in chunkrows)
+        return listarr
+
     def _read_coordinates(self, coords: Sequence[int]) -> list[list]:
         """Read rows specified in `coords`."""
         rows = []